@@ -16,6 +16,7 @@ class Settings(BaseSettings):
     port: int = Field(default=8000, env="PORT")
     debug: bool = Field(default=True, env="DEBUG")
     environment: str = Field(default="development", env="ENVIRONMENT")
+    admin_api_token: Optional[str] = Field(default=None, env="ADMIN_API_TOKEN")  # X-Admin-Token for /api/admin; unset disables it
     
     # Firebase Configuration
     firebase_project_id: Optional[str] = Field(default=None, env="FIREBASE_PROJECT_ID")
@@ -50,14 +51,90 @@ class Settings(BaseSettings):
     scholarship_cache_ttl_hours: int = Field(default=24, env="SCHOLARSHIP_CACHE_TTL_HOURS")
     ai_enrichment_cache_ttl_hours: int = Field(default=168, env="AI_ENRICHMENT_CACHE_TTL_HOURS")
     
+    # Opportunity Catalog (in-process read model fed by Firestore snapshot listeners)
+    catalog_cache_enabled: bool = Field(default=True, env="CATALOG_CACHE_ENABLED")
+    catalog_ready_timeout_seconds: float = Field(default=30.0, env="CATALOG_READY_TIMEOUT_SECONDS")
+    
+    # Vector Search ("exact" NumPy scan, or "ivf" persistent approximate index)
+    vector_index_type: str = Field(default="exact", env="VECTOR_INDEX_TYPE")
+    vector_index_path: str = Field(default="var/vector_index.npz", env="VECTOR_INDEX_PATH")
+    vector_index_nprobe: int = Field(default=8, env="VECTOR_INDEX_NPROBE")
+    
+    # Embedding Cache (content-addressed LRU + SQLite disk tier)
+    embedding_cache_enabled: bool = Field(default=True, env="EMBEDDING_CACHE_ENABLED")
+    embedding_cache_max_entries: int = Field(default=10000, env="EMBEDDING_CACHE_MAX_ENTRIES")
+    embedding_cache_path: str = Field(default="var/embedding_cache.sqlite3", env="EMBEDDING_CACHE_PATH")
+    embedding_cache_commit_every: int = Field(default=32, env="EMBEDDING_CACHE_COMMIT_EVERY")  # disk writes per commit
+    embedding_cache_commit_interval_seconds: float = Field(default=5.0, env="EMBEDDING_CACHE_COMMIT_INTERVAL_SECONDS")
+    
+    # Embedding Backfill (vectors for opportunities ingested without one)
+    embedding_backfill_enabled: bool = Field(default=True, env="EMBEDDING_BACKFILL_ENABLED")
+    embedding_backfill_batch_size: int = Field(default=50, env="EMBEDDING_BACKFILL_BATCH_SIZE")
+    embedding_backfill_max_per_minute: int = Field(default=600, env="EMBEDDING_BACKFILL_MAX_PER_MINUTE")
+    embedding_backfill_interval_seconds: int = Field(default=300, env="EMBEDDING_BACKFILL_INTERVAL_SECONDS")
+    embedding_backfill_max_batch_failures: int = Field(default=3, env="EMBEDDING_BACKFILL_MAX_BATCH_FAILURES")
+    
+    # Expiry Sweeper (removes opportunities past their deadline_timestamp)
+    expiry_sweep_enabled: bool = Field(default=True, env="EXPIRY_SWEEP_ENABLED")
+    expiry_sweep_interval_seconds: int = Field(default=600, env="EXPIRY_SWEEP_INTERVAL_SECONDS")
+    expiry_sweep_batch_size: int = Field(default=200, env="EXPIRY_SWEEP_BATCH_SIZE")
+    expiry_sweep_grace_seconds: int = Field(default=86400, env="EXPIRY_SWEEP_GRACE_SECONDS")
+    expiry_sweep_archive: bool = Field(default=True, env="EXPIRY_SWEEP_ARCHIVE")
+    
+    # Draft Autosave (write-behind buffer in front of application draft updates)
+    draft_buffer_enabled: bool = Field(default=True, env="DRAFT_BUFFER_ENABLED")
+    draft_buffer_debounce_seconds: float = Field(default=5.0, env="DRAFT_BUFFER_DEBOUNCE_SECONDS")
+    draft_buffer_max_delay_seconds: float = Field(default=30.0, env="DRAFT_BUFFER_MAX_DELAY_SECONDS")
+    
+    # Match Cache (ranked matches per user, invalidated by profile hash / catalog version)
+    match_cache_max_users: int = Field(default=10000, env="MATCH_CACHE_MAX_USERS")
+    match_cache_stale_seconds: float = Field(default=0.0, env="MATCH_CACHE_STALE_SECONDS")  # opt-in: >0 rate-limits re-ranking on catalog deltas
+    user_matches_top_k: int = Field(default=100, env="USER_MATCHES_TOP_K")
+    user_matches_cache_seconds: float = Field(default=0.0, env="USER_MATCHES_CACHE_SECONDS")  # >0 only with a single writer process
+    
+    # Storage Backend ("firestore", or "sqlite" for a local single-file store)
+    storage_backend: str = Field(default="firestore", env="STORAGE_BACKEND")
+    sqlite_path: str = Field(default="var/scholarstream.sqlite3", env="SQLITE_PATH")
+    
+    # Firestore Access (sync client calls run on a bounded thread pool)
+    firestore_max_workers: int = Field(default=32, env="FIRESTORE_MAX_WORKERS")
+    firestore_timeout_seconds: float = Field(default=10.0, env="FIRESTORE_TIMEOUT_SECONDS")
+    firestore_scan_page_size: int = Field(default=500, env="FIRESTORE_SCAN_PAGE_SIZE")
+    firestore_bulk_chunk_size: int = Field(default=200, env="FIRESTORE_BULK_CHUNK_SIZE")
+    firestore_bulk_concurrency: int = Field(default=4, env="FIRESTORE_BULK_CONCURRENCY")
+    firestore_bulk_max_ops_per_second: int = Field(default=500, env="FIRESTORE_BULK_MAX_OPS_PER_SECOND")
+    
     
     # Cloudinary
     cloudinary_cloud_name: Optional[str] = Field(default=None, env="CLOUDINARY_CLOUD_NAME")
     cloudinary_api_key: Optional[str] = Field(default=None, env="CLOUDINARY_API_KEY")
     cloudinary_api_secret: Optional[str] = Field(default=None, env="CLOUDINARY_API_SECRET")
     
-    # Event Broker Configuration
+    # Event Broker Configuration ("memory", "log" for a durable local log, or "kafka")
     event_broker_type: str = Field(default="memory", env="EVENT_BROKER_TYPE")
+    broker_queue_size: int = Field(default=250, env="BROKER_QUEUE_SIZE")  # per partition
+    broker_partitions: int = Field(default=4, env="BROKER_PARTITIONS")  # ordered consumers per subscriber
+    broker_overflow_policy: str = Field(default="block", env="BROKER_OVERFLOW_POLICY")  # block | drop_oldest | reject
+    broker_drain_timeout_seconds: float = Field(default=5.0, env="BROKER_DRAIN_TIMEOUT_SECONDS")
+    # Handler retries (exponential backoff with jitter), then the event goes to <topic>.dlq
+    broker_retry_max_attempts: int = Field(default=5, env="BROKER_RETRY_MAX_ATTEMPTS")
+    broker_retry_base_delay_seconds: float = Field(default=0.5, env="BROKER_RETRY_BASE_DELAY_SECONDS")
+    broker_retry_max_delay_seconds: float = Field(default=30.0, env="BROKER_RETRY_MAX_DELAY_SECONDS")
+    broker_retry_jitter: float = Field(default=0.5, env="BROKER_RETRY_JITTER")  # fraction of each delay
+    log_broker_path: str = Field(default="var/event_log.sqlite3", env="LOG_BROKER_PATH")
+    log_broker_flush_interval_seconds: float = Field(default=0.005, env="LOG_BROKER_FLUSH_INTERVAL_SECONDS")  # group-commit window
+    log_broker_batch_size: int = Field(default=100, env="LOG_BROKER_BATCH_SIZE")  # events per consumer read / offset commit
+    log_broker_poll_interval_seconds: float = Field(default=1.0, env="LOG_BROKER_POLL_INTERVAL_SECONDS")
+    log_broker_retention_hours: float = Field(default=168.0, env="LOG_BROKER_RETENTION_HOURS")
+    log_broker_retention_bytes: int = Field(default=1_073_741_824, env="LOG_BROKER_RETENTION_BYTES")
+    log_broker_retention_check_seconds: float = Field(default=300.0, env="LOG_BROKER_RETENTION_CHECK_SECONDS")
+    kafka_bootstrap_servers: Optional[str] = Field(default=None, env="KAFKA_BOOTSTRAP_SERVERS")
+    kafka_sasl_username: Optional[str] = Field(default=None, env="KAFKA_SASL_USERNAME")
+    kafka_sasl_password: Optional[str] = Field(default=None, env="KAFKA_SASL_PASSWORD")
+    kafka_group_prefix: str = Field(default="scholarstream", env="KAFKA_GROUP_PREFIX")  # consumer group = prefix.topic.handler
+    kafka_consume_batch_size: int = Field(default=200, env="KAFKA_CONSUME_BATCH_SIZE")
+    kafka_consume_timeout_seconds: float = Field(default=1.0, env="KAFKA_CONSUME_TIMEOUT_SECONDS")
+    kafka_linger_ms: int = Field(default=20, env="KAFKA_LINGER_MS")
     
     # Topic Names (Preserved for internal routing)
     topic_raw_html: str = Field(default="cortex.raw.html", env="TOPIC_RAW_HTML")
@@ -2,12 +2,45 @@
 Event Broker Interface (Port)
 Defines the contract for event publishing and subscription.
 """
-from typing import Dict, Any, Protocol, Callable, Awaitable
+import random
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Protocol, Callable, Awaitable
+
+DLQ_SUFFIX = ".dlq"
+
+
+def dlq_topic(topic: str) -> str:
+    """Dead-letter topic for events whose handler exhausted its retries"""
+    return f"{topic}{DLQ_SUFFIX}"
+
+
+class NonRetryableError(Exception):
+    """A handler failure that retrying cannot fix (e.g. malformed input): dead-lettered at the first attempt"""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    How often a failing handler is retried before its event is dead-lettered.
+    Delays grow exponentially from `base_delay_seconds`, capped at
+    `max_delay_seconds`, and each is shortened by a random fraction up to
+    `jitter` so retries of one outage do not land in lockstep.
+    """
+    max_attempts: int = 5
+    base_delay_seconds: float = 0.5
+    max_delay_seconds: float = 30.0
+    jitter: float = 0.5
+
+    def delay(self, attempt: int) -> float:
+        """Backoff after failed attempt number `attempt` (1-based)"""
+        delay = min(self.max_delay_seconds, self.base_delay_seconds * 2 ** (attempt - 1))
+        return delay * (1 - self.jitter * random.random())
+
 
 class EventBroker(Protocol):
     """
     Abstract Protocol for an Event Broker.
-    Allows switching between MemoryBroker and KafkaBroker.
+    Allows switching between MemoryBroker, LogBroker and KafkaBroker.
     """
     
     async def start(self) -> None:
@@ -22,6 +55,11 @@ class EventBroker(Protocol):
         """Publish an event to a topic"""
         ...
 
-    async def subscribe(self, topic: str, handler: Callable[[Dict[str, Any]], Awaitable[None]]) -> None:
-        """Subscribe a handler to a topic"""
+    async def subscribe(
+        self,
+        topic: str,
+        handler: Callable[[Dict[str, Any]], Awaitable[None]],
+        retry: Optional[RetryPolicy] = None
+    ) -> None:
+        """Subscribe a handler to a topic (broker default retry policy unless given)"""
         ...
@@ -0,0 +1,165 @@
+"""
+Storage Backend Interface (Port)
+Defines the persistence contract the API, services and workers depend on.
+Implemented by FirebaseDB (Firestore) and SQLiteDB (local file, WAL mode);
+`settings.storage_backend` selects one at startup.
+"""
+from typing import Any, Dict, List, NamedTuple, Optional, Protocol, Tuple
+
+from app.models import OpportunitySummary, Scholarship, UserProfile
+
+
+class BulkSaveOutcome(NamedTuple):
+    """Result of one item in save_scholarships_bulk"""
+    scholarship_id: str
+    status: str  # 'written' (new) | 'merged' (changed) | 'skipped' (unchanged) | 'failed'
+    error: Optional[str] = None
+
+
+class StorageBackend(Protocol):
+    """
+    Abstract Protocol for the application's persistence layer.
+    Allows switching between Firestore and a local SQLite file.
+    """
+
+    # Opportunity catalog lifecycle
+    def start_catalog(self) -> None:
+        """Feed the in-process opportunity catalog from this store"""
+        ...
+
+    def stop_catalog(self) -> None:
+        """Stop feeding the catalog and persist derived indexes"""
+        ...
+
+    # Users
+    async def get_user_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    async def update_user_profile(self, user_id: str, profile: UserProfile) -> bool:
+        ...
+
+    async def get_all_users(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """(user_id, user document) for every user"""
+        ...
+
+    async def update_user_last_match_time(self, user_id: str, timestamp: float) -> bool:
+        ...
+
+    async def save_user_scholarship(self, user_id: str, scholarship_id: str) -> bool:
+        ...
+
+    async def unsave_user_scholarship(self, user_id: str, scholarship_id: str) -> bool:
+        ...
+
+    # Scholarships
+    async def save_scholarship(self, scholarship: Scholarship) -> bool:
+        ...
+
+    async def save_scholarships_bulk(self, scholarships: List[Scholarship]) -> List[BulkSaveOutcome]:
+        ...
+
+    async def get_scholarship(self, scholarship_id: str) -> Optional[Scholarship]:
+        ...
+
+    async def get_all_scholarships(self) -> List[Scholarship]:
+        """Live opportunities with embeddings (vector path)"""
+        ...
+
+    async def get_scholarship_summaries(self) -> List[OpportunitySummary]:
+        """Live opportunities without embeddings (list views)"""
+        ...
+
+    async def update_scholarship_embeddings(self, embeddings: Dict[str, List[float]]) -> int:
+        ...
+
+    async def semantic_search(
+        self,
+        query_embedding: List[float],
+        limit: int = 20,
+        min_similarity: float = 0.55
+    ) -> List[Scholarship]:
+        ...
+
+    async def sweep_expired_scholarships(self, before: int, limit: int, archive: bool = True) -> List[str]:
+        """Remove (optionally archiving) up to `limit` opportunities whose deadline_timestamp < `before`"""
+        ...
+
+    # User matches
+    async def get_user_matched_scholarships(self, user_id: str) -> List[OpportunitySummary]:
+        ...
+
+    async def get_user_matches_doc(self, user_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    async def set_user_matches_doc(self, user_id: str, matches: Dict[str, Any]) -> bool:
+        ...
+
+    async def save_user_matches(self, user_id: str, matches: List[Tuple[str, float]]) -> bool:
+        ...
+
+    async def offer_user_match(self, user_id: str, scholarship_id: str, score: float) -> bool:
+        ...
+
+    # Applications
+    async def start_application(self, user_id: str, scholarship_id: str) -> str:
+        ...
+
+    async def save_application_draft(self, application_id: str, draft_data: Dict[str, Any]) -> bool:
+        ...
+
+    async def get_application_draft(self, user_id: str, scholarship_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    async def submit_application(self, application_data: Dict[str, Any]) -> str:
+        ...
+
+    async def get_user_applications(self, user_id: str) -> List[Dict[str, Any]]:
+        ...
+
+    async def get_application_by_id(self, application_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    async def update_application_status(self, application_id: str, status: str, **kwargs) -> bool:
+        ...
+
+    async def delete_application(self, application_id: str) -> bool:
+        ...
+
+    # Discovery jobs
+    async def create_discovery_job(self, user_id: str, job_id: str) -> bool:
+        ...
+
+    async def update_discovery_job(self, job_id: str, status: str, progress: float, scholarships_found: int) -> bool:
+        ...
+
+    async def get_discovery_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    # Chat history
+    async def save_chat_message(self, user_id: str, role: str, content: str) -> bool:
+        ...
+
+    async def get_chat_history(self, user_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+        ...
+
+    async def clear_chat_history(self, user_id: str) -> bool:
+        ...
+
+    # System state (worker checkpoints)
+    async def get_system_state(self, name: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    async def save_system_state(self, name: str, state: Dict[str, Any]) -> bool:
+        ...
+
+    # Dead letters (events whose handler exhausted its retries)
+    async def save_dead_letter(self, entry: Dict[str, Any]) -> str:
+        ...
+
+    async def get_dead_letters(
+        self, topic: Optional[str] = None, limit: int = 100, ids: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        ...
+
+    async def delete_dead_letters(self, ids: List[str]) -> int:
+        ...
@@ -1,15 +1,35 @@
 """
 Firebase Firestore database layer
 Handles all database operations with proper error handling
+
+`db` is the process-wide StorageBackend: FirebaseDB by default, or the local
+SQLiteDB when STORAGE_BACKEND=sqlite (no Firebase project needed).
 """
-import firebase_admin
-from firebase_admin import credentials, firestore
-from typing import Optional, List, Dict, Any
+try:
+    import firebase_admin
+    from firebase_admin import credentials, firestore
+    from google.cloud.firestore_v1.bulk_writer import BulkWriterOptions, SendMode
+except ImportError:  # Only the Firestore backend needs the Firebase SDK
+    firebase_admin = None
+from typing import Optional, List, Dict, Any, Tuple
+import asyncio
+import time
 from datetime import datetime
+import numpy as np
 import structlog
 
 from app.config import settings
-from app.models import Scholarship, UserProfile
+from app.core.storage import BulkSaveOutcome, StorageBackend
+from app.models import SUMMARY_FIELDS, OpportunitySummary, Scholarship, UserProfile
+from app.infrastructure.opportunity_catalog import opportunity_catalog
+from app.infrastructure.embedding_index import embedding_index, search_catalog
+from app.infrastructure.firestore_executor import firestore_executor
+from app.services.user_routing_index import user_routing_index
+from app.services.user_matches import TopKMatches, user_match_store
+from app.utils.scholarship_merge import merge_preserving
+from app.utils.fingerprint import FINGERPRINT_FIELD, content_fingerprint, is_unchanged, scholarship_write_stats
+from app.utils.embedding_codec import EMBEDDING_FIELD, PACKED_FIELD, pack_embedding, to_firestore
+from app.utils.deadlines import DEADLINE_TS_FIELD, is_expired, normalize_deadline
 
 logger = structlog.get_logger()
 
@@ -19,6 +39,8 @@ class FirebaseDB:
     
     def __init__(self):
         """Initialize Firebase Admin SDK"""
+        if firebase_admin is None:
+            raise RuntimeError("firebase_admin is not installed; set STORAGE_BACKEND=sqlite to run without Firestore")
         try:
             # Check if already initialized
             firebase_admin.get_app()
@@ -31,12 +53,78 @@ class FirebaseDB:
         
         self.db = firestore.client()
     
+    # Blocking client calls run on the bounded Firestore pool, never on the event loop
+    async def _run(self, fn, *args, **kwargs):
+        return await firestore_executor.run(fn, *args, **kwargs)
+    
+    async def _stream(self, query) -> list:
+        """Materialize a query stream off the event loop"""
+        return await firestore_executor.run(lambda: list(query.stream()))
+    
+    async def _scan(self, query) -> list:
+        """
+        Materialize an unbounded query page by page (limit + start_after).
+        Each page is its own call under the per-call timeout, so a full scan
+        never has to finish within a single call's deadline.
+        """
+        page_size = settings.firestore_scan_page_size
+        docs, last = [], None
+        while True:
+            page_query = query.limit(page_size)
+            if last is not None:
+                page_query = page_query.start_after(last)
+            page = await self._stream(page_query)
+            docs.extend(page)
+            if len(page) < page_size:
+                return docs
+            last = page[-1]
+    
+    async def _stream_live(self, query) -> list:
+        """
+        Stream only unexpired opportunities: a range query on the normalized
+        deadline_timestamp plus the undated (null) ones. Expired documents are
+        never read. Documents written before normalization lack the field and
+        are invisible here until scripts/normalize_deadlines.py has run.
+        """
+        now = int(time.time())
+        dated, undated = await asyncio.gather(
+            self._scan(query.where(DEADLINE_TS_FIELD, '>=', now)),
+            self._scan(query.where(DEADLINE_TS_FIELD, '==', None))
+        )
+        return dated + undated
+    
+    # Opportunity Catalog
+    @staticmethod
+    def _scholarship_data(doc: Dict[str, Any]) -> Dict[str, Any]:
+        """Model dump -> merge-write payload: vectors packed, legacy float arrays dropped"""
+        data = to_firestore(doc)
+        if PACKED_FIELD in data:
+            data[EMBEDDING_FIELD] = firestore.DELETE_FIELD
+        return data
+    
+    def start_catalog(self) -> None:
+        """Attach the in-process opportunity catalog to the scholarships collection"""
+        if settings.catalog_cache_enabled:
+            opportunity_catalog.start(self.db.collection('scholarships'))
+    
+    def stop_catalog(self) -> None:
+        """Detach the opportunity catalog listener and persist the vector index"""
+        opportunity_catalog.stop()
+        embedding_index.persist()
+    
+    async def _catalog_ready(self) -> bool:
+        """Start the catalog on first use and wait for its initial snapshot"""
+        if not settings.catalog_cache_enabled:
+            return False
+        self.start_catalog()
+        return await opportunity_catalog.wait_until_ready(settings.catalog_ready_timeout_seconds)
+    
     # User Profile Operations
     async def get_user_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Fetch user profile from Firestore"""
         try:
             doc_ref = self.db.collection('users').document(user_id)
-            doc = doc_ref.get()
+            doc = await self._run(doc_ref.get)
             
             if doc.exists:
                 return doc.to_dict()
@@ -45,14 +133,24 @@ class FirebaseDB:
             logger.error("Failed to fetch user profile", user_id=user_id, error=str(e))
             raise
     
+    async def get_all_users(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Fetch every user document as (user_id, document)"""
+        try:
+            docs = await self._scan(self.db.collection('users'))
+            return [(doc.id, doc.to_dict()) for doc in docs]
+        except Exception as e:
+            logger.error("Failed to fetch users", error=str(e))
+            raise
+    
     async def update_user_profile(self, user_id: str, profile: UserProfile) -> bool:
         """Update user profile in Firestore"""
         try:
             doc_ref = self.db.collection('users').document(user_id)
-            doc_ref.update({
+            await self._run(doc_ref.update, {
                 'profile': profile.model_dump(),
                 'updated_at': firestore.SERVER_TIMESTAMP
             })
+            user_routing_index.refresh_profile(user_id, profile.model_dump())
             logger.info("User profile updated", user_id=user_id)
             return True
         except Exception as e:
@@ -63,7 +161,7 @@ class FirebaseDB:
         """Update last_match_at in user profile for staleness tracking"""
         try:
             doc_ref = self.db.collection('users').document(user_id)
-            doc_ref.set({
+            await self._run(doc_ref.set, {
                 'last_match_at': timestamp,
                 'updated_at': firestore.SERVER_TIMESTAMP
             }, merge=True)
@@ -79,54 +177,122 @@ class FirebaseDB:
 
         V2 FIX: Merge-write with field-level preservation so "fast"/thin scrapes
         never overwrite richer "deep" data (prize pools, deadlines, descriptions).
+        Re-upserts whose merged content fingerprint matches the stored one are skipped.
         """
         try:
             doc_ref = self.db.collection('scholarships').document(scholarship.id)
 
-            incoming = scholarship.model_dump()
-            existing_doc = doc_ref.get()
-
-            if existing_doc.exists:
-                existing = existing_doc.to_dict() or {}
-
-                def _is_placeholder_amount_display(v: Any) -> bool:
-                    s = str(v or '').strip().lower()
-                    return s in {'', '$0', '0', 'see details', 'see listing', 'tbd', 'unknown', 'varies', 'prizes + swag (view details)'}
-
-                # Preserve richer fields from existing if incoming is empty/placeholder.
-                if float(incoming.get('amount') or 0) <= 0 and float(existing.get('amount') or 0) > 0:
-                    incoming['amount'] = existing.get('amount')
-
-                if _is_placeholder_amount_display(incoming.get('amount_display')) and not _is_placeholder_amount_display(existing.get('amount_display')):
-                    incoming['amount_display'] = existing.get('amount_display')
+            existing_doc = await self._run(doc_ref.get)
+            existing = (existing_doc.to_dict() or {}) if existing_doc.exists else None
 
-                if not incoming.get('deadline') and existing.get('deadline'):
-                    incoming['deadline'] = existing.get('deadline')
-                    incoming['deadline_timestamp'] = existing.get('deadline_timestamp')
-
-                if (not (incoming.get('description') or '').strip()) and (existing.get('description') or '').strip():
-                    incoming['description'] = existing.get('description')
-
-                # Union tags/geo/type tags for better UX.
-                for key in ['tags', 'geo_tags', 'type_tags']:
-                    inc = incoming.get(key) or []
-                    ex = existing.get(key) or []
-                    if isinstance(inc, list) and isinstance(ex, list):
-                        incoming[key] = list(dict.fromkeys([*ex, *inc]))
+            # Preserve richer fields from existing if incoming is empty/placeholder.
+            incoming = normalize_deadline(merge_preserving(scholarship.model_dump(), existing))
+            incoming[FINGERPRINT_FIELD] = content_fingerprint(incoming)
+            if is_unchanged(incoming, existing):
+                scholarship_write_stats.record('skipped')
+                logger.debug("Scholarship unchanged, write skipped", scholarship_id=scholarship.id)
+                return True
 
             # Merge write to avoid wiping fields that the incoming model doesn't include.
-            doc_ref.set(incoming, merge=True)
+            await self._run(doc_ref.set, self._scholarship_data(incoming), merge=True)
+            scholarship_write_stats.record('merged' if existing is not None else 'written')
             logger.info("Scholarship saved", scholarship_id=scholarship.id, title=scholarship.title)
             return True
         except Exception as e:
             logger.error("Failed to save scholarship", scholarship_id=scholarship.id, error=str(e))
             raise
     
+    async def save_scholarships_bulk(self, scholarships: List[Scholarship]) -> List[BulkSaveOutcome]:
+        """Save many scholarships with the same merge rules as save_scholarship.
+
+        Existing docs are read in chunks with get_all (up to
+        `firestore_bulk_concurrency` chunks in flight), merged in memory, and
+        written through one BulkWriter; unchanged documents (same content
+        fingerprint) are skipped. Returns one outcome per input item, in order;
+        a failed item never fails the rest.
+        """
+        collection = self.db.collection('scholarships')
+        # Repeated IDs collapse into one write, merged in input order
+        pending: Dict[str, Dict[str, Any]] = {}
+        for scholarship in scholarships:
+            pending[scholarship.id] = merge_preserving(scholarship.model_dump(), pending.get(scholarship.id))
+        ids = list(pending)
+
+        results: Dict[str, BulkSaveOutcome] = {}
+        writes: Dict[str, Tuple[Any, Dict[str, Any], str]] = {}
+        chunk_size = settings.firestore_bulk_chunk_size
+        limiter = asyncio.Semaphore(settings.firestore_bulk_concurrency)
+
+        async def read_chunk(chunk: List[str]) -> None:
+            refs = [collection.document(scholarship_id) for scholarship_id in chunk]
+            async with limiter:
+                try:
+                    snapshots = await self._run(lambda: list(self.db.get_all(refs)))
+                except Exception as e:
+                    logger.error("Bulk read of existing scholarships failed", count=len(chunk), error=str(e))
+                    for scholarship_id in chunk:
+                        results[scholarship_id] = BulkSaveOutcome(scholarship_id, 'failed', str(e))
+                    return
+            existing = {snap.id: snap.to_dict() or {} for snap in snapshots if snap.exists}
+            for ref in refs:
+                stored = existing.get(ref.id)
+                doc = normalize_deadline(merge_preserving(pending[ref.id], stored))
+                doc[FINGERPRINT_FIELD] = content_fingerprint(doc)
+                if is_unchanged(doc, stored):
+                    results[ref.id] = BulkSaveOutcome(ref.id, 'skipped')
+                    continue
+                writes[ref.id] = (ref, doc, 'merged' if stored is not None else 'written')
+
+        await asyncio.gather(*(read_chunk(ids[i:i + chunk_size]) for i in range(0, len(ids), chunk_size)))
+
+        if writes:
+            failures: Dict[str, str] = {}
+
+            def on_error(failure, _writer) -> bool:
+                # Retry transient failures a couple of times, then record the item
+                if failure.attempts < 3:
+                    return True
+                failures[failure.operation.reference.id] = failure.message
+                return False
+
+            def commit() -> None:
+                writer = self.db.bulk_writer(options=BulkWriterOptions(
+                    mode=SendMode.parallel,
+                    max_ops_per_second=settings.firestore_bulk_max_ops_per_second
+                ))
+                writer.on_write_error(on_error)
+                for ref, data, _ in writes.values():
+                    writer.set(ref, self._scholarship_data(data), merge=True)
+                writer.close()
+
+            try:
+                # One call covers every write, so the timeout scales with the batch
+                await self._run(commit, timeout=max(settings.firestore_timeout_seconds, len(writes) / 50))
+            except Exception as e:
+                logger.error("Bulk scholarship write failed", count=len(writes), error=str(e))
+                failures.update({scholarship_id: str(e) for scholarship_id in writes if scholarship_id not in failures})
+
+            for scholarship_id, (_, _, status) in writes.items():
+                error = failures.get(scholarship_id)
+                results[scholarship_id] = BulkSaveOutcome(scholarship_id, 'failed' if error else status, error)
+
+        counts = {'written': 0, 'merged': 0, 'skipped': 0, 'failed': 0}
+        for outcome in results.values():
+            counts[outcome.status] += 1
+        for status in ('written', 'merged', 'skipped'):
+            scholarship_write_stats.record(status, counts[status])
+
+        logger.info("Scholarships bulk saved", total=len(scholarships), **counts)
+        return [results[scholarship.id] for scholarship in scholarships]
+    
     async def get_scholarship(self, scholarship_id: str) -> Optional[Scholarship]:
         """Fetch single scholarship by ID"""
+        if opportunity_catalog.is_ready and scholarship_id in opportunity_catalog:
+            return opportunity_catalog.get(scholarship_id)
+        
         try:
             doc_ref = self.db.collection('scholarships').document(scholarship_id)
-            doc = doc_ref.get()
+            doc = await self._run(doc_ref.get)
             
             if doc.exists:
                 data = doc.to_dict()
@@ -137,62 +303,98 @@ class FirebaseDB:
             raise
     
     async def get_all_scholarships(self) -> List[Scholarship]:
-        """Fetch all scholarships, filtering out expired ones"""
+        """Fetch all scholarships, filtering out expired ones.
+
+        Full documents, embeddings included: meant for the vector path. List
+        and match views use get_scholarship_summaries.
+
+        Served from the in-process opportunity catalog once its snapshot
+        listener is live; falls back to streaming the collection otherwise.
+        """
+        if await self._catalog_ready():
+            scholarships = opportunity_catalog.snapshot()
+            logger.debug("Fetched scholarships from catalog", count=len(scholarships), catalog_version=opportunity_catalog.version)
+            return scholarships
+        
         try:
-            docs = self.db.collection('scholarships').stream()
+            docs = await self._stream_live(self.db.collection('scholarships'))
             scholarships = []
-            now = datetime.now()
-            expired_count = 0
             
             for doc in docs:
                 try:
-                    s = Scholarship(**doc.to_dict())
-                    
-                    # Filter expired opportunities
-                    if s.deadline:
-                        try:
-                            deadline_dt = datetime.fromisoformat(s.deadline.replace('Z', '+00:00'))
-                            if deadline_dt.date() < now.date():
-                                expired_count += 1
-                                continue  # Skip expired
-                        except (ValueError, TypeError):
-                            pass  # Keep if date is unparseable
-                    
-                    scholarships.append(s)
+                    scholarships.append(Scholarship(**doc.to_dict()))
                 except Exception as parse_error:
                     logger.warning("Failed to parse scholarship", doc_id=doc.id, error=str(parse_error))
                     continue
             
-            logger.info("Fetched scholarships", count=len(scholarships), expired_filtered=expired_count)
+            logger.info("Fetched scholarships", count=len(scholarships))
             return scholarships
         except Exception as e:
             logger.error("Failed to fetch all scholarships", error=str(e))
             raise
     
-    async def get_user_matched_scholarships(self, user_id: str) -> List[Scholarship]:
-        """Fetch scholarships matched to a specific user"""
+    async def get_scholarship_summaries(self) -> List[OpportunitySummary]:
+        """Fetch all live opportunities for list views, without embeddings.
+
+        Catalog entries are returned as-is (they are summaries by type and
+        serialize without the embedding); the fallback stream projects the
+        query onto SUMMARY_FIELDS so embeddings are never read.
+        """
+        if await self._catalog_ready():
+            return opportunity_catalog.snapshot()
+        
+        try:
+            docs = await self._stream_live(self.db.collection('scholarships').select(SUMMARY_FIELDS))
+            summaries = []
+            
+            for doc in docs:
+                try:
+                    data = doc.to_dict()
+                    if 'id' not in data:
+                        data['id'] = doc.id
+                    summaries.append(OpportunitySummary(**data))
+                except Exception as parse_error:
+                    logger.warning("Failed to parse scholarship", doc_id=doc.id, error=str(parse_error))
+                    continue
+            
+            logger.info("Fetched scholarship summaries", count=len(summaries))
+            return summaries
+        except Exception as e:
+            logger.error("Failed to fetch scholarship summaries", error=str(e))
+            raise
+    
+    async def get_user_matched_scholarships(self, user_id: str) -> List[OpportunitySummary]:
+        """Fetch scholarships matched to a specific user (summaries, no embeddings).
+
+        When the stored list carries scores, each summary's match_score is the
+        stored score, so callers can page in the stored rank order.
+        """
         try:
             # Get user's matched scholarship IDs
             doc_ref = self.db.collection('user_matches').document(user_id)
-            doc = doc_ref.get()
+            doc = await self._run(doc_ref.get)
             
             if not doc.exists:
                 logger.info("No matched scholarships found", user_id=user_id)
                 return []
             
-            matched_ids = doc.to_dict().get('scholarship_ids', [])
+            matches = doc.to_dict() or {}
+            matched_ids = matches.get('scholarship_ids', [])
             
             if not matched_ids:
                 return []
             
+            stored_scores = matches.get('scores') or []
+            scores = dict(zip(matched_ids, stored_scores)) if len(stored_scores) == len(matched_ids) else {}
+            
             # Create references for batch fetch
             refs = [self.db.collection('scholarships').document(sid) for sid in matched_ids]
             
-            # Fetch all documents in parallel (optimized batch read)
-            docs = self.db.get_all(refs)
+            # Fetch all documents in parallel (optimized batch read), summary fields only
+            docs = await self._run(lambda: list(self.db.get_all(refs, field_paths=SUMMARY_FIELDS)))
             
             scholarships = []
-            now = datetime.now()
+            now = time.time()
             
             for doc in docs:
                 if doc.exists:
@@ -201,17 +403,13 @@ class FirebaseDB:
                         if 'id' not in data:
                             data['id'] = doc.id
                         
-                        s = Scholarship(**data)
+                        s = OpportunitySummary(**data)
+                        if s.id in scores:
+                            s.match_score = scores[s.id]
                         
-                        # FILTER: Check if expired
-                        if s.deadline:
-                            try:
-                                deadline_dt = datetime.fromisoformat(s.deadline.replace('Z', '+00:00'))
-                                # Compare dates (ignoring time for simplicity/safety)
-                                if deadline_dt.date() < now.date():
-                                    continue # Skip expired
-                            except Exception:
-                                pass # Keep if date is weird
+                        # FILTER: Skip expired (normalized timestamp, no string parsing)
+                        if is_expired(s.deadline_timestamp, now):
+                            continue
                                 
                         scholarships.append(s)
                     except Exception as parse_error:
@@ -224,32 +422,47 @@ class FirebaseDB:
             logger.error("Failed to fetch user matched scholarships", user_id=user_id, error=str(e))
             raise
     
-    async def save_user_matches(self, user_id: str, scholarship_ids: List[str]) -> bool:
-        """Save matched scholarship IDs for a user"""
+    async def get_user_matches_doc(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Raw user_matches document (score-ordered IDs, scores, min_score)"""
+        try:
+            doc = await self._run(self.db.collection('user_matches').document(user_id).get)
+            return doc.to_dict() if doc.exists else None
+        except Exception as e:
+            logger.error("Failed to fetch user matches", user_id=user_id, error=str(e))
+            raise
+
+    async def set_user_matches_doc(self, user_id: str, matches: Dict[str, Any]) -> bool:
+        """Overwrite a user's bounded match list"""
         try:
             doc_ref = self.db.collection('user_matches').document(user_id)
-            doc_ref.set({
-                'scholarship_ids': scholarship_ids,
+            await self._run(doc_ref.set, {
+                **matches,
                 'updated_at': firestore.SERVER_TIMESTAMP
             })
-            logger.info("User matches saved", user_id=user_id, count=len(scholarship_ids))
             return True
         except Exception as e:
             logger.error("Failed to save user matches", user_id=user_id, error=str(e))
             raise
 
-    async def add_user_match(self, user_id: str, scholarship_id: str) -> bool:
-        """Add a SINGLE scholarship ID to user's matched list (Real-time update)"""
+    async def save_user_matches(self, user_id: str, matches: List[Tuple[str, float]]) -> bool:
+        """Replace a user's matches with the top K of a full (scholarship_id, score) ranking"""
+        top = TopKMatches.from_ranking(matches, user_match_store.k)
+        await user_match_store.replace(self, user_id, top)
+        logger.info("User matches saved", user_id=user_id, count=len(top), ranked=len(matches))
+        return True
+
+    async def offer_user_match(self, user_id: str, scholarship_id: str, score: float) -> bool:
+        """
+        Offer a SINGLE scored opportunity to the user's top K (Real-time update).
+        Returns True if it entered (or moved within) the list.
+        """
         try:
-            doc_ref = self.db.collection('user_matches').document(user_id)
-            doc_ref.set({
-                'scholarship_ids': firestore.ArrayUnion([scholarship_id]),
-                'updated_at': firestore.SERVER_TIMESTAMP
-            }, merge=True)
-            logger.info("Real-time match added to persistent pool", user_id=user_id, scholarship_id=scholarship_id)
-            return True
+            accepted = await user_match_store.offer(self, user_id, scholarship_id, score)
+            if accepted:
+                logger.info("Real-time match added to persistent pool", user_id=user_id, scholarship_id=scholarship_id, score=score)
+            return accepted
         except Exception as e:
-            logger.error("Failed to add individual user match", user_id=user_id, error=str(e))
+            logger.error("Failed to offer individual user match", user_id=user_id, error=str(e))
             return False
     
     # Saved Scholarships Operations
@@ -258,7 +471,7 @@ class FirebaseDB:
         try:
             doc_ref = self.db.collection('users').document(user_id)
             # Use set with merge to create document if it doesn't exist
-            doc_ref.set({
+            await self._run(doc_ref.set, {
                 'saved_scholarships': firestore.ArrayUnion([scholarship_id]),
                 'updated_at': firestore.SERVER_TIMESTAMP
             }, merge=True)
@@ -273,7 +486,7 @@ class FirebaseDB:
         try:
             doc_ref = self.db.collection('users').document(user_id)
             # Use set with merge to ensure document exists
-            doc_ref.set({
+            await self._run(doc_ref.set, {
                 'saved_scholarships': firestore.ArrayRemove([scholarship_id]),
                 'updated_at': firestore.SERVER_TIMESTAMP
             }, merge=True)
@@ -288,12 +501,13 @@ class FirebaseDB:
         """Track that user started an application, returns application_id"""
         try:
             # Check if draft already exists
-            existing = self.db.collection('applications')\
-                .where('user_id', '==', user_id)\
-                .where('scholarship_id', '==', scholarship_id)\
-                .where('status', '==', 'draft')\
-                .limit(1)\
-                .stream()
+            existing = await self._stream(
+                self.db.collection('applications')
+                .where('user_id', '==', user_id)
+                .where('scholarship_id', '==', scholarship_id)
+                .where('status', '==', 'draft')
+                .limit(1)
+            )
             
             for doc in existing:
                 logger.info("Returning existing draft", application_id=doc.id)
@@ -303,7 +517,7 @@ class FirebaseDB:
             doc_ref = self.db.collection('applications').document()
             application_id = doc_ref.id
             
-            doc_ref.set({
+            await self._run(doc_ref.set, {
                 'application_id': application_id,
                 'user_id': user_id,
                 'scholarship_id': scholarship_id,
@@ -352,7 +566,7 @@ class FirebaseDB:
             if 'additional_answers' in draft_data and draft_data['additional_answers'] is not None:
                 update_data['additional_answers'] = draft_data['additional_answers']
             
-            doc_ref.update(update_data)
+            await self._run(doc_ref.update, update_data)
             logger.info("Application draft saved", application_id=application_id)
             return True
         except Exception as e:
@@ -362,12 +576,13 @@ class FirebaseDB:
     async def get_application_draft(self, user_id: str, scholarship_id: str) -> Optional[Dict[str, Any]]:
         """Get application draft for resume"""
         try:
-            docs = self.db.collection('applications')\
-                .where('user_id', '==', user_id)\
-                .where('scholarship_id', '==', scholarship_id)\
-                .where('status', '==', 'draft')\
-                .limit(1)\
-                .stream()
+            docs = await self._stream(
+                self.db.collection('applications')
+                .where('user_id', '==', user_id)
+                .where('scholarship_id', '==', scholarship_id)
+                .where('status', '==', 'draft')
+                .limit(1)
+            )
             
             for doc in docs:
                 return doc.to_dict()
@@ -396,7 +611,7 @@ class FirebaseDB:
                 'updated_at': firestore.SERVER_TIMESTAMP
             }
             
-            doc_ref.set(submission_data)
+            await self._run(doc_ref.set, submission_data)
             logger.info("Application submitted", application_id=application_data['application_id'], confirmation=confirmation_number)
             
             return confirmation_number
@@ -407,10 +622,11 @@ class FirebaseDB:
     async def get_user_applications(self, user_id: str) -> List[Dict[str, Any]]:
         """Get all applications for a user"""
         try:
-            docs = self.db.collection('applications')\
-                .where('user_id', '==', user_id)\
-                .order_by('updated_at', direction=firestore.Query.DESCENDING)\
-                .stream()
+            docs = await self._scan(
+                self.db.collection('applications')
+                .where('user_id', '==', user_id)
+                .order_by('updated_at', direction=firestore.Query.DESCENDING)
+            )
             
             applications = []
             for doc in docs:
@@ -426,7 +642,7 @@ class FirebaseDB:
         """Get specific application by ID"""
         try:
             doc_ref = self.db.collection('applications').document(application_id)
-            doc = doc_ref.get()
+            doc = await self._run(doc_ref.get)
             
             if doc.exists:
                 return doc.to_dict()
@@ -453,19 +669,29 @@ class FirebaseDB:
             if 'notes' in kwargs:
                 update_data['notes'] = kwargs['notes']
             
-            doc_ref.update(update_data)
+            await self._run(doc_ref.update, update_data)
             logger.info("Application status updated", application_id=application_id, status=status)
             return True
         except Exception as e:
             logger.error("Failed to update status", application_id=application_id, error=str(e))
             raise
     
+    async def delete_application(self, application_id: str) -> bool:
+        """Delete an application document"""
+        try:
+            await self._run(self.db.collection('applications').document(application_id).delete)
+            logger.info("Application deleted", application_id=application_id)
+            return True
+        except Exception as e:
+            logger.error("Failed to delete application", application_id=application_id, error=str(e))
+            raise
+    
     # Discovery Job Tracking
     async def create_discovery_job(self, user_id: str, job_id: str) -> bool:
         """Create a discovery job record"""
         try:
             doc_ref = self.db.collection('discovery_jobs').document(job_id)
-            doc_ref.set({
+            await self._run(doc_ref.set, {
                 'user_id': user_id,
                 'status': 'processing',
                 'progress': 0,
@@ -483,7 +709,7 @@ class FirebaseDB:
         """Update discovery job progress"""
         try:
             doc_ref = self.db.collection('discovery_jobs').document(job_id)
-            doc_ref.update({
+            await self._run(doc_ref.update, {
                 'status': status,
                 'progress': progress,
                 'scholarships_found': scholarships_found,
@@ -498,7 +724,7 @@ class FirebaseDB:
         """Get discovery job status"""
         try:
             doc_ref = self.db.collection('discovery_jobs').document(job_id)
-            doc = doc_ref.get()
+            doc = await self._run(doc_ref.get)
             
             if doc.exists:
                 return doc.to_dict()
@@ -512,7 +738,7 @@ class FirebaseDB:
         """Save a chat message to conversation history"""
         try:
             doc_ref = self.db.collection('chat_history').document(user_id).collection('messages').document()
-            doc_ref.set({
+            await self._run(doc_ref.set, {
                 'role': role,
                 'content': content,
                 'timestamp': firestore.SERVER_TIMESTAMP
@@ -527,10 +753,11 @@ class FirebaseDB:
     async def get_chat_history(self, user_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Get conversation history for a user"""
         try:
-            messages = self.db.collection('chat_history').document(user_id).collection('messages')\
-                .order_by('timestamp', direction=firestore.Query.DESCENDING)\
-                .limit(limit)\
-                .stream()
+            messages = await self._stream(
+                self.db.collection('chat_history').document(user_id).collection('messages')
+                .order_by('timestamp', direction=firestore.Query.DESCENDING)
+                .limit(limit)
+            )
             
             history = []
             for msg in messages:
@@ -548,7 +775,7 @@ class FirebaseDB:
     async def clear_chat_history(self, user_id: str) -> bool:
         """Clear conversation history for a user"""
         try:
-            messages = self.db.collection('chat_history').document(user_id).collection('messages').stream()
+            messages = await self._scan(self.db.collection('chat_history').document(user_id).collection('messages'))
             
             batch = self.db.batch()
             count = 0
@@ -558,12 +785,12 @@ class FirebaseDB:
                 
                 # Firestore batch limit is 500
                 if count >= 500:
-                    batch.commit()
+                    await self._run(batch.commit)
                     batch = self.db.batch()
                     count = 0
             
             if count > 0:
-                batch.commit()
+                await self._run(batch.commit)
             
             logger.info("Chat history cleared", user_id=user_id)
             return True
@@ -571,6 +798,145 @@ class FirebaseDB:
             logger.error("Failed to clear chat history", user_id=user_id, error=str(e))
             raise
 
+    # ============ EMBEDDING BACKFILL ============
+
+    async def update_scholarship_embeddings(self, embeddings: Dict[str, List[float]]) -> int:
+        """Write embeddings back to many scholarships using batched updates. Returns docs written."""
+        try:
+            batch = self.db.batch()
+            count = 0
+            written = 0
+            for scholarship_id, embedding in embeddings.items():
+                doc_ref = self.db.collection('scholarships').document(scholarship_id)
+                batch.update(doc_ref, {PACKED_FIELD: pack_embedding(embedding), EMBEDDING_FIELD: firestore.DELETE_FIELD})
+                count += 1
+
+                # Firestore batch limit is 500
+                if count >= 500:
+                    await self._run(batch.commit)
+                    written += count
+                    batch = self.db.batch()
+                    count = 0
+
+            if count > 0:
+                await self._run(batch.commit)
+                written += count
+
+            logger.info("Scholarship embeddings written", count=written)
+            return written
+        except Exception as e:
+            logger.error("Failed to write scholarship embeddings", error=str(e))
+            raise
+
+    # ============ EXPIRY SWEEP ============
+
+    async def sweep_expired_scholarships(self, before: int, limit: int, archive: bool = True) -> List[str]:
+        """
+        Remove up to `limit` scholarships whose deadline_timestamp is before
+        `before`, oldest first, copying them to `scholarships_archive` first
+        when `archive` is set. Returns the removed IDs. The range query only
+        touches expired documents; the catalog listener sees the deletes.
+        """
+        try:
+            docs = await self._stream(
+                self.db.collection('scholarships')
+                .where(DEADLINE_TS_FIELD, '<', before)
+                .order_by(DEADLINE_TS_FIELD)
+                .limit(limit)
+            )
+            archive_collection = self.db.collection('scholarships_archive')
+            removed = []
+            
+            # Two writes per archived doc; Firestore batch limit is 500
+            for start in range(0, len(docs), 200):
+                batch = self.db.batch()
+                chunk = docs[start:start + 200]
+                for doc in chunk:
+                    if archive:
+                        batch.set(archive_collection.document(doc.id), {
+                            **(doc.to_dict() or {}),
+                            'archived_at': firestore.SERVER_TIMESTAMP
+                        })
+                    batch.delete(doc.reference)
+                await self._run(batch.commit)
+                removed.extend(doc.id for doc in chunk)
+            
+            if removed:
+                logger.info("Expired scholarships swept", count=len(removed), archived=archive)
+            return removed
+        except Exception as e:
+            logger.error("Failed to sweep expired scholarships", error=str(e))
+            raise
+
+    async def get_system_state(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get a system bookkeeping document (e.g. worker checkpoints)"""
+        try:
+            doc = await self._run(self.db.collection('system_state').document(name).get)
+            return doc.to_dict() if doc.exists else None
+        except Exception as e:
+            logger.error("Failed to fetch system state", name=name, error=str(e))
+            return None
+
+    async def save_system_state(self, name: str, state: Dict[str, Any]) -> bool:
+        """Persist a system bookkeeping document"""
+        try:
+            await self._run(self.db.collection('system_state').document(name).set, {
+                **state,
+                'updated_at': datetime.now().isoformat()
+            })
+            return True
+        except Exception as e:
+            logger.error("Failed to save system state", name=name, error=str(e))
+            return False
+
+    # ============ DEAD LETTERS ============
+
+    async def save_dead_letter(self, entry: Dict[str, Any]) -> str:
+        """Record an event whose handler exhausted its retries. Returns the entry ID."""
+        try:
+            doc_ref = self.db.collection('dead_letters').document()
+            await self._run(doc_ref.set, {**entry, 'failed_at': entry.get('failed_at') or time.time()})
+            return doc_ref.id
+        except Exception as e:
+            logger.error("Failed to save dead letter", topic=entry.get('topic'), error=str(e))
+            raise
+
+    async def get_dead_letters(
+        self, topic: Optional[str] = None, limit: int = 100, ids: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Oldest dead letters first: the given `ids`, or up to `limit` (of one source topic; composite index topic, failed_at)"""
+        try:
+            if ids is not None:
+                refs = [self.db.collection('dead_letters').document(entry_id) for entry_id in ids]
+                docs = [doc for doc in await self._run(lambda: list(self.db.get_all(refs))) if doc.exists]
+                entries = [{**(doc.to_dict() or {}), 'id': doc.id} for doc in docs]
+                return sorted(entries, key=lambda entry: entry.get('failed_at') or 0)
+            query = self.db.collection('dead_letters')
+            if topic:
+                query = query.where('topic', '==', topic)
+            docs = await self._stream(query.order_by('failed_at').limit(limit))
+            return [{**(doc.to_dict() or {}), 'id': doc.id} for doc in docs]
+        except Exception as e:
+            logger.error("Failed to fetch dead letters", topic=topic, error=str(e))
+            raise
+
+    async def delete_dead_letters(self, ids: List[str]) -> int:
+        """Delete dead letters by ID. Returns entries deleted."""
+        try:
+            collection = self.db.collection('dead_letters')
+            # Firestore batch limit is 500
+            for start in range(0, len(ids), 500):
+                batch = self.db.batch()
+                for entry_id in ids[start:start + 500]:
+                    batch.delete(collection.document(entry_id))
+                await self._run(batch.commit)
+            if ids:
+                logger.info("Dead letters deleted", count=len(ids))
+            return len(ids)
+        except Exception as e:
+            logger.error("Failed to delete dead letters", error=str(e))
+            raise
+
     # ============ SEMANTIC VECTOR SEARCH ============
     
     def _cosine_similarity(self, vec_a: List[float], vec_b: List[float]) -> float:
@@ -578,23 +944,21 @@ class FirebaseDB:
         Compute cosine similarity between two vectors.
         Returns value between -1 and 1 (higher = more similar).
         """
-        if not vec_a or not vec_b:
+        if vec_a is None or vec_b is None or len(vec_a) == 0 or len(vec_b) == 0:
             return 0.0
         
         if len(vec_a) != len(vec_b):
             logger.warning("Vector dimension mismatch", dim_a=len(vec_a), dim_b=len(vec_b))
             return 0.0
         
-        import math
-        
-        dot_product = sum(a * b for a, b in zip(vec_a, vec_b))
-        magnitude_a = math.sqrt(sum(a * a for a in vec_a))
-        magnitude_b = math.sqrt(sum(b * b for b in vec_b))
+        a = np.asarray(vec_a, dtype=np.float32)
+        b = np.asarray(vec_b, dtype=np.float32)
+        magnitude = float(np.linalg.norm(a)) * float(np.linalg.norm(b))
         
-        if magnitude_a == 0 or magnitude_b == 0:
+        if magnitude == 0:
             return 0.0
         
-        return dot_product / (magnitude_a * magnitude_b)
+        return float(a @ b) / magnitude
     
     async def semantic_search(
         self, 
@@ -605,10 +969,9 @@ class FirebaseDB:
         """
         Search scholarships by vector similarity.
         
-        Uses in-memory cosine similarity over all opportunities with embeddings.
-        This is the MVP approach - for production scale, consider:
-        - Firestore Vector Search (when GA)
-        - Pinecone / Weaviate for dedicated vector DB
+        Uses the catalog-backed NumPy embedding index (one matrix-vector
+        product + argpartition top-k). Falls back to a pure-Python scan over
+        a full collection stream while the catalog is not ready.
         
         Args:
             query_embedding: 768-dim embedding of the search query
@@ -619,6 +982,18 @@ class FirebaseDB:
             List of Scholarship objects sorted by similarity score (highest first)
         """
         try:
+            if await self._catalog_ready():
+                results = search_catalog(query_embedding, limit=limit, min_similarity=min_similarity)
+                
+                logger.info(
+                    "Semantic search completed",
+                    total_scanned=len(opportunity_catalog),
+                    with_embeddings=len(embedding_index),
+                    matches_found=len(results),
+                    min_similarity=min_similarity
+                )
+                return results
+            
             all_scholarships = await self.get_all_scholarships()
             scored = []
             
@@ -626,7 +1001,7 @@ class FirebaseDB:
             
             for scholarship in all_scholarships:
                 # Skip opportunities without embeddings
-                if not scholarship.embedding:
+                if scholarship.embedding is None:
                     continue
                 
                 embedding_count += 1
@@ -659,8 +1034,17 @@ class FirebaseDB:
             return []
 
 
+def create_database() -> StorageBackend:
+    """Build the storage backend selected by settings.storage_backend"""
+    if settings.storage_backend == "sqlite":
+        from app.infrastructure.sqlite_storage import SQLiteDB
+        logger.info("Using local SQLite storage", path=settings.sqlite_path)
+        return SQLiteDB(settings.sqlite_path)
+    return FirebaseDB()
+
+
 # Global database instance
-db = FirebaseDB()
+db = create_database()
 
 
 # Helper functions for easy imports
@@ -0,0 +1,339 @@
+"""
+Approximate Nearest-Neighbour Index (IVF-Flat, NumPy)
+Partitions opportunity embeddings into `nlist` inverted lists around spherical
+k-means centroids. A query scores the centroids, probes the `nprobe` closest
+lists and runs the exact EmbeddingIndex scan inside each one.
+
+Built from NumPy only (no native ANN dependency), supports incremental
+insert/delete as the catalog changes, and persists to disk so a restart
+reloads the trained partitions instead of re-clustering.
+"""
+import math
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+import numpy as np
+import structlog
+
+from app.infrastructure.embedding_index import EmbeddingIndex
+from app.infrastructure.opportunity_catalog import deadline_ordinal
+from app.models import Scholarship
+
+logger = structlog.get_logger()
+
+FORMAT_VERSION = 1
+
+
+def spherical_kmeans(
+    vectors: np.ndarray,
+    nlist: int,
+    iterations: int = 10,
+    seed: int = 0
+) -> np.ndarray:
+    """
+    Cluster unit-normalized vectors by cosine similarity.
+    Empty clusters are re-seeded from random points. Returns (nlist, dim) unit centroids.
+    """
+    rng = np.random.default_rng(seed)
+    data = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    centroids = data[rng.choice(len(data), size=nlist, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignment = np.argmax(data @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, data)
+        counts = np.bincount(assignment, minlength=nlist)
+
+        empty = np.flatnonzero(counts == 0)
+        if empty.size:
+            sums[empty] = data[rng.choice(len(data), size=empty.size, replace=False)]
+        centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+
+    return centroids.astype(np.float32)
+
+
+class IVFIndex:
+    """
+    Inverted-file ANN index with the same surface as EmbeddingIndex.
+
+    Until `train_min` vectors have arrived, everything lives in one exact
+    staging list; training then clusters the data and redistributes it.
+    The index retrains once it has grown `retrain_factor`x since the last fit,
+    since incrementally appended lists drift out of balance.
+
+    Those automatic (re)trainings run on a background thread: k-means runs
+    on a copy without the index lock, then the new centroids are swapped in
+    and the current contents re-assigned. Upserts (on the catalog's watch
+    thread) and searches never wait for clustering or the npz persist.
+    """
+
+    def __init__(
+        self,
+        dim: Optional[int] = None,
+        nprobe: int = 8,
+        nlist: Optional[int] = None,
+        train_min: int = 10_000,
+        retrain_factor: float = 4.0,
+        path: Optional[str] = None
+    ):
+        self._lock = threading.RLock()
+        self._dim = dim
+        self.nprobe = nprobe
+        self._nlist_override = nlist
+        self.train_min = train_min
+        self.retrain_factor = retrain_factor
+        self.path = path
+
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[EmbeddingIndex] = [EmbeddingIndex(dim=dim)]
+        self._assignment: Dict[str, int] = {}
+        self._trained_size = 0
+        self._trainer: Optional[threading.Thread] = None
+        self._persist_lock = threading.Lock()
+        self.dimension_mismatches = 0
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self._dim
+
+    @property
+    def is_trained(self) -> bool:
+        return self._centroids is not None
+
+    @property
+    def nlist(self) -> int:
+        return len(self._lists)
+
+    def __len__(self) -> int:
+        return len(self._assignment)
+
+    def __contains__(self, scholarship_id: str) -> bool:
+        return scholarship_id in self._assignment
+
+    # Training
+    def _choose_nlist(self, n: int) -> int:
+        if self._nlist_override:
+            return min(self._nlist_override, n)
+        return max(1, min(4096, int(math.sqrt(n))))
+
+    def train(self, sample_size: int = 50_000, iterations: int = 10) -> None:
+        """(Re)cluster every stored vector and rebuild the inverted lists (blocking)."""
+        with self._lock:
+            _, vectors, _ = self._export()
+        n = len(vectors)
+        if n == 0:
+            return
+        rng = np.random.default_rng(0)
+        sample = vectors if n <= sample_size else vectors[rng.choice(n, size=sample_size, replace=False)]
+        centroids = spherical_kmeans(sample, self._choose_nlist(n), iterations=iterations)
+
+        # Swap in, re-assigning whatever the index holds now (vectors may have
+        # arrived or gone while clustering ran without the lock)
+        with self._lock:
+            ids, vectors, expiry = self._export()
+            self._rebuild(centroids, ids, vectors, expiry)
+            self._trained_size = len(ids)
+        logger.info("IVF index trained", vectors=len(ids), nlist=len(centroids))
+
+    def _train_and_persist(self) -> None:
+        try:
+            self.train()
+            self.persist()
+        except Exception as e:
+            logger.error("IVF index training failed", error=str(e))
+
+    def wait_for_training(self, timeout: Optional[float] = None) -> bool:
+        """Block until a background (re)training has finished. False on timeout."""
+        trainer = self._trainer
+        if trainer is not None:
+            trainer.join(timeout)
+            return not trainer.is_alive()
+        return True
+
+    def _rebuild(self, centroids: np.ndarray, ids: List[str], vectors: np.ndarray, expiry: np.ndarray) -> None:
+        assignment = np.argmax(vectors @ centroids.T, axis=1) if len(ids) else np.zeros(0, dtype=np.int64)
+        lists = []
+        for list_no in range(len(centroids)):
+            rows = np.flatnonzero(assignment == list_no)
+            if rows.size:
+                lists.append(EmbeddingIndex.from_arrays([ids[i] for i in rows], vectors[rows], expiry[rows]))
+            else:
+                lists.append(EmbeddingIndex(dim=centroids.shape[1]))
+        self._centroids = centroids
+        self._lists = lists
+        self._assignment = {sid: int(a) for sid, a in zip(ids, assignment)}
+
+    def _export(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        ids: List[str] = []
+        vectors, expiry = [], []
+        for inverted_list in self._lists:
+            list_ids, list_vectors, list_expiry = inverted_list.export_arrays()
+            if list_ids:
+                ids.extend(list_ids)
+                vectors.append(list_vectors)
+                expiry.append(list_expiry)
+        if not ids:
+            return [], np.zeros((0, self._dim or 0), dtype=np.float32), np.zeros(0, dtype=np.int64)
+        return ids, np.concatenate(vectors), np.concatenate(expiry)
+
+    def _maybe_train(self) -> None:
+        """Start a background (re)training when due and none is running (caller holds the lock)."""
+        n = len(self._assignment)
+        due = n >= self.train_min if not self.is_trained else n > self._trained_size * self.retrain_factor
+        if due and (self._trainer is None or not self._trainer.is_alive()):
+            self._trainer = threading.Thread(target=self._train_and_persist, name="ivf-train", daemon=True)
+            self._trainer.start()
+
+    # Mutation
+    def upsert(self, scholarship_id: str, embedding: Sequence[float], expiry_ordinal: Optional[int] = None) -> bool:
+        """Insert or move one embedding into its nearest inverted list."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        with self._lock:
+            if self._dim is None:
+                self._dim = int(vector.shape[0])
+            if vector.ndim != 1 or vector.shape[0] != self._dim:
+                self.dimension_mismatches += 1
+                logger.warning("Vector dimension mismatch", dim_a=self._dim, dim_b=int(vector.size), scholarship_id=scholarship_id)
+                self.remove(scholarship_id)
+                return False
+
+            list_no = int(np.argmax(self._centroids @ vector)) if self.is_trained else 0
+            current = self._assignment.get(scholarship_id)
+            if current is not None and current != list_no:
+                self._lists[current].remove(scholarship_id)
+
+            self._lists[list_no].upsert(scholarship_id, vector, expiry_ordinal)
+            self._assignment[scholarship_id] = list_no
+            self._maybe_train()
+            return True
+
+    def remove(self, scholarship_id: str) -> bool:
+        with self._lock:
+            list_no = self._assignment.pop(scholarship_id, None)
+            if list_no is None:
+                return False
+            return self._lists[list_no].remove(scholarship_id)
+
+    def retain(self, scholarship_ids: Set[str]) -> int:
+        """Drop vectors whose opportunity no longer exists (stale after a reload)."""
+        with self._lock:
+            stale = [sid for sid in self._assignment if sid not in scholarship_ids]
+            for sid in stale:
+                self.remove(sid)
+        if stale:
+            logger.info("IVF index reconciled with catalog", dropped=len(stale))
+        return len(stale)
+
+    def has_vector(self, scholarship_id: str, embedding: Sequence[float]) -> bool:
+        list_no = self._assignment.get(scholarship_id)
+        return list_no is not None and self._lists[list_no].has_vector(scholarship_id, embedding)
+
+    def on_catalog_change(self, upserted: List[Scholarship], removed: List[str], version: int) -> None:
+        """Opportunity catalog listener. Unchanged vectors (e.g. replayed after a reload) are skipped."""
+        for s in upserted:
+            if s.embedding is None:
+                self.remove(s.id)
+            elif not self.has_vector(s.id, s.embedding):
+                self.upsert(s.id, s.embedding, deadline_ordinal(s.deadline))
+        for scholarship_id in removed:
+            self.remove(scholarship_id)
+
+    # Query
+    def search(
+        self,
+        query_embedding: Sequence[float],
+        limit: int = 20,
+        min_similarity: float = 0.55,
+        today_ordinal: Optional[int] = None,
+        nprobe: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        """Approximate top-k by cosine similarity over the `nprobe` closest lists."""
+        if limit <= 0:
+            return []
+        query = np.asarray(query_embedding, dtype=np.float32)
+        if today_ordinal is None:
+            today_ordinal = datetime.now().date().toordinal()
+
+        with self._lock:
+            if not self._assignment or query.ndim != 1 or query.shape[0] != self._dim:
+                return []
+            if self.is_trained:
+                probe = min(nprobe or self.nprobe, self.nlist)
+                centroid_sims = self._centroids @ query
+                probed = np.argpartition(-centroid_sims, probe - 1)[:probe] if probe < self.nlist else range(self.nlist)
+                lists = [self._lists[i] for i in probed]
+            else:
+                lists = self._lists
+
+            hits: List[Tuple[str, float]] = []
+            for inverted_list in lists:
+                hits.extend(inverted_list.search(query, limit=limit, min_similarity=min_similarity, today_ordinal=today_ordinal))
+
+        hits.sort(key=lambda h: h[1], reverse=True)
+        return hits[:limit]
+
+    # Persistence
+    @classmethod
+    def from_arrays(cls, ids: List[str], vectors: np.ndarray, expiry: np.ndarray, **kwargs) -> "IVFIndex":
+        """Bulk-load untrained vectors; call `train()` to partition them."""
+        index = cls(**kwargs)
+        if ids:  # an empty export is (0, 0): its dim is unknown, not 0
+            index._dim = int(vectors.shape[1])
+            index._lists = [EmbeddingIndex.from_arrays(ids, vectors, expiry)]
+            index._assignment = {sid: 0 for sid in ids}
+        return index
+
+    def persist(self) -> None:
+        """Atomically write centroids and all vectors to `path` (if configured)."""
+        if not self.path:
+            return
+        with self._persist_lock:  # the trainer thread and shutdown may persist concurrently
+            with self._lock:
+                ids, vectors, expiry = self._export()
+                centroids = self._centroids if self.is_trained else np.zeros((0, self._dim or 0), dtype=np.float32)
+                trained_size = self._trained_size
+
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "wb") as fh:
+                np.savez(
+                    fh,
+                    format_version=np.int64(FORMAT_VERSION),
+                    centroids=centroids,
+                    ids=np.array(ids, dtype=str),
+                    vectors=vectors,
+                    expiry=expiry,
+                    trained_size=np.int64(trained_size),
+                )
+            os.replace(tmp_path, self.path)
+        logger.info("IVF index persisted", path=self.path, vectors=len(ids))
+
+    @classmethod
+    def load_or_create(cls, path: str, **kwargs) -> "IVFIndex":
+        """Load a persisted index from `path`, or start an empty one."""
+        if not os.path.exists(path):
+            return cls(path=path, **kwargs)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data["format_version"]) != FORMAT_VERSION:
+                    raise ValueError("unsupported index format")
+                centroids = data["centroids"]
+                ids = data["ids"].tolist()
+                vectors = data["vectors"]
+                expiry = data["expiry"]
+                trained_size = int(data["trained_size"])
+        except Exception as e:
+            logger.warning("Failed to load IVF index, starting empty", path=path, error=str(e))
+            return cls(path=path, **kwargs)
+
+        index = cls.from_arrays(ids, vectors, expiry, path=path, **kwargs)
+        if len(centroids):
+            with index._lock:
+                index._dim = int(centroids.shape[1])
+                index._rebuild(centroids, ids, vectors, expiry)
+                index._trained_size = trained_size
+        logger.info("IVF index loaded", path=path, vectors=len(ids), nlist=index.nlist)
+        return index
@@ -0,0 +1,26 @@
+"""
+Event Broker Factory
+Builds the EventBroker selected by settings.event_broker_type.
+"""
+import structlog
+
+from app.config import settings
+from app.core.events import EventBroker
+
+logger = structlog.get_logger()
+
+
+def create_broker() -> EventBroker:
+    """Build the event broker selected by settings.event_broker_type"""
+    if settings.event_broker_type == "log":
+        from app.infrastructure.log_broker import LogBroker
+        logger.info("Using durable log broker", path=settings.log_broker_path)
+        return LogBroker()
+    if settings.event_broker_type == "kafka":
+        from app.infrastructure.kafka_broker import KafkaBroker
+        logger.info("Using Kafka broker", bootstrap_servers=settings.kafka_bootstrap_servers)
+        return KafkaBroker()
+    if settings.event_broker_type != "memory":
+        raise ValueError(f"Unknown event_broker_type {settings.event_broker_type!r}; expected 'memory', 'log' or 'kafka'")
+    from app.infrastructure.memory_broker import MemoryBroker
+    return MemoryBroker()
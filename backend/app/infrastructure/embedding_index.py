@@ -0,0 +1,233 @@
+"""
+Exact Vector Search Engine (NumPy)
+A float32 embedding matrix with precomputed L2 norms, kept in sync with the
+opportunity catalog. A query is one matrix-vector product plus an
+argpartition top-k, with the similarity threshold and expiry applied vectorized.
+"""
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+import numpy as np
+import structlog
+
+from app.config import settings
+from app.models import Scholarship
+from app.infrastructure.opportunity_catalog import deadline_ordinal, opportunity_catalog
+
+logger = structlog.get_logger()
+
+# Rows without a deadline never expire.
+NO_EXPIRY = np.iinfo(np.int64).max
+
+
+class EmbeddingIndex:
+    """
+    Dense, swap-remove embedding store.
+
+    Rows are packed at the front of a growable matrix; removing an ID moves
+    the last row into its slot so a search always scans a contiguous block.
+    """
+
+    def __init__(self, dim: Optional[int] = None, initial_capacity: int = 1024):
+        self._lock = threading.RLock()
+        self._dim = dim
+        self._capacity = initial_capacity
+        self._size = 0
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._vectors: Optional[np.ndarray] = None
+        self._norms: Optional[np.ndarray] = None
+        self._expiry: Optional[np.ndarray] = None
+        self.dimension_mismatches = 0
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self._dim
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, scholarship_id: str) -> bool:
+        return scholarship_id in self._rows
+
+    def _allocate(self, capacity: int) -> None:
+        vectors = np.zeros((capacity, self._dim), dtype=np.float32)
+        norms = np.zeros(capacity, dtype=np.float32)
+        expiry = np.full(capacity, NO_EXPIRY, dtype=np.int64)
+        if self._vectors is not None and self._size:
+            vectors[:self._size] = self._vectors[:self._size]
+            norms[:self._size] = self._norms[:self._size]
+            expiry[:self._size] = self._expiry[:self._size]
+        self._vectors, self._norms, self._expiry = vectors, norms, expiry
+        self._capacity = capacity
+
+    # Mutation
+    def upsert(self, scholarship_id: str, embedding: Sequence[float], expiry_ordinal: Optional[int] = None) -> bool:
+        """Insert or replace one embedding. Returns False on dimension mismatch."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        with self._lock:
+            if self._dim is None:
+                self._dim = int(vector.shape[0])
+            if vector.ndim != 1 or vector.shape[0] != self._dim:
+                self.dimension_mismatches += 1
+                logger.warning("Vector dimension mismatch", dim_a=self._dim, dim_b=int(vector.size), scholarship_id=scholarship_id)
+                self.remove(scholarship_id)
+                return False
+            if self._vectors is None:
+                self._allocate(self._capacity)
+
+            row = self._rows.get(scholarship_id)
+            if row is None:
+                if self._size == self._capacity:
+                    self._allocate(self._capacity * 2)
+                row = self._size
+                self._size += 1
+                self._ids.append(scholarship_id)
+                self._rows[scholarship_id] = row
+
+            self._vectors[row] = vector
+            self._norms[row] = np.linalg.norm(vector)
+            self._expiry[row] = NO_EXPIRY if expiry_ordinal is None else expiry_ordinal
+            return True
+
+    def remove(self, scholarship_id: str) -> bool:
+        """Drop one embedding by swapping the last row into its slot."""
+        with self._lock:
+            row = self._rows.pop(scholarship_id, None)
+            if row is None:
+                return False
+            last = self._size - 1
+            if row != last:
+                moved_id = self._ids[last]
+                self._vectors[row] = self._vectors[last]
+                self._norms[row] = self._norms[last]
+                self._expiry[row] = self._expiry[last]
+                self._ids[row] = moved_id
+                self._rows[moved_id] = row
+            self._ids.pop()
+            self._size = last
+            return True
+
+    def retain(self, scholarship_ids: Set[str]) -> int:
+        """Drop every row whose ID is not in `scholarship_ids`. Returns rows dropped."""
+        with self._lock:
+            stale = [sid for sid in self._ids if sid not in scholarship_ids]
+            for sid in stale:
+                self.remove(sid)
+        return len(stale)
+
+    def has_vector(self, scholarship_id: str, embedding: Sequence[float]) -> bool:
+        """True if the stored row for this ID already equals `embedding`."""
+        with self._lock:
+            row = self._rows.get(scholarship_id)
+            if row is None:
+                return False
+            vector = np.asarray(embedding, dtype=np.float32)
+            return vector.shape == (self._dim,) and np.array_equal(self._vectors[row], vector)
+
+    def export_arrays(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Copy out (ids, vectors, expiry ordinals) for persistence."""
+        with self._lock:
+            n = self._size
+            if n == 0:
+                return [], np.zeros((0, self._dim or 0), dtype=np.float32), np.zeros(0, dtype=np.int64)
+            return list(self._ids), self._vectors[:n].copy(), self._expiry[:n].copy()
+
+    @classmethod
+    def from_arrays(cls, ids: List[str], vectors: np.ndarray, expiry: np.ndarray) -> "EmbeddingIndex":
+        """Bulk-build an index from exported arrays without per-row upserts."""
+        n, dim = vectors.shape
+        index = cls(dim=dim, initial_capacity=max(n, 16))
+        index._allocate(index._capacity)
+        index._vectors[:n] = vectors
+        index._norms[:n] = np.linalg.norm(vectors, axis=1)
+        index._expiry[:n] = expiry
+        index._ids = list(ids)
+        index._rows = {sid: i for i, sid in enumerate(index._ids)}
+        index._size = n
+        return index
+
+    def persist(self) -> None:
+        """The exact index is rebuilt from the catalog on start; nothing to save."""
+
+    def on_catalog_change(self, upserted: List[Scholarship], removed: List[str], version: int) -> None:
+        """Opportunity catalog listener: mirror embeddings for changed documents."""
+        for s in upserted:
+            if s.embedding is not None:
+                self.upsert(s.id, s.embedding, deadline_ordinal(s.deadline))
+            else:
+                self.remove(s.id)
+        for scholarship_id in removed:
+            self.remove(scholarship_id)
+
+    # Query
+    def search(
+        self,
+        query_embedding: Sequence[float],
+        limit: int = 20,
+        min_similarity: float = 0.55,
+        today_ordinal: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Return up to `limit` (scholarship_id, cosine_similarity) pairs with
+        similarity >= min_similarity, highest first. Expired rows are masked out.
+        """
+        if limit <= 0:
+            return []
+        query = np.asarray(query_embedding, dtype=np.float32)
+        if today_ordinal is None:
+            today_ordinal = datetime.now().date().toordinal()
+
+        with self._lock:
+            n = self._size
+            if n == 0 or query.ndim != 1 or query.shape[0] != self._dim:
+                if n and query.size:
+                    logger.warning("Vector dimension mismatch", dim_a=int(query.size), dim_b=self._dim)
+                return []
+
+            query_norm = float(np.linalg.norm(query))
+            if query_norm == 0.0:
+                return []
+
+            norms = self._norms[:n]
+            dots = self._vectors[:n] @ query
+            with np.errstate(divide='ignore', invalid='ignore'):
+                sims = np.where(norms > 0, dots / (norms * query_norm), 0.0)
+
+            candidates = np.flatnonzero((sims >= min_similarity) & (self._expiry[:n] >= today_ordinal))
+            if candidates.size > limit:
+                top = np.argpartition(-sims[candidates], limit - 1)[:limit]
+                candidates = candidates[top]
+            order = candidates[np.argsort(-sims[candidates], kind='stable')]
+
+            return [(self._ids[i], float(sims[i])) for i in order]
+
+
+def search_catalog(
+    query_embedding: Sequence[float],
+    limit: int = 20,
+    min_similarity: float = 0.55
+) -> List[Scholarship]:
+    """Semantic search over the live catalog: detached opportunities, best first, match_score = similarity %."""
+    results = []
+    for scholarship_id, similarity in embedding_index.search(query_embedding, limit=limit, min_similarity=min_similarity):
+        scholarship = opportunity_catalog.get(scholarship_id)
+        if scholarship is None:
+            continue  # Removed between index and catalog updates
+        scholarship.match_score = round(similarity * 100, 1)
+        results.append(scholarship)
+    return results
+
+
+def create_embedding_index():
+    """Build the configured vector index: exact NumPy scan or persistent IVF."""
+    if settings.vector_index_type == "ivf":
+        from app.infrastructure.ann_index import IVFIndex
+        return IVFIndex.load_or_create(settings.vector_index_path, nprobe=settings.vector_index_nprobe)
+    return EmbeddingIndex()
+
+
+# Global index instance, fed by the opportunity catalog
+embedding_index = create_embedding_index()
+opportunity_catalog.add_listener(embedding_index.on_catalog_change)
+opportunity_catalog.add_ready_callback(embedding_index.retain)
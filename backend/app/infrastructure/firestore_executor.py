@@ -0,0 +1,94 @@
+"""
+Firestore Executor
+The firebase_admin Firestore client is synchronous: every get/set/stream is
+a blocking network round trip. Called directly from `async def` handlers it
+stalls the event loop (WebSocket heartbeats, every concurrent request).
+
+FirestoreExecutor runs those calls on a dedicated, bounded thread pool and
+awaits them with a per-call timeout, so the loop only ever waits on a future.
+The sync client stays in use because the catalog's snapshot listener
+(on_snapshot) needs it.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional, TypeVar
+import structlog
+
+from app.config import settings
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+
+class FirestoreTimeout(TimeoutError):
+    """A Firestore call did not complete within its timeout."""
+
+
+class FirestoreExecutor:
+    """Bounded thread pool for blocking Firestore calls."""
+
+    def __init__(self, max_workers: int = 32, timeout: float = 10.0):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        self.in_flight = 0
+        self.completed = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="firestore")
+        return self._pool
+
+    async def run(self, fn: Callable[..., T], *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> T:
+        """
+        Run `fn(*args, **kwargs)` on the pool. The timeout covers queueing and
+        the call itself; on expiry the caller gets FirestoreTimeout (the worker
+        thread finishes the call in the background).
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor(), partial(fn, *args, **kwargs))
+        self.in_flight += 1
+        try:
+            return await asyncio.wait_for(future, timeout if timeout is not None else self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            name = getattr(fn, '__qualname__', repr(fn))
+            logger.warning("Firestore call timed out", call=name, timeout=timeout or self.timeout)
+            raise FirestoreTimeout(f"Firestore call {name} timed out") from None
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "max_workers": self.max_workers,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+        }
+
+
+# Global executor shared by every FirebaseDB instance
+firestore_executor = FirestoreExecutor(
+    max_workers=settings.firestore_max_workers,
+    timeout=settings.firestore_timeout_seconds
+)
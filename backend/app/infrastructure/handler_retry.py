@@ -0,0 +1,81 @@
+"""
+Handler Retry and Dead-Lettering (shared by the broker adapters)
+`deliver` runs a subscriber's handler under its RetryPolicy; when every
+attempt fails, the broker publishes `dead_letter_record(...)` to
+`<topic>.dlq` instead of dropping the event.
+"""
+import asyncio
+import contextvars
+import time
+import traceback
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.config import settings
+from app.core.events import DLQ_SUFFIX, NonRetryableError, RetryPolicy
+
+
+# True while a broker handler runs (and in tasks it spawns): lets a closing
+# broker accept the handler's downstream publishes while it drains
+handling_event: contextvars.ContextVar[bool] = contextvars.ContextVar("handling_event", default=False)
+
+
+def default_retry_policy() -> RetryPolicy:
+    return RetryPolicy(
+        max_attempts=settings.broker_retry_max_attempts,
+        base_delay_seconds=settings.broker_retry_base_delay_seconds,
+        max_delay_seconds=settings.broker_retry_max_delay_seconds,
+        jitter=settings.broker_retry_jitter
+    )
+
+
+def is_dlq(topic: str) -> bool:
+    """Dead-letter topics are never dead-lettered themselves"""
+    return topic.endswith(DLQ_SUFFIX)
+
+
+async def deliver(
+    handler: Callable[[Dict[str, Any]], Awaitable[None]],
+    payload: Dict[str, Any],
+    policy: RetryPolicy,
+    sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+) -> Tuple[Optional[Exception], int]:
+    """
+    Run the handler until it succeeds, the policy gives up or it raises a
+    NonRetryableError. Returns (last error or None, attempts).
+    """
+    attempt = 0
+    token = handling_event.set(True)
+    try:
+        while True:
+            attempt += 1
+            try:
+                await handler(payload)
+                return None, attempt
+            except Exception as e:
+                if attempt >= policy.max_attempts or isinstance(e, NonRetryableError):
+                    return e, attempt
+                await sleep(policy.delay(attempt))
+    finally:
+        handling_event.reset(token)
+
+
+def dead_letter_record(
+    topic: str,
+    key: Optional[str],
+    payload: Dict[str, Any],
+    error: Exception,
+    attempts: int,
+    handler: str
+) -> Dict[str, Any]:
+    """DLQ payload: the original event plus why and how often it failed"""
+    return {
+        "topic": topic,
+        "key": key,
+        "payload": payload,
+        "handler": handler,
+        "error": str(error),
+        "error_type": type(error).__name__,
+        "traceback": "".join(traceback.format_exception(type(error), error, error.__traceback__))[-4000:],
+        "attempts": attempts,
+        "failed_at": time.time()
+    }
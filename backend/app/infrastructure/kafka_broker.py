@@ -0,0 +1,366 @@
+"""
+Kafka Event Broker (Adapter)
+EventBroker on a Kafka cluster (confluent_kafka), for pipelines that span
+processes or hosts.
+
+- `publish` produces with the event key, so Kafka's key partitioning keeps
+  per-URL / per-opportunity ordering. Delivery is tracked through the
+  producer's delivery callbacks (served by one poll task); there is no
+  flush per message. `publish` returns once the broker acknowledged.
+- Each subscription is a consumer group (`<group prefix>.<topic>.<handler>`).
+  Running the same handler in several processes splits the topic's
+  partitions between them.
+- Consumers read in batches (`consume(num_messages=...)`). A batch is
+  handled partition by partition, in offset order, with partitions in
+  parallel, and offsets are committed manually, only past messages whose
+  handler succeeded or that were dead-lettered.
+- A failing handler is retried under the subscription's RetryPolicy; the
+  event then goes to `<topic>.dlq`. If even that produce fails, the
+  partition is rewound so the message is redelivered.
+"""
+import asyncio
+import json
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+import structlog
+
+from app.config import settings
+from app.core.events import RetryPolicy, dlq_topic
+from app.infrastructure.handler_retry import dead_letter_record, default_retry_policy, deliver, handling_event, is_dlq
+from app.infrastructure.memory_broker import Handler
+
+try:
+    from confluent_kafka import Consumer, KafkaError, Producer, TopicPartition
+    from confluent_kafka.admin import AdminClient, NewTopic
+except ImportError:  # Only the Kafka broker needs the Kafka client
+    Consumer = Producer = None
+
+logger = structlog.get_logger()
+
+
+def client_config(bootstrap_servers: str) -> Dict[str, Any]:
+    """Connection settings shared by producer, consumers and admin client"""
+    config = {'bootstrap.servers': bootstrap_servers}
+    if settings.kafka_sasl_username:
+        config.update({
+            'security.protocol': 'SASL_SSL',
+            'sasl.mechanism': 'PLAIN',
+            'sasl.username': settings.kafka_sasl_username,
+            'sasl.password': settings.kafka_sasl_password
+        })
+    return config
+
+
+class KafkaSubscription:
+    """One consumer group on one topic, consumed in batches."""
+
+    def __init__(self, broker: "KafkaBroker", topic: str, handler: Handler, group: str, retry: RetryPolicy):
+        self.broker = broker
+        self.topic = topic
+        self.handler = handler
+        self.retry = retry
+        self.name = getattr(handler, '__name__', repr(handler))
+        self.group = group
+        self.consumer = None
+        self.task: Optional[asyncio.Task] = None
+        self.stopping = False
+        self.committed: Dict[int, int] = {}
+
+        self.delivered = 0
+        self.failed = 0
+        self.retried = 0
+        self.redelivered = 0
+        self.batches = 0
+
+    def start(self) -> None:
+        if self.task is not None:
+            return
+        self.stopping = False
+        self.consumer = Consumer({
+            **client_config(self.broker.bootstrap_servers),
+            'group.id': self.group,
+            'auto.offset.reset': 'earliest',
+            'enable.auto.commit': False,
+            'enable.partition.eof': False
+        })
+        self.consumer.subscribe([self.topic], on_assign=self._on_assign, on_revoke=self._on_revoke)
+        self.task = asyncio.create_task(self._consume(), name=f"kafka:{self.topic}:{self.group}")
+
+    # Rebalance callbacks run inside consume(), on the worker thread
+    def _on_assign(self, consumer, partitions) -> None:
+        logger.info("Kafka partitions assigned", topic=self.topic, group=self.group, partitions=[p.partition for p in partitions])
+
+    def _on_revoke(self, consumer, partitions) -> None:
+        logger.info("Kafka partitions revoked", topic=self.topic, group=self.group, partitions=[p.partition for p in partitions])
+
+    async def _consume(self) -> None:
+        broker = self.broker
+        while not self.stopping:
+            try:
+                messages = await asyncio.to_thread(
+                    self.consumer.consume, num_messages=broker.batch_size, timeout=broker.consume_timeout_seconds
+                )
+            except Exception as e:
+                logger.error("Kafka consume failed", topic=self.topic, group=self.group, error=str(e))
+                await asyncio.sleep(broker.consume_timeout_seconds)
+                continue
+
+            by_partition: Dict[int, List[Any]] = defaultdict(list)
+            for message in messages:
+                if message.error():
+                    if message.error().code() != KafkaError._PARTITION_EOF:
+                        logger.error("Kafka consumer error", topic=self.topic, error=str(message.error()))
+                    continue
+                by_partition[message.partition()].append(message)
+            if not by_partition:
+                continue
+
+            self.batches += 1
+            commits = await asyncio.gather(*(self._handle_partition(p, ms) for p, ms in by_partition.items()))
+            offsets = [TopicPartition(self.topic, p, offset) for p, offset in commits if offset is not None]
+            if offsets:
+                try:
+                    await asyncio.to_thread(self.consumer.commit, offsets=offsets, asynchronous=False)
+                    self.committed.update({tp.partition: tp.offset for tp in offsets})
+                except Exception as e:
+                    logger.error("Kafka offset commit failed", topic=self.topic, group=self.group, error=str(e))
+
+    async def _handle_partition(self, partition: int, messages: List[Any]) -> Tuple[int, Optional[int]]:
+        """Handle one partition's messages in order. Returns the offset to commit (next to read)."""
+        commit = None
+        for message in messages:
+            offset = message.offset()
+            payload = json.loads(message.value())
+            error, attempts = await deliver(self.handler, payload, self.retry)
+            self.retried += attempts - 1
+            if error is None:
+                self.delivered += 1
+            else:
+                self.failed += 1
+                key = message.key().decode("utf-8") if message.key() else None
+                if not await self.broker._dead_letter(self, partition, offset, key, payload, error, attempts):
+                    # Rewind so the next batch starts at this message; later ones are redelivered too
+                    self.redelivered += 1
+                    await asyncio.to_thread(self.consumer.seek, TopicPartition(self.topic, partition, offset))
+                    return partition, commit
+            commit = offset + 1
+        return partition, commit
+
+    async def stop(self) -> None:
+        """Finish the current batch (bounded), then leave the group"""
+        self.stopping = True
+        if self.task is not None:
+            done, pending = await asyncio.wait([self.task], timeout=self.broker.drain_timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+        if self.consumer is not None:
+            await asyncio.to_thread(self.consumer.close)
+            self.consumer = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "handler": self.name,
+            "group": self.group,
+            "committed": dict(self.committed),
+            "batches": self.batches,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "retried": self.retried,
+            "redelivered": self.redelivered
+        }
+
+
+class KafkaBroker:
+    """
+    Kafka implementation of EventBroker.
+    One idempotent producer; one batched consumer per subscription.
+    """
+    def __init__(
+        self,
+        bootstrap_servers: Optional[str] = None,
+        group_prefix: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        consume_timeout_seconds: Optional[float] = None,
+        topic_partitions: Optional[int] = None,
+        drain_timeout: Optional[float] = None,
+        retry: Optional[RetryPolicy] = None
+    ):
+        if Producer is None:
+            raise RuntimeError("confluent_kafka is not installed; set EVENT_BROKER_TYPE=memory or log to run without Kafka")
+        self.bootstrap_servers = bootstrap_servers or settings.kafka_bootstrap_servers
+        if not self.bootstrap_servers:
+            raise RuntimeError("KAFKA_BOOTSTRAP_SERVERS is not set")
+        self.group_prefix = group_prefix or settings.kafka_group_prefix
+        self.batch_size = batch_size or settings.kafka_consume_batch_size
+        self.consume_timeout_seconds = consume_timeout_seconds or settings.kafka_consume_timeout_seconds
+        self.topic_partitions = topic_partitions or settings.broker_partitions
+        self.drain_timeout = settings.broker_drain_timeout_seconds if drain_timeout is None else drain_timeout
+        self.retry = retry or default_retry_policy()
+
+        self._subscribers: Dict[str, List[KafkaSubscription]] = defaultdict(list)
+        self._producer = None
+        self._poller: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._in_flight = 0
+        self._running = False
+        self._closing = False  # stop() in progress: only handlers may still publish
+
+        self.published = 0
+        self.acked = 0
+        self.delivery_failed = 0
+        self.dead_lettered = 0
+
+    def ensure_topics(self, topics: List[str]) -> None:
+        """Create missing topics and their dead-letter topics with `topic_partitions` partitions (blocking)"""
+        topics = sorted({t for topic in topics for t in (topic, topic if is_dlq(topic) else dlq_topic(topic))})
+        admin = AdminClient(client_config(self.bootstrap_servers))
+        futures = admin.create_topics([NewTopic(t, num_partitions=self.topic_partitions, replication_factor=-1) for t in topics])
+        for topic, future in futures.items():
+            try:
+                future.result()
+                logger.info("Kafka topic created", topic=topic, partitions=self.topic_partitions)
+            except Exception as e:
+                if "exists" not in str(e).lower():
+                    logger.warning("Kafka topic creation failed", topic=topic, error=str(e))
+
+    # Delivery tracking
+    def _on_delivery(self, future: asyncio.Future, err, msg) -> None:
+        """Producer callback (poll thread): hand the result to the event loop"""
+        self._loop.call_soon_threadsafe(self._resolve, future, err)
+
+    def _resolve(self, future: asyncio.Future, err) -> None:
+        self._in_flight -= 1
+        if err is None:
+            self.acked += 1
+        else:
+            self.delivery_failed += 1
+            logger.error("Kafka delivery failed", error=str(err))
+        if not future.done():
+            future.set_result(err is None)
+
+    async def _poll_loop(self) -> None:
+        """Serve delivery callbacks without blocking the event loop"""
+        while self._running or self._in_flight:
+            await asyncio.to_thread(self._producer.poll, 0.1)
+
+    # EventBroker
+    async def start(self) -> None:
+        """Create the producer and topics, then start the consumers"""
+        self._loop = asyncio.get_running_loop()
+        self._producer = Producer({
+            **client_config(self.bootstrap_servers),
+            'acks': 'all',
+            'enable.idempotence': True,
+            'linger.ms': settings.kafka_linger_ms,
+            'compression.type': 'lz4',
+            'client.id': f"{self.group_prefix}-producer"
+        })
+        if self._subscribers:
+            await asyncio.to_thread(self.ensure_topics, list(self._subscribers))
+        self._running = True
+        self._closing = False
+        self._poller = asyncio.create_task(self._poll_loop())
+        for subscriptions in self._subscribers.values():
+            for subscription in subscriptions:
+                subscription.start()
+        logger.info("KafkaBroker started", bootstrap_servers=self.bootstrap_servers, batch_size=self.batch_size)
+
+    async def stop(self) -> None:
+        """
+        Stop accepting external events, stop the consumers (finishing their
+        batch), then wait for outstanding deliveries. Handlers keep producing
+        until they stop, so a batch is not committed without its downstream events.
+        """
+        self._closing = True
+        await asyncio.gather(*(s.stop() for subs in self._subscribers.values() for s in subs))
+        self._running = False
+        if self._producer is not None:
+            remaining = await asyncio.to_thread(self._producer.flush, self.drain_timeout)
+            if remaining:
+                logger.warning("KafkaBroker stopped with undelivered events", pending=remaining)
+        if self._poller is not None:
+            self._poller.cancel()
+            await asyncio.gather(self._poller, return_exceptions=True)
+            self._poller = None
+        logger.info("KafkaBroker stopped")
+
+    async def publish(self, topic: str, key: str, payload: Dict[str, Any]) -> bool:
+        """
+        Produce an event keyed by `key`. Returns once the cluster acknowledged it;
+        False if the broker is stopped or delivery failed.
+        While stopping, only events from a draining handler are accepted.
+        """
+        if not self._running or (self._closing and not handling_event.get()):
+            logger.warning("KafkaBroker is not running, dropping event", topic=topic)
+            return False
+        self.published += 1
+        return await self._produce(topic, key, payload)
+
+    async def _produce(self, topic: str, key: Optional[str], payload: Dict[str, Any]) -> bool:
+        future = self._loop.create_future()
+        value = json.dumps(payload).encode("utf-8")
+        while True:
+            try:
+                self._producer.produce(topic, value=value, key=key or None,
+                                       on_delivery=lambda err, msg: self._on_delivery(future, err, msg))
+                break
+            except BufferError:
+                await asyncio.sleep(0.05)  # Local queue full: wait for deliveries (backpressure)
+        self._in_flight += 1
+        if self._poller is None:  # Stopping: nobody polls, so wait for this delivery here
+            await asyncio.to_thread(self._producer.flush, self.drain_timeout)
+        return await future
+
+    async def _dead_letter(
+        self,
+        subscription: KafkaSubscription,
+        partition: int,
+        offset: int,
+        key: Optional[str],
+        payload: Dict[str, Any],
+        error: Exception,
+        attempts: int
+    ) -> bool:
+        """Produce an event whose handler gave up to `<topic>.dlq`. False if it must be redelivered instead."""
+        logger.error("EventHandler failed, dead-lettering", topic=subscription.topic, handler=subscription.name,
+                     partition=partition, offset=offset, attempts=attempts, error=str(error))
+        if is_dlq(subscription.topic):
+            return True
+        record = dead_letter_record(subscription.topic, key, payload, error, attempts, subscription.name)
+        if await self._produce(dlq_topic(subscription.topic), key, record):
+            self.dead_lettered += 1
+            return True
+        return False
+
+    async def subscribe(
+        self,
+        topic: str,
+        handler: Handler,
+        retry: Optional[RetryPolicy] = None,
+        group: Optional[str] = None
+    ) -> None:
+        """Register a consumer group (prefix.topic.handler unless given) for a topic"""
+        name = getattr(handler, '__name__', repr(handler))
+        subscription = KafkaSubscription(self, topic, handler, group or f"{self.group_prefix}.{topic}.{name}", retry or self.retry)
+        self._subscribers[topic].append(subscription)
+        if self._running:
+            await asyncio.to_thread(self.ensure_topics, [topic])
+            subscription.start()
+        logger.info("Handler subscribed", topic=topic, handler=name, group=subscription.group)
+
+    def stats(self) -> Dict[str, Any]:
+        """Producer delivery counters and per-subscriber consumer counters"""
+        return {
+            "running": self._running,
+            "published": self.published,
+            "acked": self.acked,
+            "delivery_failed": self.delivery_failed,
+            "dead_lettered": self.dead_lettered,
+            "in_flight": self._in_flight,
+            "topics": {
+                topic: [s.stats() for s in subscriptions]
+                for topic, subscriptions in self._subscribers.items()
+            }
+        }
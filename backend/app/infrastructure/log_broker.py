@@ -0,0 +1,484 @@
+"""
+Durable Log Event Broker (Adapter)
+EventBroker backed by an append-only log in a local SQLite file (WAL mode),
+so queued raw-HTML and enriched events survive a restart instead of
+throwing away finished crawls and extractions.
+
+- `publish` appends to the log. Appends are group-committed: events
+  published within `flush_interval_seconds` share one transaction (one
+  fsync), and `publish` returns once its event is durable.
+- Events are hashed onto the same key-ordered partitions as MemoryBroker.
+  The partition count is fixed when the log is created.
+- Each subscription is a consumer group (the handler name by default)
+  with one consumer per partition and a committed offset per partition.
+  Delivery is at-least-once: offsets are committed after each handled
+  batch, so a crash re-delivers at most one batch per partition.
+- A failing handler is retried under the subscription's RetryPolicy,
+  then its event is appended to `<topic>.dlq` before the offset moves.
+- A new group starts from the oldest retained event; `seek` replays
+  from any offset.
+- Retention drops events older than `retention_seconds` and, oldest
+  first, anything beyond `retention_bytes`.
+"""
+import asyncio
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import structlog
+
+from app.config import settings
+from app.core.events import RetryPolicy, dlq_topic
+from app.infrastructure.handler_retry import dead_letter_record, default_retry_policy, deliver, handling_event, is_dlq
+from app.infrastructure.memory_broker import Handler, partition_for
+
+logger = structlog.get_logger()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    topic TEXT NOT NULL,
+    partition INTEGER NOT NULL,
+    key TEXT,
+    payload TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_topic_partition ON events (topic, partition, id);
+CREATE INDEX IF NOT EXISTS idx_events_created ON events (created_at);
+CREATE TABLE IF NOT EXISTS consumer_offsets (
+    topic TEXT NOT NULL,
+    consumer TEXT NOT NULL,
+    partition INTEGER NOT NULL,
+    committed INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (topic, consumer, partition)
+);
+CREATE TABLE IF NOT EXISTS log_meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Everything older than the newest `retention_bytes` of payload
+SIZE_CUTOFF = """
+SELECT id FROM (
+    SELECT id, SUM(size) OVER (ORDER BY id DESC) AS retained FROM events
+) WHERE retained > ? ORDER BY id DESC LIMIT 1
+"""
+
+PendingAppend = Tuple[str, int, Optional[str], str, asyncio.Future]
+
+
+class LogSubscription:
+    """One consumer group on one topic: a consumer and a committed offset per partition."""
+
+    def __init__(self, broker: "LogBroker", topic: str, handler: Handler, group: str, retry: RetryPolicy):
+        self.broker = broker
+        self.topic = topic
+        self.handler = handler
+        self.name = group
+        self.retry = retry
+        self.positions: List[int] = [0] * broker.partitions  # last handled offset per partition
+        self.generation = 0  # bumped by seek so consumers drop their current batch
+        self.wakeups = [asyncio.Event() for _ in range(broker.partitions)]
+        self.tasks: List[asyncio.Task] = []
+        self.stopping = False
+
+        self.delivered = 0
+        self.failed = 0
+        self.retried = 0
+        self.redelivered = 0
+
+    async def start(self) -> None:
+        if self.tasks:
+            return
+        self.stopping = False
+        committed = await self.broker._run(self.broker._load_offsets, self.topic, self.name)
+        for partition, offset in committed.items():
+            if partition < len(self.positions):
+                self.positions[partition] = offset
+        self.tasks = [
+            asyncio.create_task(self._consume(p), name=f"log-broker:{self.topic}:{self.name}:p{p}")
+            for p in range(len(self.positions))
+        ]
+
+    async def _consume(self, partition: int) -> None:
+        broker = self.broker
+        wakeup = self.wakeups[partition]
+        while not self.stopping:
+            wakeup.clear()
+            generation = self.generation
+            rows = await broker._run(broker._fetch, self.topic, partition, self.positions[partition], broker.batch_size)
+            if not rows:
+                try:
+                    await asyncio.wait_for(wakeup.wait(), broker.poll_interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            redeliver = False
+            for offset, key, payload in rows:
+                if self.stopping or self.generation != generation:
+                    break
+                event = json.loads(payload)
+                error, attempts = await deliver(self.handler, event, self.retry)
+                self.retried += attempts - 1
+                if error is None:
+                    self.delivered += 1
+                else:
+                    self.failed += 1
+                    if not await broker._dead_letter(self, partition, offset, key, event, error, attempts):
+                        # Not recorded in the DLQ: keep the offset so the event is redelivered
+                        self.redelivered += 1
+                        redeliver = True
+                        break
+                if self.generation != generation:
+                    break
+                self.positions[partition] = offset
+            if self.generation == generation:
+                await self.commit(partition)
+            if redeliver:
+                await asyncio.sleep(broker.poll_interval_seconds)
+
+    async def commit(self, partition: int) -> None:
+        try:
+            await self.broker._run(self.broker._commit_offset, self.topic, self.name, partition, self.positions[partition])
+        except Exception as e:
+            logger.error("Offset commit failed", topic=self.topic, consumer=self.name, partition=partition, error=str(e))
+
+    def lag(self) -> List[int]:
+        heads = self.broker._heads
+        return [max(0, heads.get((self.topic, p), 0) - self.positions[p]) for p in range(len(self.positions))]
+
+    async def drain(self, timeout: float) -> bool:
+        """Wait until every partition has caught up with the log head. False on timeout."""
+        deadline = time.monotonic() + timeout
+        while any(self.lag()):
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.01)
+        return True
+
+    async def stop(self) -> None:
+        """Stop after the current event; commit what has been handled"""
+        self.stopping = True
+        for wakeup in self.wakeups:
+            wakeup.set()
+        tasks, self.tasks = self.tasks, []
+        done, pending = await asyncio.wait(tasks, timeout=self.broker.drain_timeout) if tasks else (set(), set())
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for partition in range(len(self.positions)):
+            await self.commit(partition)
+
+    def stats(self) -> Dict[str, Any]:
+        lag = self.lag()
+        return {
+            "handler": self.name,
+            "partitions": len(self.positions),
+            "committed": list(self.positions),
+            "lag": sum(lag),
+            "partition_lag": lag,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "retried": self.retried,
+            "redelivered": self.redelivered
+        }
+
+
+class LogBroker:
+    """
+    Durable implementation of EventBroker.
+    Appends events to a local SQLite log and replays them to consumer groups.
+    """
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        partitions: Optional[int] = None,
+        flush_interval_seconds: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        poll_interval_seconds: Optional[float] = None,
+        retention_seconds: Optional[float] = None,
+        retention_bytes: Optional[int] = None,
+        drain_timeout: Optional[float] = None,
+        retry: Optional[RetryPolicy] = None
+    ):
+        self.path = path or settings.log_broker_path
+        self.flush_interval_seconds = settings.log_broker_flush_interval_seconds if flush_interval_seconds is None else flush_interval_seconds
+        self.batch_size = batch_size or settings.log_broker_batch_size
+        self.poll_interval_seconds = poll_interval_seconds or settings.log_broker_poll_interval_seconds
+        self.retention_seconds = retention_seconds or settings.log_broker_retention_hours * 3600
+        self.retention_bytes = retention_bytes or settings.log_broker_retention_bytes
+        self.drain_timeout = settings.broker_drain_timeout_seconds if drain_timeout is None else drain_timeout
+        self.retry = retry or default_retry_policy()
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # One connection shared by worker threads; the lock serializes access
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.RLock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=FULL")  # fsync on every (batched) commit
+            self._conn.executescript(SCHEMA)
+        self.partitions = self._fixed_partitions(partitions or settings.broker_partitions)
+
+        self._subscribers: Dict[str, List[LogSubscription]] = defaultdict(list)
+        self._heads: Dict[Tuple[str, int], int] = {}  # newest offset per (topic, partition)
+        self._pending: List[PendingAppend] = []
+        self._has_pending = asyncio.Event()
+        self._round_robin = itertools.cycle(range(self.partitions))
+        self._flusher: Optional[asyncio.Task] = None
+        self._retention: Optional[asyncio.Task] = None
+        self._running = False
+        self._closing = False  # stop() in progress: only handlers may still publish
+
+        self.published = 0
+        self.flushes = 0
+        self.expired = 0
+        self.dead_lettered = 0
+        logger.info("Log broker opened", path=self.path, partitions=self.partitions)
+
+    # Blocking sqlite calls run in worker threads, never on the event loop
+    async def _run(self, fn, *args, **kwargs):
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+    def _query(self, sql: str, params: Iterable[Any] = ()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, tuple(params)).fetchall()
+
+    def _fixed_partitions(self, configured: int) -> int:
+        """Key -> partition must not change under stored events: the first run's count wins"""
+        rows = self._query("SELECT value FROM log_meta WHERE name = 'partitions'")
+        if rows:
+            stored = int(rows[0][0])
+            if stored != configured:
+                logger.warning("Log partition count is fixed at creation; ignoring setting", stored=stored, configured=configured)
+            return stored
+        partitions = max(1, configured)
+        self._query("INSERT INTO log_meta (name, value) VALUES ('partitions', ?)", (str(partitions),))
+        return partitions
+
+    # Log I/O (worker threads)
+    def _append(self, batch: List[PendingAppend]) -> List[int]:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                offsets = [
+                    self._conn.execute(
+                        "INSERT INTO events (topic, partition, key, payload, size, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                        (topic, partition, key, payload, len(payload), now)
+                    ).lastrowid
+                    for topic, partition, key, payload, _ in batch
+                ]
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return offsets
+
+    def _fetch(self, topic: str, partition: int, after: int, limit: int) -> List[Tuple[int, Optional[str], str]]:
+        return self._query(
+            "SELECT id, key, payload FROM events WHERE topic = ? AND partition = ? AND id > ? ORDER BY id LIMIT ?",
+            (topic, partition, after, limit)
+        )
+
+    def _load_offsets(self, topic: str, consumer: str) -> Dict[int, int]:
+        rows = self._query("SELECT partition, committed FROM consumer_offsets WHERE topic = ? AND consumer = ?", (topic, consumer))
+        return {partition: committed for partition, committed in rows}
+
+    def _commit_offset(self, topic: str, consumer: str, partition: int, committed: int) -> None:
+        self._query(
+            """INSERT INTO consumer_offsets (topic, consumer, partition, committed, updated_at) VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT (topic, consumer, partition) DO UPDATE SET committed = excluded.committed, updated_at = excluded.updated_at""",
+            (topic, consumer, partition, committed, time.time())
+        )
+
+    def _load_heads(self) -> Dict[Tuple[str, int], int]:
+        rows = self._query("SELECT topic, partition, MAX(id) FROM events GROUP BY topic, partition")
+        return {(topic, partition): head for topic, partition, head in rows}
+
+    def _apply_retention(self, now: float) -> int:
+        """Drop expired and over-budget events. Returns rows deleted."""
+        with self._lock:
+            deleted = self._conn.execute("DELETE FROM events WHERE created_at < ?", (now - self.retention_seconds,)).rowcount
+            cutoff = self._conn.execute(SIZE_CUTOFF, (self.retention_bytes,)).fetchone()
+            if cutoff:
+                deleted += self._conn.execute("DELETE FROM events WHERE id <= ?", (cutoff[0],)).rowcount
+        return deleted
+
+    # Group commit
+    async def _flush_loop(self) -> None:
+        while True:
+            await self._has_pending.wait()
+            if self.flush_interval_seconds:
+                await asyncio.sleep(self.flush_interval_seconds)  # let concurrent publishers join the batch
+            await self._flush()
+
+    async def _flush(self) -> None:
+        batch, self._pending = self._pending, []
+        self._has_pending.clear()
+        if not batch:
+            return
+        try:
+            offsets = await self._run(self._append, batch)
+        except Exception as e:
+            logger.error("Log append failed", events=len(batch), error=str(e))
+            for *_, future in batch:
+                if not future.done():
+                    future.set_result(False)
+            return
+        self.flushes += 1
+        woken = set()
+        for (topic, partition, _, _, future), offset in zip(batch, offsets):
+            self._heads[(topic, partition)] = offset
+            woken.add((topic, partition))
+            if not future.done():
+                future.set_result(True)
+        for topic, partition in woken:
+            for subscription in self._subscribers.get(topic, ()):
+                subscription.wakeups[partition].set()
+
+    async def _retention_loop(self) -> None:
+        while True:
+            try:
+                deleted = await self._run(self._apply_retention, time.time())
+                if deleted:
+                    self.expired += deleted
+                    logger.info("Log retention applied", deleted=deleted)
+            except Exception as e:
+                logger.error("Log retention failed", error=str(e))
+            await asyncio.sleep(settings.log_broker_retention_check_seconds)
+
+    # EventBroker
+    async def start(self) -> None:
+        """Recover log heads and committed offsets, then start the consumers"""
+        self._heads = await self._run(self._load_heads)
+        self._running = True
+        self._closing = False
+        self._flusher = asyncio.create_task(self._flush_loop())
+        self._retention = asyncio.create_task(self._retention_loop())
+        for subscriptions in self._subscribers.values():
+            for subscription in subscriptions:
+                await subscription.start()
+        logger.info("LogBroker started", path=self.path, partitions=self.partitions,
+                    backlog=sum(s.stats()["lag"] for subs in self._subscribers.values() for s in subs))
+
+    async def stop(self) -> None:
+        """
+        Stop accepting external events, let consumers catch up (bounded), then
+        make pending appends durable. Handlers keep appending until every
+        consumer has stopped, so events they derive downstream (raw -> enriched)
+        are in the log before the source offset is committed.
+        """
+        self._closing = True
+        subscriptions = [s for subs in self._subscribers.values() for s in subs]
+        drained = await asyncio.gather(*(s.drain(self.drain_timeout) for s in subscriptions))
+        for subscription, ok in zip(subscriptions, drained):
+            if not ok:
+                logger.info("LogBroker stopped with unconsumed events; they resume on restart",
+                            topic=subscription.topic, handler=subscription.name, lag=sum(subscription.lag()))
+        await asyncio.gather(*(s.stop() for s in subscriptions))
+
+        self._running = False
+        for task in (self._flusher, self._retention):
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._flusher = self._retention = None
+        await self._flush()
+        logger.info("LogBroker stopped")
+
+    async def publish(self, topic: str, key: str, payload: Dict[str, Any]) -> bool:
+        """
+        Append an event to the log. Returns once it is durable;
+        False if the broker is stopped or the append failed.
+        While stopping, only appends from a draining handler are accepted.
+        """
+        if not self._running or (self._closing and not handling_event.get()):
+            logger.warning("LogBroker is not running, dropping event", topic=topic)
+            return False
+
+        self.published += 1
+        return await self._append_event(topic, key, payload)
+
+    async def _append_event(self, topic: str, key: Optional[str], payload: Dict[str, Any]) -> bool:
+        partition = partition_for(key, self.partitions) if key else next(self._round_robin)
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((topic, partition, key, json.dumps(payload), future))
+        self._has_pending.set()
+        if self._flusher is None:  # No group commit running: write through
+            await self._flush()
+        return await future
+
+    async def _dead_letter(
+        self,
+        subscription: LogSubscription,
+        partition: int,
+        offset: int,
+        key: Optional[str],
+        payload: Dict[str, Any],
+        error: Exception,
+        attempts: int
+    ) -> bool:
+        """Append an event whose handler gave up to `<topic>.dlq`. False if it must be redelivered instead."""
+        logger.error("EventHandler failed, dead-lettering", topic=subscription.topic, handler=subscription.name,
+                     partition=partition, offset=offset, attempts=attempts, error=str(error))
+        if is_dlq(subscription.topic):
+            return True
+        record = dead_letter_record(subscription.topic, key, payload, error, attempts, subscription.name)
+        if await self._append_event(dlq_topic(subscription.topic), key, record):
+            self.dead_lettered += 1
+            return True
+        return False
+
+    async def subscribe(
+        self,
+        topic: str,
+        handler: Handler,
+        retry: Optional[RetryPolicy] = None,
+        group: Optional[str] = None
+    ) -> None:
+        """Register a consumer group (the handler name unless given) for a topic"""
+        name = group or getattr(handler, '__name__', repr(handler))
+        subscription = LogSubscription(self, topic, handler, name, retry or self.retry)
+        self._subscribers[topic].append(subscription)
+        if self._running:
+            await subscription.start()
+        logger.info("Handler subscribed", topic=topic, handler=subscription.name, partitions=self.partitions)
+
+    async def seek(self, topic: str, group: str, offset: int) -> None:
+        """Replay a consumer group from `offset` (inclusive) on every partition"""
+        committed = max(0, offset - 1)
+        for partition in range(self.partitions):
+            await self._run(self._commit_offset, topic, group, partition, committed)
+        for subscription in self._subscribers.get(topic, ()):
+            if subscription.name == group:
+                subscription.positions = [committed] * self.partitions
+                subscription.generation += 1
+                for wakeup in subscription.wakeups:
+                    wakeup.set()
+        logger.info("Consumer group seeked", topic=topic, consumer=group, offset=offset)
+
+    def stats(self) -> Dict[str, Any]:
+        """Log head, consumer lag and delivery counters per topic and subscriber"""
+        return {
+            "running": self._running,
+            "path": self.path,
+            "published": self.published,
+            "flushes": self.flushes,
+            "events_per_flush": round(self.published / self.flushes, 2) if self.flushes else None,
+            "expired": self.expired,
+            "dead_lettered": self.dead_lettered,
+            "topics": {
+                topic: [s.stats() for s in subscriptions]
+                for topic, subscriptions in self._subscribers.items()
+            }
+        }
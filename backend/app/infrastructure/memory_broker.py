@@ -1,94 +1,304 @@
 """
 In-Memory Event Broker (Adapter)
-Uses asyncio.Queue and direct callbacks for high-speed, local event routing.
+Uses asyncio queues and direct callbacks for high-speed, local event routing.
+
+Every subscription (one handler on one topic) owns N partitions, each a
+bounded queue with one ordered consumer task. `publish(topic, key, ...)`
+hashes the key (crc32) onto a partition, so events with the same key (a
+crawled URL, an opportunity ID) are handled in publish order while
+different keys proceed in parallel, like Kafka partitions. Events without
+a key are spread round-robin. A slow handler (e.g. the Refinery's Gemini
+call) only backs up its own partitions and never delays other subscribers.
+When a partition queue is full, `publish` applies the subscription's
+overflow policy:
+
+- "block": wait for space (backpressure on the publisher)
+- "drop_oldest": evict the oldest queued event to make room
+- "reject": refuse the event (`publish` returns False)
+
+A failing handler is retried under the subscription's RetryPolicy (the
+event keeps its partition meanwhile, so key order holds); once retries
+are exhausted the event goes to `<topic>.dlq`.
 """
 import asyncio
+import itertools
+import zlib
 import structlog
-from typing import Dict, Any, List, Callable, Awaitable
+from typing import Dict, Any, List, Callable, Awaitable, Optional
 from collections import defaultdict
-from app.core.events import EventBroker
+
+from app.config import settings
+from app.core.events import EventBroker, RetryPolicy, dlq_topic
+from app.infrastructure.handler_retry import dead_letter_record, default_retry_policy, deliver, handling_event, is_dlq
 
 logger = structlog.get_logger()
 
+Handler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "reject")
+
+
+def partition_for(key: str, partitions: int) -> int:
+    """Stable key -> partition mapping (crc32: identical across processes and restarts)"""
+    return zlib.crc32(key.encode("utf-8")) % partitions
+
+
+class Partition:
+    """A bounded queue drained by exactly one consumer, in order."""
+
+    def __init__(self, subscription: "Subscription", index: int, max_queue: int):
+        self.subscription = subscription
+        self.index = index
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, max_queue))
+        self.task: Optional[asyncio.Task] = None
+        self.busy = False
+
+    def start(self) -> None:
+        if self.task is None:
+            sub = self.subscription
+            self.task = asyncio.create_task(self._consume(), name=f"broker:{sub.topic}:{sub.name}:p{self.index}")
+
+    async def _consume(self) -> None:
+        sub = self.subscription
+        while True:
+            event = await self.queue.get()
+            self.busy = True
+            try:
+                error, attempts = await deliver(sub.handler, event["payload"], sub.retry)
+                sub.retried += attempts - 1
+                if error is None:
+                    sub.delivered += 1
+                else:
+                    sub.failed += 1
+                    await sub.broker._dead_letter(sub, event, error, attempts)
+            finally:
+                self.busy = False
+                self.queue.task_done()
+
+
+class Subscription:
+    """One handler on one topic: N key-ordered partitions."""
+
+    def __init__(
+        self,
+        broker: "MemoryBroker",
+        topic: str,
+        handler: Handler,
+        partitions: int,
+        max_queue: int,
+        overflow: str,
+        retry: RetryPolicy
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {overflow!r}; expected one of {OVERFLOW_POLICIES}")
+        self.broker = broker
+        self.topic = topic
+        self.handler = handler
+        self.retry = retry
+        self.name = getattr(handler, '__name__', repr(handler))
+        self.overflow = overflow
+        self.partitions = [Partition(self, i, max_queue) for i in range(max(1, partitions))]
+        self._round_robin = itertools.cycle(range(len(self.partitions)))
+
+        self.delivered = 0
+        self.failed = 0
+        self.retried = 0
+        self.dropped = 0
+        self.rejected = 0
+
+    def start(self) -> None:
+        for partition in self.partitions:
+            partition.start()
+
+    def partition_of(self, key: Optional[str]) -> Partition:
+        if not key:
+            return self.partitions[next(self._round_robin)]
+        return self.partitions[partition_for(key, len(self.partitions))]
+
+    async def offer(self, key: Optional[str], event: Dict[str, Any]) -> bool:
+        """Enqueue on the key's partition under the overflow policy. False if the event was rejected."""
+        queue = self.partition_of(key).queue
+        if self.overflow == "block":
+            await queue.put(event)
+            return True
+        try:
+            queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            if self.overflow == "reject":
+                self.rejected += 1
+                return False
+            # drop_oldest: no await between evicting and enqueuing, so the slot cannot be taken
+            queue.get_nowait()
+            queue.task_done()
+            self.dropped += 1
+            queue.put_nowait(event)
+            return True
+
+    async def drain(self, timeout: float) -> bool:
+        """Wait until every queued event has been handled. False on timeout."""
+        try:
+            await asyncio.wait_for(asyncio.gather(*(p.queue.join() for p in self.partitions)), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def depth(self) -> int:
+        return sum(p.queue.qsize() for p in self.partitions)
+
+    async def stop(self) -> None:
+        tasks = [p.task for p in self.partitions if p.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for partition in self.partitions:
+            partition.task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "handler": self.name,
+            "depth": self.depth(),
+            "partition_depths": [p.queue.qsize() for p in self.partitions],
+            "max_depth_per_partition": self.partitions[0].queue.maxsize,
+            "in_flight": sum(1 for p in self.partitions if p.busy),
+            "partitions": len(self.partitions),
+            "overflow": self.overflow,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "retried": self.retried,
+            "dropped": self.dropped,
+            "rejected": self.rejected
+        }
+
+
 class MemoryBroker:
     """
     In-Memory implementation of EventBroker.
     Uses asyncio for asynchronous event dispatch.
     """
-    def __init__(self):
-        self._subscribers: Dict[str, List[Callable]] = defaultdict(list)
+    def __init__(
+        self,
+        max_queue: Optional[int] = None,
+        partitions: Optional[int] = None,
+        overflow: Optional[str] = None,
+        drain_timeout: Optional[float] = None,
+        retry: Optional[RetryPolicy] = None
+    ):
+        self._subscribers: Dict[str, List[Subscription]] = defaultdict(list)
         self._running = False
-        self._queue: asyncio.Queue = asyncio.Queue()
-        self._worker_task = None
+        self._closing = False  # stop() in progress: only handlers may still publish
+        self.max_queue = max_queue or settings.broker_queue_size
+        self.partitions = partitions or settings.broker_partitions
+        self.overflow = overflow or settings.broker_overflow_policy
+        self.drain_timeout = settings.broker_drain_timeout_seconds if drain_timeout is None else drain_timeout
+        self.retry = retry or default_retry_policy()
+        self.published = 0
+        self.unrouted = 0
+        self.dead_lettered = 0
 
     async def start(self) -> None:
-        """Start the background dispatcher"""
+        """Start the partition consumers"""
         self._running = True
-        self._worker_task = asyncio.create_task(self._dispatcher())
-        logger.info("MemoryBroker started")
+        self._closing = False
+        for subscriptions in self._subscribers.values():
+            for subscription in subscriptions:
+                subscription.start()
+        logger.info("MemoryBroker started", partitions=self.partitions, max_queue=self.max_queue, overflow=self.overflow)
 
     async def stop(self) -> None:
-        """Stop the dispatcher"""
+        """
+        Stop accepting external events, let queued ones drain (bounded), then
+        stop the consumers. Handlers keep publishing while draining, so events
+        they derive downstream (raw -> enriched) are drained too, not dropped.
+        """
+        self._closing = True
+        subscriptions = [s for subs in self._subscribers.values() for s in subs]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.drain_timeout
+        while True:
+            published = self.published
+            drained = await asyncio.gather(*(s.drain(max(deadline - loop.time(), 0)) for s in subscriptions))
+            if not all(drained) or self.published == published:
+                break
+        for subscription, ok in zip(subscriptions, drained):
+            if not ok:
+                logger.warning("MemoryBroker stopped with undelivered events", topic=subscription.topic,
+                               handler=subscription.name, depth=subscription.depth())
+        await asyncio.gather(*(s.stop() for s in subscriptions))
         self._running = False
-        if self._worker_task:
-            self._worker_task.cancel()
-            try:
-                await self._worker_task
-            except asyncio.CancelledError:
-                pass
         logger.info("MemoryBroker stopped")
 
     async def publish(self, topic: str, key: str, payload: Dict[str, Any]) -> bool:
         """
-        Publish event to the in-memory queue.
-        Returns True immediately if queued.
+        Publish event to the key's partition in every subscription of the topic.
+        Returns False if the broker is stopped or any subscriber rejected the event.
+        While stopping, only publishes from a draining handler are accepted.
         """
-        if not self._running:
+        if not self._running or (self._closing and not handling_event.get()):
             logger.warning("MemoryBroker is not running, dropping event", topic=topic)
             return False
+        return await self._dispatch(topic, key, payload)
 
+    async def _dispatch(self, topic: str, key: str, payload: Dict[str, Any]) -> bool:
         event = {
             "topic": topic,
             "key": key,
             "payload": payload
         }
-        await self._queue.put(event)
-        return True
+        self.published += 1
+        subscriptions = self._subscribers.get(topic)
+        if not subscriptions:
+            self.unrouted += 1
+            return True
+        if len(subscriptions) == 1:
+            return await subscriptions[0].offer(key, event)
+        accepted = await asyncio.gather(*(s.offer(key, event) for s in subscriptions))
+        return all(accepted)
 
-    async def subscribe(self, topic: str, handler: Callable[[Dict[str, Any]], Awaitable[None]]) -> None:
-        """Register a handler for a topic"""
-        self._subscribers[topic].append(handler)
-        logger.info("Handler subscribed", topic=topic, handler=handler.__name__)
+    async def _dead_letter(self, subscription: Subscription, event: Dict[str, Any], error: Exception, attempts: int) -> None:
+        """Route an event whose handler gave up to `<topic>.dlq` (also while draining on stop)"""
+        logger.error("EventHandler failed, dead-lettering", topic=subscription.topic, handler=subscription.name,
+                     key=event["key"], attempts=attempts, error=str(error))
+        if is_dlq(subscription.topic):
+            return
+        record = dead_letter_record(subscription.topic, event["key"], event["payload"], error, attempts, subscription.name)
+        if await self._dispatch(dlq_topic(subscription.topic), event["key"], record):
+            self.dead_lettered += 1
 
-    async def _dispatcher(self):
-        """Background loop to process events from queue"""
-        while self._running:
-            try:
-                event = await self._queue.get()
-                topic = event["topic"]
-                payload = event["payload"]
-                
-                handlers = self._subscribers.get(topic, [])
-                if not handlers:
-                    # Debug log only for unhandled topics to avoid noise
-                    # logger.debug("No handlers for topic", topic=topic)
-                    self._queue.task_done()
-                    continue
-
-                # Dispatch to all handlers concurrently
-                tasks = [self._safe_execute(h, payload) for h in handlers]
-                await asyncio.gather(*tasks)
-                
-                self._queue.task_done()
-                
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error("MemoryBroker dispatcher error", error=str(e))
+    async def subscribe(
+        self,
+        topic: str,
+        handler: Handler,
+        partitions: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        overflow: Optional[str] = None,
+        retry: Optional[RetryPolicy] = None
+    ) -> None:
+        """Register a handler for a topic, with its own partitions and retry policy (broker defaults if unset)"""
+        subscription = Subscription(
+            self,
+            topic,
+            handler,
+            partitions=partitions or self.partitions,
+            max_queue=max_queue or self.max_queue,
+            overflow=overflow or self.overflow,
+            retry=retry or self.retry
+        )
+        self._subscribers[topic].append(subscription)
+        if self._running:
+            subscription.start()
+        logger.info("Handler subscribed", topic=topic, handler=subscription.name,
+                    partitions=len(subscription.partitions), overflow=subscription.overflow)
 
-    async def _safe_execute(self, handler, payload):
-        """Execute handler with error catching"""
-        try:
-            await handler(payload)
-        except Exception as e:
-            logger.error("EventHandler failed", handler=handler.__name__, error=str(e))
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and delivery counters per topic and subscriber"""
+        return {
+            "running": self._running,
+            "published": self.published,
+            "unrouted": self.unrouted,
+            "dead_lettered": self.dead_lettered,
+            "topics": {
+                topic: [s.stats() for s in subscriptions]
+                for topic, subscriptions in self._subscribers.items()
+            }
+        }
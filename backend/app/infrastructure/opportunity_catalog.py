@@ -0,0 +1,263 @@
+"""
+In-Process Opportunity Catalog (Read Model)
+Keeps the `scholarships` collection resident in memory, fed by Firestore
+snapshot listeners, so hot read paths never stream the whole collection.
+"""
+import asyncio
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+import structlog
+
+from app.models import Scholarship
+
+logger = structlog.get_logger()
+
+# Called as listener(upserted, removed_ids, version) after every applied delta.
+CatalogListener = Callable[[List[Scholarship], List[str], int], None]
+# Called once with the full set of IDs after the initial snapshot is applied.
+ReadyCallback = Callable[[Set[str]], Any]
+
+
+def deadline_ordinal(deadline: Optional[str]) -> Optional[int]:
+    """
+    Parse an ISO deadline once into a date ordinal for cheap expiry checks.
+    Returns None when missing or unparseable (kept, like the legacy filter).
+    """
+    if not deadline:
+        return None
+    try:
+        return datetime.fromisoformat(deadline.replace('Z', '+00:00')).date().toordinal()
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+class OpportunityCatalog:
+    """
+    Process-wide catalog of opportunities.
+
+    - Loads once from the initial snapshot, then applies ADDED/MODIFIED/REMOVED deltas.
+    - Exposes a monotonically increasing `version` that bumps on every applied change.
+    - Serves detached copies so per-request mutation (match_score, match_reasons)
+      never leaks into the shared state.
+
+    Snapshot callbacks run on the Firestore watch thread, so all state is
+    guarded by a lock.
+
+    If the listener fails to attach or its initial snapshot does not land in
+    time, the catalog is marked degraded: later reads fall back to the store
+    immediately instead of each waiting out the timeout, until it lands.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries: Dict[str, Scholarship] = {}
+        self._expiry: Dict[str, Optional[int]] = {}
+        self._version = 0
+        self._ready = threading.Event()
+        self._degraded = False
+        self._watch = None
+        self._listeners: List[CatalogListener] = []
+        self._ready_callbacks: List[ReadyCallback] = []
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    @property
+    def is_degraded(self) -> bool:
+        return self._degraded
+
+    @property
+    def is_running(self) -> bool:
+        return self._watch is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, scholarship_id: str) -> bool:
+        return scholarship_id in self._entries
+
+    # Lifecycle
+    def start(self, collection_ref) -> None:
+        """Attach a snapshot listener to the given collection (idempotent)."""
+        with self._lock:
+            if self._watch is not None:
+                return
+            try:
+                self._watch = collection_ref.on_snapshot(self._on_snapshot)
+            except Exception as e:
+                self._degraded = True
+                logger.error("Failed to attach catalog listener", error=str(e))
+                return
+        logger.info("Opportunity catalog listener attached")
+
+    def stop(self) -> None:
+        """Detach the snapshot listener. Cached entries stay readable but go stale."""
+        with self._lock:
+            watch, self._watch = self._watch, None
+            self._ready.clear()
+        if watch is not None:
+            try:
+                watch.unsubscribe()
+            except Exception as e:
+                logger.warning("Failed to unsubscribe catalog listener", error=str(e))
+        logger.info("Opportunity catalog listener detached")
+
+    async def wait_until_ready(self, timeout: float) -> bool:
+        """
+        Wait (off the event loop) for the initial snapshot to land. Once a
+        wait has timed out (or the listener failed), returns False at once.
+        """
+        if self._ready.is_set():
+            return True
+        if self._degraded:
+            return False
+        if await asyncio.to_thread(self._ready.wait, timeout):
+            return True
+        if not self._degraded:
+            self._degraded = True
+            logger.warning("Opportunity catalog not ready, reading from the store until its snapshot lands", timeout=timeout)
+        return False
+
+    def add_listener(self, listener: CatalogListener) -> None:
+        """Register a callback for catalog deltas (e.g. derived indexes)."""
+        self._listeners.append(listener)
+
+    def add_ready_callback(self, callback: ReadyCallback) -> None:
+        """Register a callback for the initial snapshot (e.g. reconcile persisted indexes)."""
+        self._ready_callbacks.append(callback)
+
+    def ids(self) -> Set[str]:
+        """IDs of every cached opportunity (expired included)."""
+        with self._lock:
+            return set(self._entries)
+
+    # Ingestion
+    def _on_snapshot(self, col_snapshot, changes, read_time) -> None:
+        """Firestore watch callback: translate document changes into a delta."""
+        upserts: List[Tuple[str, Dict[str, Any]]] = []
+        removals: List[str] = []
+        for change in changes:
+            doc = change.document
+            if change.type.name == 'REMOVED':
+                removals.append(doc.id)
+            else:
+                upserts.append((doc.id, doc.to_dict() or {}))
+        self._ingest(upserts, removals)
+
+    def load(self, upserts: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Initial load for stores without snapshot listeners (local storage
+        backends): marks the catalog ready and fires the ready callbacks.
+        Those stores then push their own writes through apply_changes.
+        """
+        self._ingest(list(upserts), [])
+
+    def _ingest(self, upserts: List[Tuple[str, Dict[str, Any]]], removals: List[str]) -> None:
+        initial = not self._ready.is_set()
+        if initial:
+            # A restarted listener's first snapshot is the full collection:
+            # drop entries deleted while it was detached
+            present = {doc_id for doc_id, _ in upserts}
+            removals = removals + [doc_id for doc_id in self.ids() if doc_id not in present]
+        try:
+            self.apply_changes(upserts, removals)
+        except Exception as e:
+            logger.error("Failed to apply catalog snapshot", error=str(e))
+        finally:
+            self._ready.set()
+            self._degraded = False
+
+        if initial:
+            ids = self.ids()
+            for callback in self._ready_callbacks:
+                try:
+                    callback(ids)
+                except Exception as e:
+                    logger.error("Catalog ready callback failed", callback=getattr(callback, '__name__', repr(callback)), error=str(e))
+            logger.info("Opportunity catalog loaded", count=len(ids), version=self._version)
+
+    def apply_changes(
+        self,
+        upserts: Iterable[Tuple[str, Dict[str, Any]]] = (),
+        removals: Iterable[str] = ()
+    ) -> int:
+        """
+        Apply a delta of raw documents. Documents are validated and their
+        deadlines parsed once here, outside the lock. Returns the new version.
+        """
+        parsed: List[Tuple[Scholarship, Optional[int]]] = []
+        for doc_id, data in upserts:
+            try:
+                if 'id' not in data:
+                    data = {**data, 'id': doc_id}
+                s = Scholarship(**data)
+                parsed.append((s, deadline_ordinal(s.deadline)))
+            except Exception as parse_error:
+                logger.warning("Failed to parse scholarship", doc_id=doc_id, error=str(parse_error))
+
+        removed: List[str] = []
+        with self._lock:
+            for s, ordinal in parsed:
+                self._entries[s.id] = s
+                self._expiry[s.id] = ordinal
+            for doc_id in removals:
+                if self._entries.pop(doc_id, None) is not None:
+                    removed.append(doc_id)
+                self._expiry.pop(doc_id, None)
+
+            if parsed or removed:
+                self._version += 1
+            version = self._version
+
+        if parsed or removed:
+            upserted = [s for s, _ in parsed]
+            for listener in self._listeners:
+                try:
+                    listener(upserted, removed, version)
+                except Exception as e:
+                    logger.error("Catalog listener failed", listener=getattr(listener, '__name__', repr(listener)), error=str(e))
+        return version
+
+    # Reads
+    @staticmethod
+    def _detach(s: Scholarship) -> Scholarship:
+        """Shallow copy with its own match_reasons list (callers append to it)."""
+        return s.model_copy(update={'match_reasons': list(s.match_reasons)})
+
+    def get(self, scholarship_id: str) -> Optional[Scholarship]:
+        """Fetch a single opportunity by ID (expired entries included)."""
+        s = self._entries.get(scholarship_id)
+        return self._detach(s) if s is not None else None
+
+    def is_expired(self, scholarship_id: str, today_ordinal: Optional[int] = None) -> bool:
+        """True if the opportunity's deadline date is before today."""
+        ordinal = self._expiry.get(scholarship_id)
+        if ordinal is None:
+            return False
+        if today_ordinal is None:
+            today_ordinal = datetime.now().date().toordinal()
+        return ordinal < today_ordinal
+
+    def snapshot(self, include_expired: bool = False) -> List[Scholarship]:
+        """Return detached copies of all live opportunities."""
+        today = datetime.now().date().toordinal()
+        with self._lock:
+            items = list(self._entries.values())
+            expiry = self._expiry
+
+            if not include_expired:
+                items = [
+                    s for s in items
+                    if expiry.get(s.id) is None or expiry[s.id] >= today
+                ]
+        return [self._detach(s) for s in items]
+
+
+# Global catalog instance (shared by every FirebaseDB instance)
+opportunity_catalog = OpportunityCatalog()
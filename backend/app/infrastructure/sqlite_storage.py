@@ -0,0 +1,885 @@
+"""
+Local SQLite Storage Backend
+Single-file implementation of the StorageBackend port for development,
+tests and single-node deployments. Same merge, fingerprint and
+packed-embedding rules as the Firestore backend.
+
+Documents are stored as JSON next to indexed columns (deadline_timestamp,
+user_id, status, updated_at) so list and expiry queries never scan.
+The database runs in WAL mode: readers do not block the writer.
+"""
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import structlog
+
+from app.config import settings
+from app.core.storage import BulkSaveOutcome
+from app.models import OpportunitySummary, Scholarship, UserProfile
+from app.infrastructure.opportunity_catalog import opportunity_catalog
+from app.infrastructure.embedding_index import embedding_index, search_catalog
+from app.services.user_routing_index import user_routing_index
+from app.services.user_matches import TopKMatches, user_match_store
+from app.utils.scholarship_merge import merge_preserving
+from app.utils.fingerprint import FINGERPRINT_FIELD, content_fingerprint, is_unchanged, scholarship_write_stats
+from app.utils.embedding_codec import PACKED_FIELD, pack_embedding, to_firestore
+from app.utils.deadlines import DEADLINE_TS_FIELD, is_expired, normalize_deadline
+
+logger = structlog.get_logger()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scholarships (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    embedding_f32 BLOB,
+    deadline_timestamp INTEGER,
+    content_fingerprint TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_scholarships_deadline ON scholarships (deadline_timestamp);
+CREATE TABLE IF NOT EXISTS scholarships_archive (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    embedding_f32 BLOB,
+    deadline_timestamp INTEGER,
+    archived_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS user_matches (
+    user_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS applications (
+    application_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    scholarship_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    data TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_applications_user_updated ON applications (user_id, updated_at);
+CREATE INDEX IF NOT EXISTS idx_applications_user_scholarship_status ON applications (user_id, scholarship_id, status);
+CREATE TABLE IF NOT EXISTS discovery_jobs (
+    job_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_discovery_jobs_user ON discovery_jobs (user_id);
+CREATE INDEX IF NOT EXISTS idx_discovery_jobs_status ON discovery_jobs (status);
+CREATE TABLE IF NOT EXISTS chat_messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_chat_messages_user ON chat_messages (user_id, id);
+CREATE TABLE IF NOT EXISTS system_state (
+    name TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dead_letters (
+    id TEXT PRIMARY KEY,
+    topic TEXT NOT NULL,
+    failed_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_dead_letters_topic ON dead_letters (topic, failed_at);
+"""
+
+# Upsert that keeps a stored vector when the incoming document carries none
+UPSERT_SCHOLARSHIP = """
+INSERT INTO scholarships (id, data, embedding_f32, deadline_timestamp, content_fingerprint, updated_at)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    data = excluded.data,
+    embedding_f32 = COALESCE(excluded.embedding_f32, scholarships.embedding_f32),
+    deadline_timestamp = excluded.deadline_timestamp,
+    content_fingerprint = excluded.content_fingerprint,
+    updated_at = excluded.updated_at
+"""
+
+
+def _now() -> str:
+    return datetime.now().isoformat()
+
+
+class SQLiteDB:
+    """SQLite database manager (drop-in for FirebaseDB)"""
+
+    def __init__(self, path: str):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        # One connection shared by worker threads; the lock serializes access
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+        logger.info("SQLite storage opened", path=path)
+
+    # Blocking sqlite calls run in worker threads, never on the event loop
+    async def _run(self, fn, *args, **kwargs):
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+    def _query(self, sql: str, params: Iterable[Any] = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, tuple(params)).fetchall()
+
+    def _execute(self, sql: str, params: Iterable[Any] = ()) -> int:
+        """Run one statement; returns the affected row count"""
+        with self._lock:
+            return self._conn.execute(sql, tuple(params)).rowcount
+
+    def _transaction(self, statements: List[Tuple[str, Iterable[Any]]]) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for sql, params in statements:
+                    self._conn.execute(sql, tuple(params))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _get_doc(self, table: str, key: str, value: str) -> Optional[Dict[str, Any]]:
+        rows = self._query(f"SELECT data FROM {table} WHERE {key} = ?", (value,))
+        return json.loads(rows[0]["data"]) if rows else None
+
+    def _merge_doc(self, table: str, key: str, value: str, fields: Dict[str, Any]) -> None:
+        """set(..., merge=True): create the row or overlay top-level fields"""
+        with self._lock:
+            doc = self._get_doc(table, key, value) or {}
+            doc.update(fields)
+            self._execute(
+                f"INSERT INTO {table} ({key}, data) VALUES (?, ?) ON CONFLICT ({key}) DO UPDATE SET data = excluded.data",
+                (value, json.dumps(doc, default=str))
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # Opportunity Catalog
+    @staticmethod
+    def _scholarship_row(doc: Dict[str, Any]) -> Tuple[Any, ...]:
+        """Merged model dump -> UPSERT_SCHOLARSHIP parameters (vector packed into its own column)"""
+        data = to_firestore(doc)
+        packed = data.pop(PACKED_FIELD, None)
+        return (
+            data['id'], json.dumps(data, default=str), packed,
+            data.get(DEADLINE_TS_FIELD), data.get(FINGERPRINT_FIELD), _now()
+        )
+
+    @staticmethod
+    def _row_doc(row: sqlite3.Row) -> Dict[str, Any]:
+        data = json.loads(row["data"])
+        if row["embedding_f32"] is not None:
+            data[PACKED_FIELD] = row["embedding_f32"]
+        return data
+
+    def _publish(self, docs: List[Dict[str, Any]]) -> None:
+        """Push written rows into the catalog (there is no listener to do it)"""
+        if docs and opportunity_catalog.is_ready:
+            rows = self._query(
+                f"SELECT * FROM scholarships WHERE id IN ({','.join('?' * len(docs))})",
+                [doc['id'] for doc in docs]
+            )
+            opportunity_catalog.apply_changes([(row["id"], self._row_doc(row)) for row in rows])
+
+    def start_catalog(self) -> None:
+        """Load the scholarships table into the in-process opportunity catalog"""
+        if settings.catalog_cache_enabled and not opportunity_catalog.is_ready:
+            rows = self._query("SELECT * FROM scholarships")
+            opportunity_catalog.load((row["id"], self._row_doc(row)) for row in rows)
+
+    def stop_catalog(self) -> None:
+        """Persist the vector index (the catalog has no listener to detach)"""
+        opportunity_catalog.stop()
+        embedding_index.persist()
+
+    def _live_rows(self, columns: str) -> List[sqlite3.Row]:
+        """Unexpired rows only: a range scan on the deadline index plus the undated rows"""
+        return self._query(
+            f"SELECT {columns} FROM scholarships WHERE deadline_timestamp >= ? "
+            f"UNION ALL SELECT {columns} FROM scholarships WHERE deadline_timestamp IS NULL",
+            (int(time.time()),)
+        )
+
+    # User Profile Operations
+    async def get_user_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch user profile"""
+        try:
+            return await self._run(self._get_doc, 'users', 'user_id', user_id)
+        except Exception as e:
+            logger.error("Failed to fetch user profile", user_id=user_id, error=str(e))
+            raise
+
+    async def get_all_users(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Fetch every user document as (user_id, document)"""
+        try:
+            rows = await self._run(self._query, "SELECT user_id, data FROM users ORDER BY user_id")
+            return [(row["user_id"], json.loads(row["data"])) for row in rows]
+        except Exception as e:
+            logger.error("Failed to fetch users", error=str(e))
+            raise
+
+    async def update_user_profile(self, user_id: str, profile: UserProfile) -> bool:
+        """Update user profile"""
+        try:
+            if await self.get_user_profile(user_id) is None:
+                raise KeyError(f"No user document: {user_id}")
+            await self._run(self._merge_doc, 'users', 'user_id', user_id, {
+                'profile': profile.model_dump(),
+                'updated_at': _now()
+            })
+            user_routing_index.refresh_profile(user_id, profile.model_dump())
+            logger.info("User profile updated", user_id=user_id)
+            return True
+        except Exception as e:
+            logger.error("Failed to update user profile", user_id=user_id, error=str(e))
+            raise
+
+    async def update_user_last_match_time(self, user_id: str, timestamp: float) -> bool:
+        """Update last_match_at in user profile for staleness tracking"""
+        try:
+            await self._run(self._merge_doc, 'users', 'user_id', user_id, {
+                'last_match_at': timestamp,
+                'updated_at': _now()
+            })
+            logger.info("User match timestamp updated", user_id=user_id)
+            return True
+        except Exception as e:
+            logger.error("Failed to update match timestamp", user_id=user_id, error=str(e))
+            return False
+
+    def _update_saved(self, user_id: str, scholarship_id: str, add: bool) -> None:
+        with self._lock:
+            saved = (self._get_doc('users', 'user_id', user_id) or {}).get('saved_scholarships') or []
+            if add and scholarship_id not in saved:
+                saved = saved + [scholarship_id]
+            elif not add:
+                saved = [s for s in saved if s != scholarship_id]
+            self._merge_doc('users', 'user_id', user_id, {'saved_scholarships': saved, 'updated_at': _now()})
+
+    async def save_user_scholarship(self, user_id: str, scholarship_id: str) -> bool:
+        """Add scholarship to user's saved list"""
+        try:
+            await self._run(self._update_saved, user_id, scholarship_id, True)
+            logger.info("Scholarship saved to user favorites", user_id=user_id, scholarship_id=scholarship_id)
+            return True
+        except Exception as e:
+            logger.error("Failed to save scholarship to favorites", user_id=user_id, error=str(e))
+            raise
+
+    async def unsave_user_scholarship(self, user_id: str, scholarship_id: str) -> bool:
+        """Remove scholarship from user's saved list"""
+        try:
+            await self._run(self._update_saved, user_id, scholarship_id, False)
+            logger.info("Scholarship removed from user favorites", user_id=user_id, scholarship_id=scholarship_id)
+            return True
+        except Exception as e:
+            logger.error("Failed to remove scholarship from favorites", user_id=user_id, error=str(e))
+            raise
+
+    # Scholarship Operations
+    def _existing_scholarships(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        existing = {}
+        for i in range(0, len(ids), 500):  # SQLite bound-parameter limit
+            chunk = ids[i:i + 500]
+            rows = self._query(f"SELECT id, data FROM scholarships WHERE id IN ({','.join('?' * len(chunk))})", chunk)
+            existing.update({row["id"]: json.loads(row["data"]) for row in rows})
+        return existing
+
+    async def save_scholarship(self, scholarship: Scholarship) -> bool:
+        """Merge-save one scholarship; unchanged re-upserts are skipped"""
+        outcome = (await self.save_scholarships_bulk([scholarship]))[0]
+        if outcome.status == 'failed':
+            raise RuntimeError(outcome.error)
+        return True
+
+    async def save_scholarships_bulk(self, scholarships: List[Scholarship]) -> List[BulkSaveOutcome]:
+        """Save many scholarships with field-preserving merges, in one transaction"""
+        pending: Dict[str, Dict[str, Any]] = {}
+        for scholarship in scholarships:
+            pending[scholarship.id] = merge_preserving(scholarship.model_dump(), pending.get(scholarship.id))
+
+        def commit() -> Dict[str, BulkSaveOutcome]:
+            results: Dict[str, BulkSaveOutcome] = {}
+            written: List[Dict[str, Any]] = []
+            with self._lock:
+                existing = self._existing_scholarships(list(pending))
+                statements = []
+                for scholarship_id, doc in pending.items():
+                    stored = existing.get(scholarship_id)
+                    doc = normalize_deadline(merge_preserving(doc, stored))
+                    doc[FINGERPRINT_FIELD] = content_fingerprint(doc)
+                    if is_unchanged(doc, stored):
+                        results[scholarship_id] = BulkSaveOutcome(scholarship_id, 'skipped')
+                        continue
+                    statements.append((UPSERT_SCHOLARSHIP, self._scholarship_row(doc)))
+                    written.append(doc)
+                    results[scholarship_id] = BulkSaveOutcome(scholarship_id, 'merged' if stored is not None else 'written')
+                self._transaction(statements)
+                self._publish(written)
+            return results
+
+        try:
+            results = await self._run(commit)
+        except Exception as e:
+            logger.error("Bulk scholarship write failed", count=len(pending), error=str(e))
+            results = {scholarship_id: BulkSaveOutcome(scholarship_id, 'failed', str(e)) for scholarship_id in pending}
+
+        counts = {'written': 0, 'merged': 0, 'skipped': 0, 'failed': 0}
+        for outcome in results.values():
+            counts[outcome.status] += 1
+        for status in ('written', 'merged', 'skipped'):
+            scholarship_write_stats.record(status, counts[status])
+
+        logger.info("Scholarships bulk saved", total=len(scholarships), **counts)
+        return [results[scholarship.id] for scholarship in scholarships]
+
+    async def get_scholarship(self, scholarship_id: str) -> Optional[Scholarship]:
+        """Fetch single scholarship by ID"""
+        if opportunity_catalog.is_ready and scholarship_id in opportunity_catalog:
+            return opportunity_catalog.get(scholarship_id)
+
+        try:
+            rows = await self._run(self._query, "SELECT * FROM scholarships WHERE id = ?", (scholarship_id,))
+            return Scholarship(**self._row_doc(rows[0])) if rows else None
+        except Exception as e:
+            logger.error("Failed to fetch scholarship", scholarship_id=scholarship_id, error=str(e))
+            raise
+
+    def _parse_rows(self, rows: List[sqlite3.Row], model, decode) -> List[Any]:
+        items = []
+        for row in rows:
+            try:
+                items.append(model(**decode(row)))
+            except Exception as parse_error:
+                logger.warning("Failed to parse scholarship", doc_id=row["id"], error=str(parse_error))
+        return items
+
+    async def get_all_scholarships(self) -> List[Scholarship]:
+        """Fetch all live scholarships, embeddings included (vector path)"""
+        if settings.catalog_cache_enabled:
+            self.start_catalog()
+            return opportunity_catalog.snapshot()
+
+        try:
+            rows = await self._run(self._live_rows, "*")
+            scholarships = self._parse_rows(rows, Scholarship, self._row_doc)
+            logger.info("Fetched scholarships", count=len(scholarships))
+            return scholarships
+        except Exception as e:
+            logger.error("Failed to fetch all scholarships", error=str(e))
+            raise
+
+    async def get_scholarship_summaries(self) -> List[OpportunitySummary]:
+        """Fetch all live opportunities for list views, without reading embeddings"""
+        if settings.catalog_cache_enabled:
+            self.start_catalog()
+            return opportunity_catalog.snapshot()
+
+        try:
+            rows = await self._run(self._live_rows, "id, data")
+            summaries = self._parse_rows(rows, OpportunitySummary, lambda row: json.loads(row["data"]))
+            logger.info("Fetched scholarship summaries", count=len(summaries))
+            return summaries
+        except Exception as e:
+            logger.error("Failed to fetch scholarship summaries", error=str(e))
+            raise
+
+    async def update_scholarship_embeddings(self, embeddings: Dict[str, List[float]]) -> int:
+        """Write embeddings back to many scholarships in one transaction. Returns rows written."""
+        def commit() -> int:
+            with self._lock:
+                existing = set(self._existing_scholarships(list(embeddings)))
+                self._transaction([
+                    ("UPDATE scholarships SET embedding_f32 = ?, updated_at = ? WHERE id = ?",
+                     (pack_embedding(embedding), _now(), scholarship_id))
+                    for scholarship_id, embedding in embeddings.items() if scholarship_id in existing
+                ])
+                self._publish([{'id': scholarship_id} for scholarship_id in existing])
+                return len(existing)
+
+        try:
+            written = await self._run(commit)
+            logger.info("Scholarship embeddings written", count=written)
+            return written
+        except Exception as e:
+            logger.error("Failed to write scholarship embeddings", error=str(e))
+            raise
+
+    async def semantic_search(
+        self,
+        query_embedding: List[float],
+        limit: int = 20,
+        min_similarity: float = 0.55
+    ) -> List[Scholarship]:
+        """Search scholarships by vector similarity over the catalog-backed embedding index"""
+        try:
+            self.start_catalog()
+            results = search_catalog(query_embedding, limit=limit, min_similarity=min_similarity)
+            logger.info(
+                "Semantic search completed",
+                total_scanned=len(opportunity_catalog),
+                with_embeddings=len(embedding_index),
+                matches_found=len(results),
+                min_similarity=min_similarity
+            )
+            return results
+        except Exception as e:
+            logger.error("Semantic search failed", error=str(e))
+            return []
+
+    async def sweep_expired_scholarships(self, before: int, limit: int, archive: bool = True) -> List[str]:
+        """Remove up to `limit` rows with deadline_timestamp < `before` (oldest first), archiving them first if asked"""
+        def sweep() -> List[str]:
+            with self._lock:
+                rows = self._query(
+                    "SELECT * FROM scholarships WHERE deadline_timestamp < ? ORDER BY deadline_timestamp LIMIT ?",
+                    (before, limit)
+                )
+                if not rows:
+                    return []
+                ids = [row["id"] for row in rows]
+                statements = []
+                if archive:
+                    now = _now()
+                    statements += [(
+                        "INSERT OR REPLACE INTO scholarships_archive (id, data, embedding_f32, deadline_timestamp, archived_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (row["id"], row["data"], row["embedding_f32"], row["deadline_timestamp"], now)
+                    ) for row in rows]
+                statements += [("DELETE FROM scholarships WHERE id = ?", (scholarship_id,)) for scholarship_id in ids]
+                self._transaction(statements)
+                if opportunity_catalog.is_ready:
+                    opportunity_catalog.apply_changes(removals=ids)
+                return ids
+
+        try:
+            removed = await self._run(sweep)
+            if removed:
+                logger.info("Expired scholarships swept", count=len(removed), archived=archive)
+            return removed
+        except Exception as e:
+            logger.error("Failed to sweep expired scholarships", error=str(e))
+            raise
+
+    # User Matches
+    async def get_user_matched_scholarships(self, user_id: str) -> List[OpportunitySummary]:
+        """Fetch scholarships matched to a user (summaries, stored scores as match_score)"""
+        try:
+            matches = await self.get_user_matches_doc(user_id) or {}
+            matched_ids = matches.get('scholarship_ids', [])
+            if not matched_ids:
+                logger.info("No matched scholarships found", user_id=user_id)
+                return []
+
+            stored_scores = matches.get('scores') or []
+            scores = dict(zip(matched_ids, stored_scores)) if len(stored_scores) == len(matched_ids) else {}
+
+            docs = await self._run(self._existing_scholarships, matched_ids)
+            now = time.time()
+            scholarships = []
+            for scholarship_id in matched_ids:
+                data = docs.get(scholarship_id)
+                if data is None:
+                    continue
+                try:
+                    s = OpportunitySummary(**data)
+                except Exception as parse_error:
+                    logger.warning("Failed to parse scholarship", doc_id=scholarship_id, error=str(parse_error))
+                    continue
+                if is_expired(s.deadline_timestamp, now):
+                    continue
+                if s.id in scores:
+                    s.match_score = scores[s.id]
+                scholarships.append(s)
+
+            logger.info("Fetched user matched scholarships", user_id=user_id, count=len(scholarships))
+            return scholarships
+        except Exception as e:
+            logger.error("Failed to fetch user matched scholarships", user_id=user_id, error=str(e))
+            raise
+
+    async def get_user_matches_doc(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Raw user_matches document (score-ordered IDs, scores, min_score)"""
+        try:
+            return await self._run(self._get_doc, 'user_matches', 'user_id', user_id)
+        except Exception as e:
+            logger.error("Failed to fetch user matches", user_id=user_id, error=str(e))
+            raise
+
+    async def set_user_matches_doc(self, user_id: str, matches: Dict[str, Any]) -> bool:
+        """Overwrite a user's bounded match list"""
+        try:
+            await self._run(
+                self._execute,
+                "INSERT OR REPLACE INTO user_matches (user_id, data) VALUES (?, ?)",
+                (user_id, json.dumps({**matches, 'updated_at': _now()}, default=str))
+            )
+            return True
+        except Exception as e:
+            logger.error("Failed to save user matches", user_id=user_id, error=str(e))
+            raise
+
+    async def save_user_matches(self, user_id: str, matches: List[Tuple[str, float]]) -> bool:
+        """Replace a user's matches with the top K of a full (scholarship_id, score) ranking"""
+        top = TopKMatches.from_ranking(matches, user_match_store.k)
+        await user_match_store.replace(self, user_id, top)
+        logger.info("User matches saved", user_id=user_id, count=len(top), ranked=len(matches))
+        return True
+
+    async def offer_user_match(self, user_id: str, scholarship_id: str, score: float) -> bool:
+        """Offer a single scored opportunity to the user's top K. True if it entered (or moved within) the list."""
+        try:
+            return await user_match_store.offer(self, user_id, scholarship_id, score)
+        except Exception as e:
+            logger.error("Failed to offer individual user match", user_id=user_id, error=str(e))
+            return False
+
+    # Application Tracking & Management
+    def _put_application(self, data: Dict[str, Any]) -> None:
+        self._execute(
+            "INSERT OR REPLACE INTO applications (application_id, user_id, scholarship_id, status, data, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (data['application_id'], data.get('user_id', ''), data.get('scholarship_id', ''),
+             data.get('status', ''), json.dumps(data, default=str), data['updated_at'])
+        )
+
+    def _update_application(self, application_id: str, fields: Dict[str, Any]) -> None:
+        """update(): fails when the application does not exist"""
+        with self._lock:
+            data = self._get_doc('applications', 'application_id', application_id)
+            if data is None:
+                raise KeyError(f"No application: {application_id}")
+            data.update(fields)
+            self._put_application(data)
+
+    def _find_draft(self, user_id: str, scholarship_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._query(
+            "SELECT data FROM applications WHERE user_id = ? AND scholarship_id = ? AND status = 'draft' LIMIT 1",
+            (user_id, scholarship_id)
+        )
+        return json.loads(rows[0]["data"]) if rows else None
+
+    async def start_application(self, user_id: str, scholarship_id: str) -> str:
+        """Track that user started an application, returns application_id"""
+        def start() -> Tuple[str, bool]:
+            with self._lock:
+                existing = self._find_draft(user_id, scholarship_id)
+                if existing is not None:
+                    return existing['application_id'], False
+                now = _now()
+                application_id = uuid.uuid4().hex[:20]
+                self._put_application({
+                    'application_id': application_id,
+                    'user_id': user_id,
+                    'scholarship_id': scholarship_id,
+                    'status': 'draft',
+                    'current_step': 1,
+                    'progress_percentage': 0.0,
+                    'personal_info': None,
+                    'documents': [],
+                    'essays': [],
+                    'recommenders': [],
+                    'additional_answers': {},
+                    'created_at': now,
+                    'updated_at': now,
+                    'last_saved': now
+                })
+                return application_id, True
+
+        try:
+            application_id, created = await self._run(start)
+            if created:
+                logger.info("Application draft created", application_id=application_id, user_id=user_id, scholarship_id=scholarship_id)
+            else:
+                logger.info("Returning existing draft", application_id=application_id)
+            return application_id
+        except Exception as e:
+            logger.error("Failed to start application", user_id=user_id, error=str(e))
+            raise
+
+    async def save_application_draft(self, application_id: str, draft_data: Dict[str, Any]) -> bool:
+        """Save application draft with auto-save data"""
+        try:
+            now = _now()
+            update_data: Dict[str, Any] = {'updated_at': now, 'last_saved': now}
+            for field in ('current_step', 'progress_percentage'):
+                if field in draft_data:
+                    update_data[field] = draft_data[field]
+            for field in ('personal_info', 'documents', 'essays', 'recommenders', 'additional_answers'):
+                if draft_data.get(field) is not None:
+                    update_data[field] = draft_data[field]
+
+            await self._run(self._update_application, application_id, update_data)
+            logger.info("Application draft saved", application_id=application_id)
+            return True
+        except Exception as e:
+            logger.error("Failed to save draft", application_id=application_id, error=str(e))
+            raise
+
+    async def get_application_draft(self, user_id: str, scholarship_id: str) -> Optional[Dict[str, Any]]:
+        """Get application draft for resume"""
+        try:
+            return await self._run(self._find_draft, user_id, scholarship_id)
+        except Exception as e:
+            logger.error("Failed to get draft", user_id=user_id, scholarship_id=scholarship_id, error=str(e))
+            raise
+
+    async def submit_application(self, application_data: Dict[str, Any]) -> str:
+        """Submit final application and generate confirmation number"""
+        try:
+            import secrets
+
+            confirmation_number = f"AS-{datetime.now().year}-{secrets.token_hex(6).upper()}"
+            now = _now()
+            await self._run(self._put_application, {
+                **application_data,
+                'status': 'submitted',
+                'confirmation_number': confirmation_number,
+                'submitted_at': now,
+                'updated_at': now
+            })
+            logger.info("Application submitted", application_id=application_data['application_id'], confirmation=confirmation_number)
+            return confirmation_number
+        except Exception as e:
+            logger.error("Failed to submit application", error=str(e))
+            raise
+
+    async def get_user_applications(self, user_id: str) -> List[Dict[str, Any]]:
+        """Get all applications for a user, most recently updated first"""
+        try:
+            rows = await self._run(
+                self._query,
+                "SELECT data FROM applications WHERE user_id = ? ORDER BY updated_at DESC",
+                (user_id,)
+            )
+            applications = [json.loads(row["data"]) for row in rows]
+            logger.info("Fetched user applications", user_id=user_id, count=len(applications))
+            return applications
+        except Exception as e:
+            logger.error("Failed to fetch user applications", user_id=user_id, error=str(e))
+            raise
+
+    async def get_application_by_id(self, application_id: str) -> Optional[Dict[str, Any]]:
+        """Get specific application by ID"""
+        try:
+            return await self._run(self._get_doc, 'applications', 'application_id', application_id)
+        except Exception as e:
+            logger.error("Failed to fetch application", application_id=application_id, error=str(e))
+            raise
+
+    async def update_application_status(self, application_id: str, status: str, **kwargs) -> bool:
+        """Update application status (for admin or automated updates)"""
+        try:
+            update_data = {'status': status, 'updated_at': _now()}
+            for field in ('decision_date', 'award_amount', 'notes'):
+                if field in kwargs:
+                    update_data[field] = kwargs[field]
+
+            await self._run(self._update_application, application_id, update_data)
+            logger.info("Application status updated", application_id=application_id, status=status)
+            return True
+        except Exception as e:
+            logger.error("Failed to update status", application_id=application_id, error=str(e))
+            raise
+
+    async def delete_application(self, application_id: str) -> bool:
+        """Delete an application row"""
+        try:
+            await self._run(self._execute, "DELETE FROM applications WHERE application_id = ?", (application_id,))
+            logger.info("Application deleted", application_id=application_id)
+            return True
+        except Exception as e:
+            logger.error("Failed to delete application", application_id=application_id, error=str(e))
+            raise
+
+    # Discovery Job Tracking
+    async def create_discovery_job(self, user_id: str, job_id: str) -> bool:
+        """Create a discovery job record"""
+        try:
+            now = _now()
+            data = {
+                'user_id': user_id,
+                'status': 'processing',
+                'progress': 0,
+                'scholarships_found': 0,
+                'started_at': now,
+                'updated_at': now
+            }
+            await self._run(
+                self._execute,
+                "INSERT OR REPLACE INTO discovery_jobs (job_id, user_id, status, data) VALUES (?, ?, ?, ?)",
+                (job_id, user_id, data['status'], json.dumps(data))
+            )
+            logger.info("Discovery job created", job_id=job_id, user_id=user_id)
+            return True
+        except Exception as e:
+            logger.error("Failed to create discovery job", job_id=job_id, error=str(e))
+            raise
+
+    async def update_discovery_job(self, job_id: str, status: str, progress: float, scholarships_found: int) -> bool:
+        """Update discovery job progress"""
+        def update() -> None:
+            with self._lock:
+                data = self._get_doc('discovery_jobs', 'job_id', job_id)
+                if data is None:
+                    raise KeyError(f"No discovery job: {job_id}")
+                data.update({
+                    'status': status,
+                    'progress': progress,
+                    'scholarships_found': scholarships_found,
+                    'updated_at': _now()
+                })
+                self._execute(
+                    "UPDATE discovery_jobs SET status = ?, data = ? WHERE job_id = ?",
+                    (status, json.dumps(data), job_id)
+                )
+
+        try:
+            await self._run(update)
+            return True
+        except Exception as e:
+            logger.error("Failed to update discovery job", job_id=job_id, error=str(e))
+            raise
+
+    async def get_discovery_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get discovery job status"""
+        try:
+            return await self._run(self._get_doc, 'discovery_jobs', 'job_id', job_id)
+        except Exception as e:
+            logger.error("Failed to fetch discovery job", job_id=job_id, error=str(e))
+            raise
+
+    # Chat History Operations
+    async def save_chat_message(self, user_id: str, role: str, content: str) -> bool:
+        """Save a chat message to conversation history"""
+        try:
+            await self._run(
+                self._execute,
+                "INSERT INTO chat_messages (user_id, role, content, timestamp) VALUES (?, ?, ?, ?)",
+                (user_id, role, content, _now())
+            )
+            logger.info("Chat message saved", user_id=user_id, role=role)
+            return True
+        except Exception as e:
+            logger.error("Failed to save chat message", user_id=user_id, error=str(e))
+            # Don't raise - chat should continue even if history fails
+            return False
+
+    async def get_chat_history(self, user_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Get the latest `limit` messages for a user, in chronological order"""
+        try:
+            rows = await self._run(
+                self._query,
+                "SELECT role, content, timestamp FROM chat_messages WHERE user_id = ? ORDER BY id DESC LIMIT ?",
+                (user_id, limit)
+            )
+            history = [dict(row) for row in reversed(rows)]
+            logger.info("Fetched chat history", user_id=user_id, count=len(history))
+            return history
+        except Exception as e:
+            logger.error("Failed to fetch chat history", user_id=user_id, error=str(e))
+            return []
+
+    async def clear_chat_history(self, user_id: str) -> bool:
+        """Clear conversation history for a user"""
+        try:
+            await self._run(self._execute, "DELETE FROM chat_messages WHERE user_id = ?", (user_id,))
+            logger.info("Chat history cleared", user_id=user_id)
+            return True
+        except Exception as e:
+            logger.error("Failed to clear chat history", user_id=user_id, error=str(e))
+            raise
+
+    # System State
+    async def get_system_state(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get a system bookkeeping document (e.g. worker checkpoints)"""
+        try:
+            return await self._run(self._get_doc, 'system_state', 'name', name)
+        except Exception as e:
+            logger.error("Failed to fetch system state", name=name, error=str(e))
+            return None
+
+    async def save_system_state(self, name: str, state: Dict[str, Any]) -> bool:
+        """Persist a system bookkeeping document"""
+        try:
+            await self._run(
+                self._execute,
+                "INSERT OR REPLACE INTO system_state (name, data) VALUES (?, ?)",
+                (name, json.dumps({**state, 'updated_at': _now()}, default=str))
+            )
+            return True
+        except Exception as e:
+            logger.error("Failed to save system state", name=name, error=str(e))
+            return False
+
+    # Dead Letters
+    async def save_dead_letter(self, entry: Dict[str, Any]) -> str:
+        """Record an event whose handler exhausted its retries. Returns the entry ID."""
+        entry_id = str(uuid.uuid4())
+        try:
+            await self._run(
+                self._execute,
+                "INSERT INTO dead_letters (id, topic, failed_at, data) VALUES (?, ?, ?, ?)",
+                (entry_id, entry['topic'], entry.get('failed_at') or time.time(), json.dumps(entry, default=str))
+            )
+            return entry_id
+        except Exception as e:
+            logger.error("Failed to save dead letter", topic=entry.get('topic'), error=str(e))
+            raise
+
+    async def get_dead_letters(
+        self, topic: Optional[str] = None, limit: int = 100, ids: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Oldest dead letters first: the given `ids`, or up to `limit` (of one source topic)"""
+        try:
+            if ids is not None:
+                placeholders = ",".join("?" * len(ids))
+                rows = await self._run(
+                    self._query,
+                    f"SELECT id, data FROM dead_letters WHERE id IN ({placeholders}) ORDER BY failed_at",
+                    ids
+                ) if ids else []
+            elif topic:
+                rows = await self._run(
+                    self._query,
+                    "SELECT id, data FROM dead_letters WHERE topic = ? ORDER BY failed_at LIMIT ?",
+                    (topic, limit)
+                )
+            else:
+                rows = await self._run(self._query, "SELECT id, data FROM dead_letters ORDER BY failed_at LIMIT ?", (limit,))
+            return [{**json.loads(row['data']), 'id': row['id']} for row in rows]
+        except Exception as e:
+            logger.error("Failed to fetch dead letters", topic=topic, error=str(e))
+            raise
+
+    async def delete_dead_letters(self, ids: List[str]) -> int:
+        """Delete dead letters by ID. Returns entries deleted."""
+        if not ids:
+            return 0
+        try:
+            placeholders = ",".join("?" * len(ids))
+            deleted = await self._run(self._execute, f"DELETE FROM dead_letters WHERE id IN ({placeholders})", ids)
+            logger.info("Dead letters deleted", count=deleted)
+            return deleted
+        except Exception as e:
+            logger.error("Failed to delete dead letters", error=str(e))
+            raise
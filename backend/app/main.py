@@ -13,7 +13,15 @@ import logging
 import asyncio
 
 from app.config import settings
-from app.routes import scholarships, applications, chat, websocket, extension, documents
+from app.routes import scholarships, applications, chat, websocket, extension, documents, admin
+from app.services.embedding_cache import embedding_cache
+from app.services.match_cache import match_cache
+from app.services.user_matches import user_match_store
+from app.services.expiry_sweeper import expiry_sweeper
+from app.services.draft_buffer import draft_buffer
+from app.services.dead_letters import dead_letter_queue
+from app.infrastructure.firestore_executor import firestore_executor
+from app.utils.fingerprint import scholarship_write_stats
 
 # Configure structured logging with readable format for development
 log_renderer = (
@@ -134,7 +142,16 @@ async def health_check():
     return {
         "status": "healthy",
         "environment": settings.environment,
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "embedding_cache": embedding_cache.stats(),
+        "match_cache": match_cache.stats(),
+        "user_matches": user_match_store.stats(),
+        "firestore": firestore_executor.stats(),
+        "scholarship_writes": scholarship_write_stats.stats(),
+        "expiry_sweeper": expiry_sweeper.stats(),
+        "draft_buffer": draft_buffer.stats(),
+        "broker": broker.stats(),
+        "dead_letters": dead_letter_queue.stats()
     }
 
 
@@ -157,14 +174,14 @@ app.include_router(chat.router)
 app.include_router(websocket.router)
 app.include_router(extension.router)
 app.include_router(documents.router)
+app.include_router(admin.router)
 from app.routes import crawler
 app.include_router(crawler.router)
 
 
-# Initialize Event Broker (Global)
-from app.infrastructure.memory_broker import MemoryBroker
-# In a real app, we'd use a factory based on settings.event_broker_type
-broker = MemoryBroker()
+# Initialize Event Broker (Global, selected by settings.event_broker_type)
+from app.infrastructure.brokers import create_broker
+broker = create_broker()
 
 # Startup event
 @app.on_event("startup")
@@ -179,6 +196,10 @@ async def startup_event():
     # 1. Start Event Broker
     await broker.start()
     
+    # 1b. Warm the opportunity catalog (Firestore snapshot listener)
+    from app.database import db
+    db.start_catalog()
+    
     # 2. Wire up Event Subscribers (The Wiring)
     # Refinery: Listens for Raw HTML -> Enriches
     from app.services.cortex.refinery import refinery_service
@@ -188,8 +209,26 @@ async def startup_event():
     from app.routes.websocket import subscribe_to_opportunities
     await subscribe_to_opportunities()
     
+    # Dead letters: events whose handler exhausted its retries -> dead_letters store (admin re-drive)
+    from app.core.events import dlq_topic
+    for topic in (settings.topic_raw_html, settings.topic_enriched_opportunity):
+        await broker.subscribe(dlq_topic(topic), dead_letter_queue.record)
+    
     logger.info("Event Mesh sub-systems wired successfully")
 
+    # Backfill embeddings the Refinery skipped (off the ingest hot path)
+    if settings.embedding_backfill_enabled:
+        from app.services.embedding_backfill import embedding_backfill_worker
+        embedding_backfill_worker.start()
+
+    # Remove expired opportunities incrementally (reads already skip them)
+    if settings.expiry_sweep_enabled:
+        expiry_sweeper.start()
+
+    # Coalesce application draft autosaves (write-behind)
+    if settings.draft_buffer_enabled:
+        draft_buffer.start()
+
     # === DEVPOST API SCRAPER: IMMEDIATE DATABASE POPULATION ===
     # Run DevPost API scraper on startup to immediately populate database
     # This is fast (API-based) and doesn't require Playwright
@@ -287,6 +326,22 @@ async def shutdown_event():
     # Stop Event Broker
     await broker.stop()
     
+    # Stop embedding backfill
+    from app.services.embedding_backfill import embedding_backfill_worker
+    await embedding_backfill_worker.stop()
+    
+    # Stop expiry sweeper
+    await expiry_sweeper.stop()
+    
+    # Write buffered draft autosaves before the database goes away
+    await draft_buffer.stop()
+    
+    # Detach opportunity catalog listener
+    from app.database import db
+    db.stop_catalog()
+    embedding_cache.close()
+    firestore_executor.shutdown()
+    
     # Close scraper HTTP client
     from app.services.scraper_service import scraper_service
     await scraper_service.close()
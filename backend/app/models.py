@@ -3,8 +3,21 @@ Pydantic models for ScholarStream API
 Data validation and serialization schemas
 """
 from typing import List, Optional, Literal, Dict, Any
+from typing_extensions import Annotated
 from datetime import datetime
-from pydantic import BaseModel, Field, validator
+import numpy as np
+from pydantic import BaseModel, BeforeValidator, Field, PlainSerializer, WithJsonSchema, model_validator, validator
+
+from app.utils.embedding_codec import EMBEDDING_FIELD, PACKED_FIELD, as_vector
+
+
+# Optional float32 vector; accepts packed bytes or a float list, serializes to a list in JSON
+EmbeddingVector = Annotated[
+    Optional[np.ndarray],
+    BeforeValidator(as_vector),
+    PlainSerializer(lambda v: None if v is None else v.tolist(), when_used='json'),
+    WithJsonSchema({'anyOf': [{'type': 'array', 'items': {'type': 'number'}}, {'type': 'null'}]}),
+]
 
 
 # Enums and Type Literals
@@ -110,11 +123,11 @@ class ScholarshipRequirements(BaseModel):
     other: List[str] = Field(default_factory=list)
 
 
-# System Manifest V1 Schema (The "Refinery" Output)
-class OpportunitySchema(BaseModel):
+# List/match view of an opportunity: every field except the embedding
+class OpportunitySummary(BaseModel):
     """
-    The Single Source of Truth for Enriched Opportunities.
-    Topic: opportunity.enriched.v1
+    What list and match views read and serialize. Firestore reads project
+    onto SUMMARY_FIELDS so the 768-float embedding is never transferred.
     """
     id: str = Field(..., description="Unique hash of source_url")
     title: Optional[str] = None
@@ -143,9 +156,6 @@ class OpportunitySchema(BaseModel):
     match_tier: Optional[MatchTier] = "Fair"
     competition_level: Optional[CompetitionLevel] = "Medium"
 
-    # Vectorization
-    embedding: Optional[List[float]] = Field(None, description="768-dim vector embedding")
-    
     # Raw Eligibility (for deeper checks)
     eligibility_text: Optional[str] = None
 
@@ -160,6 +170,30 @@ class OpportunitySchema(BaseModel):
     class Config:
         extra = "ignore" 
 
+
+# Firestore field paths for summary projections
+SUMMARY_FIELDS = list(OpportunitySummary.model_fields)
+
+
+# System Manifest V1 Schema (The "Refinery" Output)
+class OpportunitySchema(OpportunitySummary):
+    """
+    The Single Source of Truth for Enriched Opportunities.
+    Topic: opportunity.enriched.v1
+    """
+    # Vectorization (read only by the vector path); stored packed as `embedding_f32`
+    embedding: EmbeddingVector = Field(None, description="768-dim vector embedding")
+
+    model_config = {'arbitrary_types_allowed': True}
+
+    @model_validator(mode='before')
+    @classmethod
+    def _decode_packed_embedding(cls, data: Any) -> Any:
+        """Prefer the packed float32 bytes over a legacy float array."""
+        if isinstance(data, dict) and data.get(PACKED_FIELD) is not None:
+            data = {**data, EMBEDDING_FIELD: data[PACKED_FIELD]}
+        return data
+
 # Alias for backward compatibility if needed, but prefer OpportunitySchema
 Scholarship = OpportunitySchema
 
@@ -174,19 +208,21 @@ class DiscoverRequest(BaseModel):
 class DiscoveryJobResponse(BaseModel):
     """Response for discovery job status"""
     status: DiscoveryStatus
-    immediate_results: Optional[List[Scholarship]] = None
+    immediate_results: Optional[List[OpportunitySummary]] = None
     job_id: Optional[str] = None
     estimated_completion: Optional[int] = None  # seconds
     progress: Optional[float] = Field(None, ge=0, le=100)
-    new_scholarships: Optional[List[Scholarship]] = None
+    new_scholarships: Optional[List[OpportunitySummary]] = None
     total_found: Optional[int] = None
 
 
 class MatchedScholarshipsResponse(BaseModel):
-    """Response for matched scholarships list"""
-    scholarships: List[Scholarship]
-    total_value: float
+    """One page of a user's matched scholarships, best first"""
+    scholarships: List[OpportunitySummary]
+    total_value: float  # across every match, not just this page
     last_updated: str  # ISO format datetime string
+    total_count: int = 0
+    next_cursor: Optional[str] = None  # pass back as `cursor` for the next page; None on the last
 
 
 class SaveScholarshipRequest(BaseModel):
@@ -342,6 +378,18 @@ class SaveEssayRequest(BaseModel):
     word_count: int
 
 
+class RedriveDeadLettersRequest(BaseModel):
+    """Re-drive dead letters: the given IDs, or the oldest `limit` (of one topic)"""
+    ids: Optional[List[str]] = None
+    topic: Optional[str] = None
+    limit: int = Field(default=100, ge=1, le=1000)
+
+
+class PurgeDeadLettersRequest(BaseModel):
+    """Delete dead letters without re-driving them"""
+    ids: List[str] = Field(..., min_length=1, max_length=1000)
+
+
 class ErrorResponse(BaseModel):
     """Standard error response format"""
     error: str
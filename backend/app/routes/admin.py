@@ -0,0 +1,61 @@
+"""
+Admin API Routes
+Operational endpoints (dead-letter queue inspection and re-drive).
+Guarded by the X-Admin-Token header; disabled unless ADMIN_API_TOKEN is set.
+"""
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+import structlog
+
+from app.config import settings
+from app.models import PurgeDeadLettersRequest, RedriveDeadLettersRequest
+from app.services.dead_letters import dead_letter_queue
+
+logger = structlog.get_logger()
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Constant-time check of the X-Admin-Token header"""
+    if not settings.admin_api_token:
+        raise HTTPException(status_code=403, detail="Admin API is disabled")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, settings.admin_api_token):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+@router.get("/dlq", dependencies=[Depends(require_admin)])
+async def list_dead_letters(
+    topic: Optional[str] = Query(None, description="Source topic (e.g. cortex.raw.html)"),
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """Oldest dead-lettered events first, with error and attempt count"""
+    try:
+        entries = await dead_letter_queue.list(topic=topic, limit=limit)
+        return {"entries": entries, "count": len(entries)}
+    except Exception as e:
+        logger.error("Failed to list dead letters", error=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/dlq/redrive", dependencies=[Depends(require_admin)])
+async def redrive_dead_letters(request: RedriveDeadLettersRequest):
+    """Publish dead letters back to their original topic and remove them from the queue"""
+    from app.main import broker
+
+    try:
+        return await dead_letter_queue.redrive(broker, ids=request.ids, topic=request.topic, limit=request.limit)
+    except Exception as e:
+        logger.error("Failed to re-drive dead letters", error=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/dlq/purge", dependencies=[Depends(require_admin)])
+async def purge_dead_letters(request: PurgeDeadLettersRequest):
+    """Delete dead letters without re-driving them"""
+    try:
+        return {"purged": await dead_letter_queue.purge(request.ids)}
+    except Exception as e:
+        logger.error("Failed to purge dead letters", error=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
@@ -19,6 +19,7 @@ from app.models import (
 )
 from app.database import db
 from app.config import settings
+from app.services.draft_buffer import draft_buffer
 
 logger = structlog.get_logger()
 router = APIRouter(prefix="/api/applications", tags=["applications"])
@@ -31,6 +32,18 @@ cloudinary.config(
 )
 
 
+async def _save_draft(application_id: str, draft_data: dict) -> str:
+    """Autosave through the write-behind buffer (or straight to the database). Returns last_saved."""
+    if settings.draft_buffer_enabled:
+        # The write lands later: confirm the application exists before acknowledging
+        # its first buffered save, or the edits would be abandoned silently
+        if application_id not in draft_buffer and not await db.get_application_by_id(application_id):
+            raise HTTPException(status_code=404, detail="Application not found")
+        return draft_buffer.save(application_id, draft_data)
+    await db.save_application_draft(application_id, draft_data)
+    return datetime.now().isoformat()
+
+
 @router.post("/start")
 async def start_application(request: StartApplicationRequest):
     """
@@ -91,16 +104,18 @@ async def save_draft(request: SaveDraftRequest):
         if request.additional_answers:
             draft_data['additional_answers'] = request.additional_answers
         
-        # Save to database
-        await db.save_application_draft(application_id, draft_data)
+        # Save (coalesced with other autosaves of this draft)
+        last_saved = await _save_draft(application_id, draft_data)
         
         return {
             "success": True,
             "application_id": application_id,
             "message": "Draft saved successfully",
-            "last_saved": datetime.now().isoformat()
+            "last_saved": last_saved
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Failed to save draft", error=str(e), user_id=request.user_id)
         raise HTTPException(
@@ -118,7 +133,7 @@ async def get_draft(user_id: str, scholarship_id: str):
     try:
         logger.info("Fetching draft", user_id=user_id, scholarship_id=scholarship_id)
         
-        draft = await db.get_application_draft(user_id, scholarship_id)
+        draft = draft_buffer.overlay(await db.get_application_draft(user_id, scholarship_id))
         
         if not draft:
             return {
@@ -154,6 +169,10 @@ async def submit_application(request: SubmitApplicationRequest):
         if not draft:
             raise HTTPException(status_code=404, detail="No draft found for this application")
         
+        # Land buffered autosaves before the submission replaces the document
+        if not await draft_buffer.flush(draft['application_id']):
+            raise HTTPException(status_code=503, detail="Could not save the latest draft changes, please retry")
+        
         # Prepare submission data
         submission_data = {
             'application_id': draft['application_id'],
@@ -170,6 +189,7 @@ async def submit_application(request: SubmitApplicationRequest):
         
         # Submit to database
         confirmation_number = await db.submit_application(submission_data)
+        draft_buffer.discard(draft['application_id'])  # autosaves racing the submit must not overwrite it
         
         logger.info("Application submitted successfully", 
                    user_id=request.user_id, 
@@ -257,8 +277,8 @@ async def save_essay(request: SaveEssayRequest):
     try:
         logger.info("Saving essay", user_id=request.user_id, scholarship_id=request.scholarship_id, word_count=request.word_count)
         
-        # Get draft
-        draft = await db.get_application_draft(request.user_id, request.scholarship_id)
+        # Get draft (with buffered autosaves)
+        draft = draft_buffer.overlay(await db.get_application_draft(request.user_id, request.scholarship_id))
         
         if not draft:
             application_id = await db.start_application(request.user_id, request.scholarship_id)
@@ -288,7 +308,7 @@ async def save_essay(request: SaveEssayRequest):
             essays.append(essay_data)
         
         # Save draft
-        await db.save_application_draft(application_id, {'essays': essays})
+        await _save_draft(application_id, {'essays': essays})
         
         return {
             "success": True,
@@ -297,6 +317,8 @@ async def save_essay(request: SaveEssayRequest):
             "message": "Essay saved successfully"
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Failed to save essay", error=str(e), user_id=request.user_id)
         raise HTTPException(
@@ -314,7 +336,7 @@ async def get_user_applications(user_id: str, status: Optional[str] = None):
     try:
         logger.info("Fetching user applications", user_id=user_id, status_filter=status)
         
-        applications = await db.get_user_applications(user_id)
+        applications = draft_buffer.overlay_all(await db.get_user_applications(user_id))
         
         # Filter by status if provided
         if status:
@@ -352,7 +374,7 @@ async def get_application_by_id(application_id: str):
     try:
         logger.info("Fetching application", application_id=application_id)
         
-        application = await db.get_application_by_id(application_id)
+        application = draft_buffer.overlay(await db.get_application_by_id(application_id))
         
         if not application:
             raise HTTPException(status_code=404, detail="Application not found")
@@ -388,10 +410,8 @@ async def delete_application(application_id: str):
         if application.get('status') != 'draft':
             raise HTTPException(status_code=400, detail="Can only delete draft applications")
         
-        # Delete from Firebase
-        db.db.collection('applications').document(application_id).delete()
-        
-        logger.info("Application deleted", application_id=application_id)
+        draft_buffer.discard(application_id)
+        await db.delete_application(application_id)
         
         return {
             "success": True,
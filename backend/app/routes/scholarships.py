@@ -2,8 +2,8 @@
 Scholarship API Routes
 All endpoints for scholarship discovery, matching, and management
 """
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from typing import List
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query
+from typing import List, Optional
 import time
 import structlog
 
@@ -19,6 +19,7 @@ from app.models import (
 from app.services.matching_service import matching_service
 from app.services.discovery_pulse import discovery_pulse
 from app.database import db
+from app.utils.pagination import MAX_PAGE_SIZE, decode_cursor, paginate
 
 logger = structlog.get_logger()
 router = APIRouter(prefix="/api/scholarships", tags=["scholarships"])
@@ -127,80 +128,54 @@ async def get_discovery_progress(job_id: str):
 
 
 @router.get("/matched", response_model=MatchedScholarshipsResponse)
-async def get_matched_scholarships(user_id: str):
+async def get_matched_scholarships(
+    user_id: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=50, ge=1, le=MAX_PAGE_SIZE)
+):
     """
-    Get all scholarships matched to a user
-    Returns full list with match scores
+    Get scholarships matched to a user, one page at a time
+    Ordered by match score (ties by ID); follow `next_cursor` for later pages
     """
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
     try:
-        logger.info("Fetching matched scholarships", user_id=user_id)
-        
-        # 1. Fetch current matches
-        scholarships = await db.get_user_matched_scholarships(user_id)
+        logger.info("Fetching matched scholarships", user_id=user_id, paged=bool(cursor), limit=limit)
         
-        # 2. Get last match check timestamp
         user_profile_data = await db.get_user_profile(user_id)
-        last_match_time = 0
-        if user_profile_data:
-            last_match_time = user_profile_data.get('last_match_at', 0)
-        
-        now = time.time()
-        # Proactive Refresh: If matches are old (>30m) or empty, trigger fresh check
-        STALENESS_THRESHOLD = 1800 # 30 minutes
         
-        should_refresh = False
-        if not scholarships:
-            should_refresh = True
-        elif (now - last_match_time) > STALENESS_THRESHOLD:
-            should_refresh = True
-        
-        if should_refresh:
-            logger.info("Proactive match refresh (Staleness/Empty Trigger)", user_id=user_id)
-            all_opps = await db.get_all_scholarships()
-            if not all_opps:
+        if user_profile_data and 'profile' in user_profile_data:
+            from app.models import UserProfile
+            profile = UserProfile(**user_profile_data['profile'])
+            
+            # Cached per (profile hash, catalog version); catalog deltas re-rank unless
+            # match_cache_stale_seconds opts into serving a recent ranking
+            matches = await matching_service.get_user_matches(user_id, profile, cursor=cursor, limit=limit)
+            scholarships, next_cursor = matches.scholarships, matches.next_cursor
+            total_count, total_value = len(matches.ranking), matches.total_value
+            if not matches.ranking:
                 logger.warning("Empty database - no opportunities to match", user_id=user_id)
-            if all_opps:
-                if user_profile_data and 'profile' in user_profile_data:
-                    from app.models import UserProfile
-                    profile = UserProfile(**user_profile_data['profile'])
-                    
-                    # Compute fresh matches
-                    matched = matching_service._filter_and_rank(all_opps, profile)
-                    logger.info("Match diagnostics", total_pool=len(all_opps), matched_count=len(matched), user_id=user_id)
-                    
-                    if matched:
-                        # Save matches for next time
-                        await db.save_user_matches(user_id, [s.id for s in matched])
-                        scholarships = matched
-                        # Update last_match_at in profile record
-                        await db.update_user_last_match_time(user_id, now)
-                        logger.info("Auto-refresh match complete", confirmed_matches=len(scholarships))
-
-        # ALWAYS Re-Score matches to ensure personalization is fresh
-        if scholarships:
-            try:
-                user_profile_data = await db.get_user_profile(user_id)
-                if user_profile_data and 'profile' in user_profile_data:
-                    from app.models import UserProfile
-                    profile = UserProfile(**user_profile_data['profile'])
-                    
-                    # Re-calculate scores for up-to-the-minute accuracy
-                    for scholarship in scholarships:
-                        score = matching_service.calculate_match_score(scholarship, profile)
-                        scholarship.match_score = score
-                        scholarship.match_tier = matching_service.get_match_tier(score)
-                    
-                    # Re-sort by score descending
-                    scholarships.sort(key=lambda x: x.match_score, reverse=True)
-            except Exception as e:
-                logger.warning("Failed to re-calculate scores on read", error=str(e))
-
-        total_value = sum(s.amount for s in scholarships)
+            elif matches.recomputed:
+                # Save the top K for other readers
+                await db.save_user_matches(user_id, matches.ranking)
+                await db.update_user_last_match_time(user_id, time.time())
+                logger.info("Match refresh complete", confirmed_matches=total_count, user_id=user_id)
+        else:
+            # No profile to score against: page through the stored (bounded) match list
+            stored = await db.get_user_matched_scholarships(user_id)
+            scholarships, next_cursor = paginate(stored, lambda s: (s.match_score, s.id), cursor, limit)
+            total_count, total_value = len(stored), sum(s.amount for s in stored)
         
         return MatchedScholarshipsResponse(
             scholarships=scholarships,
             total_value=total_value,
-            last_updated=(scholarships[0].last_verified or "") if scholarships else ""
+            last_updated=(scholarships[0].last_verified or "") if scholarships else "",
+            total_count=total_count,
+            next_cursor=next_cursor
         )
         
     except Exception as e:
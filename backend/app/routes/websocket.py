@@ -3,7 +3,7 @@ WebSocket Endpoint for Real-Time Opportunity Streaming
 Consumes enriched opportunities from EventBroker and pushes matches to connected clients
 """
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException, Depends
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 import json
 import asyncio
 import structlog
@@ -11,12 +11,15 @@ import structlog
 from firebase_admin import auth
 from datetime import datetime
 
-from app.database import get_user_profile, FirebaseDB
+from app.database import get_user_profile, db
 from app.services.personalization_engine import PersonalizationEngine
+from app.services.opportunity_features import OpportunityFeatures
+from app.services.user_routing_index import user_routing_index
 
 from app.models import (
     Scholarship, ScholarshipEligibility, ScholarshipRequirements
 )
+from app.utils.deadlines import deadline_timestamp as parse_deadline, is_expired
 
 router = APIRouter()
 logger = structlog.get_logger()
@@ -34,6 +37,7 @@ class ConnectionManager:
         await websocket.accept()
         self.active_connections[user_id] = websocket
         self.user_profiles[user_id] = user_profile
+        user_routing_index.upsert(user_id, user_profile)
 
         logger.info(
             "WebSocket connected",
@@ -96,7 +100,7 @@ class ConnectionManager:
 
 manager = ConnectionManager()
 personalization_engine = PersonalizationEngine()
-firebase_db = FirebaseDB()  # For persisting opportunities to Firestore
+firebase_db = db  # For persisting opportunities
 
 
 async def verify_firebase_token(token: str) -> Optional[str]:
@@ -110,66 +114,6 @@ async def verify_firebase_token(token: str) -> Optional[str]:
         return None
 
 
-async def process_and_route_opportunity(final_data: Dict):
-    """
-    Process enriched opportunity and route to connected clients.
-    Moved out of consume_kafka_stream for reuse.
-    """
-    try:
-        # Convert to Scholarship Model
-        scholarship = convert_to_scholarship(final_data)
-
-        if not scholarship:
-            return
-
-        # Start Personalization Engine (scoring)
-        # We need to fetch all active user profiles to match against
-        active_user_ids = manager.get_all_user_ids()
-
-        if not active_user_ids:
-            logger.info("No active users to match against", opportunity=scholarship.title)
-            return
-
-        # Persist to Firestore (Source of Truth)
-        # Note: Refinery already does a fallback save, but we save here to be sure
-        # if the flow came from a different source.
-        # await firebase_db.save_scholarship(scholarship) 
-
-        # Match against active users
-        match_count = 0
-        for user_id in active_user_ids:
-            user_profile_data = manager.user_profiles.get(user_id)
-            if not user_profile_data:
-                continue
-
-            # Calculate Match Score
-            score = personalization_engine.calculate_match_score(scholarship, user_profile_data)
-
-            if score.score >= 0.6: # configurable threshold
-                # Send "New Opportunity" Notification
-                await manager.send_personal_message(user_id, {
-                    'type': 'new_opportunity_match',
-                    'opportunity': scholarship.model_dump(),
-                    'score': score.score,
-                    'reasons': score.match_reasons,
-                    'timestamp': datetime.utcnow().isoformat()
-                })
-                match_count += 1
-                
-                # Persist match to user's history
-                await firebase_db.add_user_match(user_id, scholarship.id)
-
-        logger.info(
-            "Opportunity routed",
-            title=scholarship.title,
-            matched_users=match_count,
-            total_active=len(active_user_ids)
-        )
-
-    except Exception as e:
-        logger.error("Routing failed", error=str(e))
-
-
 async def subscribe_to_opportunities():
     """
     Subscribe to the EventBroker for enriched opportunities.
@@ -189,6 +133,7 @@ async def subscribe_to_opportunities():
             
         except Exception as e:
             logger.error("WebSocket handler failed", error=str(e))
+            raise  # The broker retries, then dead-letters
 
     await broker.subscribe(settings.topic_enriched_opportunity, handle_opportunity)
     logger.info("WebSocket Service subscribed to EventBroker", topic=settings.topic_enriched_opportunity)
@@ -308,26 +253,18 @@ def convert_to_scholarship(enriched_data: Dict) -> Optional[Scholarship]:
         type_tags = enriched_data.get('type_tags', [])
         all_tags = list(set(enriched_data.get('tags', []) + geo_tags + type_tags))
 
-        # Calculate deadline_timestamp — NEVER fabricate fake deadlines
+        # Normalize deadline_timestamp — NEVER fabricate fake deadlines
         deadline_str = enriched_data.get('deadline') or None
         deadline_timestamp = None
         if deadline_str:
-            try:
-                # Try parsing simple YYYY-MM-DD
-                if len(deadline_str) == 10:
-                    dt = datetime.strptime(deadline_str, "%Y-%m-%d")
-                else:
-                    dt = datetime.fromisoformat(deadline_str.replace('Z', '+00:00'))
-                deadline_timestamp = int(dt.timestamp())
-                
-                # REJECT if deadline is in the past
-                if deadline_timestamp < int(datetime.utcnow().timestamp()):
-                    logger.debug("Dropping opportunity with past deadline", name=name, deadline=deadline_str)
-                    return None
-            except Exception:
+            deadline_timestamp = parse_deadline(deadline_str)
+            if deadline_timestamp is None:
                 # Unparseable deadline — leave as None, don't fabricate
                 deadline_str = None
-                deadline_timestamp = None
+            elif is_expired(deadline_timestamp):
+                # REJECT if deadline is in the past
+                logger.debug("Dropping opportunity with past deadline", name=name, deadline=deadline_str)
+                return None
 
         # Create Deterministic ID if missing
         opp_id = enriched_data.get('id')
@@ -370,18 +307,18 @@ async def process_and_route_opportunity(enriched_opportunity: Dict):
     3. Send to users with match score > 60
     """
     # STEP 1: Persist to Firestore (critical for /api/scholarships/matched)
-    try:
-        scholarship = convert_to_scholarship(enriched_opportunity)
-        if scholarship:
+    scholarship = convert_to_scholarship(enriched_opportunity)
+    if scholarship:
+        try:
             await firebase_db.save_scholarship(scholarship)
-            logger.info(
-                "Opportunity persisted to Firestore",
-                scholarship_id=scholarship.id,
-                name=scholarship.title
-            )
-    except Exception as e:
-        logger.error("Failed to persist opportunity to Firestore", error=str(e))
-        # Continue with routing even if persistence fails
+        except Exception as e:
+            logger.error("Failed to persist opportunity to Firestore", scholarship_id=scholarship.id, error=str(e))
+            raise  # The broker retries the event, then dead-letters it
+        logger.info(
+            "Opportunity persisted to Firestore",
+            scholarship_id=scholarship.id,
+            name=scholarship.title
+        )
     
     # STEP 2: Route to connected users
     connected_users = manager.get_all_user_ids()
@@ -390,21 +327,33 @@ async def process_and_route_opportunity(enriched_opportunity: Dict):
         logger.debug("No connected users - skipping routing")
         return
 
+    # Score only users whose interests/passions intersect the opportunity
+    # (everyone else stays below the 60 threshold)
+    try:
+        features = personalization_engine.build_features(enriched_opportunity)
+        candidate_users = user_routing_index.candidates(features, among=connected_users)
+    except Exception as e:
+        logger.warning("Routing index lookup failed, scoring all connected users", error=str(e))
+        features = None
+        candidate_users = connected_users
+
     logger.info(
         "Routing opportunity to connected users",
         opportunity_name=enriched_opportunity.get('name'),
-        connected_users=len(connected_users)
+        connected_users=len(connected_users),
+        candidate_users=len(candidate_users)
     )
 
-    for user_id in connected_users:
-        user_profile = manager.user_profiles.get(user_id)
+    for user_id in candidate_users:
+        # The index copy also reflects profile writes made since the user connected
+        user_profile = user_routing_index.profile(user_id) or manager.user_profiles.get(user_id)
 
         if not user_profile or not isinstance(user_profile, dict):
             logger.warning("Invalid or missing user profile in cache", user_id=user_id)
             continue
 
         try:
-            match_score = calculate_match_score(enriched_opportunity, user_profile)
+            match_score = calculate_match_score(features or enriched_opportunity, user_profile)
 
             if match_score >= 60:
                 enriched_opportunity_with_score = enriched_opportunity.copy()
@@ -426,7 +375,7 @@ async def process_and_route_opportunity(enriched_opportunity: Dict):
 
                 # STEP 3: Persist match so it doesn't vanish on refresh
                 if scholarship:
-                    await firebase_db.add_user_match(user_id, scholarship.id)
+                    await firebase_db.offer_user_match(user_id, scholarship.id, match_score)
 
                 logger.info(
                     "Opportunity pushed to user",
@@ -446,10 +395,10 @@ async def process_and_route_opportunity(enriched_opportunity: Dict):
             continue
 
 
-def calculate_match_score(opportunity: Dict, user_profile: Dict) -> float:
+def calculate_match_score(opportunity: Union[Dict, OpportunityFeatures], user_profile: Dict) -> float:
     """
     Calculate match score between opportunity and user profile
-    Uses PersonalizationEngine logic
+    Uses PersonalizationEngine logic (accepts a prebuilt feature record)
     """
     return personalization_engine.calculate_personalized_score(opportunity, user_profile)
 
@@ -533,6 +482,7 @@ async def websocket_endpoint(websocket: WebSocket, token: str = ""):
     # Register connection (don't call accept again - already accepted above)
     manager.active_connections[user_id] = websocket
     manager.user_profiles[user_id] = user_profile
+    user_routing_index.upsert(user_id, user_profile)
     logger.info(
         "WebSocket connected",
         user_id=user_id,
@@ -573,6 +523,7 @@ async def websocket_endpoint(websocket: WebSocket, token: str = ""):
                     updated_profile = message.get('profile', {})
                     if isinstance(updated_profile, dict):
                         manager.user_profiles[user_id] = updated_profile
+                        user_routing_index.upsert(user_id, updated_profile)
                         logger.info("User profile updated in WebSocket", user_id=user_id)
                     else:
                         logger.warning(
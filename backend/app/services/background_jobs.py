@@ -58,16 +58,15 @@ async def refresh_opportunities_job():
                 continue
         
         # 4. Cache in Firebase
-        for opp in converted_opportunities:
-            try:
-                await db.save_scholarship(opp)
-            except Exception as e:
-                logger.error("Failed to cache opportunity", scholarship_id=opp.id, error=str(e))
+        outcomes = await db.save_scholarships_bulk(converted_opportunities)
+        for outcome in outcomes:
+            if outcome.status == 'failed':
+                logger.error("Failed to cache opportunity", scholarship_id=outcome.scholarship_id, error=outcome.error)
         
         logger.info(
             "Opportunity refresh complete",
             total_scraped=len(raw_opportunities),
-            total_cached=len(converted_opportunities)
+            total_cached=sum(1 for outcome in outcomes if outcome.status != 'failed')
         )
         
     except Exception as e:
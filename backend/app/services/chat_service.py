@@ -40,11 +40,12 @@ from typing import Dict, Any, List, Optional
 import structlog
 from datetime import datetime, timedelta
 
-from app.models import UserProfile, Scholarship
+from app.models import UserProfile, OpportunitySummary
 from app.database import db
 from app.config import settings
 from app.services.matching_service import matching_service
 from app.services.personalization_engine import personalization_engine
+from app.services.opportunity_features import opportunity_features, infer_opportunity_type
 from app.services.cortex.navigator import scout, sentinel
 from app.utils.rate_limiter import gemini_rate_limiter
 
@@ -477,13 +478,13 @@ Eager Discovery Plan:
 
         start = datetime.now()
         now_str = start.strftime("%Y-%m-%d")
-        opps = await db.get_all_scholarships()
+        opps = await db.get_scholarship_summaries()
         
         filtered = []
         for o in opps:
             try:
                 # Convert Pydantic model to dict for safe access
-                o_dict = o.model_dump() if hasattr(o, 'model_dump') else o.dict()
+                o_dict = o.model_dump(exclude={'embedding'}) if hasattr(o, 'model_dump') else o.dict()
             except Exception:
                 # Fallback if it's already a dict or something else
                 o_dict = dict(o) if isinstance(o, dict) else {}
@@ -494,9 +495,11 @@ Eager Discovery Plan:
             if deadline and deadline < now_str:
                 continue
 
-            # 2. Type filtering logic
-            if type != "any" and type.lower() not in self._infer_type(o_dict):
-                continue
+            # 2. Type filtering logic (precomputed per catalog entry)
+            if type != "any":
+                inferred = opportunity_features.get(o).inferred_type if isinstance(o, OpportunitySummary) else self._infer_type(o_dict)
+                if type.lower() not in inferred:
+                    continue
             
             # 3. Filter by amount
             amt = o_dict.get('amount') or 0
@@ -524,7 +527,7 @@ Eager Discovery Plan:
             now_str = datetime.now().strftime("%Y-%m-%d")
             filtered = []
             for r in results:
-                r_dict = r.dict()
+                r_dict = r.model_dump(exclude={'embedding'})
                 deadline = r_dict.get('deadline')
                 if deadline and deadline < now_str:
                     continue
@@ -601,18 +604,33 @@ Eager Discovery Plan:
         except Exception:
             pass
 
-        results = []
+        opp_dicts = []
+        all_features = []
         for opp in opps:
-            opp_dict = opp if isinstance(opp, dict) else (opp.model_dump() if hasattr(opp, 'model_dump') else opp.dict() if hasattr(opp, 'dict') else {})
-            
-            # Fresh match score
-            score = 50
-            if user_profile_obj:
-                try:
-                    score = personalization_engine.calculate_personalized_score(opp_dict, user_profile_obj)
-                except Exception:
-                    score = opp_dict.get('match_score', 50)
-            else:
+            opp_dict = opp if isinstance(opp, dict) else (opp.model_dump(exclude={'embedding'}) if hasattr(opp, 'model_dump') else opp.dict() if hasattr(opp, 'dict') else {})
+            # One feature record serves both the score and the inferred type
+            try:
+                features = opportunity_features.get(opp) if isinstance(opp, OpportunitySummary) else personalization_engine.build_features(opp_dict)
+            except Exception:
+                features = None
+            opp_dicts.append(opp_dict)
+            all_features.append(features)
+        
+        # Fresh match scores: one batch over every opportunity with a feature record
+        scores: Dict[int, float] = {}
+        if user_profile_obj:
+            scored = [i for i, f in enumerate(all_features) if f is not None]
+            try:
+                view = opportunity_features.view([opp_dicts[i] for i in scored], [all_features[i] for i in scored])
+                for row, score in personalization_engine.score_batch(user_profile_obj, view):
+                    scores[scored[row]] = score
+            except Exception as e:
+                logger.warning("Batch scoring failed, using stored scores", error=str(e))
+        
+        results = []
+        for i, (opp_dict, features) in enumerate(zip(opp_dicts, all_features)):
+            score = scores.get(i)
+            if score is None:
                 score = opp_dict.get('match_score', 50)
 
             results.append({
@@ -622,7 +640,7 @@ Eager Discovery Plan:
                 'amount': opp_dict.get('amount'),
                 'amount_display': opp_dict.get('amount_display'),
                 'deadline': opp_dict.get('deadline'),
-                'type': self._infer_type(opp_dict),
+                'type': features.inferred_type if features else self._infer_type(opp_dict),
                 'match_score': int(round(score)),
                 'source_url': opp_dict.get('source_url'),
                 'tags': opp_dict.get('tags'),
@@ -636,23 +654,8 @@ Eager Discovery Plan:
         return self._interleave_for_diversity(results, target_count=12)
 
     def _infer_type(self, opp) -> str:
-        """Infer opportunity type from tags/description."""
-        tags_str = ' '.join(opp.get('tags', []) or []).lower()
-        desc_str = (opp.get('description') or '').lower()
-        name_str = (opp.get('name') or '').lower()
-        combined = f"{tags_str} {desc_str} {name_str}"
-
-        if any(kw in combined for kw in ['hackathon', 'hack', 'buildathon', 'codeathon', 'ideathon', 'builder']):
-            return 'hackathon'
-        elif any(kw in combined for kw in ['bounty', 'bug bounty', 'vulnerability', 'testnet', 'auditing']):
-            return 'bounty'
-        elif any(kw in combined for kw in ['competition', 'contest', 'challenge', 'olympiad', 'tournament', 'quiz']):
-            return 'competition'
-        elif any(kw in combined for kw in ['grant', 'funding', 'seed', 'investment', 'acceleration', 'equity-free']):
-            return 'grant'
-        elif any(kw in combined for kw in ['internship', 'intern', 'fellowship', 'graduate program', 'trainee', 'apprentice']):
-            return 'internship'
-        return 'scholarship'
+        """Infer opportunity type from tags/description (catalog entries carry it precomputed)."""
+        return infer_opportunity_type(opp)
 
     def _get_location_string(self, opp) -> str:
         """Human-readable location eligibility."""
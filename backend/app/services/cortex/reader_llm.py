@@ -3,6 +3,7 @@ import structlog
 import google.generativeai as genai
 from typing import Optional, Dict, Any, List
 from app.config import settings
+from app.core.events import NonRetryableError
 from app.models import OpportunitySchema
 from app.utils.json_utils import robust_json_loads
 from app.utils.rate_limiter import gemini_rate_limiter
@@ -13,6 +14,15 @@ from urllib.parse import urlparse, urljoin
 
 logger = structlog.get_logger()
 
+
+class ExtractionError(Exception):
+    """Gemini call or its response failed; the raw event should be retried"""
+
+
+class MalformedOutputError(ExtractionError, NonRetryableError):
+    """The model answered, but not with a JSON array: retrying the same page would only burn quota"""
+
+
 # Configure Gemini
 if settings.gemini_api_key:
     genai.configure(api_key=settings.gemini_api_key)
@@ -61,6 +71,9 @@ class ReaderLLM:
         """
         V2 CORE: Extracts MULTIPLE opportunities from list/aggregator pages.
         This is critical for DevPost, DoraHacks, etc. that show many items per page.
+        Raises ExtractionError when the model call fails, so a transient outage
+        is retried rather than read as "no opportunities", and
+        MalformedOutputError (not retried) when its answer is not a JSON array.
         """
         if not settings.gemini_api_key:
             logger.warning("Gemini API key not configured")
@@ -140,6 +153,8 @@ class ReaderLLM:
             # Ensure it's a list
             if isinstance(data, dict):
                 data = [data]
+            if not isinstance(data, list):
+                raise MalformedOutputError(f"Model returned no JSON array for {source_url}")
             
             opportunities = []
             for item in data[:max_items]:
@@ -183,10 +198,13 @@ class ReaderLLM:
 
         except json.JSONDecodeError as je:
             logger.error("Reader LLM JSON parse error", url=source_url, error=str(je))
-            return []
+            raise MalformedOutputError(f"Invalid JSON from model for {source_url}: {je}") from je
+        except MalformedOutputError:
+            logger.error("Reader LLM returned malformed output", url=source_url)
+            raise
         except Exception as e:
             logger.error("Reader LLM extraction failed", url=source_url, error=str(e))
-            return []
+            raise ExtractionError(f"Extraction failed for {source_url}: {e}") from e
 
     async def _call_gemini(self, prompt: str) -> str:
         """
@@ -1,13 +1,15 @@
 
 import structlog
 import json
-from datetime import datetime
 from typing import Optional, List
 
 from app.services.cortex.reader_llm import reader_llm
 from app.models import OpportunitySchema
 from app.config import settings
+from app.core.events import dlq_topic
 from app.database import db
+from app.infrastructure.handler_retry import dead_letter_record
+from app.utils.deadlines import is_expired
 
 logger = structlog.get_logger()
 
@@ -45,6 +47,7 @@ class RefineryService:
         
         # 2. Process each opportunity
         processed_count = 0
+        failed = []
         for opportunity in opportunities:
             try:
                 # 2.1 Strict Expiration Gate
@@ -58,7 +61,7 @@ class RefineryService:
                 # 2.3 Type-Tagging
                 opportunity.type_tags = self._enrich_type_tags(opportunity)
                 
-                # 2.4 Skip Vectorization for speed (can be done async later)
+                # 2.4 Skip Vectorization for speed (EmbeddingBackfillWorker fills it in)
                 # from app.services.vectorization_service import vectorization_service
                 # opportunity.embedding = await vectorization_service.vectorize_opportunity(opportunity)
 
@@ -68,15 +71,22 @@ class RefineryService:
                 
             except Exception as e:
                 logger.error("Failed to process opportunity", error=str(e))
+                failed.append((opportunity, e))
                 continue
         
         logger.info(f"Refinery Complete: {processed_count}/{len(opportunities)} opportunities processed from {url[:40]}")
+        # Dead-letter only the failed opportunities (re-drivable onto the enriched topic), so the
+        # page is not re-extracted and its successful opportunities are not republished
+        undelivered = [(opp, e) for opp, e in failed if not await self._dead_letter(opp, e)]
+        if undelivered:
+            # Nowhere to record them: fail the raw event so the broker retries it
+            opp, error = undelivered[0]
+            raise RuntimeError(f"{len(undelivered)}/{len(opportunities)} opportunities from {url} failed: {error}") from error
 
     def _is_expired(self, deadline_ts: int) -> bool:
         """Strict Expiration Logic"""
         if not deadline_ts: return False # Keep if unknown, flag later
-        now_ts = int(datetime.now().timestamp())
-        return deadline_ts < now_ts
+        return is_expired(deadline_ts)
 
     def _enrich_geo_tags(self, opp: OpportunitySchema) -> List[str]:
         """Auto-detect Global vs Local"""
@@ -124,16 +134,32 @@ class RefineryService:
         from app.config import settings
         
         try:
-            await broker.publish(
+            published = await broker.publish(
                 topic=settings.topic_enriched_opportunity,
                 key=opp.id,
-                payload=opp.model_dump()
+                payload=opp.model_dump(mode='json')
             )
-            logger.info("Verified Opportunity Published to EventBroker", title=opp.title)
         except Exception as e:
             logger.error("EventBroker Publish Failed", error=str(e))
-            # Fallback to direct DB save if broker fails (though MemoryBroker shouldn't fail)
-            await self._persist_fallback(opp)
+            published = False
+        if published:
+            logger.info("Verified Opportunity Published to EventBroker", title=opp.title)
+            return
+        # Refused or failed: save directly so the opportunity is visible, and fail so the event is retried
+        await self._persist_fallback(opp)
+        raise RuntimeError(f"EventBroker did not accept opportunity {opp.id}")
+
+    async def _dead_letter(self, opp: OpportunitySchema, error: Exception) -> bool:
+        """Publish one failed opportunity to the enriched topic's DLQ. False if the broker refused it."""
+        from app.main import broker
+
+        topic = settings.topic_enriched_opportunity
+        record = dead_letter_record(topic, opp.id, opp.model_dump(mode='json'), error, 1, "refinery")
+        try:
+            return await broker.publish(topic=dlq_topic(topic), key=opp.id, payload=record)
+        except Exception as e:
+            logger.error("Dead-lettering opportunity failed", opportunity_id=opp.id, error=str(e))
+            return False
 
     async def _persist_fallback(self, opp: OpportunitySchema):
         """Direct-to-Database Fallback"""
@@ -0,0 +1,74 @@
+"""
+Dead-Letter Queue
+Brokers publish events whose handler exhausted its retries to
+`<topic>.dlq`. This service consumes those topics into the `dead_letters`
+store, where the admin API can inspect them and re-drive them in bulk:
+a re-driven entry is published again to its original topic and key, so a
+transient Firestore or Gemini failure costs a replay, not a re-crawl.
+"""
+from typing import Any, Dict, List, Optional
+import structlog
+
+logger = structlog.get_logger()
+
+
+class DeadLetterQueue:
+    """Persistence and re-drive for dead-lettered events."""
+
+    def __init__(self, db: Any = None):
+        self._db = db
+        self.recorded = 0
+        self.redriven = 0
+        self.purged = 0
+
+    @property
+    def db(self):
+        if self._db is None:
+            from app.database import db
+            self._db = db
+        return self._db
+
+    async def record(self, entry: Dict[str, Any]) -> None:
+        """DLQ topic handler: persist one dead letter (raises so the broker retries the write)"""
+        entry_id = await self.db.save_dead_letter(entry)
+        self.recorded += 1
+        logger.warning("Event dead-lettered", id=entry_id, topic=entry.get("topic"),
+                       handler=entry.get("handler"), attempts=entry.get("attempts"), error=entry.get("error"))
+
+    async def list(self, topic: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        return await self.db.get_dead_letters(topic=topic, limit=limit)
+
+    async def redrive(
+        self,
+        broker: Any,
+        ids: Optional[List[str]] = None,
+        topic: Optional[str] = None,
+        limit: int = 100
+    ) -> Dict[str, int]:
+        """
+        Publish dead letters back to their original topic, then delete them.
+        Selects `ids` if given, else the oldest `limit` entries (of `topic`).
+        Entries the broker does not accept stay in the queue.
+        """
+        entries = await self.db.get_dead_letters(topic=topic, limit=limit, ids=ids)
+
+        accepted = []
+        for entry in entries:
+            if await broker.publish(entry["topic"], entry.get("key"), entry["payload"]):
+                accepted.append(entry["id"])
+        await self.db.delete_dead_letters(accepted)
+        self.redriven += len(accepted)
+        logger.info("Dead letters re-driven", redriven=len(accepted), failed=len(entries) - len(accepted), topic=topic)
+        return {"redriven": len(accepted), "failed": len(entries) - len(accepted)}
+
+    async def purge(self, ids: List[str]) -> int:
+        purged = await self.db.delete_dead_letters(ids)
+        self.purged += purged
+        return purged
+
+    def stats(self) -> Dict[str, int]:
+        return {"recorded": self.recorded, "redriven": self.redriven, "purged": self.purged}
+
+
+# Global dead-letter queue instance
+dead_letter_queue = DeadLetterQueue()
@@ -0,0 +1,223 @@
+"""
+Write-Behind Buffer for Application Draft Autosave
+The frontend autosaves drafts every few seconds, and each save used to be
+one `update` on the application document, mostly overwriting the previous
+one. Saves now merge field by field into a per-application pending update
+held in memory:
+
+- A pending update is flushed once no save has arrived for
+  `debounce_seconds`, and at most `max_delay_seconds` after its first save,
+  even while the user keeps typing.
+- `flush(application_id)` writes immediately (the submit path);
+  `stop()` flushes everything (graceful shutdown).
+- Reads overlay the pending fields on the stored draft, so a client always
+  sees its latest save.
+- A failed flush is merged back under any newer saves and retried.
+
+Buffered state lives in this process only; a crash loses at most the
+last `max_delay_seconds` of edits.
+"""
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import structlog
+
+from app.config import settings
+
+logger = structlog.get_logger()
+
+# Fields save_application_draft writes unconditionally vs only when not None
+ALWAYS_FIELDS = ('current_step', 'progress_percentage')
+NON_NULL_FIELDS = ('personal_info', 'documents', 'essays', 'recommenders', 'additional_answers')
+
+
+def draft_update(draft_data: Dict[str, Any]) -> Dict[str, Any]:
+    """The fields of a draft save that save_application_draft would write"""
+    update = {field: draft_data[field] for field in ALWAYS_FIELDS if field in draft_data}
+    update.update({field: draft_data[field] for field in NON_NULL_FIELDS if draft_data.get(field) is not None})
+    return update
+
+
+class PendingDraft:
+    """Merged, not yet written fields of one application draft"""
+
+    __slots__ = ('fields', 'first_at', 'last_at', 'saved_at', 'saves', 'attempts')
+
+    def __init__(self, now: float):
+        self.fields: Dict[str, Any] = {}
+        self.first_at = now
+        self.last_at = now
+        self.saved_at = datetime.now().isoformat()
+        self.saves = 0
+        self.attempts = 0
+
+    def due_at(self, debounce_seconds: float, max_delay_seconds: float) -> float:
+        return min(self.last_at + debounce_seconds, self.first_at + max_delay_seconds)
+
+
+class DraftWriteBuffer:
+    """Per-application write-behind buffer in front of save_application_draft."""
+
+    def __init__(
+        self,
+        db: Any = None,
+        debounce_seconds: float = 5.0,
+        max_delay_seconds: float = 30.0,
+        max_attempts: int = 5,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._db = db
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.max_attempts = max_attempts
+        self.clock = clock
+        self._pending: Dict[str, PendingDraft] = {}
+        self._flushing: Dict[str, Tuple[asyncio.Future, PendingDraft]] = {}  # writes in flight
+        self._task: Optional[asyncio.Task] = None
+
+        self.saves = 0
+        self.writes = 0
+        self.failed_writes = 0
+        self.dropped = 0
+
+    @property
+    def db(self):
+        if self._db is None:
+            from app.database import db
+            self._db = db
+        return self._db
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def __contains__(self, application_id: str) -> bool:
+        """Edits for the application are pending or being written"""
+        return application_id in self._pending or application_id in self._flushing
+
+    # Writes
+    def save(self, application_id: str, draft_data: Dict[str, Any]) -> str:
+        """Buffer a draft save. Returns the save time (ISO) reported to the client."""
+        now = self.clock()
+        entry = self._pending.get(application_id)
+        if entry is None:
+            entry = self._pending[application_id] = PendingDraft(now)
+        entry.fields.update(draft_update(draft_data))
+        entry.last_at = now
+        entry.saved_at = datetime.now().isoformat()
+        entry.saves += 1
+        self.saves += 1
+        return entry.saved_at
+
+    def discard(self, application_id: str) -> None:
+        """Drop pending edits (the application was deleted or submitted)"""
+        self._pending.pop(application_id, None)
+
+    async def flush(self, application_id: str) -> bool:
+        """Write one application's pending edits now. True if nothing is left pending."""
+        # One write per application at a time: a later flush lands after an earlier one
+        while (inflight := self._flushing.get(application_id)) is not None:
+            await asyncio.shield(inflight[0])
+        entry = self._pending.pop(application_id, None)
+        if entry is None or not entry.fields:
+            return True
+        done = asyncio.get_running_loop().create_future()
+        self._flushing[application_id] = (done, entry)
+        try:
+            await self.db.save_application_draft(application_id, entry.fields)
+            self.writes += 1
+            logger.debug("Draft flushed", application_id=application_id, coalesced_saves=entry.saves)
+            return True
+        except Exception as e:
+            self.failed_writes += 1
+            entry.attempts += 1
+            if entry.attempts >= self.max_attempts:
+                self.dropped += 1
+                logger.error("Draft flush abandoned", application_id=application_id, attempts=entry.attempts, error=str(e))
+                return False
+            # Put the edits back underneath anything saved while the write was in flight
+            newer = self._pending.get(application_id)
+            if newer is not None:
+                entry.fields.update(newer.fields)
+                entry.last_at, entry.saved_at = newer.last_at, newer.saved_at
+                entry.saves += newer.saves
+            self._pending[application_id] = entry
+            logger.warning("Draft flush failed, will retry", application_id=application_id, attempts=entry.attempts, error=str(e))
+            return False
+        finally:
+            del self._flushing[application_id]
+            done.set_result(None)
+
+    async def flush_due(self) -> int:
+        """Flush every entry whose debounce or max delay has elapsed. Returns applications flushed."""
+        now = self.clock()
+        due = [
+            application_id for application_id, entry in self._pending.items()
+            if entry.due_at(self.debounce_seconds, self.max_delay_seconds) <= now
+        ]
+        results = await asyncio.gather(*(self.flush(application_id) for application_id in due))
+        return sum(1 for ok in results if ok)
+
+    async def flush_all(self) -> int:
+        """Flush everything regardless of timing (shutdown). Returns applications flushed."""
+        results = await asyncio.gather(*(self.flush(application_id) for application_id in list(self._pending)))
+        return sum(1 for ok in results if ok)
+
+    # Reads
+    def overlay(self, draft: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """A stored application document with its pending edits applied"""
+        if not draft:
+            return draft
+        application_id = draft.get('application_id')
+        inflight = self._flushing.get(application_id)
+        for entry in (inflight[1] if inflight else None, self._pending.get(application_id)):
+            if entry is not None:
+                draft = {**draft, **entry.fields, 'last_saved': entry.saved_at, 'updated_at': entry.saved_at}
+        return draft
+
+    def overlay_all(self, drafts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [self.overlay(draft) for draft in drafts]
+
+    # Lifecycle
+    async def run_forever(self) -> None:
+        tick = max(min(self.debounce_seconds, self.max_delay_seconds) / 2, 0.05)
+        while True:
+            try:
+                await self.flush_due()
+            except Exception as e:
+                logger.error("Draft buffer loop error", error=str(e))
+            await asyncio.sleep(tick)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run_forever())
+            logger.info("Draft write-behind buffer started", debounce_seconds=self.debounce_seconds)
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write every pending draft"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        flushed = await self.flush_all()
+        logger.info("Draft write-behind buffer stopped", flushed=flushed, pending=len(self._pending))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "saves": self.saves,
+            "writes": self.writes,
+            "failed_writes": self.failed_writes,
+            "dropped": self.dropped,
+            "saves_per_write": round(self.saves / self.writes, 2) if self.writes else None
+        }
+
+
+# Global buffer instance
+draft_buffer = DraftWriteBuffer(
+    debounce_seconds=settings.draft_buffer_debounce_seconds,
+    max_delay_seconds=settings.draft_buffer_max_delay_seconds
+)
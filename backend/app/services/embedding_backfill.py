@@ -0,0 +1,181 @@
+"""
+Embedding Backfill Worker
+The Refinery publishes opportunities without vectors (embedding is skipped
+for ingest speed), which leaves them invisible to semantic search and the
+vector half of the Cortex formula. This worker closes the gap off the hot path:
+
+1. Finds catalog entries with no embedding (ordered by ID)
+2. Embeds them in multi-document calls under the shared Gemini rate limiter
+3. Writes the vectors back with batched Firestore updates
+4. Checkpoints the last committed ID so a restart resumes where it stopped
+
+A failed batch stops the pass at the checkpoint. Once the same batch has
+failed `max_batch_failures` times in a row, it is retried in halves down to
+single documents; documents that still fail are skipped (logged and
+counted) and the checkpoint moves past them, so one poison document cannot
+stall the backfill. Skipped documents are retried on the next full pass.
+
+Throughput is capped at `max_per_minute` documents.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import structlog
+
+from app.config import settings
+from app.infrastructure.opportunity_catalog import OpportunityCatalog, opportunity_catalog
+from app.models import Scholarship
+from app.utils.rate_limiter import gemini_rate_limiter
+
+logger = structlog.get_logger()
+
+# Async callable: opportunities -> embeddings (same order)
+EmbedBatchFn = Callable[[List[Scholarship]], Awaitable[List[List[float]]]]
+
+
+async def _embed_with_gemini(opportunities: List[Scholarship]) -> List[List[float]]:
+    """One multi-document embedding call (run off the event loop)."""
+    from app.services.vectorization_service import vectorization_service
+    texts = [vectorization_service._opportunity_text(opp) for opp in opportunities]
+    return await asyncio.to_thread(vectorization_service.embed_documents, texts)
+
+
+class EmbeddingBackfillWorker:
+    """Resumable background backfill of missing opportunity embeddings."""
+
+    CHECKPOINT_NAME = "embedding_backfill"
+
+    def __init__(
+        self,
+        db: Any = None,
+        embed_batch: Optional[EmbedBatchFn] = None,
+        catalog: OpportunityCatalog = opportunity_catalog,
+        batch_size: int = 50,
+        max_per_minute: int = 600,
+        max_batch_failures: int = 3,
+        rate_limiter: Any = gemini_rate_limiter
+    ):
+        self._db = db
+        self.embed_batch = embed_batch or _embed_with_gemini
+        self.catalog = catalog
+        self.batch_size = batch_size
+        self.max_per_minute = max_per_minute
+        self.max_batch_failures = max_batch_failures
+        self.rate_limiter = rate_limiter
+        self._task: Optional[asyncio.Task] = None
+
+        self.embedded = 0
+        self.failed_batches = 0
+        self.skipped = 0
+
+    @property
+    def db(self):
+        if self._db is None:
+            from app.database import db
+            self._db = db
+        return self._db
+
+    def pending(self, after_id: str = "") -> List[Scholarship]:
+        """Live catalog entries without an embedding, ID-ordered, strictly after `after_id`."""
+        return sorted(
+            (s for s in self.catalog.snapshot() if s.embedding is None and s.id > after_id),
+            key=lambda s: s.id
+        )
+
+    async def run_once(self) -> int:
+        """Backfill one full pass from the last checkpoint. Returns documents embedded."""
+        checkpoint = await self.db.get_system_state(self.CHECKPOINT_NAME) or {}
+        after_id = checkpoint.get("last_id", "")
+        failures = checkpoint.get("failures", 0)  # consecutive failures of the batch after the checkpoint
+        todo = self.pending(after_id)
+        if not todo:
+            if after_id:
+                # Previous pass finished; start over to pick up anything added below the cursor
+                await self.db.save_system_state(self.CHECKPOINT_NAME, {"last_id": ""})
+            return 0
+
+        logger.info("Embedding backfill pass started", pending=len(todo), resume_after=after_id or None)
+        embedded = 0
+        min_batch_seconds = self.batch_size * 60.0 / self.max_per_minute if self.max_per_minute > 0 else 0.0
+
+        for start in range(0, len(todo), self.batch_size):
+            batch = todo[start:start + self.batch_size]
+            started = time.monotonic()
+            try:
+                embedded += await self._embed_and_write(batch)
+            except Exception as e:
+                self.failed_batches += 1
+                failures += 1
+                logger.error("Embedding backfill batch failed", first_id=batch[0].id, failures=failures, error=str(e))
+                if failures < self.max_batch_failures:
+                    # Stop the pass; the checkpoint still points at the last committed batch
+                    await self.db.save_system_state(self.CHECKPOINT_NAME, {"last_id": after_id, "failures": failures})
+                    break
+                written, skipped = await self._isolate(batch)
+                embedded += written
+                self.skipped += len(skipped)
+                logger.warning("Embedding backfill skipped failing documents", ids=skipped, embedded=written)
+            failures = 0
+            after_id = batch[-1].id
+            await self.db.save_system_state(self.CHECKPOINT_NAME, {"last_id": after_id})
+
+            # Throughput ceiling: pace batches to `max_per_minute` documents
+            elapsed = time.monotonic() - started
+            if elapsed < min_batch_seconds:
+                await asyncio.sleep(min_batch_seconds - elapsed)
+
+        self.embedded += embedded
+        logger.info("Embedding backfill pass finished", embedded=embedded, total_embedded=self.embedded)
+        return embedded
+
+    async def _embed_and_write(self, batch: List[Scholarship]) -> int:
+        vectors = await self.rate_limiter.execute(self.embed_batch, batch)
+        return await self.db.update_scholarship_embeddings({s.id: v for s, v in zip(batch, vectors) if v})
+
+    async def _isolate(self, batch: List[Scholarship]) -> Tuple[int, List[str]]:
+        """Embed `batch` in halves down to single documents. Returns (written, IDs that still failed)."""
+        try:
+            return await self._embed_and_write(batch), []
+        except Exception as e:
+            if len(batch) == 1:
+                logger.warning("Embedding backfill document failed", scholarship_id=batch[0].id, error=str(e))
+                return 0, [batch[0].id]
+        middle = len(batch) // 2
+        written_a, skipped_a = await self._isolate(batch[:middle])
+        written_b, skipped_b = await self._isolate(batch[middle:])
+        return written_a + written_b, skipped_a + skipped_b
+
+    async def run_forever(self, interval_seconds: float) -> None:
+        """Wait for the catalog, then backfill on a fixed interval."""
+        await self.catalog.wait_until_ready(settings.catalog_ready_timeout_seconds)
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error("Embedding backfill loop error", error=str(e))
+            await asyncio.sleep(interval_seconds)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run_forever(settings.embedding_backfill_interval_seconds))
+            logger.info("Embedding backfill worker scheduled", max_per_minute=self.max_per_minute)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, int]:
+        return {"embedded": self.embedded, "failed_batches": self.failed_batches, "skipped": self.skipped}
+
+
+# Global worker instance
+embedding_backfill_worker = EmbeddingBackfillWorker(
+    batch_size=settings.embedding_backfill_batch_size,
+    max_per_minute=settings.embedding_backfill_max_per_minute,
+    max_batch_failures=settings.embedding_backfill_max_batch_failures
+)
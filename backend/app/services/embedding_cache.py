@@ -0,0 +1,191 @@
+"""
+Content-Addressed Embedding Cache
+Embeddings are a pure function of (model, task_type, title, text), so they are
+cached under a SHA-256 of exactly those inputs:
+
+- L1: in-process LRU (OrderedDict), bounded by `max_entries`
+- L2: SQLite file on local disk, so restarts keep their warm set
+
+Repeated queries and unchanged profiles never leave the process. Disk
+writes are committed in groups (every `commit_every` stores, on the first
+store after `commit_interval` seconds, and on close), so a cache fill
+rarely pays a synchronous commit on the caller's thread (often the event
+loop); a crash loses at most the last uncommitted group.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import structlog
+
+from app.config import settings
+
+logger = structlog.get_logger()
+
+
+def embedding_cache_key(model: str, task_type: str, text: str, title: Optional[str] = None) -> str:
+    """Stable content address for one embedding request."""
+    digest = hashlib.sha256()
+    for part in (model, task_type, title or "", text):
+        encoded = part.encode("utf-8")
+        # Length-prefix each field so ("ab", "c") and ("a", "bc") never collide
+        digest.update(len(encoded).to_bytes(8, "little"))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace and case so trivially different queries share an embedding."""
+    return " ".join(query.split()).lower()
+
+
+class EmbeddingCache:
+    """
+    Two-level LRU + disk embedding cache.
+
+    Vectors are stored as float64 on disk so a cached embedding is
+    bit-identical to the one the API returned.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        path: Optional[str] = None,
+        commit_every: int = 32,
+        commit_interval: float = 5.0
+    ):
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self.max_entries = max_entries
+        self.path = path
+        self.commit_every = commit_every
+        self.commit_interval = commit_interval
+        self._conn: Optional[sqlite3.Connection] = None
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def _disk(self) -> Optional[sqlite3.Connection]:
+        """Open the SQLite store lazily; disk errors degrade to memory-only."""
+        if not self.path:
+            return None
+        if self._conn is None:
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+                conn.commit()
+                self._conn = conn
+            except Exception as e:
+                logger.warning("Embedding disk cache unavailable, using memory only", path=self.path, error=str(e))
+                self.path = None
+                return None
+        return self._conn
+
+    def get(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return list(vector)
+
+            conn = self._disk()
+            if conn is not None:
+                try:
+                    row = conn.execute("SELECT vector FROM embeddings WHERE key = ?", (key,)).fetchone()
+                except Exception as e:
+                    logger.warning("Embedding disk cache read failed", error=str(e))
+                    row = None
+                if row is not None:
+                    vector = array("d", row[0]).tolist()
+                    self._remember(key, vector)
+                    self.disk_hits += 1
+                    return list(vector)
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, vector: List[float]) -> None:
+        with self._lock:
+            self._remember(key, list(vector))
+            self.stores += 1
+            conn = self._disk()
+            if conn is not None:
+                try:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                        (key, array("d", vector).tobytes())
+                    )
+                    self._uncommitted += 1
+                    if (
+                        self._uncommitted >= self.commit_every
+                        or time.monotonic() - self._last_commit >= self.commit_interval
+                    ):
+                        self._commit()
+                except Exception as e:
+                    logger.warning("Embedding disk cache write failed", error=str(e))
+
+    def _commit(self) -> None:
+        if self._conn is not None and self._uncommitted:
+            self._conn.commit()
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+
+    def flush(self) -> None:
+        """Commit buffered disk writes."""
+        with self._lock:
+            try:
+                self._commit()
+            except Exception as e:
+                logger.warning("Embedding disk cache commit failed", error=str(e))
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop the in-memory tier (the disk tier is left intact)."""
+        with self._lock:
+            self._memory.clear()
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "entries_in_memory": len(self._memory),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "uncommitted": self._uncommitted,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Global cache instance used by VectorizationService
+embedding_cache = EmbeddingCache(
+    max_entries=settings.embedding_cache_max_entries,
+    path=settings.embedding_cache_path if settings.embedding_cache_enabled else None,
+    commit_every=settings.embedding_cache_commit_every,
+    commit_interval=settings.embedding_cache_commit_interval_seconds
+)
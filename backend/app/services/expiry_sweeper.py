@@ -0,0 +1,97 @@
+"""
+Expiry Sweeper
+Reads already exclude expired opportunities through the deadline_timestamp
+range query; this worker removes the dead rows themselves so the
+collection, the catalog and every derived index stop carrying them.
+
+Each pass takes the oldest expired documents in batches of `batch_size`
+(an index range scan, never a full-collection read) and archives or
+deletes them, until nothing past the grace period is left.
+"""
+import asyncio
+import time
+from typing import Any, Dict, Optional
+import structlog
+
+from app.config import settings
+
+logger = structlog.get_logger()
+
+
+class ExpirySweeper:
+    """Continuous, incremental removal of expired opportunities."""
+
+    def __init__(
+        self,
+        db: Any = None,
+        batch_size: int = 200,
+        grace_seconds: int = 86400,
+        archive: bool = True
+    ):
+        self._db = db
+        self.batch_size = batch_size
+        self.grace_seconds = grace_seconds
+        self.archive = archive
+        self._task: Optional[asyncio.Task] = None
+
+        self.swept = 0
+        self.passes = 0
+        self.failed_passes = 0
+
+    @property
+    def db(self):
+        if self._db is None:
+            from app.database import db
+            self._db = db
+        return self._db
+
+    async def run_once(self, now: Optional[float] = None) -> int:
+        """Sweep everything that expired more than `grace_seconds` ago. Returns documents removed."""
+        before = int((time.time() if now is None else now) - self.grace_seconds)
+        removed = 0
+        while True:
+            ids = await self.db.sweep_expired_scholarships(before, self.batch_size, archive=self.archive)
+            removed += len(ids)
+            if len(ids) < self.batch_size:
+                break
+            await asyncio.sleep(0)  # Yield between batches
+
+        self.swept += removed
+        self.passes += 1
+        if removed:
+            logger.info("Expiry sweep pass finished", removed=removed, total_swept=self.swept)
+        return removed
+
+    async def run_forever(self, interval_seconds: float) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                self.failed_passes += 1
+                logger.error("Expiry sweep loop error", error=str(e))
+            await asyncio.sleep(interval_seconds)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run_forever(settings.expiry_sweep_interval_seconds))
+            logger.info("Expiry sweeper scheduled", archive=self.archive, grace_seconds=self.grace_seconds)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, int]:
+        return {"swept": self.swept, "passes": self.passes, "failed_passes": self.failed_passes}
+
+
+# Global sweeper instance
+expiry_sweeper = ExpirySweeper(
+    batch_size=settings.expiry_sweep_batch_size,
+    grace_seconds=settings.expiry_sweep_grace_seconds,
+    archive=settings.expiry_sweep_archive
+)
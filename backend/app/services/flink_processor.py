@@ -6,6 +6,7 @@ from collections import deque
 import asyncio
 
 from app.config import settings
+from app.utils.deadlines import deadline_timestamp as parse_deadline, is_expired
 
 logger = structlog.get_logger()
 
@@ -161,21 +162,16 @@ class CortexFlinkProcessor:
         event['id'] = content_id  # Assign stable ID
         event['cortex_processed_at'] = now
         
-        # EXPIRY GATE: Reject expired opportunities at intake
-        deadline_str = event.get('deadline', '')
-        deadline_ts = event.get('deadline_timestamp')
-        if deadline_ts and int(deadline_ts) < int(now):
+        # EXPIRY GATE: Reject expired opportunities at intake.
+        # The ISO deadline is normalized once here; downstream stages filter on the timestamp.
+        deadline_ts = parse_deadline(event.get('deadline'))
+        if deadline_ts is not None:
+            event['deadline_timestamp'] = deadline_ts
+        elif isinstance(event.get('deadline_timestamp'), (int, float)):
+            deadline_ts = event['deadline_timestamp'] or None
+        if is_expired(deadline_ts, now):
             logger.debug("Expired opportunity rejected at intake", content_id=content_id[:8])
             return None
-        if deadline_str and not deadline_ts:
-            try:
-                from datetime import datetime as dt
-                parsed = dt.fromisoformat(deadline_str.replace('Z', '+00:00'))
-                if parsed.timestamp() < now:
-                    logger.debug("Expired opportunity rejected at intake (string deadline)", content_id=content_id[:8])
-                    return None
-            except (ValueError, TypeError):
-                pass
         
         # Standardize 'name' (New Schema Compliance)
         if 'name' not in event and 'title' in event:
@@ -0,0 +1,83 @@
+"""
+Compiled Multi-Pattern Keyword Matcher
+Replaces per-keyword `keyword in text` scans with one regex pass.
+
+The vocabulary is compiled into a single trie-factored pattern; a search
+loop reports the longest term starting at every position where any term
+starts. Shorter terms starting at the same position are prefixes of that
+match and are recovered from a precomputed prefix table, so the result is
+exactly the set of vocabulary terms that `term in text` would find.
+
+Scan results are memoized per text: the same opportunity is scored against
+every user, but only scanned once.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List
+
+
+def _trie_pattern(node: Dict[str, dict]) -> str:
+    """Regex for a trie node; greedy optionals make it prefer the longest term."""
+    terminal = "" in node
+    branches = [re.escape(ch) + _trie_pattern(child) for ch, child in sorted(node.items()) if ch != ""]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    return "(?:" + body + ")?" if terminal else body
+
+
+class KeywordMatcher:
+    """
+    Finds every vocabulary term occurring in a text (substring semantics).
+
+    Terms are matched case-sensitively; callers lower-case both the
+    vocabulary and the text, as the scoring code does.
+    """
+
+    def __init__(self, terms: Iterable[str], cache_size: int = 10_000):
+        self.vocabulary: FrozenSet[str] = frozenset(t for t in terms if t)
+
+        trie: Dict[str, dict] = {}
+        for term in self.vocabulary:
+            node = trie
+            for ch in term:
+                node = node.setdefault(ch, {})
+            node[""] = {}
+        self._regex = re.compile(_trie_pattern(trie)) if self.vocabulary else None
+
+        # term -> every vocabulary term that is a prefix of it (itself included)
+        self._prefixes: Dict[str, FrozenSet[str]] = {
+            term: frozenset(term[:i] for i in range(1, len(term) + 1) if term[:i] in self.vocabulary)
+            for term in self.vocabulary
+        }
+        self.find_all = lru_cache(maxsize=cache_size)(self._scan)
+
+    def _scan(self, text: str) -> FrozenSet[str]:
+        """Set of vocabulary terms that occur anywhere in `text`."""
+        if self._regex is None:
+            return frozenset()
+        search = self._regex.search
+        longest = set()
+        match = search(text)
+        while match is not None:
+            longest.add(match.group())
+            match = search(text, match.start() + 1)
+
+        found = set()
+        for term in longest:
+            found |= self._prefixes[term]
+        return frozenset(found)
+
+    def contains(self, term: str, text: str, found: FrozenSet[str]) -> bool:
+        """`term in text`, answered from `found` when the term was compiled."""
+        if term in self.vocabulary:
+            return term in found
+        return term in text
+
+
+def compile_keyword_groups(groups: Dict[str, List[str]]) -> KeywordMatcher:
+    """Compile group names and their (lower-cased) keywords into one matcher."""
+    terms = set(groups)
+    for keywords in groups.values():
+        terms.update(k.lower() for k in keywords)
+    return KeywordMatcher(terms)
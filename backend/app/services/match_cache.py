@@ -0,0 +1,149 @@
+"""
+Per-User Match Cache
+A user's ranked matches are a pure function of their profile, the catalog
+contents and the clock (deadlines), so they are cached under:
+
+- user ID
+- profile hash: SHA-256 of the canonical profile JSON
+- catalog version: the version of the batch-scoring view they were ranked on
+
+plus a `valid_until` timestamp (the earliest moment a ranked row would
+expire). A profile edit, any catalog delta or a passing deadline invalidates
+the entry exactly; nothing is recomputed on a timer.
+
+Catalog deltas arrive far more often than profile edits, and each would
+otherwise re-rank (and re-persist) every active user. Where that cost
+matters, setting `match_cache_stale_seconds` (off by default) lets
+`get_recent` serve an entry from an older catalog version for that long
+after it was computed, re-mapped by ID onto the current view: removed or
+expired opportunities drop out at once, new and edited ones appear at most
+that much later.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+import structlog
+
+from app.config import settings
+
+logger = structlog.get_logger()
+
+
+def profile_hash(profile: Any) -> str:
+    """Stable content hash of a profile (model or dict)."""
+    data = profile.model_dump() if hasattr(profile, 'model_dump') else profile
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class MatchCacheEntry(NamedTuple):
+    profile_hash: str
+    catalog_version: int
+    valid_until: float
+    ranked: List[Tuple[int, float]]  # (view row, score), best first
+    ranking: List[Tuple[str, float]]  # the same as (opportunity ID, score), to re-map onto newer views
+    computed_at: float
+
+
+class MatchCache:
+    """In-process LRU of ranked matches, bounded by `max_users`."""
+
+    def __init__(self, max_users: int = 10_000):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, MatchCacheEntry]" = OrderedDict()
+        self.max_users = max_users
+
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.stores = 0
+
+    def get(
+        self,
+        user_id: str,
+        profile_hash: str,
+        catalog_version: int,
+        now: Optional[float] = None
+    ) -> Optional[List[Tuple[int, float]]]:
+        """Ranked (row, score) pairs if the entry still matches profile, catalog and clock."""
+        if now is None:
+            now = time.time()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if (
+                entry is not None
+                and entry.profile_hash == profile_hash
+                and entry.catalog_version == catalog_version
+                and now < entry.valid_until
+            ):
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry.ranked
+            self.misses += 1
+            return None
+
+    def get_recent(
+        self,
+        user_id: str,
+        profile_hash: str,
+        max_age: float,
+        now: Optional[float] = None
+    ) -> Optional[MatchCacheEntry]:
+        """The entry for this profile if computed within `max_age` seconds, whatever its catalog version."""
+        if now is None:
+            now = time.time()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if (
+                entry is not None
+                and entry.profile_hash == profile_hash
+                and now - entry.computed_at < max_age
+                and now < entry.valid_until
+            ):
+                self._entries.move_to_end(user_id)
+                self.stale_hits += 1
+                return entry
+            return None
+
+    def put(
+        self,
+        user_id: str,
+        profile_hash: str,
+        catalog_version: int,
+        ranked: List[Tuple[int, float]],
+        valid_until: float = float("inf"),
+        ranking: Optional[List[Tuple[str, float]]] = None
+    ) -> None:
+        entry = MatchCacheEntry(profile_hash, catalog_version, valid_until, ranked, ranking or [], time.time())
+        with self._lock:
+            self._entries[user_id] = entry
+            self._entries.move_to_end(user_id)
+            self.stores += 1
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "users": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "stores": self.stores,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Global cache instance used by OpportunityMatchingService
+match_cache = MatchCache(max_users=settings.match_cache_max_users)
@@ -18,6 +18,7 @@ from app.models import (
 )
 from app.services.scraper_service import scraper_service
 from app.database import db
+from app.services.opportunity_features import opportunity_features
 # from app.services.vectorization_service import vectorization_service # Circular import risk, import inside method
 
 logger = structlog.get_logger()
@@ -56,7 +57,7 @@ class MatchingEngine:
         """
         Cosine Similarity between User DNA and Opportunity DNA.
         """
-        if not opp_vector or not user_vector:
+        if opp_vector is None or not len(opp_vector) or not user_vector:
             return None
             
         try:
@@ -81,7 +82,7 @@ class MatchingEngine:
         
         # 1. Keyword Overlap (Jaccard-ish)
         user_text = (f"{profile.major} {' '.join(profile.hard_skills)} {' '.join(profile.soft_skills)}").lower()
-        opp_text = (f"{opp.title} {opp.description} {' '.join(opp.tags)}").lower()
+        opp_text = opportunity_features.get(opp).summary_text
         
         # Simple boost for matching terms
         priority_keywords = [w.strip() for w in user_text.split() if len(w) > 3]
@@ -106,7 +107,7 @@ class MatchingEngine:
         
         # Retrieve user vector (Mocking this retrieval for now, in prod fetch from Vector DB)
         # For now, we assume the profile MIGHT have it implicitly or we fetch it.
-        # Let's import the service to generate it on the fly if needed (caching needed in V2)
+        # Let's import the service to generate it on the fly if needed (cached by content hash)
         from app.services.vectorization_service import vectorization_service
         user_vector = await vectorization_service.vectorize_profile(profile)
 
@@ -4,7 +4,7 @@ Provides backward-compatible discovery job handling.
 Internally uses MatchingEngine for scoring.
 """
 import uuid
-from typing import List, Optional, Dict, Any
+from typing import List, NamedTuple, Optional, Dict, Any, Tuple
 import structlog
 from datetime import datetime
 
@@ -14,11 +14,25 @@ from app.models import (
     DiscoveryJobResponse
 )
 from app.services.scraper_service import scraper_service
+from app.services.opportunity_features import CatalogView, opportunity_features
+from app.infrastructure.opportunity_catalog import opportunity_catalog
+from app.services.match_cache import match_cache, profile_hash
+from app.utils.pagination import MAX_PAGE_SIZE, paginate
 from app.database import db
+from app.config import settings
 
 logger = structlog.get_logger()
 
 
+class MatchPage(NamedTuple):
+    """One page of a user's ranked matches"""
+    scholarships: List[Scholarship]       # this page, scored
+    ranking: List[Tuple[str, float]]      # (ID, score) of every match, best first
+    total_value: float                    # summed over every match, not just the page
+    next_cursor: Optional[str]
+    recomputed: bool
+
+
 class OpportunityMatchingService:
     """Orchestrates multi-opportunity discovery and matching"""
     
@@ -34,24 +48,21 @@ class OpportunityMatchingService:
         job_id = str(uuid.uuid4())
         
         try:
-            # Step 1: Check cache (Fast path)
-            cached_opportunities = await db.get_all_scholarships()
+            # Step 1: Check cache (Fast path) - only the top 30 are materialized
+            immediate_results, ranking = await self.rank_catalog(user_profile, top_k=30)
             
-            if cached_opportunities:
-                matched = self._filter_and_rank(cached_opportunities, user_profile)
-                if matched:
-                    scholarship_ids = [s.id for s in matched]
-                    await db.save_user_matches(user_id, scholarship_ids)
-                    
-                    logger.info("Returning cached opportunities", count=len(matched))
-                    
-                    return DiscoveryJobResponse(
-                        status="completed",
-                        immediate_results=matched[:30],
-                        job_id=job_id,
-                        estimated_completion=0,
-                        total_found=len(matched)
-                    )
+            if ranking:
+                await db.save_user_matches(user_id, ranking)
+                
+                logger.info("Returning cached opportunities", count=len(ranking))
+                
+                return DiscoveryJobResponse(
+                    status="completed",
+                    immediate_results=immediate_results,
+                    job_id=job_id,
+                    estimated_completion=0,
+                    total_found=len(ranking)
+                )
             
             # Step 2: Start fresh discovery (Slow path)
             await db.create_discovery_job(user_id, job_id)
@@ -102,8 +113,7 @@ class OpportunityMatchingService:
             for opp in matched_opportunities:
                 await db.save_scholarship(opp)
             
-            scholarship_ids = [s.id for s in matched_opportunities]
-            await db.save_user_matches(user_id, scholarship_ids)
+            await db.save_user_matches(user_id, [(s.id, s.match_score) for s in matched_opportunities])
             
             # Update job status
             await db.update_job_status(
@@ -126,54 +136,113 @@ class OpportunityMatchingService:
     def calculate_match_score(self, opportunity: Scholarship, profile: UserProfile) -> float:
         """Use PersonalizationEngine for proper scoring"""
         from app.services.personalization_engine import personalization_engine
+        from app.services.opportunity_features import opportunity_features
         
-        # Convert Scholarship to dict for personalization engine
-        opp_dict = {
-            'name': opportunity.name or opportunity.title or 'Unknown Opportunity',
-            'description': opportunity.description or '',
-            'organization': opportunity.organization or '',
-            'tags': opportunity.tags if hasattr(opportunity, 'tags') else [],
-            'eligibility': opportunity.eligibility.model_dump() if hasattr(opportunity.eligibility, 'model_dump') else {},
-            'requirements': opportunity.requirements.model_dump() if hasattr(opportunity.requirements, 'model_dump') else {},
-        }
-        
-        return personalization_engine.calculate_personalized_score(opp_dict, profile)
+        # Precomputed feature record (cached per catalog version)
+        return personalization_engine.calculate_personalized_score(opportunity_features.get(opportunity), profile)
     
     def _filter_and_rank(
         self,
         opportunities: List[Scholarship],
-        user_profile: UserProfile
+        user_profile: UserProfile,
+        top_k: Optional[int] = None
     ) -> List[Scholarship]:
-        """Filter and rank opportunities using PersonalizationEngine"""
-        from datetime import datetime
+        """Filter and rank opportunities using PersonalizationEngine (batch scored)"""
+        view = opportunity_features.view_of(opportunities)
+        return self.rank_view(view, user_profile, top_k=top_k)
+    
+    def rank_view(
+        self,
+        view: CatalogView,
+        user_profile: UserProfile,
+        top_k: Optional[int] = None,
+        live_only: bool = True
+    ) -> List[Scholarship]:
+        """Score a whole view in one batch; expired rows are skipped unless live_only=False"""
+        from app.services.personalization_engine import personalization_engine
         
-        eligible = []
-        now = datetime.now().timestamp()
+        ranked = personalization_engine.score_batch(user_profile, view, top_k=top_k, live_only=live_only)
+        return self._materialize(view, ranked)
+    
+    async def rank_catalog(
+        self,
+        user_profile: UserProfile,
+        top_k: Optional[int] = None
+    ) -> Tuple[List[Scholarship], List[Tuple[str, float]]]:
+        """
+        Rank every live opportunity for a profile.
+        Returns (best `top_k` as scored Scholarships, (ID, score) of all live
+        opportunities best first). Uses the catalog's cached batch view once
+        the catalog is live.
+        """
+        from app.services.personalization_engine import personalization_engine
         
-        for opp in opportunities:
-            # Skip expired — check BOTH numeric timestamp AND string deadline
-            if hasattr(opp, 'deadline_timestamp') and opp.deadline_timestamp:
-                if opp.deadline_timestamp < int(now):
-                    continue
-            elif hasattr(opp, 'deadline') and opp.deadline:
-                try:
-                    deadline_dt = datetime.fromisoformat(opp.deadline.replace('Z', '+00:00'))
-                    if deadline_dt.timestamp() < now:
-                        continue
-                except (ValueError, TypeError):
-                    pass  # Keep if unparseable
-            
-            # Calculate score using PersonalizationEngine
-            score = self.calculate_match_score(opp, user_profile)
+        if opportunity_catalog.is_ready:
+            view = opportunity_features.catalog_view()
+        else:
+            view = opportunity_features.view_of(await db.get_scholarship_summaries())
+        
+        ranked = personalization_engine.score_batch(user_profile, view, live_only=True)
+        ranking = [(view.items[row].id, score) for row, score in ranked]
+        best = ranked if top_k is None else ranked[:top_k]
+        return self._materialize(view, best), ranking
+    
+    async def get_user_matches(
+        self,
+        user_id: str,
+        user_profile: UserProfile,
+        cursor: Optional[str] = None,
+        limit: int = MAX_PAGE_SIZE
+    ) -> MatchPage:
+        """
+        A page of ranked matches for a user, served from the match cache while
+        the profile, the catalog version and every ranked deadline are
+        unchanged. When `match_cache_stale_seconds` is set, a ranking computed
+        less than that long before a catalog delta is re-mapped onto the new
+        view instead of re-scored. Only the requested page is materialized.
+        Raises ValueError on a malformed cursor.
+        """
+        from app.services.personalization_engine import personalization_engine
+        
+        if opportunity_catalog.is_ready:
+            view = opportunity_features.catalog_view()
+            key = profile_hash(user_profile)
+            ranked = match_cache.get(user_id, key, view.version)
+            if ranked is None and settings.match_cache_stale_seconds > 0:
+                recent = match_cache.get_recent(user_id, key, settings.match_cache_stale_seconds)
+                if recent is not None:
+                    # Not stored under the new version: once the window passes, this re-ranks
+                    ranked = view.rows_of(recent.ranking)
+            recomputed = ranked is None
+            if recomputed:
+                ranked = personalization_engine.score_batch(user_profile, view, live_only=True)
+                valid_until = view.next_expiry([row for row, _ in ranked])
+                match_cache.put(user_id, key, view.version, ranked, valid_until=valid_until,
+                                ranking=[(view.items[row].id, score) for row, score in ranked])
+        else:
+            # No catalog version to key on: rank from the database every time
+            view = opportunity_features.view_of(await db.get_scholarship_summaries())
+            ranked = personalization_engine.score_batch(user_profile, view, live_only=True)
+            recomputed = True
+        
+        items = view.items
+        page, next_cursor = paginate(ranked, lambda r: (r[1], items[r[0]].id), cursor, limit)
+        return MatchPage(
+            scholarships=self._materialize(view, page),
+            ranking=[(items[row].id, score) for row, score in ranked],
+            total_value=sum(items[row].amount for row, _ in ranked),
+            next_cursor=next_cursor,
+            recomputed=recomputed
+        )
+    
+    def _materialize(self, view: CatalogView, ranked: List[Tuple[int, float]]) -> List[Scholarship]:
+        results = []
+        for row, score in ranked:
+            opp = view.take(row)
             opp.match_score = int(round(score))
-            
-            # Determine match tier
             opp.match_tier = self.get_match_tier(opp.match_score)
-            
-            # Include all opportunities (minimum 10% ensured by personalization engine)
-            eligible.append(opp)
-        
-        return sorted(eligible, key=lambda x: x.match_score, reverse=True)
+            results.append(opp)
+        return results
 
     def get_match_tier(self, score: float) -> str:
         """Convert match score to tier"""
@@ -32,14 +32,14 @@ class MatchingWorker:
             opp = Scholarship(**value)
             logger.info("Matching Worker processing", opp_id=opp.id, title=opp.title)
             
-            # 2. Fetch Active Users (Simulated: In prod, iterate through users or use vector search on USER index)
-            # For FAANG-scale, we'd use a Vector DB (Pinecone/Milvus) to find users CLOSE to this opportunity vector.
-            # Here, we'll fetch all users (assuming low scale for MVP) or a set of active users.
-            users = await db.get_all_users() # Assuming this exists and returns list of UserProfile/DeepUserProfile
+            # 2. Score every user: the routing index bounds PersonalizationEngine's
+            # interest/passion scoring, not calculate_match_score (major, skills,
+            # location, vector), and only knows users seen by this process
+            users = await db.get_all_users()
             
             matched_count = 0
             
-            for user in users:
+            for user_id, user in users:
                 # Convert to DeepUserProfile if needed 
                 deep_profile = self._ensure_deep_profile(user)
                 
@@ -49,15 +49,15 @@ class MatchingWorker:
                 # 4. Filter & Notify
                 if score >= 50: # Threshold
                     opp.match_score = score
-                    await db.save_user_match(user.id, opp)
+                    await db.offer_user_match(user_id, opp.id, score)
                     
                     # Notify via WebSocket (Conceptually pushing to a user topic)
                     # The WebSocket service listens to user-specific channels
                     # We can publish to 'user.matches' topic which WebSocket service consumes
-                    self._notify_user(user.id, opp)
+                    self._notify_user(user_id, opp)
                     matched_count += 1
             
-            logger.info("Matching Complete", opp_id=opp.id, matched_users=matched_count)
+            logger.info("Matching Complete", opp_id=opp.id, matched_users=matched_count, users=len(users))
 
         except Exception as e:
             logger.error("Matching Worker failed", error=str(e), key=key)
@@ -70,7 +70,7 @@ class MatchingWorker:
             return user_data
         # If it's a basic UserProfile or dict, upgrade it
         # ... logic ...
-        return DeepUserProfile(**user_data.dict()) # Simplistic conversion
+        return DeepUserProfile(**(user_data if isinstance(user_data, dict) else user_data.dict())) # Simplistic conversion
 
     def _notify_user(self, user_id: str, opp: Scholarship):
         """Publish match to User Notification Stream"""
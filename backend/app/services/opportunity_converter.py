@@ -12,6 +12,7 @@ from app.models import (
     ScholarshipEligibility,
     ScholarshipRequirements,
 )
+from app.utils.deadlines import deadline_timestamp as parse_deadline
 
 
 def _to_str(value: Optional[Any], default: str = "") -> str:
@@ -140,17 +141,8 @@ def convert_to_scholarship(opp_data: Dict[str, Any], user_profile: UserProfile)
 
         now_iso = _now_iso()
 
-        # Calculate deadline_timestamp
-        deadline_timestamp = None
-        try:
-            if deadline and len(deadline) == 10:
-                dt = datetime.strptime(deadline, "%Y-%m-%d")
-                deadline_timestamp = int(dt.timestamp())
-            elif deadline:
-                dt = datetime.fromisoformat(deadline.replace('Z', '+00:00'))
-                deadline_timestamp = int(dt.timestamp())
-        except Exception:
-            deadline_timestamp = None
+        # Normalized deadline_timestamp (None when missing or unparseable)
+        deadline_timestamp = parse_deadline(deadline)
 
         # Generate STABLE ID using Flink processor's hash function
         from app.services.flink_processor import generate_opportunity_id
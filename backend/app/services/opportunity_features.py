@@ -0,0 +1,349 @@
+"""
+Precomputed Opportunity Feature Records
+Everything the scorers derive from an opportunity's content — normalized
+text, keyword hits, tag bitmasks, eligibility fields, inferred type — is
+computed once per opportunity version instead of once per (user, opportunity)
+pair.
+
+Records are built by PersonalizationEngine.build_features and cached by
+OpportunityFeatureStore, which follows the opportunity catalog.
+"""
+import math
+import threading
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+import numpy as np
+import structlog
+
+from app.models import Scholarship
+from app.infrastructure.opportunity_catalog import deadline_ordinal, opportunity_catalog
+
+logger = structlog.get_logger()
+
+# Scholarship fields the scorers read; a cached record is valid while these are unchanged
+CONTENT_FIELDS = (
+    'name', 'title', 'description', 'organization', 'tags', 'type_tags',
+    'geo_tags', 'eligibility_text', 'eligibility', 'requirements',
+)
+
+
+class TagBits:
+    """Assigns one bit per distinct tag so tag sets become int masks."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bits: Dict[str, int] = {}
+
+    def bit(self, tag: str) -> int:
+        """Bit for `tag`, allocating one on first sight."""
+        bit = self._bits.get(tag)
+        if bit is None:
+            with self._lock:
+                bit = self._bits.setdefault(tag, 1 << len(self._bits))
+        return bit
+
+    def get(self, tag: Optional[str]) -> int:
+        """Bit for `tag`, or 0 if no opportunity has carried it."""
+        return self._bits.get(tag, 0) if tag else 0
+
+    def mask(self, tags) -> int:
+        mask = 0
+        for tag in tags or ():
+            if isinstance(tag, str):
+                mask |= self.bit(tag)
+        return mask
+
+
+geo_tag_bits = TagBits()
+type_tag_bits = TagBits()
+
+# Geo tags that open an opportunity to every country
+GLOBAL_GEO_TAGS = frozenset({'Global', 'International'})
+
+
+def infer_opportunity_type(opp: Dict[str, Any]) -> str:
+    """Infer opportunity type from tags/description."""
+    tags_str = ' '.join(opp.get('tags', []) or []).lower()
+    desc_str = (opp.get('description') or '').lower()
+    name_str = (opp.get('name') or '').lower()
+    combined = f"{tags_str} {desc_str} {name_str}"
+
+    if any(kw in combined for kw in ['hackathon', 'hack', 'buildathon', 'codeathon', 'ideathon', 'builder']):
+        return 'hackathon'
+    elif any(kw in combined for kw in ['bounty', 'bug bounty', 'vulnerability', 'testnet', 'auditing']):
+        return 'bounty'
+    elif any(kw in combined for kw in ['competition', 'contest', 'challenge', 'olympiad', 'tournament', 'quiz']):
+        return 'competition'
+    elif any(kw in combined for kw in ['grant', 'funding', 'seed', 'investment', 'acceleration', 'equity-free']):
+        return 'grant'
+    elif any(kw in combined for kw in ['internship', 'intern', 'fellowship', 'graduate program', 'trainee', 'apprentice']):
+        return 'internship'
+    return 'scholarship'
+
+
+class OpportunityFeatures:
+    """Immutable-by-convention scoring view of one opportunity."""
+
+    __slots__ = (
+        'id', 'name', 'text', 'summary_text', 'tokens', 'keyword_hits', 'group_hits',
+        'geo_tags', 'geo_mask', 'type_mask', 'gpa_min', 'majors', 'backgrounds',
+        'grade_levels', 'inferred_type', 'source',
+    )
+
+    def __init__(
+        self,
+        id: Optional[str],
+        name: str,
+        text: str,
+        summary_text: str,
+        tokens: FrozenSet[str],
+        keyword_hits: FrozenSet[str],
+        group_hits: FrozenSet[str],
+        geo_tags: Tuple[str, ...],
+        type_tags: Tuple[str, ...],
+        gpa_min: Optional[float],
+        majors: Optional[Tuple[str, ...]],
+        backgrounds: Tuple[str, ...],
+        grade_levels: Tuple[str, ...],
+        inferred_type: str,
+        source: Optional[Scholarship] = None
+    ):
+        self.id = id
+        self.name = name
+        self.text = text                  # lower-cased full searchable text
+        self.summary_text = summary_text  # lower-cased title/description/tags (Cortex heuristics)
+        self.tokens = tokens
+        self.keyword_hits = keyword_hits  # compiled interest keywords found in `text`
+        self.group_hits = group_hits      # interest groups with at least one keyword hit
+        self.geo_tags = geo_tags
+        self.geo_mask = geo_tag_bits.mask(geo_tags)
+        self.type_mask = type_tag_bits.mask(type_tags)
+        self.gpa_min = gpa_min
+        self.majors = majors
+        self.backgrounds = backgrounds
+        self.grade_levels = grade_levels
+        self.inferred_type = inferred_type
+        self.source = source
+
+    def __repr__(self) -> str:
+        return f"OpportunityFeatures(id={self.id!r}, type={self.inferred_type!r}, groups={sorted(self.group_hits)})"
+
+
+def _group_rows(values: Sequence[Any]) -> Dict[Any, np.ndarray]:
+    """Row indices per distinct non-empty value (rows sharing eligibility rules are scored together)."""
+    groups: Dict[Any, List[int]] = defaultdict(list)
+    for row, value in enumerate(values):
+        if value:
+            groups[value].append(row)
+    return {value: np.array(rows, dtype=np.intp) for value, rows in groups.items()}
+
+
+def _deadline_columns(item: Any) -> Tuple[float, float, int]:
+    """(deadline_timestamp, parsed ISO deadline, deadline ordinal); inf / max when absent."""
+    get = item.get if isinstance(item, dict) else lambda f: getattr(item, f, None)
+    ts, deadline = get('deadline_timestamp'), get('deadline')
+    parsed = math.inf
+    if not ts and deadline:
+        try:
+            parsed = datetime.fromisoformat(deadline.replace('Z', '+00:00')).timestamp()
+        except (ValueError, TypeError, AttributeError):
+            pass  # Keep if unparseable
+    ordinal = deadline_ordinal(deadline) if isinstance(deadline, str) else None
+    return (float(ts) if ts else math.inf), parsed, (np.iinfo(np.int64).max if ordinal is None else ordinal)
+
+
+class CatalogView:
+    """
+    Column-oriented view of a list of opportunities for batch scoring.
+
+    Keyword and interest-group hits become boolean matrices; eligibility
+    fields are grouped by distinct value so each rule is evaluated once per
+    distinct value instead of once per row.
+    """
+
+    def __init__(
+        self,
+        items: Sequence[Any],
+        features: Sequence[OpportunityFeatures],
+        group_names: Sequence[str],
+        vocabulary: Sequence[str],
+        shared: bool = False,
+        catalog_filter: bool = False,
+        version: Optional[int] = None
+    ):
+        n = len(items)
+        self.version = version                # catalog version for catalog-wide views
+        self.items = list(items)
+        self.features = list(features)
+        self.shared = shared                  # items are catalog-owned and must be copied before mutation
+        self.catalog_filter = catalog_filter  # also drop rows the catalog snapshot would hide (past deadline date)
+
+        self.group_index = {g: i for i, g in enumerate(group_names)}
+        self.vocab_index = {t: i for i, t in enumerate(vocabulary)}
+        self.group_hits = np.zeros((n, len(group_names)), dtype=bool)
+        self.keyword_hits = np.zeros((n, len(vocabulary)), dtype=bool)
+        for row, f in enumerate(self.features):
+            for g in f.group_hits:
+                col = self.group_index.get(g)
+                if col is not None:
+                    self.group_hits[row, col] = True
+            for t in f.keyword_hits:
+                col = self.vocab_index.get(t)
+                if col is not None:
+                    self.keyword_hits[row, col] = True
+        self.texts = [f.text for f in self.features]
+
+        self.gpa_min = np.array([f.gpa_min if f.gpa_min else np.nan for f in self.features], dtype=np.float64)
+        self.has_majors = np.array([bool(f.majors) for f in self.features], dtype=bool)
+        self.majors = _group_rows([f.majors for f in self.features])
+        self.backgrounds = _group_rows([f.backgrounds for f in self.features])
+        self.has_grades = np.array([bool(f.grade_levels) for f in self.features], dtype=bool)
+        self.grade_levels = _group_rows([f.grade_levels for f in self.features])
+
+        self.has_geo = np.array([bool(f.geo_tags) for f in self.features], dtype=bool)
+        self.is_global = np.array([bool(set(f.geo_tags) & GLOBAL_GEO_TAGS) for f in self.features], dtype=bool)
+        geo_rows: Dict[str, List[int]] = defaultdict(list)
+        for row, f in enumerate(self.features):
+            for tag in set(f.geo_tags):
+                if isinstance(tag, str):
+                    geo_rows[tag].append(row)
+        self.geo_rows = {tag: np.array(rows, dtype=np.intp) for tag, rows in geo_rows.items()}
+
+        deadlines = [_deadline_columns(item) for item in self.items]
+        self.deadline_ts = np.array([d[0] for d in deadlines], dtype=np.float64)
+        self.deadline_at = np.array([d[1] for d in deadlines], dtype=np.float64)
+        self.deadline_ordinal = np.array([d[2] for d in deadlines], dtype=np.int64)
+        self._rows: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def rows_of(self, ranking: Sequence[Tuple[str, float]]) -> List[Tuple[int, float]]:
+        """(ID, score) pairs -> (row, score) pairs in this view; IDs no longer live are dropped."""
+        if self._rows is None:
+            self._rows = {item.id: row for row, item in enumerate(self.items)}
+        live = self.live_mask()
+        rows = ((self._rows.get(scholarship_id), score) for scholarship_id, score in ranking)
+        return [(row, score) for row, score in rows if row is not None and live[row]]
+
+    def live_mask(self, now: Optional[float] = None) -> np.ndarray:
+        """Rows whose deadline has not passed (same rules as OpportunityMatchingService)."""
+        if now is None:
+            now = datetime.now().timestamp()
+        mask = (self.deadline_ts >= int(now)) & (self.deadline_at >= now)
+        if self.catalog_filter:
+            mask &= self.deadline_ordinal >= datetime.fromtimestamp(now).date().toordinal()
+        return mask
+
+    def next_expiry(self, rows: Sequence[int]) -> float:
+        """Earliest time at which any of `rows` drops out of live_mask() (inf if never)."""
+        if len(rows) == 0:
+            return math.inf
+        rows = np.asarray(rows, dtype=np.intp)
+        expiry = min(float(np.floor(self.deadline_ts[rows].min())) + 1, float(self.deadline_at[rows].min()))
+        if self.catalog_filter:
+            ordinal = int(self.deadline_ordinal[rows].min())
+            if ordinal < np.iinfo(np.int64).max:
+                # Hidden from the day after its deadline date (local midnight)
+                midnight = datetime.combine(date.fromordinal(ordinal + 1), datetime.min.time())
+                expiry = min(expiry, midnight.timestamp())
+        return expiry
+
+    def take(self, row: int) -> Any:
+        """The opportunity at `row`, detached from shared catalog state."""
+        item = self.items[row]
+        if self.shared:
+            return item.model_copy(update={'match_reasons': list(item.match_reasons)})
+        return item
+
+
+def scoring_dict(opportunity: Scholarship) -> Dict[str, Any]:
+    """Plain-dict view of an opportunity as the scorers read it (no embedding)."""
+    return opportunity.model_dump(exclude={'embedding'})
+
+
+class OpportunityFeatureStore:
+    """
+    Feature records for catalog opportunities, rebuilt on every catalog delta.
+
+    `get()` also accepts opportunities that are not (or no longer) in the
+    catalog; those get a fresh, uncached record.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._features: Dict[str, OpportunityFeatures] = {}
+        self._version = 0
+        self._view: Optional[Tuple[int, CatalogView]] = None
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+    @staticmethod
+    def build(opportunity: Scholarship) -> OpportunityFeatures:
+        from app.services.personalization_engine import personalization_engine
+        return personalization_engine.build_features(scoring_dict(opportunity), source=opportunity)
+
+    def get(self, opportunity: Scholarship) -> OpportunityFeatures:
+        """Cached record when it was built from this exact content, else a fresh one."""
+        cached = self._features.get(opportunity.id)
+        if cached is not None:
+            source = cached.source
+            if all(getattr(opportunity, f) is getattr(source, f) for f in CONTENT_FIELDS):
+                return cached
+        return self.build(opportunity)
+
+    def get_many(self, opportunities: List[Scholarship]) -> List[OpportunityFeatures]:
+        return [self.get(o) for o in opportunities]
+
+    @staticmethod
+    def view(items: Sequence[Any], features: Sequence[OpportunityFeatures], **kwargs) -> CatalogView:
+        from app.services.personalization_engine import personalization_engine
+        return CatalogView(
+            items, features,
+            personalization_engine.keyword_group_names,
+            personalization_engine.keyword_vocabulary,
+            **kwargs
+        )
+
+    def view_of(self, opportunities: List[Scholarship]) -> CatalogView:
+        """Batch-scoring view over an arbitrary opportunity list (not cached)."""
+        return self.view(opportunities, self.get_many(opportunities))
+
+    def catalog_view(self) -> CatalogView:
+        """
+        Batch-scoring view over every catalog entry, rebuilt once per catalog
+        version. Expired entries stay in the view; `live_mask()` excludes them.
+        """
+        with self._lock:
+            version = self._version
+            cached = self._view
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            records = list(self._features.values())
+        view = self.view([f.source for f in records], records, shared=True, catalog_filter=True, version=version)
+        self._view = (version, view)
+        return view
+
+    def on_catalog_change(self, upserted: List[Scholarship], removed: List[str], version: int) -> None:
+        """Opportunity catalog listener: (re)build records for changed documents."""
+        built = {}
+        for s in upserted:
+            try:
+                built[s.id] = self.build(s)
+            except Exception as e:
+                logger.warning("Failed to build opportunity features", scholarship_id=s.id, error=str(e))
+        with self._lock:
+            self._features.update(built)
+            for scholarship_id in removed:
+                self._features.pop(scholarship_id, None)
+            for s in upserted:
+                if s.id not in built:
+                    self._features.pop(s.id, None)
+            self._version = version
+
+
+# Global store, fed by the opportunity catalog
+opportunity_features = OpportunityFeatureStore()
+opportunity_catalog.add_listener(opportunity_features.on_catalog_change)
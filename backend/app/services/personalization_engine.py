@@ -3,12 +3,22 @@ Personalization Engine V2 - Deep Semantic Matching
 Transforms ScholarStream from generic to AI-powered personalization
 FIXED: Duplicate method bug, 30% floor removed, semantic scoring added
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple, Union
+import re
+import numpy as np
 import structlog
 import asyncio
 
+from app.services.keyword_matcher import compile_keyword_groups
+from app.services.opportunity_features import (
+    GLOBAL_GEO_TAGS, CatalogView, OpportunityFeatures, infer_opportunity_type, geo_tag_bits
+)
+
 logger = structlog.get_logger()
 
+# Opportunities tagged with any of GLOBAL_GEO_TAGS are open to every country
+GLOBAL_GEO_MASK = geo_tag_bits.mask(sorted(GLOBAL_GEO_TAGS))
+
 
 class PersonalizationEngine:
     """Advanced personalization using semantic matching and behavioral signals"""
@@ -39,8 +49,58 @@ class PersonalizationEngine:
             'math': ['math', 'mathematics', 'statistics', 'calculus', 'algebra', 'quantitative'],
             'design': ['design', 'ui', 'ux', 'product', 'figma', 'creative', 'graphics'],
         }
+        self._compile_keywords()
         self._gemini_client = None
     
+    def _compile_keywords(self) -> None:
+        """
+        Compile interest_keywords into one matcher plus lower-cased keyword sets.
+        Call again after editing interest_keywords at runtime (cached feature
+        records keep the keyword hits they were built with).
+        """
+        self._keyword_matcher = compile_keyword_groups(self.interest_keywords)
+        self._group_terms: Dict[str, FrozenSet[str]] = {
+            group: frozenset(k.lower() for k in keywords)
+            for group, keywords in self.interest_keywords.items()
+        }
+        # Column order of CatalogView hit matrices
+        self.keyword_group_names = tuple(self._group_terms)
+        self.keyword_vocabulary = tuple(sorted(self._keyword_matcher.vocabulary))
+    
+    def build_features(self, opp: Dict[str, Any], source: Any = None) -> OpportunityFeatures:
+        """
+        Derive everything the scorers read from an opportunity dict, once.
+        Scoring a record gives the same result as scoring the dict it came from.
+        """
+        text = self._get_opportunity_text(opp).lower()
+        hits = self._keyword_matcher.find_all(text)
+        eligibility = self._safe_get_dict(opp, 'eligibility')
+        required_majors = eligibility.get('majors')
+        
+        return OpportunityFeatures(
+            id=opp.get('id'),
+            name=opp.get('name') or opp.get('title') or 'Unknown',
+            text=text,
+            summary_text=f"{opp.get('title')} {opp.get('description')} {' '.join(opp.get('tags') or [])}".lower(),
+            tokens=frozenset(re.findall(r'\w+', text)),
+            keyword_hits=hits,
+            group_hits=frozenset(g for g, terms in self._group_terms.items() if not terms.isdisjoint(hits)),
+            geo_tags=tuple(opp.get('geo_tags') or ()),
+            type_tags=tuple(opp.get('type_tags') or ()),
+            gpa_min=eligibility.get('gpa_min'),
+            majors=tuple(m.lower() for m in required_majors) if required_majors else None,
+            backgrounds=tuple(eligibility.get('backgrounds') or ()),
+            grade_levels=tuple(eligibility.get('grade_levels', []) or eligibility.get('grades_eligible', []) or ()),
+            inferred_type=infer_opportunity_type(opp),
+            source=source
+        )
+    
+    def _features(self, opp: Union[Dict[str, Any], OpportunityFeatures]) -> OpportunityFeatures:
+        """Accept either a precomputed record or a raw opportunity dict."""
+        if isinstance(opp, OpportunityFeatures):
+            return opp
+        return self.build_features(opp)
+    
     def _get_attr(self, obj: Any, attr: str, default: Any = None) -> Any:
         """Helper to get attribute from object or key from dict"""
         if isinstance(obj, dict):
@@ -56,34 +116,36 @@ class PersonalizationEngine:
 
     def calculate_personalized_score(
         self, 
-        opportunity: Dict[str, Any], 
+        opportunity: Union[Dict[str, Any], OpportunityFeatures], 
         user_profile: Any
     ) -> float:
         """
         Calculate personalized match score (0-100)
         V2: REMOVED 30% FLOOR - Scores now range from 0-100 based on true fit
+        Pass a precomputed OpportunityFeatures record to skip per-call text work.
         """
         score = 0.0
         max_score = 100.0
+        features = self._features(opportunity)
         
         # 1. Interest Match (40 points max) - MOST IMPORTANT
-        interest_score = self._score_interests(opportunity, user_profile)
+        interest_score = self._score_interests(features, user_profile)
         score += interest_score * 0.4
         
         # 2. Passion Alignment (30 points max)
-        passion_score = self._score_passions(opportunity, user_profile)
+        passion_score = self._score_passions(features, user_profile)
         score += passion_score * 0.3
         
         # 3. Demographic Match (20 points max)
-        demographic_score = self._score_demographics(opportunity, user_profile)
+        demographic_score = self._score_demographics(features, user_profile)
         score += demographic_score * 0.2
         
         # 4. Academic Fit (10 points max)
-        academic_score = self._score_academics(opportunity, user_profile)
+        academic_score = self._score_academics(features, user_profile)
         score += academic_score * 0.1
         
         try:
-             opp_name = opportunity.get('name') or opportunity.get('title') or 'Unknown'
+             opp_name = features.name
              logger.info(
                 "Personalization V2 Score",
                 opportunity=opp_name[:50],
@@ -106,7 +168,170 @@ class PersonalizationEngine:
         # For users with profiles, show true calculated score
         return float(int(max(min(score, max_score), 5.0)))
     
-    def _score_interests(self, opp: Dict[str, Any], profile: Any) -> float:
+    def score_batch(
+        self,
+        user_profile: Any,
+        view: CatalogView,
+        top_k: Optional[int] = None,
+        live_only: bool = False,
+        now: Optional[float] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Score one profile against every row of `view` with array operations.
+
+        Returns (row, score) pairs, best first (ties keep row order), cut to
+        `top_k` when given. Scores are identical to calculate_personalized_score;
+        `live_only` drops rows whose deadline has passed.
+        """
+        n = len(view)
+        if n == 0:
+            return []
+        
+        interest = self._batch_interests(view, user_profile)
+        passion = self._batch_passions(view, user_profile)
+        demographic = self._batch_demographics(view, user_profile)
+        academic = self._batch_academics(view, user_profile)
+        
+        # Same operation order as calculate_personalized_score, so floats match bit for bit
+        score = interest * 0.4
+        score = score + passion * 0.3
+        score = score + demographic * 0.2
+        score = score + academic * 0.1
+        score = np.trunc(np.maximum(np.minimum(score, 100.0), 5.0))
+        
+        rows = np.flatnonzero(view.live_mask(now)) if live_only else np.arange(n)
+        if top_k is not None and top_k < len(rows):
+            if top_k <= 0:
+                return []
+            # Everything scoring at least the k-th best survives, so ties at the cut stay row-ordered
+            kth = np.partition(score[rows], len(rows) - top_k)[len(rows) - top_k]
+            rows = rows[score[rows] >= kth]
+        order = rows[np.lexsort((rows, -score[rows]))]
+        if top_k is not None:
+            order = order[:top_k]
+        
+        logger.debug("Batch personalization scored", rows=n, returned=len(order))
+        return [(int(row), float(score[row])) for row in order]
+    
+    def _term_column(self, view: CatalogView, term: str) -> np.ndarray:
+        """Rows whose text contains `term` (`term in text`)."""
+        col = view.vocab_index.get(term)
+        if col is not None and term in self._keyword_matcher.vocabulary:
+            return view.keyword_hits[:, col]
+        return np.fromiter((term in text for text in view.texts), dtype=bool, count=len(view))
+    
+    def _group_column(self, view: CatalogView, term: str) -> Optional[np.ndarray]:
+        col = view.group_index.get(term)
+        return view.group_hits[:, col] if col is not None else None
+    
+    def _batch_interests(self, view: CatalogView, profile: Any) -> np.ndarray:
+        """Vectorized _score_interests."""
+        interests = self._get_attr(profile, 'interests') or []
+        if not interests:
+            return np.full(len(view), 50.0)
+        
+        user_interests = [str(i).lower().strip() for i in interests]
+        satisfied = np.zeros(len(view), dtype=np.int64)
+        for interest in user_interests:
+            hit = self._term_column(view, interest)
+            group = self._group_column(view, interest)
+            satisfied += (hit | group) if group is not None else hit
+        
+        match_rate = satisfied / len(user_interests)
+        match_rate = np.where(match_rate > 0.5, np.minimum(match_rate * 1.5, 1.0), match_rate)
+        match_rate = np.where(match_rate > 0.75, np.minimum(match_rate * 1.2, 1.0), match_rate)
+        match_rate = np.where((satisfied > 0) & (match_rate < 0.2), 0.2, match_rate)
+        return match_rate * 100
+    
+    def _batch_passions(self, view: CatalogView, profile: Any) -> np.ndarray:
+        """Vectorized _score_passions."""
+        background = self._get_attr(profile, 'background') or []
+        if not background:
+            return np.full(len(view), 50.0)
+        
+        passion_matches = np.zeros(len(view), dtype=np.int64)
+        for passion in background:
+            if isinstance(passion, str):
+                passion_lower = passion.lower()
+                passion_matches += self._term_column(view, passion_lower)
+                group = self._group_column(view, passion_lower)
+                if group is not None:
+                    passion_matches += group
+        
+        return np.minimum(passion_matches / len(background), 1.0) * 100
+    
+    def _batch_demographics(self, view: CatalogView, profile: Any) -> np.ndarray:
+        """Vectorized _score_demographics; rules run once per distinct eligibility value."""
+        n = len(view)
+        score = np.zeros(n)
+        checks = np.zeros(n, dtype=np.int64)
+        
+        # GPA check
+        user_gpa = self._get_attr(profile, 'gpa')
+        if user_gpa:
+            gpa_min = view.gpa_min
+            has_gpa = ~np.isnan(gpa_min)
+            checks += has_gpa
+            score += np.where(has_gpa & (user_gpa >= gpa_min), 100, np.where(has_gpa & (user_gpa >= gpa_min - 0.3), 50, 0))
+        
+        # Major check (rows without majors are open to all)
+        user_major = self._get_attr(profile, 'major')
+        open_majors = ~view.has_majors
+        checks += open_majors
+        score += np.where(open_majors, 80, 0)
+        if user_major:
+            user_major_lower = user_major.lower()
+            for required_majors, rows in view.majors.items():
+                checks[rows] += 1
+                if any(major in user_major_lower for major in required_majors):
+                    score[rows] += 100
+                elif any(user_major_lower in major for major in required_majors):
+                    score[rows] += 80
+        
+        # Background check
+        user_background = self._get_attr(profile, 'background') or []
+        if user_background:
+            for required_backgrounds, rows in view.backgrounds.items():
+                checks[rows] += 1
+                if any(bg in required_backgrounds for bg in user_background):
+                    score[rows] += 100
+        
+        # Location check
+        user_country = self._get_attr(profile, 'country')
+        located = view.has_geo.copy()
+        checks += located
+        score += np.where(located & view.is_global, 90, 0)
+        located &= ~view.is_global
+        if user_country and isinstance(user_country, str) and user_country in view.geo_rows:
+            match = np.zeros(n, dtype=bool)
+            match[view.geo_rows[user_country]] = True
+            score += np.where(located & match, 100, np.where(located & ~match, 30, 0))
+        else:
+            score += np.where(located, 30, 0)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(checks > 0, score / np.maximum(checks, 1), 60.0)
+    
+    def _batch_academics(self, view: CatalogView, profile: Any) -> np.ndarray:
+        """Vectorized _score_academics."""
+        academic_status = self._get_attr(profile, 'academic_status')
+        if not academic_status:
+            return np.full(len(view), 50.0)
+        
+        score = np.full(len(view), 70.0)  # Open to all academic levels
+        academic_status_lower = academic_status.lower()
+        for grade_levels, rows in view.grade_levels.items():
+            if academic_status in grade_levels:
+                score[rows] = 100.0
+            elif any(level.lower() in academic_status_lower for level in grade_levels):
+                score[rows] = 80.0
+            elif any(academic_status_lower in level.lower() for level in grade_levels):
+                score[rows] = 70.0
+            else:
+                score[rows] = 20.0
+        return score
+    
+    def _score_interests(self, opp: Union[Dict[str, Any], OpportunityFeatures], profile: Any) -> float:
         """Score based on user interests (0-100) - FIXED: No duplicate definition"""
         interests = self._get_attr(profile, 'interests') or []
         
@@ -114,21 +339,16 @@ class PersonalizationEngine:
             return 50.0  # Neutral score if no interests
         
         user_interests = [str(i).lower().strip() for i in interests]
-        opp_text = self._get_opportunity_text(opp).lower()
+        features = self._features(opp)
+        contains = self._keyword_matcher.contains
         
         satisfied_interests = 0
         matched_details = []
         
         for interest in user_interests:
-            # Get keywords for this interest (expand synonyms)
-            keywords = self.interest_keywords.get(interest, [interest])
-            
-            # Check if ANY keyword matches (Interest Satisfied)
-            if any(keyword.lower() in opp_text for keyword in keywords):
-                satisfied_interests += 1
-                matched_details.append(interest)
-            # Also check if the raw interest term appears
-            elif interest in opp_text:
+            # Check if ANY keyword of the interest's group matches (Interest Satisfied)
+            # or the raw interest term appears
+            if interest in features.group_hits or contains(interest, features.text, features.keyword_hits):
                 satisfied_interests += 1
                 matched_details.append(interest)
         
@@ -163,25 +383,26 @@ class PersonalizationEngine:
         
         return match_rate * 100
     
-    def _score_passions(self, opp: Dict[str, Any], profile: Any) -> float:
+    def _score_passions(self, opp: Union[Dict[str, Any], OpportunityFeatures], profile: Any) -> float:
         """Score based on user passions/background (0-100)"""
         background = self._get_attr(profile, 'background') or []
         
         if not background:
             return 50.0
         
-        opp_text = self._get_opportunity_text(opp).lower()
+        features = self._features(opp)
+        contains = self._keyword_matcher.contains
         
         # Check for passion matches
         passion_matches = 0
         for passion in background:
             if isinstance(passion, str):
+                passion_lower = passion.lower()
                 # Check direct match
-                if passion.lower() in opp_text:
+                if contains(passion_lower, features.text, features.keyword_hits):
                     passion_matches += 1
                 # Check keyword expansion
-                expanded = self.interest_keywords.get(passion.lower(), [])
-                if any(kw.lower() in opp_text for kw in expanded):
+                if passion_lower in features.group_hits:
                     passion_matches += 1
         
         if len(background) == 0:
@@ -190,15 +411,15 @@ class PersonalizationEngine:
         match_rate = min(passion_matches / len(background), 1.0)
         return match_rate * 100
     
-    def _score_demographics(self, opp: Dict[str, Any], profile: Any) -> float:
+    def _score_demographics(self, opp: Union[Dict[str, Any], OpportunityFeatures], profile: Any) -> float:
         """Score based on demographic match (0-100)"""
         score = 0.0
         checks = 0
         
-        eligibility = self._safe_get_dict(opp, 'eligibility')
+        features = self._features(opp)
         
         # GPA check
-        gpa_min = eligibility.get('gpa_min')
+        gpa_min = features.gpa_min
         user_gpa = self._get_attr(profile, 'gpa')
         
         if gpa_min and user_gpa:
@@ -209,14 +430,15 @@ class PersonalizationEngine:
                 score += 50
         
         # Major check
-        required_majors = eligibility.get('majors')
+        required_majors = features.majors  # lower-cased
         user_major = self._get_attr(profile, 'major')
         
         if required_majors and user_major:
             checks += 1
-            if any(major.lower() in user_major.lower() for major in required_majors):
+            user_major_lower = user_major.lower()
+            if any(major in user_major_lower for major in required_majors):
                 score += 100
-            elif any(user_major.lower() in major.lower() for major in required_majors):
+            elif any(user_major_lower in major for major in required_majors):
                 score += 80  # Partial match
         elif not required_majors:
             # Open to all majors
@@ -224,7 +446,7 @@ class PersonalizationEngine:
             score += 80
         
         # Background check
-        required_backgrounds = eligibility.get('backgrounds', [])
+        required_backgrounds = features.backgrounds
         user_background = self._get_attr(profile, 'background') or []
         
         if required_backgrounds and user_background:
@@ -233,21 +455,20 @@ class PersonalizationEngine:
                 score += 100
         
         # Location check (Global opportunities score well)
-        geo_tags = opp.get('geo_tags', [])
         user_country = self._get_attr(profile, 'country')
         
-        if geo_tags:
+        if features.geo_tags:
             checks += 1
-            if 'Global' in geo_tags or 'International' in geo_tags:
+            if features.geo_mask & GLOBAL_GEO_MASK:
                 score += 90  # Global = accessible
-            elif user_country and user_country in geo_tags:
+            elif user_country and features.geo_mask & geo_tag_bits.get(user_country):
                 score += 100  # Location match
             else:
                 score += 30  # Location mismatch
         
         return (score / checks) if checks > 0 else 60.0
     
-    def _score_academics(self, opp: Dict[str, Any], profile: Any) -> float:
+    def _score_academics(self, opp: Union[Dict[str, Any], OpportunityFeatures], profile: Any) -> float:
         """Score based on academic fit (0-100)"""
         score = 0.0
         
@@ -255,8 +476,7 @@ class PersonalizationEngine:
         academic_status = self._get_attr(profile, 'academic_status')
         
         if academic_status:
-            eligibility = self._safe_get_dict(opp, 'eligibility')
-            grade_levels = eligibility.get('grade_levels', []) or eligibility.get('grades_eligible', [])
+            grade_levels = self._features(opp).grade_levels
             
             if not grade_levels:
                 # Open to all academic levels
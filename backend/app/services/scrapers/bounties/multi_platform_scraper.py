@@ -1152,16 +1152,12 @@ async def populate_database_multi_platform() -> Dict[str, int]:
     
     results, scholarships = await scrape_all_platforms()
     
-    saved_count = 0
-    for scholarship in scholarships:
-        try:
-            await db.save_scholarship(scholarship)
-            saved_count += 1
-        except Exception as e:
-            logger.warning("Failed to save scholarship", id=scholarship.id, error=str(e))
-            continue
+    outcomes = await db.save_scholarships_bulk(scholarships)
+    for outcome in outcomes:
+        if outcome.status == 'failed':
+            logger.warning("Failed to save scholarship", id=outcome.scholarship_id, error=outcome.error)
     
-    results['saved'] = saved_count
+    results['saved'] = sum(1 for outcome in outcomes if outcome.status != 'failed')
     logger.info("Multi-platform population complete", **results)
     return results
 
@@ -223,14 +223,11 @@ async def populate_database_with_devpost() -> int:
     
     scholarships = await scrape_devpost_api(max_pages=3)
     
-    saved_count = 0
-    for scholarship in scholarships:
-        try:
-            await db.save_scholarship(scholarship)
-            saved_count += 1
-        except Exception as e:
-            logger.warning("Failed to save scholarship", id=scholarship.id, error=str(e))
-            continue
+    outcomes = await db.save_scholarships_bulk(scholarships)
+    for outcome in outcomes:
+        if outcome.status == 'failed':
+            logger.warning("Failed to save scholarship", id=outcome.scholarship_id, error=outcome.error)
+    saved_count = sum(1 for outcome in outcomes if outcome.status != 'failed')
     
     logger.info("DevPost population complete", saved=saved_count, total=len(scholarships))
     return saved_count
@@ -0,0 +1,226 @@
+"""
+Bounded Per-User Match Lists
+`user_matches/{uid}` holds a user's best K opportunities as score-ordered
+IDs plus the scores and a min-score watermark:
+
+    {'scholarship_ids': [...], 'scores': [...], 'min_score': 61.0}
+
+Full re-ranks replace the list (save_user_matches); single opportunities
+arriving in real time are offered to it (offer_user_match). An offer below
+the watermark of a full list is rejected without a write; otherwise it is
+placed by binary search and the lowest entry drops out.
+
+Writes for one user are serialized (load, merge and write under a per-user
+lock), and the cached list is re-read from storage once it is older than
+`user_matches_cache_seconds` (0, the default, re-reads on every write), so
+another process's writes are merged rather than overwritten.
+"""
+import asyncio
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import structlog
+
+from app.config import settings
+from app.infrastructure.opportunity_catalog import opportunity_catalog
+
+logger = structlog.get_logger()
+
+
+class TopKMatches:
+    """The K best (scholarship_id, score) pairs, best first (ties by ID)."""
+
+    def __init__(self, k: int):
+        self.k = k
+        self._entries: List[Tuple[float, str]] = []  # (-score, id), ascending
+        self._scores: Dict[str, float] = {}
+
+    @classmethod
+    def from_ranking(cls, ranking: Iterable[Tuple[str, float]], k: int) -> "TopKMatches":
+        top = cls(k)
+        for scholarship_id, score in ranking:
+            top.offer(scholarship_id, score)
+        return top
+
+    @classmethod
+    def from_doc(cls, doc: Optional[Dict[str, Any]], k: int) -> "TopKMatches":
+        """Load a user_matches document; legacy docs without scores keep their order."""
+        doc = doc or {}
+        ids = doc.get('scholarship_ids') or []
+        scores = doc.get('scores') or []
+        if len(scores) != len(ids):
+            # Pre-top-K documents: rank by stored position only
+            scores = [float(len(ids) - i) / len(ids) for i in range(len(ids))]
+        return cls.from_ranking(zip(ids, scores), k)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, scholarship_id: str) -> bool:
+        return scholarship_id in self._scores
+
+    @property
+    def is_full(self) -> bool:
+        return len(self._entries) >= self.k
+
+    @property
+    def watermark(self) -> Optional[float]:
+        """Score an offer must beat once the list is full (None while it has room)."""
+        return -self._entries[-1][0] if self.is_full and self._entries else None
+
+    def offer(self, scholarship_id: str, score: float) -> bool:
+        """Insert, rescore or reject one opportunity. Returns True if the list changed."""
+        score = float(score)
+        previous = self._scores.get(scholarship_id)
+        if previous == score:
+            return False
+        if previous is None and self.is_full and (-score, scholarship_id) >= self._entries[-1]:
+            return False
+        if previous is not None:
+            self._remove(scholarship_id, previous)
+
+        insort(self._entries, (-score, scholarship_id))
+        self._scores[scholarship_id] = score
+        if len(self._entries) > self.k:
+            _, evicted = self._entries.pop()
+            del self._scores[evicted]
+        return True
+
+    def discard(self, scholarship_id: str) -> bool:
+        score = self._scores.get(scholarship_id)
+        if score is None:
+            return False
+        self._remove(scholarship_id, score)
+        return True
+
+    def _remove(self, scholarship_id: str, score: float) -> None:
+        del self._entries[bisect_left(self._entries, (-score, scholarship_id))]
+        del self._scores[scholarship_id]
+
+    def ids(self) -> List[str]:
+        return [scholarship_id for _, scholarship_id in self._entries]
+
+    def to_doc(self) -> Dict[str, Any]:
+        return {
+            'scholarship_ids': self.ids(),
+            'scores': [-neg for neg, _ in self._entries],
+            'min_score': self.watermark,
+        }
+
+
+class UserMatchStore:
+    """
+    Write-through cache of per-user TopKMatches.
+
+    Opportunities removed from the catalog are dropped from every cached list
+    immediately; the Firestore document catches up on that user's next write.
+    """
+
+    def __init__(self, k: int = 100, max_users: int = 10_000, max_age: float = float("inf")):
+        self.k = k
+        self.max_users = max_users
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._tops: "OrderedDict[str, TopKMatches]" = OrderedDict()
+        self._loaded_at: Dict[str, float] = {}
+        self._dirty: Set[str] = set()
+        self._user_locks: Dict[str, asyncio.Lock] = {}
+        self._lock_holders: Dict[str, int] = {}
+
+        self.accepted = 0
+        self.rejected = 0
+
+    def remember(self, user_id: str, top: TopKMatches) -> None:
+        with self._lock:
+            self._tops[user_id] = top
+            self._tops.move_to_end(user_id)
+            self._loaded_at[user_id] = time.monotonic()
+            self._dirty.discard(user_id)
+            while len(self._tops) > self.max_users:
+                evicted, _ = self._tops.popitem(last=False)
+                self._loaded_at.pop(evicted, None)
+                self._dirty.discard(evicted)
+
+    async def _locked(self, user_id: str) -> asyncio.Lock:
+        """Acquire the user's write lock; release it with `_unlock`."""
+        lock = self._user_locks.setdefault(user_id, asyncio.Lock())
+        self._lock_holders[user_id] = self._lock_holders.get(user_id, 0) + 1
+        await lock.acquire()
+        return lock
+
+    def _unlock(self, user_id: str, lock: asyncio.Lock) -> None:
+        lock.release()
+        self._lock_holders[user_id] -= 1
+        if not self._lock_holders[user_id]:
+            del self._lock_holders[user_id]
+            del self._user_locks[user_id]
+
+    async def load(self, db, user_id: str) -> TopKMatches:
+        """The user's list, re-read from storage when the cached copy may be stale."""
+        top = self._tops.get(user_id)
+        if top is None or time.monotonic() - self._loaded_at.get(user_id, 0.0) >= self.max_age:
+            top = TopKMatches.from_doc(await db.get_user_matches_doc(user_id), self.k)
+            # The stored doc may still list opportunities removed since it was written
+            stale = [sid for sid in top.ids() if opportunity_catalog.is_ready and sid not in opportunity_catalog]
+            self.remember(user_id, top)
+            if any([top.discard(sid) for sid in stale]):
+                self._dirty.add(user_id)
+        return top
+
+    async def offer(self, db, user_id: str, scholarship_id: str, score: float) -> bool:
+        """Offer one scored opportunity; writes only when the list changed."""
+        user_lock = await self._locked(user_id)
+        try:
+            top = await self.load(db, user_id)
+            with self._lock:
+                changed = top.offer(scholarship_id, score)
+                dirty = changed or user_id in self._dirty
+                doc = top.to_doc() if dirty else None
+                self._dirty.discard(user_id)
+            if changed:
+                self.accepted += 1
+            else:
+                self.rejected += 1
+            if doc is not None:
+                try:
+                    await db.set_user_matches_doc(user_id, doc)
+                except Exception:
+                    self._forget(user_id)  # the cached list no longer matches storage
+                    raise
+            return changed
+        finally:
+            self._unlock(user_id, user_lock)
+
+    async def replace(self, db, user_id: str, top: TopKMatches) -> None:
+        """Overwrite the user's list (a full re-rank), serialized with offers."""
+        user_lock = await self._locked(user_id)
+        try:
+            await db.set_user_matches_doc(user_id, top.to_doc())
+            self.remember(user_id, top)
+        finally:
+            self._unlock(user_id, user_lock)
+
+    def _forget(self, user_id: str) -> None:
+        with self._lock:
+            self._tops.pop(user_id, None)
+            self._loaded_at.pop(user_id, None)
+            self._dirty.discard(user_id)
+
+    def on_catalog_change(self, upserted: List[Any], removed: List[str], version: int) -> None:
+        """Opportunity catalog listener: drop removed opportunities from cached lists."""
+        if not removed:
+            return
+        with self._lock:
+            for user_id, top in self._tops.items():
+                if any([top.discard(scholarship_id) for scholarship_id in removed]):
+                    self._dirty.add(user_id)
+
+    def stats(self) -> Dict[str, int]:
+        return {"users": len(self._tops), "accepted": self.accepted, "rejected": self.rejected}
+
+
+# Global store, shared by every FirebaseDB instance
+user_match_store = UserMatchStore(k=settings.user_matches_top_k, max_age=settings.user_matches_cache_seconds)
+opportunity_catalog.add_listener(user_match_store.on_catalog_change)
@@ -0,0 +1,134 @@
+"""
+User Routing Index
+Inverted index from profile terms (interests and background passions) to
+user IDs, so a new opportunity is scored only against users it can match.
+
+A user's interest/passion terms are matched against an opportunity exactly
+as PersonalizationEngine does (keyword group hit, or `term in text`). Users
+with no hit can still score at most 50 (interest*0.4 + passion*0.3 < 30,
+plus 30 from demographics and academics), so for any routing threshold
+above ROUTING_MIN_SCORE the candidate set loses no match.
+
+Geo tags and academic status together contribute at most 30 points; they
+cannot rule a user out on their own and are not index keys.
+"""
+import threading
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+import structlog
+
+from app.services.opportunity_features import OpportunityFeatures
+
+logger = structlog.get_logger()
+
+# Candidate sets are exact for routing thresholds strictly above this score
+ROUTING_MIN_SCORE = 50
+
+
+def _get_attr(obj: Any, attr: str, default: Any = None) -> Any:
+    if isinstance(obj, dict):
+        return obj.get(attr, default)
+    return getattr(obj, attr, default)
+
+
+def profile_terms(profile: Any) -> FrozenSet[str]:
+    """Normalized interest and passion terms, as the scorers read them."""
+    interests = _get_attr(profile, 'interests') or []
+    background = _get_attr(profile, 'background') or []
+    terms = {str(i).lower().strip() for i in interests}
+    terms.update(p.lower() for p in background if isinstance(p, str))
+    return frozenset(terms)
+
+
+def is_open_profile(profile: Any) -> bool:
+    """No interests and no background: neutral scores, can match anything."""
+    return not (_get_attr(profile, 'interests') or []) and not (_get_attr(profile, 'background') or [])
+
+
+class UserRoutingIndex:
+    """term -> user IDs, plus the routing profile of every indexed user."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._profiles: Dict[str, Any] = {}
+        self._user_terms: Dict[str, FrozenSet[str]] = {}
+        self._term_users: Dict[str, Set[str]] = {}
+        self._open_users: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._profiles
+
+    def upsert(self, user_id: str, profile: Any) -> None:
+        """Index (or re-index) a user's profile."""
+        terms = profile_terms(profile)
+        with self._lock:
+            self._unlink(user_id)
+            self._profiles[user_id] = profile
+            self._user_terms[user_id] = terms
+            for term in terms:
+                self._term_users.setdefault(term, set()).add(user_id)
+            if is_open_profile(profile):
+                self._open_users.add(user_id)
+
+    def refresh_profile(self, user_id: str, profile: Dict[str, Any]) -> None:
+        """
+        Apply a profile write. Users indexed with their full user document
+        (as the WebSocket layer caches it) keep that shape, with `profile` replaced.
+        """
+        existing = self._profiles.get(user_id)
+        if isinstance(existing, dict) and 'profile' in existing:
+            profile = {**existing, 'profile': profile}
+        self.upsert(user_id, profile)
+
+    def remove(self, user_id: str) -> None:
+        with self._lock:
+            self._unlink(user_id)
+            self._profiles.pop(user_id, None)
+
+    def _unlink(self, user_id: str) -> None:
+        for term in self._user_terms.pop(user_id, ()):
+            users = self._term_users.get(term)
+            if users is not None:
+                users.discard(user_id)
+                if not users:
+                    del self._term_users[term]
+        self._open_users.discard(user_id)
+
+    def profile(self, user_id: str) -> Optional[Any]:
+        return self._profiles.get(user_id)
+
+    def hit_terms(self, features: OpportunityFeatures) -> List[str]:
+        """Indexed terms the opportunity matches (group hit or substring of its text)."""
+        from app.services.personalization_engine import personalization_engine
+        contains = personalization_engine._keyword_matcher.contains
+        return [
+            term for term in list(self._term_users)
+            if term in features.group_hits or contains(term, features.text, features.keyword_hits)
+        ]
+
+    def candidates(self, features: OpportunityFeatures, among: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Users who can score above ROUTING_MIN_SCORE for this opportunity.
+        With `among`, restricts to those IDs; IDs that were never indexed are
+        kept, since nothing is known about them.
+        """
+        hits = self.hit_terms(features)
+        with self._lock:
+            matched = set(self._open_users)
+            for term in hits:
+                matched |= self._term_users.get(term, set())
+        if among is None:
+            return sorted(matched)
+        return [uid for uid in among if uid in matched or uid not in self._profiles]
+
+    def candidate_profiles(self, features: OpportunityFeatures) -> List[Tuple[str, Any]]:
+        return [(uid, self._profiles[uid]) for uid in self.candidates(features) if uid in self._profiles]
+
+    def stats(self) -> Dict[str, int]:
+        return {"users": len(self._profiles), "terms": len(self._term_users), "open_users": len(self._open_users)}
+
+
+# Global index, maintained on WebSocket connect/profile updates and profile writes
+user_routing_index = UserRoutingIndex()
@@ -4,6 +4,7 @@ import google.generativeai as genai
 from typing import List, Optional, Any
 from app.config import settings
 from app.models import DeepUserProfile, OpportunitySchema
+from app.services.embedding_cache import embedding_cache, embedding_cache_key, normalize_query
 
 logger = structlog.get_logger()
 
@@ -19,6 +20,36 @@ class VectorizationService:
     
     MODEL_NAME = "models/embedding-001"
 
+    def _embed(
+        self,
+        text: str,
+        task_type: str,
+        title: Optional[str] = None,
+        cache_text: Optional[str] = None
+    ) -> List[float]:
+        """
+        Embed `text`, served from the content-addressed cache when possible.
+        `cache_text` (default: `text`) is what the cache key is derived from.
+        Raises on API failure (callers own the error handling).
+        """
+        key = embedding_cache_key(self.MODEL_NAME, task_type, cache_text if cache_text is not None else text, title)
+        if settings.embedding_cache_enabled:
+            cached = embedding_cache.get(key)
+            if cached is not None:
+                return cached
+
+        kwargs = {"title": title} if title else {}
+        result = genai.embed_content(
+            model=self.MODEL_NAME,
+            content=text,
+            task_type=task_type,
+            **kwargs
+        )
+        embedding = result['embedding']
+        if settings.embedding_cache_enabled:
+            embedding_cache.put(key, embedding)
+        return embedding
+
     async def vectorize_profile(self, profile: DeepUserProfile) -> Optional[List[float]]:
         """
         Generate a single vector embedding representing the user's entire professional identity.
@@ -32,15 +63,8 @@ class VectorizationService:
         dna_text = self._synthesize_dna(profile)
         
         try:
-            # 2. Call Gemini
-            result = genai.embed_content(
-                model=self.MODEL_NAME,
-                content=dna_text,
-                task_type="retrieval_document",
-                title="User Professional Profile"
-            )
-            
-            embedding = result['embedding']
+            # 2. Call Gemini (unchanged profiles are served from the cache)
+            embedding = self._embed(dna_text, "retrieval_document", title="User Professional Profile")
             logger.info("Generated Digital DNA Vector", dimensions=len(embedding))
             return embedding
 
@@ -76,21 +100,42 @@ class VectorizationService:
         if not settings.gemini_api_key:
             return None
             
-        # Synthesize text for embedding
-        text = f"{opportunity.title} {opportunity.description} {' '.join(opportunity.geo_tags)} {' '.join(opportunity.type_tags)}"
+        text = self._opportunity_text(opportunity)
         
         try:
-            result = genai.embed_content(
-                model=self.MODEL_NAME,
-                content=text,
-                task_type="retrieval_document",
-                title=opportunity.title
-            )
-            return result['embedding']
+            return self._embed(text, "retrieval_document", title=opportunity.title)
         except Exception as e:
             logger.error("Opportunity vectorization failed", error=str(e))
             return None
 
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed many documents in one API call (retrieval_document, no per-document title).
+        Cached texts are served locally; only misses are sent. Raises on API failure.
+        """
+        keys = [embedding_cache_key(self.MODEL_NAME, "retrieval_document", text) for text in texts]
+        embeddings: List[Optional[List[float]]] = [
+            embedding_cache.get(key) if settings.embedding_cache_enabled else None for key in keys
+        ]
+        missing = [i for i, e in enumerate(embeddings) if e is None]
+
+        if missing:
+            result = genai.embed_content(
+                model=self.MODEL_NAME,
+                content=[texts[i] for i in missing],
+                task_type="retrieval_document"
+            )
+            for i, embedding in zip(missing, result['embedding']):
+                embeddings[i] = embedding
+                if settings.embedding_cache_enabled:
+                    embedding_cache.put(keys[i], embedding)
+        return embeddings
+
+    @staticmethod
+    def _opportunity_text(opportunity: OpportunitySchema) -> str:
+        """Synthesize the text embedded for an opportunity."""
+        return f"{opportunity.title} {opportunity.description} {' '.join(opportunity.geo_tags)} {' '.join(opportunity.type_tags)}"
+
     async def vectorize_query(self, query: str) -> Optional[List[float]]:
         """
         Generate embedding for a search query.
@@ -106,13 +151,9 @@ class VectorizationService:
             return None
         
         try:
-            result = genai.embed_content(
-                model=self.MODEL_NAME,
-                content=query.strip(),
-                task_type="retrieval_query"  # Optimized for search queries
-            )
-            
-            embedding = result['embedding']
+            # retrieval_query is optimized for search; the original text is embedded,
+            # only the cache key is normalized so trivially different repeats hit it
+            embedding = self._embed(query, "retrieval_query", cache_text=normalize_query(query))
             logger.info("Generated query embedding", query_preview=query[:50], dimensions=len(embedding))
             return embedding
             
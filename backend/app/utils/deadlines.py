@@ -0,0 +1,53 @@
+"""
+Deadline normalization.
+
+`deadline` (ISO 8601 string) is what scrapers and the UI speak;
+`deadline_timestamp` (epoch seconds) is what storage filters on. Writes
+derive the timestamp from the string once, so reads range-query
+`deadline_timestamp >= now` (plus `== null` for rolling opportunities)
+instead of parsing strings per row.
+
+A date-only deadline stays live through the end of that day (UTC). Naive
+datetimes are read as UTC.
+"""
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+DEADLINE_TS_FIELD = 'deadline_timestamp'
+
+
+def deadline_timestamp(deadline: Optional[str]) -> Optional[int]:
+    """Epoch seconds at which an ISO deadline passes; None when missing or unparseable"""
+    if not deadline or not isinstance(deadline, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(deadline.strip().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    if len(deadline.strip()) == 10:  # YYYY-MM-DD
+        parsed += timedelta(days=1, seconds=-1)
+    return int(parsed.timestamp())
+
+
+def normalize_deadline(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Set doc['deadline_timestamp'] in place and return doc. The string wins when
+    it parses; a bare numeric timestamp is kept. The field is always present
+    (None for rolling/unknown) so `== null` queries find undated documents.
+    """
+    ts = deadline_timestamp(doc.get('deadline'))
+    if ts is None:
+        existing = doc.get(DEADLINE_TS_FIELD)
+        ts = int(existing) if isinstance(existing, (int, float)) and not isinstance(existing, bool) and existing > 0 else None
+    doc[DEADLINE_TS_FIELD] = ts
+    return doc
+
+
+def is_expired(ts: Optional[float], now: Optional[float] = None) -> bool:
+    """True if a normalized deadline has passed (undated opportunities never expire)"""
+    if ts is None:
+        return False
+    return ts < (time.time() if now is None else now)
@@ -0,0 +1,56 @@
+"""
+Packed embedding storage.
+
+Opportunity embeddings are stored in Firestore as `embedding_f32`: the
+vector as little-endian float32 bytes (3 KB for 768 dims, one blob value)
+instead of an array of 768 doubles. Reads decode the bytes with
+np.frombuffer, a zero-copy read-only view, so no per-element Python floats
+are created and validation does not walk the vector.
+
+Documents written before the migration still carry the `embedding` array;
+as_vector accepts both.
+"""
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+EMBEDDING_FIELD = 'embedding'
+PACKED_FIELD = 'embedding_f32'
+
+# Storage dtype: float32, little-endian regardless of host byte order
+PACKED_DTYPE = np.dtype('<f4')
+
+
+def pack_embedding(vector: Any) -> bytes:
+    return np.ascontiguousarray(vector, dtype=PACKED_DTYPE).tobytes()
+
+
+def unpack_embedding(raw: bytes) -> np.ndarray:
+    """Zero-copy float32 view over packed bytes."""
+    return np.frombuffer(raw, dtype=PACKED_DTYPE)
+
+
+def as_vector(value: Any) -> Optional[np.ndarray]:
+    """Packed bytes, a float sequence or an array -> 1-D float32 array (None if empty)."""
+    if value is None:
+        return None
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        vector = unpack_embedding(value)
+    else:
+        vector = np.asarray(value, dtype=np.float32)
+    if vector.ndim != 1:
+        raise ValueError(f"embedding must be 1-D, got shape {vector.shape}")
+    return vector if vector.size else None
+
+
+def to_firestore(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Prepare a model dump for writing: the `embedding` vector becomes packed
+    `embedding_f32` bytes. A missing vector writes neither field, so an
+    upsert without one never clears a stored embedding.
+    """
+    doc = dict(doc)
+    vector = as_vector(doc.pop(EMBEDDING_FIELD, None))
+    if vector is not None:
+        doc[PACKED_FIELD] = pack_embedding(vector)
+    return doc
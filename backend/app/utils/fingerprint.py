@@ -0,0 +1,61 @@
+"""
+Content fingerprints for opportunity documents.
+
+Scrapers re-upsert the same opportunities every patrol. Each document stores
+`content_fingerprint`, a SHA-256 of its canonical content, so a re-upsert
+whose merged result hashes the same is skipped instead of written (a write
+also wakes every snapshot listener on the collection).
+
+Fields that change on every scrape without changing the opportunity
+(`last_verified`), per-user scoring output and the embedding (maintained
+by the backfill worker) are left out of the hash.
+"""
+import hashlib
+import json
+import threading
+from typing import Any, Dict, Optional
+
+FINGERPRINT_FIELD = 'content_fingerprint'
+
+VOLATILE_FIELDS = frozenset({
+    FINGERPRINT_FIELD, 'last_verified', 'match_score', 'match_reasons', 'embedding', 'embedding_f32'
+})
+
+
+def content_fingerprint(doc: Dict[str, Any]) -> str:
+    """Stable SHA-256 of a document's content, ignoring volatile fields."""
+    content = {key: value for key, value in doc.items() if key not in VOLATILE_FIELDS}
+    canonical = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def is_unchanged(doc: Dict[str, Any], existing: Optional[Dict[str, Any]]) -> bool:
+    """True if `existing` was written with the same fingerprint as `doc`."""
+    return bool(existing) and existing.get(FINGERPRINT_FIELD) == doc.get(FINGERPRINT_FIELD)
+
+
+class WriteStats:
+    """Outcome counters for opportunity upserts."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.written = 0  # new documents
+        self.merged = 0   # existing documents whose content changed
+        self.skipped = 0  # unchanged re-upserts, no write issued
+
+    def record(self, outcome: str, count: int = 1) -> None:
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + count)
+
+    def stats(self) -> Dict[str, float]:
+        total = self.written + self.merged + self.skipped
+        return {
+            "written": self.written,
+            "merged": self.merged,
+            "skipped": self.skipped,
+            "skip_rate": round(self.skipped / total, 4) if total else 0.0,
+        }
+
+
+# Global counters, shared by every FirebaseDB instance
+scholarship_write_stats = WriteStats()
@@ -0,0 +1,64 @@
+"""
+Keyset pagination over score-ranked lists.
+
+Items are ordered by score descending, ties by ID ascending. That is the
+order of the stored top-K match lists. A cursor is the (score, id) of the
+last item already served, as opaque base64url JSON. The next page starts
+strictly after that key. Pages stay stable when the list is re-ranked
+between requests: no offsets shift. An item whose score moved across the
+cursor may be skipped or repeated once.
+"""
+import base64
+import json
+from bisect import bisect_right
+from typing import Callable, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# (score, id) of an item
+RankKey = Tuple[float, str]
+
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(score: float, item_id: str) -> str:
+    raw = json.dumps([float(score), item_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> RankKey:
+    """Inverse of encode_cursor. Raises ValueError on anything malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        score, item_id = json.loads(raw)
+        return float(score), str(item_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def paginate(
+    items: Sequence[T],
+    key: Callable[[T], RankKey],
+    cursor: Optional[str] = None,
+    limit: int = MAX_PAGE_SIZE
+) -> Tuple[List[T], Optional[str]]:
+    """
+    One page of `items` in rank order, starting after `cursor`.
+    Returns (page, next_cursor); next_cursor is None on the last page.
+    Input that is already in rank order is sorted in linear time.
+    """
+    def order(item: T) -> Tuple[float, str]:
+        score, item_id = key(item)
+        return -score, item_id
+
+    ordered = sorted(items, key=order)
+    start = 0
+    if cursor:
+        score, item_id = decode_cursor(cursor)
+        start = bisect_right(ordered, (-score, item_id), key=order)
+
+    page = ordered[start:start + limit]
+    next_cursor = None
+    if page and start + limit < len(ordered):
+        next_cursor = encode_cursor(*key(page[-1]))
+    return page, next_cursor
@@ -0,0 +1,49 @@
+"""
+Placeholder-preserving merge for scraped opportunities.
+
+Fast scrapes often carry thin data ($0 prizes, "See details", no deadline)
+for opportunities a deep scrape already filled in. Before an upsert, the
+incoming document is merged with the stored one so richer fields survive.
+"""
+from typing import Any, Dict, Optional
+
+PLACEHOLDER_AMOUNT_DISPLAYS = {
+    '', '$0', '0', 'see details', 'see listing', 'tbd', 'unknown', 'varies', 'prizes + swag (view details)'
+}
+
+UNION_KEYS = ('tags', 'geo_tags', 'type_tags')
+
+
+def is_placeholder_amount_display(value: Any) -> bool:
+    return str(value or '').strip().lower() in PLACEHOLDER_AMOUNT_DISPLAYS
+
+
+def merge_preserving(incoming: Dict[str, Any], existing: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Return `incoming` with empty/placeholder fields backfilled from `existing`
+    and tag lists unioned (existing order first). `incoming` is not modified.
+    """
+    merged = dict(incoming)
+    if not existing:
+        return merged
+
+    if float(merged.get('amount') or 0) <= 0 and float(existing.get('amount') or 0) > 0:
+        merged['amount'] = existing.get('amount')
+
+    if is_placeholder_amount_display(merged.get('amount_display')) and not is_placeholder_amount_display(existing.get('amount_display')):
+        merged['amount_display'] = existing.get('amount_display')
+
+    if not merged.get('deadline') and existing.get('deadline'):
+        merged['deadline'] = existing.get('deadline')
+        merged['deadline_timestamp'] = existing.get('deadline_timestamp')
+
+    if (not (merged.get('description') or '').strip()) and (existing.get('description') or '').strip():
+        merged['description'] = existing.get('description')
+
+    for key in UNION_KEYS:
+        inc = merged.get(key) or []
+        ex = existing.get(key) or []
+        if isinstance(inc, list) and isinstance(ex, list):
+            merged[key] = list(dict.fromkeys([*ex, *inc]))
+
+    return merged
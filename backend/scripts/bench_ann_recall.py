@@ -0,0 +1,79 @@
+"""
+Benchmark: IVF ANN index recall vs latency
+Builds an exact EmbeddingIndex and an IVFIndex over the same clustered
+synthetic embeddings, then sweeps nprobe and reports recall@k against the
+exact search together with per-query latency.
+
+Usage:
+    python scripts/bench_ann_recall.py [--rows 200000] [--queries 100] [--k 20] [--noise 2.0]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.infrastructure.ann_index import IVFIndex
+from app.infrastructure.embedding_index import EmbeddingIndex
+
+DIM = 768
+
+
+def clustered_embeddings(n: int, clusters: int, noise: float, rng: np.random.Generator) -> np.ndarray:
+    """Topic-clustered vectors; real opportunity embeddings group by domain."""
+    centers = rng.standard_normal((clusters, DIM), dtype=np.float32)
+    labels = rng.integers(0, clusters, n)
+    return centers[labels] + noise * rng.standard_normal((n, DIM), dtype=np.float32)
+
+
+def timed_search(index, queries, k, **kwargs):
+    results, timings = [], []
+    for q in queries:
+        start = time.perf_counter()
+        results.append({sid for sid, _ in index.search(q, limit=k, min_similarity=0.0, **kwargs)})
+        timings.append(time.perf_counter() - start)
+    return results, np.array(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--clusters", type=int, default=500)
+    parser.add_argument("--noise", type=float, default=2.0, help="Within-topic spread (higher = harder)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    vectors = clustered_embeddings(args.rows, args.clusters, args.noise, rng)
+    ids = [f"opp_{i}" for i in range(args.rows)]
+    expiry = np.full(args.rows, np.iinfo(np.int64).max, dtype=np.int64)
+
+    exact = EmbeddingIndex.from_arrays(ids, vectors, expiry)
+    ivf = IVFIndex.from_arrays(ids, vectors, expiry)
+
+    start = time.perf_counter()
+    ivf.train()
+    print(f"Trained IVF: rows={args.rows:,} nlist={ivf.nlist} in {time.perf_counter() - start:.1f}s")
+
+    queries = vectors[rng.integers(0, args.rows, args.queries)] + 0.3 * rng.standard_normal((args.queries, DIM), dtype=np.float32)
+    truth, exact_ms = timed_search(exact, queries, args.k)
+    print(f"Exact scan: p50={np.percentile(exact_ms, 50):.2f} ms  p99={np.percentile(exact_ms, 99):.2f} ms\n")
+
+    print(f"{'nprobe':>6} | {'recall@' + str(args.k):>10} | {'p50 (ms)':>9} | {'p99 (ms)':>9} | {'speedup':>8}")
+    print("-" * 54)
+    for nprobe in [1, 2, 4, 8, 16, 32, 64]:
+        if nprobe > ivf.nlist:
+            break
+        got, ivf_ms = timed_search(ivf, queries, args.k, nprobe=nprobe)
+        recall = np.mean([len(t & g) / max(1, len(t)) for t, g in zip(truth, got)])
+        p50 = np.percentile(ivf_ms, 50)
+        print(f"{nprobe:>6} | {recall:>10.3f} | {p50:>9.2f} | {np.percentile(ivf_ms, 99):>9.2f} | {np.percentile(exact_ms, 50) / p50:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
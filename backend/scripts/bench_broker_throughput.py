@@ -0,0 +1,80 @@
+"""
+Benchmark: MemoryBroker throughput vs partition count
+Publishes events for a set of keys (crawled URLs) to one subscription whose
+handler awaits a fixed latency (asyncio.sleep stands in for the Gemini or
+Firestore call), once per partition count. Reports events/s, end-to-end
+latency, and whether every key's events were handled in publish order.
+
+Usage:
+    python scripts/bench_broker_throughput.py [--events 2000] [--keys 64] [--latency-ms 5] [--partitions 1 2 4 8 16]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+import structlog
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.infrastructure.memory_broker import MemoryBroker
+
+
+async def run(partitions, args):
+    latency_s = args.latency_ms / 1e3
+    broker = MemoryBroker(max_queue=args.events, partitions=partitions, drain_timeout=600.0)
+    seen = {}
+    latencies = []
+
+    async def handler(payload):
+        await asyncio.sleep(latency_s)
+        seen.setdefault(payload["key"], []).append(payload["n"])
+        latencies.append(time.perf_counter() - payload["published_at"])
+
+    await broker.subscribe("raw", handler)
+    await broker.start()
+    keys = [f"https://example.org/opportunity/{i}" for i in range(args.keys)]
+    start = time.perf_counter()
+    for n in range(args.events):
+        key = keys[n % len(keys)]
+        await broker.publish("raw", key, {"key": key, "n": n, "published_at": time.perf_counter()})
+    await broker.stop()
+    elapsed = time.perf_counter() - start
+
+    ordered = all(ns == sorted(ns) for ns in seen.values())
+    return elapsed, latencies, ordered
+
+
+def report(partitions, events, elapsed, latencies, ordered):
+    latencies_ms = sorted(latency * 1e3 for latency in latencies) or [0.0]
+    p99 = latencies_ms[min(len(latencies_ms) - 1, int(len(latencies_ms) * 0.99))]
+    print(
+        f"partitions {partitions:3d}  wall {elapsed:6.2f}s  {events / elapsed:8.0f} events/s  "
+        f"latency median {statistics.median(latencies_ms):8.1f} ms  p99 {p99:8.1f} ms  "
+        f"per-key order {'ok' if ordered else 'VIOLATED'}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--keys", type=int, default=64)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--partitions", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    # Keep broker logging out of the measurement
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    print(f"events: {args.events}  keys: {args.keys}  handler latency: {args.latency_ms:.0f} ms")
+    for partitions in args.partitions:
+        elapsed, latencies, ordered = asyncio.run(run(partitions, args))
+        report(partitions, args.events, elapsed, latencies, ordered)
+
+
+if __name__ == "__main__":
+    main()
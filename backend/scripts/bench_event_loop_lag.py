@@ -0,0 +1,94 @@
+"""
+Benchmark: event-loop lag under concurrent Firestore-style requests
+Simulates concurrent /matched-like requests, each making a couple of
+blocking client calls (time.sleep stands in for the network round trip),
+once with the calls made inline on the event loop and once through
+FirestoreExecutor. A ticker task measures how late the loop wakes it,
+which is the delay every other coroutine (WebSocket heartbeats, other
+requests) sees.
+
+Usage:
+    python scripts/bench_event_loop_lag.py [--requests 200] [--calls 2] [--latency-ms 20]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+import structlog
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.infrastructure.firestore_executor import FirestoreExecutor
+
+TICK_S = 0.005
+
+
+def blocking_call(latency_s):
+    time.sleep(latency_s)
+    return {}
+
+
+async def ticker(lags, stop):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + TICK_S
+        await asyncio.sleep(TICK_S)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def run(mode, args, executor):
+    latency_s = args.latency_ms / 1e3
+
+    async def request():
+        for _ in range(args.calls):
+            if mode == "inline":
+                blocking_call(latency_s)
+            else:
+                await executor.run(blocking_call, latency_s)
+
+    lags, stop = [], asyncio.Event()
+    tick = asyncio.create_task(ticker(lags, stop))
+    await asyncio.sleep(TICK_S * 2)
+    start = time.perf_counter()
+    await asyncio.gather(*(request() for _ in range(args.requests)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await tick
+    return elapsed, lags
+
+
+def report(mode, elapsed, lags):
+    lags_ms = sorted(lag * 1e3 for lag in lags) or [0.0]
+    p99 = lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))]
+    print(
+        f"{mode:<9} wall {elapsed:6.2f}s  ticks {len(lags):5d}  "
+        f"lag median {statistics.median(lags_ms):7.1f} ms  p99 {p99:7.1f} ms  max {lags_ms[-1]:7.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--calls", type=int, default=2)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--workers", type=int, default=32)
+    args = parser.parse_args()
+
+    # Keep executor logging out of the measurement
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    print(f"requests: {args.requests}  calls/request: {args.calls}  call latency: {args.latency_ms:.0f} ms")
+    executor = FirestoreExecutor(max_workers=args.workers, timeout=60.0)
+    for mode in ("inline", "executor"):
+        elapsed, lags = asyncio.run(run(mode, args, executor))
+        report(mode, elapsed, lags)
+    executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
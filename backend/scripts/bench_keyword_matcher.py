@@ -0,0 +1,119 @@
+"""
+Benchmark: interest/passion keyword scoring
+Compares the legacy per-keyword substring scan with the compiled
+KeywordMatcher (via precomputed feature records) on a synthetic catalog,
+and checks the scores are identical.
+
+Usage:
+    python scripts/bench_keyword_matcher.py [--opportunities 2000] [--users 50]
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+import structlog
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.personalization_engine import PersonalizationEngine
+
+FILLER = (
+    "students applicants must submit a project demo team prize pool winners will receive "
+    "mentorship funding the program is open to undergraduate graduate learners worldwide "
+    "deadline eligibility judging criteria include impact originality technical execution"
+).split()
+
+
+def legacy_scores(engine, opp, profile):
+    """Copy of _score_interests + _score_passions keyword logic before compilation."""
+    interests = [str(i).lower().strip() for i in profile['interests']]
+    opp_text = engine._get_opportunity_text(opp).lower()
+    satisfied = sum(
+        1 for interest in interests
+        if any(k.lower() in opp_text for k in engine.interest_keywords.get(interest, [interest]))
+        or interest in opp_text
+    )
+    opp_text = engine._get_opportunity_text(opp).lower()
+    passions = 0
+    for passion in profile['background']:
+        if passion.lower() in opp_text:
+            passions += 1
+        if any(k.lower() in opp_text for k in engine.interest_keywords.get(passion.lower(), [])):
+            passions += 1
+    return satisfied, passions
+
+
+def make_catalog(n, rng, terms):
+    catalog = []
+    for i in range(n):
+        words = rng.choices(FILLER, k=rng.randint(60, 160)) + rng.choices(terms, k=rng.randint(2, 8))
+        rng.shuffle(words)
+        catalog.append({
+            'name': f"Opportunity {i} " + " ".join(rng.choices(terms, k=2)),
+            'description': " ".join(words),
+            'organization': "Example Org",
+            'tags': rng.choices(terms, k=3),
+            'type_tags': ['Hackathon'],
+            'geo_tags': ['Global'],
+            'eligibility_text': " ".join(rng.choices(FILLER, k=20)),
+        })
+    return catalog
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--opportunities", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=50)
+    args = parser.parse_args()
+
+    # Keep per-score debug logging out of the measurement
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.INFO))
+
+    rng = random.Random(3)
+    engine = PersonalizationEngine()
+    groups = list(engine.interest_keywords)
+    terms = [k for ks in engine.interest_keywords.values() for k in ks]
+    catalog = make_catalog(args.opportunities, rng, terms)
+    users = [
+        {'interests': rng.sample(groups, 4) + ["climate"], 'background': rng.sample(groups, 2)}
+        for _ in range(args.users)
+    ]
+    pairs = args.opportunities * args.users
+
+    start = time.perf_counter()
+    for profile in users:
+        for opp in catalog:
+            legacy_scores(engine, opp, profile)
+    legacy_s = time.perf_counter() - start
+
+    # Feature records are built once per opportunity when it enters the catalog
+    start = time.perf_counter()
+    features = [engine.build_features(opp) for opp in catalog]
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for profile in users:
+        for record in features:
+            engine._score_interests(record, profile)
+            engine._score_passions(record, profile)
+    compiled_s = time.perf_counter() - start
+
+    mismatches = sum(
+        1 for profile in users[:5] for opp in catalog
+        if engine._score_passions(opp, profile) != min(legacy_scores(engine, opp, profile)[1] / len(profile['background']), 1.0) * 100
+    )
+
+    print(f"pairs scored:     {pairs:,}")
+    print(f"legacy scan:      {legacy_s:.2f}s  ({legacy_s / pairs * 1e6:.1f} us/pair)")
+    print(f"feature build:    {build_s:.2f}s  ({build_s / len(catalog) * 1e6:.0f} us/opportunity, once)")
+    print(f"compiled matcher: {compiled_s:.2f}s  ({compiled_s / pairs * 1e6:.1f} us/pair)")
+    print(f"speedup:          {legacy_s / (compiled_s + build_s):.1f}x (including build)")
+    print(f"passion score mismatches (5 users): {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark: semantic_search engines
+Compares the legacy pure-Python cosine scan with the NumPy EmbeddingIndex at
+10k / 100k / 500k opportunities (768-dim, synthetic embeddings).
+
+Usage:
+    python scripts/bench_semantic_search.py [--sizes 10000 100000 500000] [--queries 20]
+
+The pure-Python baseline is measured on a 5k-row sample and extrapolated
+linearly; scanning 500k rows in Python takes minutes per query.
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.infrastructure.embedding_index import EmbeddingIndex
+
+DIM = 768
+BASELINE_SAMPLE = 5000
+
+
+def legacy_cosine(vec_a, vec_b):
+    """Copy of FirebaseDB._cosine_similarity"""
+    dot_product = sum(a * b for a, b in zip(vec_a, vec_b))
+    magnitude_a = math.sqrt(sum(a * a for a in vec_a))
+    magnitude_b = math.sqrt(sum(b * b for b in vec_b))
+    if magnitude_a == 0 or magnitude_b == 0:
+        return 0.0
+    return dot_product / (magnitude_a * magnitude_b)
+
+
+def bench_legacy(vectors: np.ndarray, query: np.ndarray) -> float:
+    rows = vectors[:BASELINE_SAMPLE].tolist()
+    q = query.tolist()
+    start = time.perf_counter()
+    scored = [(legacy_cosine(q, r), i) for i, r in enumerate(rows)]
+    scored = [s for s in scored if s[0] >= 0.55]
+    scored.sort(reverse=True)
+    elapsed = time.perf_counter() - start
+    return elapsed * (len(vectors) / len(rows))
+
+
+def bench_index(n: int, queries: int, rng: np.random.Generator):
+    vectors = rng.standard_normal((n, DIM), dtype=np.float32)
+
+    index = EmbeddingIndex(dim=DIM, initial_capacity=n)
+    start = time.perf_counter()
+    for i in range(n):
+        index.upsert(f"opp_{i}", vectors[i])
+    build_s = time.perf_counter() - start
+
+    query_vectors = vectors[rng.integers(0, n, queries)] + rng.standard_normal((queries, DIM), dtype=np.float32) * 0.3
+    index.search(query_vectors[0], limit=20)  # warm up
+
+    timings = []
+    for q in query_vectors:
+        start = time.perf_counter()
+        index.search(q, limit=20, min_similarity=0.55)
+        timings.append(time.perf_counter() - start)
+
+    legacy_s = bench_legacy(vectors, query_vectors[0])
+    return build_s, np.array(timings), legacy_s
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 500_000])
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    print(f"{'rows':>9} | {'build (s)':>9} | {'p50 (ms)':>9} | {'p99 (ms)':>9} | {'legacy est (ms)':>15} | {'speedup':>8}")
+    print("-" * 75)
+    for n in args.sizes:
+        build_s, timings, legacy_s = bench_index(n, args.queries, rng)
+        p50 = np.percentile(timings, 50) * 1000
+        p99 = np.percentile(timings, 99) * 1000
+        print(f"{n:>9,} | {build_s:>9.2f} | {p50:>9.2f} | {p99:>9.2f} | {legacy_s * 1000:>15.0f} | {legacy_s * 1000 / p50:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
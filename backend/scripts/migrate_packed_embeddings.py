@@ -0,0 +1,79 @@
+"""
+Migration: pack opportunity embeddings into float32 bytes
+Rewrites every `scholarships` document that still stores `embedding` as an
+array of doubles: the vector moves to `embedding_f32` (little-endian
+float32 bytes) and the array is deleted. Documents that already carry
+`embedding_f32` only have a leftover array removed. Safe to re-run.
+
+Usage:
+    python scripts/migrate_packed_embeddings.py [--dry-run] [--batch-size 400]
+"""
+import argparse
+import os
+import sys
+
+from firebase_admin import firestore
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import db
+from app.config import settings
+from app.utils.embedding_codec import EMBEDDING_FIELD, PACKED_FIELD, as_vector, pack_embedding
+
+
+def migrate(dry_run: bool, batch_size: int) -> None:
+    print(f"Packing embeddings on project: {settings.firebase_project_id}{' (dry run)' if dry_run else ''}")
+
+    query = db.db.collection('scholarships').select([EMBEDDING_FIELD, PACKED_FIELD])
+    scanned = packed = cleaned = unreadable = 0
+    bytes_before = bytes_after = 0
+    batch, pending = db.db.batch(), 0
+
+    for doc in query.stream():
+        scanned += 1
+        data = doc.to_dict() or {}
+        legacy = data.get(EMBEDDING_FIELD)
+        if legacy is None:
+            continue
+
+        if data.get(PACKED_FIELD) is not None:
+            update = {EMBEDDING_FIELD: firestore.DELETE_FIELD}
+            cleaned += 1
+        else:
+            try:
+                vector = as_vector(legacy)
+            except (TypeError, ValueError) as e:
+                print(f"   !! {doc.id}: unreadable embedding ({e}), left as-is")
+                unreadable += 1
+                continue
+            update = {EMBEDDING_FIELD: firestore.DELETE_FIELD}
+            if vector is not None:
+                update[PACKED_FIELD] = pack_embedding(vector)
+                bytes_before += 8 * len(vector)
+                bytes_after += 4 * len(vector)
+                packed += 1
+
+        if dry_run:
+            continue
+        batch.update(doc.reference, update)
+        pending += 1
+        if pending >= batch_size:
+            batch.commit()
+            batch, pending = db.db.batch(), 0
+            print(f"      ... {packed + cleaned} docs rewritten")
+
+    if pending:
+        batch.commit()
+
+    print(f"Scanned {scanned} docs: packed {packed}, removed leftover arrays from {cleaned}, unreadable {unreadable}")
+    if packed:
+        print(f"Vector payload: {bytes_before / 1024:.0f} KB as doubles -> {bytes_after / 1024:.0f} KB packed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+    parser.add_argument("--batch-size", type=int, default=400)
+    args = parser.parse_args()
+    migrate(args.dry_run, args.batch_size)
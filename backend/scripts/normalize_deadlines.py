@@ -0,0 +1,74 @@
+"""
+Migration: normalize `deadline_timestamp` on every opportunity
+Reads filter on a range query over `deadline_timestamp` (>= now, or null for
+undated opportunities). Documents written before write-time normalization
+may lack the field, carry a timestamp that disagrees with `deadline`, or
+hold 0 for "unknown"; those are invisible to, or misfiled by, the query.
+This rewrites the field from the ISO `deadline` string (see
+app/utils/deadlines.py). Safe to re-run.
+
+Usage:
+    python scripts/normalize_deadlines.py [--dry-run] [--batch-size 400]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import db
+from app.config import settings
+from app.utils.deadlines import DEADLINE_TS_FIELD, is_expired, normalize_deadline
+
+_MISSING = object()
+
+
+def migrate(dry_run: bool, batch_size: int) -> None:
+    print(f"Normalizing deadlines on project: {settings.firebase_project_id}{' (dry run)' if dry_run else ''}")
+
+    query = db.db.collection('scholarships').select(['deadline', DEADLINE_TS_FIELD])
+    scanned = added = corrected = undated = expired = 0
+    batch, pending = db.db.batch(), 0
+    now = time.time()
+
+    for doc in query.stream():
+        scanned += 1
+        data = doc.to_dict() or {}
+        before = data.get(DEADLINE_TS_FIELD, _MISSING)
+        after = normalize_deadline(dict(data))[DEADLINE_TS_FIELD]
+
+        if after is None:
+            undated += 1
+        elif is_expired(after, now):
+            expired += 1
+        if before is not _MISSING and before == after:
+            continue
+        if before is _MISSING:
+            added += 1
+        else:
+            corrected += 1
+
+        if dry_run:
+            continue
+        batch.update(doc.reference, {DEADLINE_TS_FIELD: after})
+        pending += 1
+        if pending >= batch_size:
+            batch.commit()
+            batch, pending = db.db.batch(), 0
+            print(f"      ... {added + corrected} docs rewritten")
+
+    if pending:
+        batch.commit()
+
+    print(f"Scanned {scanned} docs: added the field to {added}, corrected {corrected}")
+    print(f"Undated (kept by the null query): {undated}; already expired (left for the sweeper): {expired}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+    parser.add_argument("--batch-size", type=int, default=400)
+    args = parser.parse_args()
+    migrate(args.dry_run, args.batch_size)
@@ -0,0 +1,102 @@
+"""
+Unit Tests for the IVF Approximate Nearest-Neighbour Index
+"""
+import threading
+
+import numpy as np
+
+from app.infrastructure.ann_index import IVFIndex
+from app.infrastructure.embedding_index import EmbeddingIndex
+
+
+def _clustered(n=2000, dim=16, clusters=20, seed=3):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, n)
+    return centers[labels] + 0.3 * rng.standard_normal((n, dim)).astype(np.float32), centers
+
+
+def _fill(index, vectors):
+    for i, v in enumerate(vectors):
+        index.upsert(f"opp_{i}", v)
+
+
+def test_full_probe_equals_exact_search():
+    vectors, centers = _clustered()
+    exact, ivf = EmbeddingIndex(), IVFIndex(train_min=500)
+    _fill(exact, vectors)
+    _fill(ivf, vectors)
+    assert ivf.wait_for_training(10) and ivf.is_trained
+
+    query = centers[0]
+    expected = exact.search(query, limit=25, min_similarity=0.0)
+    got = ivf.search(query, limit=25, min_similarity=0.0, nprobe=ivf.nlist)
+    assert [sid for sid, _ in got] == [sid for sid, _ in expected]
+
+
+def test_training_runs_off_the_upserting_thread(monkeypatch):
+    from app.infrastructure import ann_index
+
+    vectors, _ = _clustered(n=600)
+    release = threading.Event()
+    fit = ann_index.spherical_kmeans
+
+    def slow_kmeans(*args, **kwargs):
+        release.wait(10)
+        return fit(*args, **kwargs)
+
+    monkeypatch.setattr(ann_index, "spherical_kmeans", slow_kmeans)
+    ivf = IVFIndex(train_min=500)
+    _fill(ivf, vectors[:550])   # crosses train_min: clustering starts and blocks in the background
+    _fill(ivf, vectors)         # upserts and searches proceed meanwhile
+    assert not ivf.is_trained and ivf.search(vectors[0], limit=1, min_similarity=0.0)[0][0] == "opp_0"
+
+    release.set()
+    assert ivf.wait_for_training(10) and ivf.is_trained
+    assert len(ivf) == len(vectors) and ivf.has_vector("opp_599", vectors[599])
+
+
+def test_default_probe_has_high_recall_on_clustered_data():
+    vectors, centers = _clustered()
+    exact, ivf = EmbeddingIndex(), IVFIndex(train_min=500, nprobe=8)
+    _fill(exact, vectors)
+    _fill(ivf, vectors)
+    ivf.wait_for_training(10)
+
+    recalls = []
+    for query in centers:
+        truth = {sid for sid, _ in exact.search(query, limit=20, min_similarity=0.0)}
+        got = {sid for sid, _ in ivf.search(query, limit=20, min_similarity=0.0)}
+        recalls.append(len(truth & got) / len(truth))
+    assert np.mean(recalls) >= 0.9
+
+
+def test_incremental_delete_and_persistence_roundtrip(tmp_path):
+    vectors, centers = _clustered(n=800)
+    path = str(tmp_path / "index.npz")
+    ivf = IVFIndex(train_min=400, path=path)
+    _fill(ivf, vectors)
+    ivf.wait_for_training(10)
+    ivf.remove("opp_0")
+    ivf.persist()
+
+    reloaded = IVFIndex.load_or_create(path)
+    assert reloaded.is_trained and reloaded.nlist == ivf.nlist
+    assert len(reloaded) == len(vectors) - 1 and "opp_0" not in reloaded
+    assert reloaded.has_vector("opp_1", vectors[1])
+
+    query = centers[1]
+    assert reloaded.search(query, limit=10, min_similarity=0.0) == ivf.search(query, limit=10, min_similarity=0.0)
+
+    reloaded.retain({"opp_1", "opp_2"})
+    assert len(reloaded) == 2
+
+
+def test_empty_index_persists_without_pinning_a_dimension(tmp_path):
+    path = str(tmp_path / "index.npz")
+    IVFIndex(path=path).persist()
+
+    reloaded = IVFIndex.load_or_create(path)
+    assert reloaded.dim is None
+    assert reloaded.upsert("opp_1", np.ones(8, dtype=np.float32))
+    assert reloaded.dim == 8 and reloaded.dimension_mismatches == 0
@@ -0,0 +1,96 @@
+"""
+Unit Tests for the Dead-Letter Queue (SQLite store, fake broker)
+"""
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.infrastructure.sqlite_storage import SQLiteDB
+from app.services.dead_letters import DeadLetterQueue
+
+
+class FakeBroker:
+    def __init__(self, refuse=()):
+        self.published = []
+        self.refuse = set(refuse)
+
+    async def publish(self, topic, key, payload):
+        if key in self.refuse:
+            return False
+        self.published.append((topic, key, payload))
+        return True
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'catalog_cache_enabled', False)
+    db = SQLiteDB(str(tmp_path / "store.sqlite3"))
+    yield db
+    db.close()
+
+
+def _entry(topic, key, n):
+    return {"topic": topic, "key": key, "payload": {"n": n}, "handler": "h", "error": "boom",
+            "error_type": "RuntimeError", "attempts": 5, "failed_at": 1000.0 + n}
+
+
+def test_record_list_redrive_and_purge(store):
+    async def scenario():
+        dlq = DeadLetterQueue(db=store)
+        for n, (topic, key) in enumerate([("raw", "u1"), ("raw", "u2"), ("enriched", "o1"), ("raw", "u3")]):
+            await dlq.record(_entry(topic, key, n))
+
+        raw = await dlq.list(topic="raw")
+        assert [e["key"] for e in raw] == ["u1", "u2", "u3"]  # oldest first
+
+        broker = FakeBroker(refuse={"u2"})
+        outcome = await dlq.redrive(broker, topic="raw", limit=2)
+        assert outcome == {"redriven": 1, "failed": 1}
+        assert broker.published == [("raw", "u1", {"n": 0})]
+
+        by_id = await dlq.redrive(broker, ids=[raw[2]["id"]])
+        assert by_id == {"redriven": 1, "failed": 0} and broker.published[-1][1] == "u3"
+
+        remaining = await dlq.list()
+        assert [e["key"] for e in remaining] == ["u2", "o1"]
+        assert await dlq.purge([e["id"] for e in remaining]) == 2
+        assert await dlq.list() == []
+        return dlq.stats()
+
+    assert asyncio.run(scenario()) == {"recorded": 4, "redriven": 2, "purged": 2}
+
+
+def test_failed_opportunity_save_is_dead_lettered(monkeypatch):
+    pytest.importorskip("fastapi")
+    pytest.importorskip("firebase_admin")
+    from app.core.events import RetryPolicy, dlq_topic
+    from app.infrastructure.memory_broker import MemoryBroker
+    from app.routes import websocket
+
+    class FailingDB:
+        async def save_scholarship(self, scholarship):
+            raise ConnectionError("firestore unavailable")
+
+    monkeypatch.setattr(websocket, "firebase_db", FailingDB())
+
+    async def scenario():
+        broker = MemoryBroker(partitions=1, retry=RetryPolicy(max_attempts=2, base_delay_seconds=0.001))
+        dead = []
+
+        async def record(entry):
+            dead.append(entry)
+
+        await broker.subscribe("enriched", websocket.process_and_route_opportunity)
+        await broker.subscribe(dlq_topic("enriched"), record)
+        await broker.start()
+        await broker.publish("enriched", "opp-1", {
+            "id": "opp-1", "name": "Open Source Grant", "organization": "Example Foundation",
+            "source_url": "https://example.org/grant", "description": "Funding for maintainers of open source tools."
+        })
+        await broker.stop()
+        return dead
+
+    [entry] = asyncio.run(scenario())
+    assert entry["topic"] == "enriched" and entry["key"] == "opp-1"
+    assert entry["error_type"] == "ConnectionError" and entry["attempts"] == 2
@@ -0,0 +1,53 @@
+"""
+Unit Tests for Deadline Normalization and the Expiry Sweeper
+"""
+import asyncio
+from datetime import datetime, timezone
+
+from app.services.expiry_sweeper import ExpirySweeper
+from app.utils.deadlines import DEADLINE_TS_FIELD, deadline_timestamp, is_expired, normalize_deadline
+
+
+def _ts(*args):
+    return int(datetime(*args, tzinfo=timezone.utc).timestamp())
+
+
+def test_deadline_timestamp_normalization():
+    assert deadline_timestamp("2026-03-01") == _ts(2026, 3, 1, 23, 59, 59)  # live through the whole day
+    assert deadline_timestamp("2026-03-01T12:00:00Z") == _ts(2026, 3, 1, 12)
+    assert deadline_timestamp("2026-03-01T12:00:00+02:00") == _ts(2026, 3, 1, 10)
+    assert deadline_timestamp("2026-03-01T12:00:00") == _ts(2026, 3, 1, 12)
+    for bad in (None, "", "next friday", 1767225600):
+        assert deadline_timestamp(bad) is None
+
+    # The string wins over a stale timestamp; bare timestamps survive; 0 means unknown
+    assert normalize_deadline({'deadline': "2026-03-01", DEADLINE_TS_FIELD: 5})[DEADLINE_TS_FIELD] == _ts(2026, 3, 1, 23, 59, 59)
+    assert normalize_deadline({DEADLINE_TS_FIELD: 1767225600})[DEADLINE_TS_FIELD] == 1767225600
+    assert normalize_deadline({'deadline': "rolling", DEADLINE_TS_FIELD: 0}) == {'deadline': "rolling", DEADLINE_TS_FIELD: None}
+
+    assert is_expired(100, now=101) and not is_expired(100, now=100) and not is_expired(None)
+
+
+class _FakeDB:
+    def __init__(self, deadlines):
+        self.rows = dict(deadlines)
+        self.calls = []
+
+    async def sweep_expired_scholarships(self, before, limit, archive=True):
+        self.calls.append((before, limit, archive))
+        expired = sorted((ts, sid) for sid, ts in self.rows.items() if ts is not None and ts < before)[:limit]
+        for _, sid in expired:
+            del self.rows[sid]
+        return [sid for _, sid in expired]
+
+
+def test_sweeper_drains_in_batches_after_grace():
+    now = 1_000_000
+    db = _FakeDB({f"old{i}": now - 10_000 - i for i in range(5)})
+    db.rows.update({'recent': now - 10, 'live': now + 10, 'rolling': None})
+    sweeper = ExpirySweeper(db=db, batch_size=2, grace_seconds=60, archive=False)
+
+    assert asyncio.run(sweeper.run_once(now=now)) == 5
+    assert sorted(db.rows) == ['live', 'recent', 'rolling']  # inside the grace period, or not expired
+    assert [c[0] for c in db.calls] == [now - 60] * 3 and all(c[1:] == (2, False) for c in db.calls)
+    assert sweeper.stats() == {"swept": 5, "passes": 1, "failed_passes": 0}
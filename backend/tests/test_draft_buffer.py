@@ -0,0 +1,89 @@
+"""
+Unit Tests for the Application Draft Write-Behind Buffer
+"""
+import asyncio
+
+from app.services.draft_buffer import DraftWriteBuffer
+
+
+class _FakeDB:
+    def __init__(self, fail=0):
+        self.docs = {}
+        self.writes = []
+        self.fail = fail
+
+    async def save_application_draft(self, application_id, draft_data):
+        await asyncio.sleep(0)
+        if self.fail:
+            self.fail -= 1
+            raise RuntimeError("unavailable")
+        self.writes.append((application_id, dict(draft_data)))
+        self.docs.setdefault(application_id, {'application_id': application_id}).update(draft_data)
+        return True
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_autosaves_coalesce_into_debounced_writes():
+    db, clock = _FakeDB(), _Clock()
+    buffer = DraftWriteBuffer(db=db, debounce_seconds=5, max_delay_seconds=30, clock=clock)
+
+    async def scenario():
+        # 40 autosaves, one per second: the max delay forces a write every 30s of typing
+        for second in range(40):
+            clock.now = float(second)
+            buffer.save('app1', {'current_step': 2, 'progress_percentage': float(second), 'essays': None})
+            await buffer.flush_due()
+        assert len(db.writes) == 1 and db.writes[0][1]['progress_percentage'] == 30.0
+
+        buffer.save('app1', {'current_step': 3, 'personal_info': {'name': 'A'}})
+        merged = buffer.overlay({'application_id': 'app1', 'current_step': 1, 'essays': []})
+        assert merged['progress_percentage'] == 39.0 and merged['current_step'] == 3 and merged['essays'] == []
+
+        clock.now = 45.0  # quiet for the debounce interval
+        assert await buffer.flush_due() == 1
+
+    asyncio.run(scenario())
+    assert len(db.writes) == 2 and buffer.stats()['saves_per_write'] == 20.5
+    assert db.docs['app1']['personal_info'] == {'name': 'A'} and db.docs['app1']['progress_percentage'] == 39.0
+    assert 'essays' not in db.docs['app1']  # None fields are never written
+
+
+def test_failed_flush_keeps_edits_and_stop_drains():
+    db = _FakeDB(fail=1)
+    buffer = DraftWriteBuffer(db=db, clock=_Clock())
+
+    async def scenario():
+        buffer.save('a', {'current_step': 1})
+        assert not await buffer.flush('a')
+        buffer.save('a', {'progress_percentage': 50.0})
+        buffer.save('b', {'current_step': 4})
+        await buffer.stop()
+
+    asyncio.run(scenario())
+    assert db.docs['a'] == {'application_id': 'a', 'current_step': 1, 'progress_percentage': 50.0}
+    assert db.docs['b']['current_step'] == 4 and len(buffer) == 0
+
+
+def test_flushes_of_one_application_are_serialized():
+    db = _FakeDB()
+    buffer = DraftWriteBuffer(db=db, clock=_Clock())
+
+    async def scenario():
+        buffer.save('a', {'current_step': 1})
+        first = asyncio.create_task(buffer.flush('a'))
+        await asyncio.sleep(0)  # first write is in flight
+        assert 'a' in buffer and 'b' not in buffer
+        assert buffer.overlay({'application_id': 'a'})['current_step'] == 1
+        buffer.save('a', {'current_step': 2})
+        await asyncio.gather(first, buffer.flush('a'))
+
+    asyncio.run(scenario())
+    assert [w[1]['current_step'] for w in db.writes] == [1, 2]
+    assert 'a' not in buffer
@@ -0,0 +1,103 @@
+"""
+Unit Tests for the Embedding Backfill Worker
+"""
+import asyncio
+
+from app.infrastructure.opportunity_catalog import OpportunityCatalog
+from app.services.embedding_backfill import EmbeddingBackfillWorker
+
+
+class _FakeDB:
+    def __init__(self, fail_on_batch=None):
+        self.state = {}
+        self.written = {}
+        self.batches = 0
+        self.fail_on_batch = fail_on_batch
+
+    async def get_system_state(self, name):
+        return self.state.get(name)
+
+    async def save_system_state(self, name, state):
+        self.state[name] = dict(state)
+        return True
+
+    async def update_scholarship_embeddings(self, embeddings):
+        self.batches += 1
+        if self.batches == self.fail_on_batch:
+            raise RuntimeError("write failed")
+        self.written.update(embeddings)
+        return len(embeddings)
+
+
+class _DirectLimiter:
+    async def execute(self, fn, *args, **kwargs):
+        return await fn(*args, **kwargs)
+
+
+def _catalog(n, embedded=()):
+    catalog = OpportunityCatalog()
+    catalog.apply_changes([
+        (f"opp_{i:02d}", {'name': f"Opp {i}", 'source_url': f"https://example.com/{i}",
+                          'embedding': [1.0, 0.0] if i in embedded else None})
+        for i in range(n)
+    ])
+    return catalog
+
+
+async def _fake_embed(opportunities):
+    return [[float(len(opp.id)), 1.0] for opp in opportunities]
+
+
+def _worker(db, catalog, batch_size=4):
+    return EmbeddingBackfillWorker(
+        db=db, embed_batch=_fake_embed, catalog=catalog,
+        batch_size=batch_size, max_per_minute=0, rate_limiter=_DirectLimiter()
+    )
+
+
+def test_backfills_only_missing_embeddings_in_batches():
+    db = _FakeDB()
+    worker = _worker(db, _catalog(10, embedded={0, 5}))
+
+    assert asyncio.run(worker.run_once()) == 8
+    assert sorted(db.written) == [f"opp_{i:02d}" for i in range(10) if i not in (0, 5)]
+    assert db.batches == 2
+    assert db.state["embedding_backfill"]["last_id"] == "opp_09"
+
+
+def test_failed_batch_resumes_from_checkpoint():
+    db = _FakeDB(fail_on_batch=2)
+    catalog = _catalog(10)
+    worker = _worker(db, catalog)
+
+    assert asyncio.run(worker.run_once()) == 4
+    assert db.state["embedding_backfill"]["last_id"] == "opp_03"
+    assert worker.stats()["failed_batches"] == 1
+
+    # Restarted worker continues after the checkpoint instead of starting over
+    resumed = _worker(db, catalog)
+    assert asyncio.run(resumed.run_once()) == 6
+    assert sorted(db.written) == [f"opp_{i:02d}" for i in range(10)]
+
+
+def test_poison_document_is_isolated_and_skipped_after_repeated_failures():
+    db = _FakeDB()
+    catalog = _catalog(8)
+
+    async def embed_rejecting_opp_05(opportunities):
+        if any(opp.id == "opp_05" for opp in opportunities):
+            raise ValueError("document too large")
+        return await _fake_embed(opportunities)
+
+    worker = EmbeddingBackfillWorker(
+        db=db, embed_batch=embed_rejecting_opp_05, catalog=catalog, batch_size=4,
+        max_per_minute=0, max_batch_failures=2, rate_limiter=_DirectLimiter()
+    )
+
+    assert asyncio.run(worker.run_once()) == 4  # second batch fails once: pass stops at the checkpoint
+    assert db.state["embedding_backfill"] == {"last_id": "opp_03", "failures": 1}
+
+    assert asyncio.run(worker.run_once()) == 3  # fails again: bisected, opp_05 skipped
+    assert db.state["embedding_backfill"] == {"last_id": "opp_07"}
+    assert sorted(db.written) == [f"opp_{i:02d}" for i in range(8) if i != 5]
+    assert worker.stats()["skipped"] == 1 and worker.stats()["failed_batches"] == 2
@@ -0,0 +1,57 @@
+"""
+Unit Tests for the Content-Addressed Embedding Cache
+"""
+from app.services.embedding_cache import EmbeddingCache, embedding_cache_key, normalize_query
+
+
+def test_key_covers_every_input():
+    base = embedding_cache_key("models/embedding-001", "retrieval_query", "robotics grants")
+    assert base == embedding_cache_key("models/embedding-001", "retrieval_query", "robotics grants")
+    assert base != embedding_cache_key("models/embedding-002", "retrieval_query", "robotics grants")
+    assert base != embedding_cache_key("models/embedding-001", "retrieval_document", "robotics grants")
+    assert base != embedding_cache_key("models/embedding-001", "retrieval_query", "robotics grants", title="x")
+    assert normalize_query("  Robotics \n GRANTS ") == "robotics grants"
+
+
+def test_lru_eviction_and_metrics():
+    cache = EmbeddingCache(max_entries=2)
+    cache.put("a", [0.1, 0.2])
+    cache.put("b", [0.3])
+    assert cache.get("a") == [0.1, 0.2]  # a becomes most recent
+    cache.put("c", [0.4])                # evicts b
+
+    assert cache.get("b") is None
+    assert cache.get("c") == [0.4]
+    stats = cache.stats()
+    assert stats["memory_hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["entries_in_memory"] == 2
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite3")
+    vector = [0.1, -2.5e-7, 1 / 3]
+
+    first = EmbeddingCache(max_entries=10, path=path)
+    first.put("k", vector)
+    first.close()
+
+    second = EmbeddingCache(max_entries=10, path=path)
+    assert second.get("k") == vector  # bit-identical round trip
+    assert second.get("k") == vector
+    assert second.stats()["disk_hits"] == 1
+    assert second.stats()["memory_hits"] == 1
+    second.close()
+
+
+def test_disk_writes_are_committed_in_groups(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite3")
+    cache = EmbeddingCache(max_entries=10, path=path, commit_every=3, commit_interval=3600)
+    for key in "abcd":
+        cache.put(key, [0.5])
+    assert cache.stats()["uncommitted"] == 1  # a, b, c committed together; d is buffered
+
+    reader = EmbeddingCache(max_entries=10, path=path)
+    assert reader.get("c") == [0.5] and reader.get("d") is None
+    cache.close()
+    assert reader.get("d") == [0.5]
@@ -0,0 +1,34 @@
+"""
+Unit Tests for Packed Embedding Storage
+"""
+import numpy as np
+
+from app.models import Scholarship
+from app.utils.embedding_codec import PACKED_FIELD, pack_embedding, to_firestore, unpack_embedding
+
+
+def _opp(**fields):
+    return Scholarship(id="a", name="A", source_url="https://example.com/a", **fields)
+
+
+def test_packed_bytes_decode_zero_copy_and_round_trip():
+    vector = np.random.default_rng(3).standard_normal(768).astype(np.float32)
+    raw = pack_embedding(vector.tolist())
+    assert len(raw) == 768 * 4
+
+    decoded = unpack_embedding(raw)
+    assert not decoded.flags.owndata  # a view over the bytes
+    assert np.array_equal(decoded, vector)
+
+    s = _opp(**{PACKED_FIELD: raw, 'embedding': [9.0] * 768})  # packed wins over a leftover array
+    assert s.embedding.dtype == np.float32 and np.array_equal(s.embedding, vector)
+    assert s.model_dump(mode='json')['embedding'][:3] == vector[:3].tolist()
+    assert to_firestore(s.model_dump())[PACKED_FIELD] == raw
+
+
+def test_legacy_arrays_and_missing_vectors():
+    assert _opp(embedding=[0.5, 0.25]).embedding.tolist() == [0.5, 0.25]
+    assert _opp(embedding=[]).embedding is None
+
+    doc = to_firestore(_opp().model_dump())
+    assert 'embedding' not in doc and PACKED_FIELD not in doc  # never clears a stored vector
@@ -0,0 +1,65 @@
+"""
+Unit Tests for the NumPy Embedding Index
+Checks parity with the legacy pure-Python cosine scan.
+"""
+import math
+import random
+from datetime import datetime, timedelta
+
+from app.infrastructure.embedding_index import EmbeddingIndex
+from app.infrastructure.opportunity_catalog import deadline_ordinal
+
+
+def _legacy_search(rows, query, limit, min_similarity):
+    """Reference: FirebaseDB._cosine_similarity + sort, as shipped before the index."""
+    scored = []
+    for sid, vec in rows:
+        dot = sum(a * b for a, b in zip(query, vec))
+        mag_a = math.sqrt(sum(a * a for a in query))
+        mag_b = math.sqrt(sum(b * b for b in vec))
+        sim = 0.0 if mag_a == 0 or mag_b == 0 else dot / (mag_a * mag_b)
+        if sim >= min_similarity:
+            scored.append((sim, sid))
+    scored.sort(key=lambda x: x[0], reverse=True)
+    return [sid for _, sid in scored[:limit]]
+
+
+def test_search_matches_legacy_scan():
+    rng = random.Random(7)
+    base = [rng.gauss(0, 1) for _ in range(32)]
+    rows = []
+    index = EmbeddingIndex()
+    for i in range(300):
+        # Cluster around `base` so plenty of rows clear the threshold
+        vec = [b + rng.gauss(0, 1.2) for b in base]
+        rows.append((f"opp_{i}", vec))
+        index.upsert(f"opp_{i}", vec)
+
+    query = [b + rng.gauss(0, 0.5) for b in base]
+    for limit, threshold in [(5, 0.3), (20, 0.55), (500, 0.0)]:
+        got = [sid for sid, _ in index.search(query, limit=limit, min_similarity=threshold)]
+        assert got == _legacy_search(rows, query, limit, threshold)
+
+
+def test_remove_and_replace_keep_rows_consistent():
+    index = EmbeddingIndex(initial_capacity=2)
+    index.upsert("a", [1.0, 0.0])
+    index.upsert("b", [0.0, 1.0])
+    index.upsert("c", [1.0, 1.0])   # forces growth
+    index.remove("a")               # swap-remove moves "c" into row 0
+    index.upsert("b", [1.0, 0.1])   # replace in place
+
+    hits = index.search([1.0, 0.0], limit=10, min_similarity=0.5)
+    assert [sid for sid, _ in hits] == ["b", "c"]
+    assert len(index) == 2 and "a" not in index
+
+
+def test_expired_and_mismatched_rows_are_excluded():
+    yesterday = deadline_ordinal((datetime.now() - timedelta(days=1)).date().isoformat())
+    index = EmbeddingIndex()
+    index.upsert("live", [1.0, 0.0, 0.0])
+    index.upsert("expired", [1.0, 0.0, 0.0], expiry_ordinal=yesterday)
+    assert index.upsert("wrong_dim", [1.0, 0.0]) is False
+
+    assert [sid for sid, _ in index.search([1.0, 0.0, 0.0])] == ["live"]
+    assert index.search([1.0, 0.0]) == []
@@ -0,0 +1,38 @@
+"""
+Unit Tests for Opportunity Content Fingerprints
+"""
+from app.models import Scholarship
+from app.utils.fingerprint import FINGERPRINT_FIELD, WriteStats, content_fingerprint, is_unchanged
+from app.utils.scholarship_merge import merge_preserving
+
+
+def _doc(**overrides):
+    data = {
+        'id': "opp-1", 'name': "Chain Hack", 'source_url': "https://example.com/hack",
+        'amount': 10000, 'amount_display': "$10,000", 'tags': ['web3'],
+        'last_verified': "2026-10-01T10:00:00",
+    }
+    data.update(overrides)
+    return Scholarship(**data).model_dump()
+
+
+def test_rescrape_with_new_timestamp_is_unchanged():
+    stored = _doc()
+    stored[FINGERPRINT_FIELD] = content_fingerprint(stored)
+
+    rescrape = merge_preserving(_doc(last_verified="2026-10-17T09:30:00", amount=0, amount_display="TBD"), stored)
+    rescrape[FINGERPRINT_FIELD] = content_fingerprint(rescrape)
+    assert is_unchanged(rescrape, stored)
+
+    edited = merge_preserving(_doc(description="Now with a judging rubric"), stored)
+    edited[FINGERPRINT_FIELD] = content_fingerprint(edited)
+    assert not is_unchanged(edited, stored)
+    assert not is_unchanged(rescrape, None)
+    assert not is_unchanged(rescrape, {k: v for k, v in stored.items() if k != FINGERPRINT_FIELD})
+
+
+def test_write_stats_counts_outcomes():
+    stats = WriteStats()
+    stats.record('written')
+    stats.record('skipped', 3)
+    assert stats.stats() == {"written": 1, "merged": 0, "skipped": 3, "skip_rate": 0.75}
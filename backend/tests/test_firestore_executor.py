@@ -0,0 +1,34 @@
+"""
+Unit Tests for the Firestore Executor
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.infrastructure.firestore_executor import FirestoreExecutor, FirestoreTimeout
+
+
+def test_calls_run_off_the_event_loop_with_timeouts():
+    async def scenario():
+        executor = FirestoreExecutor(max_workers=2, timeout=0.05)
+        loop_thread = threading.get_ident()
+
+        assert await executor.run(threading.get_ident) != loop_thread
+        assert await executor.run(lambda a, b=0: a + b, 2, b=3) == 5
+
+        with pytest.raises(FirestoreTimeout):
+            await executor.run(time.sleep, 0.5)
+        with pytest.raises(ValueError):
+            await executor.run(int, "not a number")
+
+        stats = executor.stats()
+        executor.shutdown()
+        return stats
+
+    stats = asyncio.run(scenario())
+    assert stats['timeouts'] == 1
+    assert stats['errors'] == 1
+    assert stats['completed'] == 4
+    assert stats['in_flight'] == 0
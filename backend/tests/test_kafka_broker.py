@@ -0,0 +1,87 @@
+"""
+Integration Tests for the Kafka Broker
+Run against a local single-node broker, e.g.
+    docker run -d -p 9092:9092 apache/kafka:3.8.0
+    KAFKA_BOOTSTRAP=localhost:9092 pytest tests/test_kafka_broker.py
+"""
+import asyncio
+import os
+import uuid
+
+import pytest
+
+pytest.importorskip("confluent_kafka")
+BOOTSTRAP = os.environ.get("KAFKA_BOOTSTRAP")
+pytestmark = pytest.mark.skipif(not BOOTSTRAP, reason="KAFKA_BOOTSTRAP not set")
+
+from app.core.events import RetryPolicy  # noqa: E402
+from app.infrastructure.kafka_broker import KafkaBroker  # noqa: E402
+
+
+def make_broker():
+    return KafkaBroker(
+        bootstrap_servers=BOOTSTRAP,
+        group_prefix=f"test-{uuid.uuid4().hex[:8]}",
+        consume_timeout_seconds=0.2,
+        topic_partitions=3,
+        drain_timeout=5.0,
+        retry=RetryPolicy(max_attempts=3, base_delay_seconds=0.01)
+    )
+
+
+async def wait_for(condition, timeout=30.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.1)
+
+
+def test_keyed_events_arrive_in_order_and_are_committed():
+    topic = f"test.raw.{uuid.uuid4().hex[:8]}"
+
+    async def scenario():
+        seen = {}
+        broker = make_broker()
+
+        async def handle_raw_html_event(payload):
+            seen.setdefault(payload["key"], []).append(payload["n"])
+
+        await broker.subscribe(topic, handle_raw_html_event)
+        await broker.start()
+        keys = [f"https://example.org/{i}" for i in range(5)]
+        results = await asyncio.gather(*(
+            broker.publish(topic, key, {"key": key, "n": n}) for n in range(10) for key in keys
+        ))
+        assert all(results)
+        await wait_for(lambda: sum(len(ns) for ns in seen.values()) == 50)
+        await broker.stop()
+        return seen, broker.stats()
+
+    seen, stats = asyncio.run(scenario())
+    assert all(ns == sorted(ns) for ns in seen.values())
+    assert stats["acked"] == 50 and stats["in_flight"] == 0
+    assert sum(stats["topics"][topic][0]["committed"].values()) == 50
+
+
+def test_failed_message_is_retried_before_commit():
+    topic = f"test.raw.{uuid.uuid4().hex[:8]}"
+
+    async def scenario():
+        attempts = []
+        broker = make_broker()
+
+        async def flaky_handler(payload):
+            attempts.append(payload["n"])
+            if attempts.count(payload["n"]) == 1:
+                raise RuntimeError("transient")
+
+        await broker.subscribe(topic, flaky_handler)
+        await broker.start()
+        assert await broker.publish(topic, "k", {"n": 1})
+        await wait_for(lambda: len(attempts) == 2)
+        await broker.stop()
+        return attempts, broker.stats()["topics"][topic][0]
+
+    attempts, stats = asyncio.run(scenario())
+    assert attempts == [1, 1]
+    assert stats["retried"] == 1 and stats["delivered"] == 1 and stats["failed"] == 0
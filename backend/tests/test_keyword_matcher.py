@@ -0,0 +1,77 @@
+"""
+Unit Tests for the Compiled Keyword Matcher
+Checks that compiled interest/passion scoring is identical to the legacy
+per-keyword substring scan.
+"""
+import random
+
+from app.services.keyword_matcher import KeywordMatcher
+from app.services.personalization_engine import PersonalizationEngine
+
+
+def _legacy_interests(engine, opp, profile):
+    """Reference: _score_interests as shipped before the compiled matcher."""
+    interests = profile.get('interests') or []
+    if not interests:
+        return 50.0
+    user_interests = [str(i).lower().strip() for i in interests]
+    opp_text = engine._get_opportunity_text(opp).lower()
+    satisfied = 0
+    for interest in user_interests:
+        keywords = engine.interest_keywords.get(interest, [interest])
+        if any(k.lower() in opp_text for k in keywords) or interest in opp_text:
+            satisfied += 1
+    rate = satisfied / len(user_interests)
+    if rate > 0.5:
+        rate = min(rate * 1.5, 1.0)
+    if rate > 0.75:
+        rate = min(rate * 1.2, 1.0)
+    if satisfied > 0 and rate < 0.2:
+        rate = 0.2
+    return rate * 100
+
+
+def _legacy_passions(engine, opp, profile):
+    """Reference: _score_passions as shipped before the compiled matcher."""
+    background = profile.get('background') or []
+    if not background:
+        return 50.0
+    opp_text = engine._get_opportunity_text(opp).lower()
+    matches = 0
+    for passion in background:
+        if isinstance(passion, str):
+            if passion.lower() in opp_text:
+                matches += 1
+            if any(k.lower() in opp_text for k in engine.interest_keywords.get(passion.lower(), [])):
+                matches += 1
+    return min(matches / len(background), 1.0) * 100
+
+
+def test_matcher_finds_overlapping_and_nested_terms():
+    matcher = KeywordMatcher(["hack", "hackathon", "ai", "thon", "ml", "html"])
+    assert matcher.find_all("the hackathon said html") == {"hack", "hackathon", "thon", "ai", "html", "ml"}
+    assert matcher.find_all("nothing here") == set()
+
+
+def test_scores_identical_to_legacy_scan():
+    rng = random.Random(11)
+    engine = PersonalizationEngine()
+    terms = [k for ks in engine.interest_keywords.values() for k in ks] + list(engine.interest_keywords)
+    filler = ["the", "students", "said", "global", "prize", "html", "thon", "Build", "x"]
+    free_terms = ["climate action", "music", "", "  AI  ", "Design", "poetry"]
+
+    for _ in range(300):
+        words = rng.choices(terms + filler, k=rng.randint(0, 25))
+        opp = {
+            'name': " ".join(words[:4]),
+            'description': "".join(rng.choice([" ", "", "-"]) + w for w in words[4:]),
+            'tags': rng.sample(terms, 2),
+            'geo_tags': ['Global'],
+        }
+        pool = list(engine.interest_keywords) + free_terms
+        profile = {
+            'interests': rng.sample(pool, rng.randint(0, 5)),
+            'background': rng.sample(pool, rng.randint(0, 3)),
+        }
+        assert engine._score_interests(opp, profile) == _legacy_interests(engine, opp, profile)
+        assert engine._score_passions(opp, profile) == _legacy_passions(engine, opp, profile)
@@ -0,0 +1,205 @@
+"""
+Unit Tests for the Durable Log Broker
+"""
+import asyncio
+import time
+
+from app.core.events import RetryPolicy, dlq_topic
+from app.infrastructure.log_broker import LogBroker
+
+
+def make_broker(path, **kwargs):
+    kwargs.setdefault("partitions", 2)
+    kwargs.setdefault("poll_interval_seconds", 0.05)
+    kwargs.setdefault("drain_timeout", 0.5)
+    return LogBroker(path=str(path), **kwargs)
+
+
+def recorder(seen, gate=None):
+    async def handle_raw_html_event(payload):
+        if gate is not None:
+            await gate.wait()
+        seen.append(payload["n"])
+    return handle_raw_html_event
+
+
+def test_unconsumed_events_survive_a_restart(tmp_path):
+    path = tmp_path / "events.sqlite3"
+
+    async def first_run():
+        broker = make_broker(path, drain_timeout=0.05)
+        await broker.subscribe("raw", recorder([], gate=asyncio.Event()))  # never released
+        await broker.start()
+        for n in range(6):
+            assert await broker.publish("raw", f"https://example.org/{n % 3}", {"n": n})
+        await broker.stop()
+
+    async def second_run():
+        seen = []
+        broker = make_broker(path)
+        await broker.subscribe("raw", recorder(seen))
+        await broker.start()
+        await broker.stop()
+        return seen, broker.stats()
+
+    asyncio.run(first_run())
+    seen, stats = asyncio.run(second_run())
+    assert sorted(seen) == list(range(6))
+    assert stats["topics"]["raw"][0]["lag"] == 0
+
+
+def test_committed_offsets_are_not_redelivered_and_seek_replays(tmp_path):
+    path = tmp_path / "events.sqlite3"
+
+    async def run(publish, seek_to=None):
+        seen = []
+        broker = make_broker(path)
+        await broker.subscribe("raw", recorder(seen))
+        await broker.start()
+        for n in publish:
+            await broker.publish("raw", "k", {"n": n})
+        if seek_to is not None:
+            await broker.seek("raw", "handle_raw_html_event", seek_to)
+        await broker.stop()
+        return seen
+
+    assert asyncio.run(run(range(4))) == [0, 1, 2, 3]
+    assert asyncio.run(run([4])) == [4]
+    assert asyncio.run(run([], seek_to=3)) == [2, 3, 4]  # offsets start at 1
+
+
+def test_events_published_by_draining_handlers_survive_stop(tmp_path):
+    path = tmp_path / "events.sqlite3"
+
+    async def first_run():
+        broker = make_broker(path, drain_timeout=1.0)
+        release = asyncio.Event()
+
+        async def handle_raw_html_event(payload):
+            await release.wait()
+            assert await broker.publish("enriched", payload["url"], {"n": payload["n"]})
+
+        await broker.subscribe("raw", handle_raw_html_event)
+        await broker.start()
+        for n in range(4):
+            await broker.publish("raw", f"https://example.org/{n}", {"url": f"https://example.org/{n}", "n": n})
+        stopping = asyncio.create_task(broker.stop())
+        await asyncio.sleep(0.05)
+        refused = await broker.publish("raw", "https://example.org/late", {"url": "", "n": 99})
+        release.set()
+        await stopping
+        return refused, broker.stats()
+
+    async def second_run():
+        seen = []
+        broker = make_broker(path)
+        await broker.subscribe("enriched", recorder(seen))
+        await broker.start()
+        await broker.stop()
+        return seen
+
+    refused, stats = asyncio.run(first_run())
+    assert refused is False
+    assert stats["topics"]["raw"][0]["lag"] == 0
+    assert sorted(asyncio.run(second_run())) == [0, 1, 2, 3]
+
+
+def test_group_commit_batches_concurrent_publishes(tmp_path):
+    async def scenario():
+        broker = make_broker(tmp_path / "events.sqlite3", flush_interval_seconds=0.01)
+        await broker.start()
+        results = await asyncio.gather(*(broker.publish("raw", f"k{n}", {"n": n}) for n in range(50)))
+        await broker.stop()
+        return results, broker.stats()
+
+    results, stats = asyncio.run(scenario())
+    assert all(results)
+    assert stats["published"] == 50 and stats["flushes"] < 5
+
+
+def test_retention_by_size_and_age(tmp_path):
+    async def scenario():
+        broker = make_broker(tmp_path / "events.sqlite3", retention_bytes=120, retention_seconds=3600)
+        await broker.start()
+        for n in range(10):
+            await broker.publish("raw", "k", {"n": n, "pad": "x" * 20})
+        await broker.stop()
+        by_size = broker._apply_retention(time.time())
+        by_age = broker._apply_retention(time.time() + 7200)
+        return by_size, by_age
+
+    by_size, by_age = asyncio.run(scenario())
+    assert by_size == 7  # each payload is 37 bytes: the newest three fit in 120
+    assert by_age == 3
+
+
+def test_exhausted_event_is_dead_lettered_durably(tmp_path):
+    path = tmp_path / "events.sqlite3"
+    retry = RetryPolicy(max_attempts=2, base_delay_seconds=0.001)
+
+    async def first_run():
+        broker = make_broker(path, retry=retry)
+
+        async def handle_raw_html_event(payload):
+            raise TimeoutError("gemini timed out")
+
+        await broker.subscribe("raw", handle_raw_html_event)
+        await broker.start()
+        await broker.publish("raw", "https://example.org/a", {"n": 1})
+        await broker.stop()
+        return broker.stats()
+
+    async def second_run():
+        dead = []
+        broker = make_broker(path)
+
+        async def record(entry):
+            dead.append(entry)
+
+        await broker.subscribe(dlq_topic("raw"), record)
+        await broker.start()
+        await broker.stop()
+        return dead
+
+    stats = asyncio.run(first_run())
+    assert stats["dead_lettered"] == 1 and stats["topics"]["raw"][0]["lag"] == 0
+    [entry] = asyncio.run(second_run())
+    assert entry["key"] == "https://example.org/a" and entry["payload"] == {"n": 1} and entry["attempts"] == 2
+
+
+def test_event_is_redelivered_when_its_dead_letter_cannot_be_appended(tmp_path):
+    async def scenario():
+        broker = make_broker(tmp_path / "events.sqlite3", retry=RetryPolicy(max_attempts=1, base_delay_seconds=0.001))
+        append = broker._append_event
+        dlq_down = [True]
+        dead = []
+
+        async def flaky_append(topic, key, payload):
+            if topic == dlq_topic("raw") and dlq_down[0]:
+                return False
+            return await append(topic, key, payload)
+
+        broker._append_event = flaky_append
+
+        async def handle_raw_html_event(payload):
+            raise ValueError("unparseable")
+
+        async def record(entry):
+            dead.append(entry)
+
+        await broker.subscribe("raw", handle_raw_html_event)
+        await broker.subscribe(dlq_topic("raw"), record)
+        await broker.start()
+        await broker.publish("raw", "https://example.org/a", {"n": 1})
+        await asyncio.sleep(0.2)
+        stalled = broker.stats()["topics"]["raw"][0]
+
+        dlq_down[0] = False
+        await asyncio.sleep(0.2)
+        await broker.stop()
+        return stalled, broker.stats(), dead
+
+    stalled, stats, dead = asyncio.run(scenario())
+    assert stalled["lag"] == 1 and stalled["committed"] == [0, 0] and stalled["redelivered"] >= 1
+    assert stats["dead_lettered"] == 1 and stats["topics"]["raw"][0]["lag"] == 0
+    assert [entry["payload"] for entry in dead] == [{"n": 1}]
@@ -0,0 +1,68 @@
+"""
+Unit Tests for the Per-User Match Cache
+"""
+from datetime import datetime, timedelta
+
+from app.infrastructure.opportunity_catalog import OpportunityCatalog
+from app.models import UserProfile
+from app.services.match_cache import MatchCache, profile_hash
+from app.services.opportunity_features import OpportunityFeatureStore
+
+
+def test_entries_invalidate_on_profile_catalog_and_clock():
+    cache = MatchCache(max_users=2)
+    key = profile_hash(UserProfile(interests=['ai']))
+    assert key == profile_hash({**UserProfile(interests=['ai']).model_dump()})
+    assert key != profile_hash(UserProfile(interests=['ai', 'fintech']))
+
+    cache.put('u1', key, 7, [(3, 90.0), (0, 40.0)], valid_until=1000.0)
+    assert cache.get('u1', key, 7, now=10.0) == [(3, 90.0), (0, 40.0)]
+    assert cache.get('u1', 'other-profile', 7, now=10.0) is None
+    assert cache.get('u1', key, 8, now=10.0) is None
+    assert cache.get('u1', key, 7, now=1000.0) is None
+
+    cache.put('u2', key, 7, [])
+    cache.put('u3', key, 7, [])
+    assert cache.get('u1', key, 7, now=10.0) is None  # evicted (LRU)
+    assert cache.stats()['users'] == 2
+
+
+def test_catalog_view_reports_next_expiry():
+    now = datetime.now()
+    catalog = OpportunityCatalog()
+    store = OpportunityFeatureStore()
+    catalog.add_listener(store.on_catalog_change)
+    soon = int((now + timedelta(hours=3)).timestamp())
+    catalog.apply_changes([
+        ('a', {'name': "A", 'source_url': "https://example.com/a", 'description': "x", 'deadline_timestamp': soon}),
+        ('b', {'name': "B", 'source_url': "https://example.com/b", 'description': "x"}),
+    ])
+    view = store.catalog_view()
+    assert view.version == catalog.version
+    rows = {view.items[i].id: i for i in range(len(view))}
+    assert view.next_expiry([rows['b']]) == float('inf')
+    assert view.next_expiry([rows['a'], rows['b']]) == soon + 1
+    assert view.live_mask(now=soon + 1)[rows['a']] == False  # noqa: E712
+
+
+def test_recent_entries_serve_newer_catalog_versions_remapped_by_id():
+    cache = MatchCache()
+    key = profile_hash(UserProfile(interests=['ai']))
+    cache.put('u1', key, 7, [(0, 90.0), (1, 40.0)], ranking=[('a', 90.0), ('b', 40.0)])
+    computed_at = cache._entries['u1'].computed_at
+
+    assert cache.get('u1', key, 8) is None
+    assert cache.get_recent('u1', key, max_age=30.0, now=computed_at + 10).ranking == [('a', 90.0), ('b', 40.0)]
+    assert cache.get_recent('u1', key, max_age=30.0, now=computed_at + 31) is None
+    assert cache.get_recent('u1', 'other-profile', max_age=30.0, now=computed_at + 10) is None
+
+    catalog = OpportunityCatalog()
+    store = OpportunityFeatureStore()
+    catalog.add_listener(store.on_catalog_change)
+    catalog.apply_changes([
+        (oid, {'name': oid.upper(), 'source_url': f"https://example.com/{oid}", 'description': "x"}) for oid in 'bc'
+    ])
+    view = store.catalog_view()
+    rows = view.rows_of([('a', 90.0), ('b', 40.0)])  # 'a' was removed
+    assert [(view.items[row].id, score) for row, score in rows] == [('b', 40.0)]
+    assert cache.stats()['stale_hits'] == 1
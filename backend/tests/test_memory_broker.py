@@ -0,0 +1,217 @@
+"""
+Unit Tests for Bounded, Key-Partitioned MemoryBroker Dispatch
+"""
+import asyncio
+import random
+
+from app.core.events import NonRetryableError, RetryPolicy, dlq_topic
+from app.infrastructure.memory_broker import MemoryBroker, partition_for
+
+
+def test_slow_subscriber_does_not_delay_other_topics():
+    async def scenario():
+        broker = MemoryBroker(max_queue=10, partitions=2)
+        release = asyncio.Event()
+        fast = []
+
+        async def slow_handler(payload):
+            await release.wait()
+
+        async def fast_handler(payload):
+            fast.append(payload["n"])
+
+        await broker.subscribe("raw", slow_handler)
+        await broker.subscribe("enriched", fast_handler)
+        await broker.start()
+
+        for n in range(3):
+            await broker.publish("raw", "", {"n": n})  # unkeyed: round-robin over the partitions
+        for n in range(3):
+            await broker.publish("enriched", "k", {"n": n})
+        await asyncio.sleep(0.01)
+
+        assert sorted(fast) == [0, 1, 2]
+        raw = broker.stats()["topics"]["raw"][0]
+        assert raw["in_flight"] == 2 and raw["depth"] == 1  # both partitions busy, one event waiting
+
+        release.set()
+        await broker.stop()
+        assert broker.stats()["topics"]["raw"][0]["delivered"] == 3
+
+    asyncio.run(scenario())
+
+
+def test_overflow_policies():
+    async def scenario():
+        broker = MemoryBroker(max_queue=2, partitions=1, drain_timeout=0.01)
+        gate = asyncio.Event()
+        seen = {"drop": [], "reject": [], "block": []}
+
+        def handler(name):
+            async def handle(payload):
+                await gate.wait()
+                seen[name].append(payload["n"])
+            handle.__name__ = name
+            return handle
+
+        await broker.subscribe("drop", handler("drop"), overflow="drop_oldest")
+        await broker.subscribe("reject", handler("reject"), overflow="reject")
+        await broker.subscribe("block", handler("block"), overflow="block")
+        await broker.start()
+
+        results = []
+        for n in range(5):  # one in flight + two queued fit
+            results.append(await broker.publish("drop", "k", {"n": n}))
+            results.append(await broker.publish("reject", "k", {"n": n}))
+            await asyncio.sleep(0)
+        assert results.count(False) == 2
+
+        for n in range(3):
+            await broker.publish("block", "k", {"n": n})
+        await asyncio.sleep(0)
+        blocked = asyncio.create_task(broker.publish("block", "k", {"n": 3}))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()  # backpressure: the publisher waits for space
+
+        gate.set()
+        assert await blocked
+        await broker.stop()
+        return broker.stats()["topics"]
+
+    topics = asyncio.run(scenario())
+    assert topics["drop"][0]["dropped"] == 2 and topics["reject"][0]["rejected"] == 2
+    assert topics["block"][0]["delivered"] == 4
+
+
+def test_same_key_is_handled_in_order_while_keys_run_in_parallel():
+    async def scenario():
+        broker = MemoryBroker(max_queue=100, partitions=4)
+        seen = {}
+        active = 0
+        peak = 0
+
+        async def handler(payload):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(random.random() / 1000)
+            seen.setdefault(payload["key"], []).append(payload["n"])
+            active -= 1
+
+        await broker.subscribe("raw", handler)
+        await broker.start()
+        keys = [f"https://example.org/{i}" for i in range(8)]
+        for n in range(20):
+            for key in keys:
+                await broker.publish("raw", key, {"key": key, "n": n})
+        await broker.stop()
+        return seen, peak
+
+    seen, peak = asyncio.run(scenario())
+    assert all(seen[key] == list(range(20)) for key in seen) and len(seen) == 8
+    assert peak > 1
+
+
+def test_partition_for_is_stable():
+    assert partition_for("https://example.org/a", 8) == partition_for("https://example.org/a", 8)
+    assert {partition_for(f"opp-{i}", 8) for i in range(200)} == set(range(8))
+
+
+def test_failing_handler_is_retried_then_dead_lettered():
+    async def scenario():
+        broker = MemoryBroker(max_queue=10, partitions=2, retry=RetryPolicy(max_attempts=3, base_delay_seconds=0.001))
+        calls = {"flaky": 0, "broken": 0}
+        dead = []
+
+        async def flaky(payload):
+            calls["flaky"] += 1
+            if calls["flaky"] < 3:
+                raise ConnectionError("firestore unavailable")
+
+        async def broken(payload):
+            calls["broken"] += 1
+            raise ValueError("unparseable")
+
+        async def record(entry):
+            dead.append(entry)
+
+        await broker.subscribe("raw", flaky)
+        await broker.subscribe("enriched", broken)
+        await broker.subscribe(dlq_topic("enriched"), record)
+        await broker.start()
+        await broker.publish("raw", "a", {"n": 1})
+        await broker.publish("enriched", "opp-1", {"n": 2})
+        await broker.stop()
+        return calls, dead, broker.stats()
+
+    calls, dead, stats = asyncio.run(scenario())
+    assert calls == {"flaky": 3, "broken": 3}
+    assert stats["topics"]["raw"][0]["delivered"] == 1 and stats["topics"]["raw"][0]["retried"] == 2
+    assert stats["dead_lettered"] == 1
+    [entry] = dead
+    assert entry["topic"] == "enriched" and entry["key"] == "opp-1" and entry["payload"] == {"n": 2}
+    assert entry["attempts"] == 3 and entry["error_type"] == "ValueError"
+
+
+def test_non_retryable_failure_is_dead_lettered_without_backoff():
+    async def scenario():
+        broker = MemoryBroker(max_queue=10, partitions=1, retry=RetryPolicy(max_attempts=5, base_delay_seconds=10))
+        calls = []
+        dead = []
+
+        async def handle_raw_html_event(payload):
+            calls.append(payload["n"])
+            raise NonRetryableError("model returned no JSON array")
+
+        async def record(entry):
+            dead.append(entry)
+
+        await broker.subscribe("raw", handle_raw_html_event)
+        await broker.subscribe(dlq_topic("raw"), record)
+        await broker.start()
+        await broker.publish("raw", "https://example.org/a", {"n": 1})
+        await asyncio.wait_for(broker.stop(), 1.0)  # a single 10s backoff would time out
+        return calls, dead
+
+    calls, dead = asyncio.run(scenario())
+    assert calls == [1]
+    [entry] = dead
+    assert entry["attempts"] == 1 and entry["error_type"] == "NonRetryableError"
+
+
+def test_events_published_by_draining_handlers_survive_stop():
+    async def scenario():
+        broker = MemoryBroker(max_queue=10, partitions=2, drain_timeout=1.0)
+        release = asyncio.Event()
+        enriched = []
+
+        async def handle_raw_html_event(payload):
+            await release.wait()
+            assert await broker.publish("enriched", payload["url"], {"n": payload["n"]})
+
+        async def process_and_route_opportunity(payload):
+            enriched.append(payload["n"])
+
+        await broker.subscribe("raw", handle_raw_html_event)
+        await broker.subscribe("enriched", process_and_route_opportunity)
+        await broker.start()
+        for n in range(4):
+            await broker.publish("raw", f"https://example.org/{n}", {"url": f"https://example.org/{n}", "n": n})
+        stopping = asyncio.create_task(broker.stop())
+        await asyncio.sleep(0.01)
+        refused = await broker.publish("raw", "https://example.org/late", {"url": "", "n": 99})
+        release.set()
+        await stopping
+        return refused, enriched
+
+    refused, enriched = asyncio.run(scenario())
+    assert refused is False
+    assert sorted(enriched) == [0, 1, 2, 3]
+
+
+def test_retry_delays_back_off_exponentially_with_jitter():
+    policy = RetryPolicy(base_delay_seconds=1.0, max_delay_seconds=8.0, jitter=0.5)
+    for attempt, full in [(1, 1.0), (2, 2.0), (3, 4.0), (4, 8.0), (6, 8.0)]:
+        delays = [policy.delay(attempt) for _ in range(50)]
+        assert all(full * 0.5 <= d <= full for d in delays)
+        assert len(set(delays)) > 1
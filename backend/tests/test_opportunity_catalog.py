@@ -0,0 +1,122 @@
+"""
+Unit Tests for the In-Process Opportunity Catalog
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from app.infrastructure.opportunity_catalog import OpportunityCatalog
+from app.models import SUMMARY_FIELDS, MatchedScholarshipsResponse
+
+
+def _doc(doc_id, **fields):
+    data = {'name': doc_id.title(), 'source_url': f'https://example.com/{doc_id}', **fields}
+    return SimpleNamespace(id=doc_id, to_dict=lambda: dict(data))
+
+
+def _change(kind, doc):
+    return SimpleNamespace(type=SimpleNamespace(name=kind), document=doc)
+
+
+def test_initial_snapshot_marks_ready_and_bumps_version():
+    catalog = OpportunityCatalog()
+    assert not catalog.is_ready
+
+    catalog._on_snapshot(None, [_change('ADDED', _doc('a')), _change('ADDED', _doc('b'))], None)
+
+    assert catalog.is_ready
+    assert catalog.version == 1
+    assert sorted(s.id for s in catalog.snapshot()) == ['a', 'b']
+
+
+def test_deltas_modify_and_remove_entries():
+    catalog = OpportunityCatalog()
+    catalog._on_snapshot(None, [_change('ADDED', _doc('a', amount=10))], None)
+    catalog._on_snapshot(None, [_change('MODIFIED', _doc('a', amount=500))], None)
+    assert catalog.get('a').amount == 500
+
+    catalog._on_snapshot(None, [_change('REMOVED', _doc('a'))], None)
+    assert catalog.get('a') is None
+    assert catalog.version == 3
+
+
+def test_restarted_listener_drops_entries_removed_while_detached():
+    catalog = OpportunityCatalog()
+    removed = []
+    catalog.add_listener(lambda upserted, removed_ids, version: removed.extend(removed_ids))
+    catalog._on_snapshot(None, [_change('ADDED', _doc('a')), _change('ADDED', _doc('b'))], None)
+
+    catalog.stop()
+    catalog._on_snapshot(None, [_change('ADDED', _doc('b'))], None)  # 'a' was deleted meanwhile
+
+    assert catalog.ids() == {'b'} and removed == ['a']
+
+
+def test_ready_timeout_degrades_to_immediate_fallback():
+    catalog = OpportunityCatalog()
+
+    async def scenario():
+        assert not await catalog.wait_until_ready(0.05)
+        started = time.monotonic()
+        assert not await catalog.wait_until_ready(5.0)
+        fallback_seconds = time.monotonic() - started
+        catalog._on_snapshot(None, [_change('ADDED', _doc('a'))], None)
+        return fallback_seconds, await catalog.wait_until_ready(5.0)
+
+    fallback_seconds, ready = asyncio.run(scenario())
+    assert fallback_seconds < 0.5 and ready and not catalog.is_degraded
+
+    failing = OpportunityCatalog()
+    failing.start(SimpleNamespace(on_snapshot=lambda callback: (_ for _ in ()).throw(RuntimeError("permission denied"))))
+    assert failing.is_degraded and not failing.is_running
+
+
+def test_expired_entries_are_filtered():
+    yesterday = (datetime.now() - timedelta(days=1)).date().isoformat()
+    tomorrow = (datetime.now() + timedelta(days=1)).date().isoformat()
+    catalog = OpportunityCatalog()
+    catalog.apply_changes([
+        ('old', {'name': 'Old', 'source_url': 'x', 'deadline': yesterday}),
+        ('new', {'name': 'New', 'source_url': 'y', 'deadline': tomorrow}),
+        ('open', {'name': 'Open', 'source_url': 'z', 'deadline': 'rolling'}),
+    ])
+
+    assert sorted(s.id for s in catalog.snapshot()) == ['new', 'open']
+    assert len(catalog.snapshot(include_expired=True)) == 3
+
+
+def test_reads_are_detached_from_shared_state():
+    catalog = OpportunityCatalog()
+    catalog.apply_changes([('a', {'name': 'A', 'source_url': 'x'})])
+
+    first = catalog.snapshot()[0]
+    first.match_score = 99
+    first.match_reasons.append("AI Match: 99%")
+
+    second = catalog.get('a')
+    assert second.match_score == 0.0
+    assert second.match_reasons == []
+
+
+def test_listeners_receive_deltas():
+    catalog = OpportunityCatalog()
+    seen = []
+    catalog.add_listener(lambda upserted, removed, version: seen.append(([s.id for s in upserted], removed, version)))
+
+    catalog.apply_changes([('a', {'name': 'A', 'source_url': 'x'})])
+    catalog.apply_changes(removals=['a', 'missing'])
+    catalog.apply_changes(removals=['missing'])
+
+    assert seen == [(['a'], [], 1), ([], ['a'], 2)]
+
+
+def test_list_views_serialize_without_embeddings():
+    catalog = OpportunityCatalog()
+    catalog.apply_changes([('a', {'name': "A", 'source_url': "https://example.com/a", 'embedding': [0.5] * 768})])
+    items = catalog.snapshot()
+    assert items[0].embedding is not None  # the catalog keeps vectors for the vector path
+
+    payload = MatchedScholarshipsResponse(scholarships=items, total_value=0, last_updated="").model_dump()
+    assert 'embedding' not in payload['scholarships'][0]
+    assert 'embedding' not in SUMMARY_FIELDS and 'deadline' in SUMMARY_FIELDS
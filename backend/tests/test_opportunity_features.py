@@ -0,0 +1,103 @@
+"""
+Unit Tests for Precomputed Opportunity Feature Records
+"""
+from app.infrastructure.opportunity_catalog import OpportunityCatalog
+from app.models import UserProfile
+from app.services.opportunity_features import OpportunityFeatureStore, scoring_dict
+from app.services.personalization_engine import personalization_engine
+
+
+def _opp(doc_id, **fields):
+    return {
+        'name': f"{doc_id} AI Hackathon",
+        'source_url': f"https://example.com/{doc_id}",
+        'description': "Build machine learning tools for climate research",
+        'tags': ['AI', 'Hackathon'],
+        'geo_tags': ['Nigeria'],
+        'eligibility': {'majors': ['Computer Science'], 'gpa_min': 3.0, 'grades_eligible': ['Undergraduate']},
+        **fields,
+    }
+
+
+PROFILES = [
+    UserProfile(interests=['artificial intelligence', 'climate'], background=['ai'], major='Computer Science',
+                gpa=3.5, academic_status='Undergraduate', country='Nigeria'),
+    UserProfile(interests=['fintech'], background=[], major='Economics', gpa=2.8, country='Kenya'),
+    UserProfile(),
+]
+
+
+def test_feature_record_scores_match_raw_dict():
+    catalog = OpportunityCatalog()
+    catalog.apply_changes([
+        ('a', _opp('a')),
+        ('b', _opp('b', geo_tags=['Global'], eligibility={}, tags=[])),
+        ('c', _opp('c', description="Fintech payments bounty", geo_tags=[])),
+    ])
+    for s in catalog.snapshot():
+        features = personalization_engine.build_features(scoring_dict(s))
+        for profile in PROFILES:
+            expected = personalization_engine.calculate_personalized_score(scoring_dict(s), profile)
+            assert personalization_engine.calculate_personalized_score(features, profile) == expected
+
+    assert personalization_engine.build_features(scoring_dict(catalog.get('a'))).inferred_type == 'hackathon'
+
+
+def test_store_follows_catalog_changes():
+    catalog = OpportunityCatalog()
+    store = OpportunityFeatureStore()
+    catalog.add_listener(store.on_catalog_change)
+
+    catalog.apply_changes([('a', _opp('a'))])
+    first = store.get(catalog.get('a'))
+    assert store.get(catalog.get('a')) is first  # detached copies hit the cache
+    assert 'artificial intelligence' in first.group_hits
+
+    catalog.apply_changes([('a', _opp('a', name="Fintech Grant", description="Payments", tags=[]))])
+    second = store.get(catalog.get('a'))
+    assert second is not first
+    assert second.inferred_type == 'grant'
+
+    # A modified copy that is not the catalog's content gets a fresh, uncached record
+    edited = catalog.get('a').model_copy(update={'description': "Robotics hackathon"})
+    assert store.get(edited).inferred_type == 'hackathon'
+    assert store.get(catalog.get('a')) is second
+
+    catalog.apply_changes(removals=['a'])
+    assert len(store) == 0
+
+
+def test_score_batch_matches_per_item_scores():
+    catalog = OpportunityCatalog()
+    store = OpportunityFeatureStore()
+    catalog.add_listener(store.on_catalog_change)
+    catalog.apply_changes([
+        ('a', _opp('a')),
+        ('b', _opp('b', geo_tags=['Global'], eligibility={}, tags=[])),
+        ('c', _opp('c', description="Fintech payments bounty", geo_tags=['Kenya'],
+                   eligibility={'majors': ['Economics'], 'gpa_min': 3.0, 'backgrounds': ['fintech']})),
+        ('d', _opp('d', deadline="2000-01-01", eligibility={'grade_levels': ['Graduate']})),
+    ])
+    view = store.catalog_view()
+    assert store.catalog_view() is view  # cached per catalog version
+
+    profiles = PROFILES + [UserProfile(interests=['payments', 'ai', 'web development'], background=['fintech'],
+                                       major='economics', gpa=2.75, academic_status='graduate', country='Kenya')]
+    for profile in profiles:
+        expected = [
+            personalization_engine.calculate_personalized_score(scoring_dict(s), profile) for s in view.items
+        ]
+        ranked = personalization_engine.score_batch(profile, view)
+        assert sorted(ranked, key=lambda r: r[0]) == list(enumerate(expected))
+        assert [score for _, score in ranked] == sorted(expected, reverse=True)
+
+        live = personalization_engine.score_batch(profile, view, top_k=2, live_only=True)
+        assert len(live) == 2 and all(view.items[row].id != 'd' for row, _ in live)
+
+    # Rows served from a shared catalog view are detached before callers mutate them
+    taken = view.take(0)
+    taken.match_reasons.append("x")
+    assert view.items[0].match_reasons == []
+
+    catalog.apply_changes(removals=['d'])
+    assert len(store.catalog_view()) == 3
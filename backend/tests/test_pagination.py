@@ -0,0 +1,46 @@
+"""
+Unit Tests for Cursor Pagination of Ranked Lists
+"""
+import random
+
+import pytest
+
+from app.utils.pagination import decode_cursor, encode_cursor, paginate
+
+
+def _walk(items, limit):
+    pages, cursor = [], None
+    while True:
+        page, cursor = paginate(items, lambda it: it, cursor, limit)
+        pages.append(page)
+        if cursor is None:
+            return pages
+
+
+def test_pages_cover_ranking_once_in_order():
+    rng = random.Random(17)
+    ranking = [(float(rng.randint(40, 60)), f"s{i:03d}") for i in range(95)]  # many ties
+    rng.shuffle(ranking)
+
+    pages = _walk(ranking, limit=10)
+    flat = [item for page in pages for item in page]
+    assert [len(p) for p in pages] == [10] * 9 + [5]
+    assert flat == sorted(ranking, key=lambda it: (-it[0], it[1]))
+
+    assert _walk(ranking[:20], limit=20) == [sorted(ranking[:20], key=lambda it: (-it[0], it[1]))]
+    assert paginate([], lambda it: it) == ([], None)
+
+
+def test_cursor_survives_reranking_and_rejects_garbage():
+    ranking = [(90.0, 'a'), (80.0, 'b'), (70.0, 'c'), (60.0, 'd')]
+    page, cursor = paginate(ranking, lambda it: it, None, 2)
+    assert decode_cursor(cursor) == (80.0, 'b')
+
+    # 'b' was rescored and a new item arrived above the cursor: the next page continues after (80, 'b')
+    reranked = [(90.0, 'a'), (95.0, 'e'), (50.0, 'b'), (70.0, 'c'), (60.0, 'd')]
+    assert paginate(reranked, lambda it: it, cursor, 2)[0] == [(70.0, 'c'), (60.0, 'd')]
+
+    assert decode_cursor(encode_cursor(61.25, "id/with+chars")) == (61.25, "id/with+chars")
+    for bad in ("not-a-cursor", encode_cursor(1, "x")[:-3], "W10"):
+        with pytest.raises(ValueError):
+            decode_cursor(bad)
@@ -0,0 +1,32 @@
+"""
+Unit Tests for Placeholder-Preserving Scholarship Merges
+"""
+from app.utils.scholarship_merge import merge_preserving
+
+
+def test_thin_scrape_keeps_rich_fields_and_unions_tags():
+    existing = {
+        'amount': 25000, 'amount_display': "$25,000 in prizes",
+        'deadline': "2026-12-01", 'deadline_timestamp': 1796083200,
+        'description': "Full description", 'tags': ['ai', 'web3'], 'geo_tags': ['Global'],
+    }
+    incoming = {
+        'amount': 0, 'amount_display': "See details", 'deadline': None, 'deadline_timestamp': None,
+        'description': "  ", 'tags': ['web3', 'defi'], 'geo_tags': [], 'type_tags': ['Hackathon'],
+    }
+
+    merged = merge_preserving(incoming, existing)
+    assert merged['amount'] == 25000
+    assert merged['amount_display'] == "$25,000 in prizes"
+    assert (merged['deadline'], merged['deadline_timestamp']) == ("2026-12-01", 1796083200)
+    assert merged['description'] == "Full description"
+    assert merged['tags'] == ['ai', 'web3', 'defi']
+    assert merged['geo_tags'] == ['Global']
+    assert incoming['amount'] == 0  # input untouched
+
+
+def test_richer_incoming_wins_and_new_docs_pass_through():
+    incoming = {'amount': 500, 'amount_display': "$500", 'deadline': "2027-01-01", 'description': "New"}
+    assert merge_preserving(incoming, None) == incoming
+    merged = merge_preserving(incoming, {'amount': 100, 'amount_display': "$100", 'description': "Old"})
+    assert (merged['amount'], merged['amount_display'], merged['description']) == (500, "$500", "New")
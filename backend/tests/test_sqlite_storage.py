@@ -0,0 +1,119 @@
+"""
+Unit Tests for the Local SQLite Storage Backend
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.infrastructure import sqlite_storage
+from app.infrastructure.opportunity_catalog import OpportunityCatalog
+from app.infrastructure.sqlite_storage import SQLiteDB
+from app.models import Scholarship
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'catalog_cache_enabled', False)
+    db = SQLiteDB(str(tmp_path / "store.sqlite3"))
+    yield db
+    db.close()
+
+
+def _opp(scholarship_id, **fields):
+    return Scholarship(id=scholarship_id, name=scholarship_id.title(), source_url=f"https://example.com/{scholarship_id}", **fields)
+
+
+def test_scholarship_upserts_merge_skip_and_filter_expired(store):
+    past = (datetime.now() - timedelta(days=3)).date().isoformat()
+    future = (datetime.now() + timedelta(days=30)).date().isoformat()
+    vector = np.arange(4, dtype=np.float32)
+
+    outcomes = asyncio.run(store.save_scholarships_bulk([
+        _opp('a', amount=5000, deadline=future, embedding=vector.tolist()),
+        _opp('b', deadline=past),
+    ]))
+    assert [o.status for o in outcomes] == ['written', 'written']
+
+    # Thin re-scrape: richer fields and the stored vector survive; an identical re-upsert is skipped
+    outcomes = asyncio.run(store.save_scholarships_bulk([_opp('a', amount=0, deadline=future), _opp('b', deadline=past)]))
+    assert [o.status for o in outcomes] == ['skipped', 'skipped']
+
+    stored = asyncio.run(store.get_scholarship('a'))
+    assert stored.amount == 5000 and np.array_equal(stored.embedding, vector)
+
+    assert [s.id for s in asyncio.run(store.get_all_scholarships())] == ['a']
+    summaries = asyncio.run(store.get_scholarship_summaries())
+    assert [s.id for s in summaries] == ['a'] and not hasattr(summaries[0], 'embedding')
+
+    plan = store._query("EXPLAIN QUERY PLAN SELECT id FROM scholarships WHERE deadline_timestamp >= 0")
+    assert 'idx_scholarships_deadline' in ' '.join(row['detail'] for row in plan)
+
+
+def test_applications_jobs_chat_and_matches(store):
+    async def scenario():
+        app_id = await store.start_application('u1', 's1')
+        assert await store.start_application('u1', 's1') == app_id  # existing draft is reused
+        await store.save_application_draft(app_id, {'current_step': 3, 'essays': None})
+        draft = await store.get_application_draft('u1', 's1')
+        assert draft['current_step'] == 3 and draft['essays'] == []
+
+        await store.update_application_status(app_id, 'submitted', notes='sent')
+        assert await store.get_application_draft('u1', 's1') is None
+        assert [a['notes'] for a in await store.get_user_applications('u1')] == ['sent']
+        with pytest.raises(KeyError):
+            await store.update_application_status('missing', 'draft')
+        await store.delete_application(app_id)
+        assert await store.get_application_by_id(app_id) is None
+
+        await store.create_discovery_job('u1', 'job1')
+        await store.update_discovery_job('job1', 'completed', 1.0, 7)
+        assert (await store.get_discovery_job('job1'))['scholarships_found'] == 7
+
+        for i in range(5):
+            await store.save_chat_message('u1', 'user', f"m{i}")
+        assert [m['content'] for m in await store.get_chat_history('u1', limit=3)] == ['m2', 'm3', 'm4']
+        await store.clear_chat_history('u1')
+        assert await store.get_chat_history('u1') == []
+
+        await store.save_scholarships_bulk([_opp('x'), _opp('y')])
+        await store.set_user_matches_doc('u1', {'scholarship_ids': ['y', 'x', 'gone'], 'scores': [90.0, 80.0, 70.0]})
+        matched = await store.get_user_matched_scholarships('u1')
+        assert [(s.id, s.match_score) for s in matched] == [('y', 90.0), ('x', 80.0)]
+
+        await store.save_user_scholarship('u1', 'x')
+        await store.save_user_scholarship('u1', 'x')
+        assert (await store.get_user_profile('u1'))['saved_scholarships'] == ['x']
+        await store.save_user_scholarship('u2', 'y')
+        assert [(uid, doc['saved_scholarships']) for uid, doc in await store.get_all_users()] == [('u1', ['x']), ('u2', ['y'])]
+
+    asyncio.run(scenario())
+
+
+def test_catalog_loads_from_table_and_sees_later_writes(store, monkeypatch):
+    catalog = OpportunityCatalog()
+    monkeypatch.setattr(sqlite_storage, 'opportunity_catalog', catalog)
+    monkeypatch.setattr(settings, 'catalog_cache_enabled', True)
+    asyncio.run(store.save_scholarship(_opp('a')))
+
+    assert [s.id for s in asyncio.run(store.get_all_scholarships())] == ['a']
+    assert catalog.is_ready
+
+    asyncio.run(store.save_scholarship(_opp('b', amount=100)))
+    asyncio.run(store.update_scholarship_embeddings({'a': [1.0, 0.0]}))
+    assert catalog.get('b').amount == 100
+    assert catalog.get('a').embedding.tolist() == [1.0, 0.0]
+
+
+def test_expired_rows_are_range_filtered_then_swept_to_archive(store):
+    past = (datetime.now() - timedelta(days=3)).date().isoformat()
+    asyncio.run(store.save_scholarships_bulk([_opp('old', deadline=past), _opp('rolling'), _opp('junk', deadline="soon")]))
+    assert sorted(s.id for s in asyncio.run(store.get_scholarship_summaries())) == ['junk', 'rolling']
+
+    before = int(datetime.now().timestamp())
+    assert asyncio.run(store.sweep_expired_scholarships(before, limit=10)) == ['old']
+    assert asyncio.run(store.sweep_expired_scholarships(before, limit=10)) == []
+    assert store._query("SELECT id FROM scholarships_archive")[0]['id'] == 'old'
+    assert asyncio.run(store.get_scholarship('old')) is None
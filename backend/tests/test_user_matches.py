@@ -0,0 +1,98 @@
+"""
+Unit Tests for Bounded Per-User Match Lists
+"""
+import asyncio
+import random
+
+from app.services.user_matches import TopKMatches, UserMatchStore
+
+
+class _FakeDB:
+    def __init__(self, docs=None):
+        self.docs = dict(docs or {})
+        self.writes = 0
+
+    async def get_user_matches_doc(self, user_id):
+        return self.docs.get(user_id)
+
+    async def set_user_matches_doc(self, user_id, doc):
+        self.writes += 1
+        self.docs[user_id] = dict(doc)
+        return True
+
+
+def test_top_k_matches_stays_sorted_and_bounded():
+    rng = random.Random(11)
+    top = TopKMatches(k=10)
+    truth = {}
+    for _ in range(500):
+        scholarship_id = f"s{rng.randint(0, 60)}"
+        score = float(rng.randint(5, 100))
+        top.offer(scholarship_id, score)
+        truth[scholarship_id] = score  # rescoring replaces the old score
+
+    doc = top.to_doc()
+    assert len(doc['scholarship_ids']) == 10
+    assert doc['scores'] == sorted(doc['scores'], reverse=True)
+    assert doc['min_score'] == doc['scores'][-1]
+    assert all(truth[i] == s for i, s in zip(doc['scholarship_ids'], doc['scores']))
+
+
+def test_watermark_rejects_and_rescoring_moves():
+    top = TopKMatches.from_ranking([('a', 90), ('b', 70), ('c', 50)], k=3)
+    assert top.watermark == 50
+    assert top.offer('d', 40) is False
+    assert top.offer('d', 60) is True
+    assert top.ids() == ['a', 'b', 'd']
+    assert top.offer('a', 10) is True  # rescored below the others, stays until displaced
+    assert top.ids() == ['b', 'd', 'a']
+    assert top.discard('d') and top.watermark is None
+    assert TopKMatches.from_doc({'scholarship_ids': ['x', 'y']}, k=5).ids() == ['x', 'y']
+
+
+def test_store_writes_only_on_change_and_follows_removals():
+    async def scenario():
+        db = _FakeDB({'u1': {'scholarship_ids': ['a', 'b'], 'scores': [80.0, 60.0], 'min_score': 60.0}})
+        store = UserMatchStore(k=2)
+
+        assert await store.offer(db, 'u1', 'c', 55) is False
+        assert db.writes == 0
+        assert await store.offer(db, 'u1', 'c', 70) is True
+        assert db.docs['u1']['scholarship_ids'] == ['a', 'c']
+        assert db.docs['u1']['min_score'] == 70.0
+
+        store.on_catalog_change([], ['a'], version=2)
+        assert await store.offer(db, 'u1', 'c', 70) is False
+        assert db.docs['u1']['scholarship_ids'] == ['c']  # removal persisted with the next write
+        assert store.stats()['accepted'] == 1
+
+    asyncio.run(scenario())
+
+
+class _SlowDB(_FakeDB):
+    async def set_user_matches_doc(self, user_id, doc):
+        await asyncio.sleep(0.01 if 'a' in doc['scholarship_ids'] else 0)  # first write lands last
+        return await super().set_user_matches_doc(user_id, doc)
+
+
+def test_concurrent_offers_for_one_user_persist_in_order():
+    async def scenario():
+        db = _SlowDB()
+        store = UserMatchStore(k=5)
+        await asyncio.gather(store.offer(db, 'u1', 'a', 90), store.offer(db, 'u1', 'b', 80))
+        assert db.docs['u1']['scholarship_ids'] == ['a', 'b']
+        assert not store._user_locks
+
+    asyncio.run(scenario())
+
+
+def test_store_rereads_writes_from_other_processes():
+    async def scenario():
+        db = _FakeDB()
+        ours, theirs = UserMatchStore(k=5, max_age=0), UserMatchStore(k=5, max_age=0)
+        await ours.offer(db, 'u1', 'a', 90)
+        await theirs.offer(db, 'u1', 'b', 80)
+        await ours.offer(db, 'u1', 'c', 70)
+        assert db.docs['u1']['scholarship_ids'] == ['a', 'b', 'c']
+
+    asyncio.run(scenario())
@@ -0,0 +1,65 @@
+"""
+Unit Tests for the User Routing Index
+"""
+import random
+
+from app.models import UserProfile
+from app.services.personalization_engine import personalization_engine
+from app.services.user_routing_index import ROUTING_MIN_SCORE, UserRoutingIndex
+
+
+def _features(description, **fields):
+    return personalization_engine.build_features({'name': "Opportunity", 'description': description, **fields})
+
+
+def test_candidates_follow_profile_changes():
+    index = UserRoutingIndex()
+    index.upsert('ai', {'interests': ['artificial intelligence'], 'background': []})
+    index.upsert('fin', {'interests': ['fintech'], 'background': ['Payments']})
+    index.upsert('open', {'interests': [], 'background': []})
+
+    ml = _features("Machine learning research grant")
+    assert index.candidates(ml) == ['ai', 'open']
+    assert index.candidates(_features("Payments API challenge")) == ['fin', 'open']
+
+    # Unindexed IDs are kept; indexed non-matches are dropped
+    assert index.candidates(ml, among=['fin', 'ai', 'ghost']) == ['ai', 'ghost']
+
+    index.refresh_profile('ai', {'interests': ['robotics'], 'background': []})
+    assert index.candidates(ml) == ['open']
+
+    index.upsert('doc', {'profile': {'interests': ['ai']}, 'interests': ['ai']})
+    index.refresh_profile('doc', {'interests': ['fintech']})
+    assert index.profile('doc')['profile'] == {'interests': ['fintech']}
+
+    index.remove('fin')
+    assert index.candidates(_features("Payments API challenge")) == ['open']
+    assert index.stats()['users'] == 3
+
+
+def test_users_left_out_cannot_reach_routing_threshold():
+    rng = random.Random(9)
+    groups = list(personalization_engine.interest_keywords)
+    keywords = [k for ks in personalization_engine.interest_keywords.values() for k in ks]
+    index = UserRoutingIndex()
+    profiles = {}
+    for i in range(120):
+        profile = UserProfile(
+            interests=rng.sample(groups + ['climate', 'origami'], rng.randint(0, 3)),
+            background=rng.sample(groups + ['woodwork'], rng.randint(0, 2)),
+            major=rng.choice([None, 'Computer Science']), gpa=rng.choice([None, 3.9]),
+            academic_status=rng.choice(['Unknown', 'Undergraduate']), country=rng.choice(['Nigeria', 'Kenya'])
+        )
+        profiles[str(i)] = profile
+        index.upsert(str(i), profile)
+
+    for _ in range(60):
+        features = _features(
+            " ".join(rng.choices(keywords + ['filler'] * 30, k=rng.randint(0, 6))),
+            geo_tags=rng.sample(['Nigeria', 'Global'], rng.randint(0, 1)),
+            eligibility={'grade_levels': ['Undergraduate']} if rng.random() < 0.5 else {}
+        )
+        candidates = set(index.candidates(features))
+        for user_id, profile in profiles.items():
+            if user_id not in candidates:
+                assert personalization_engine.calculate_personalized_score(features, profile) <= ROUTING_MIN_SCORE
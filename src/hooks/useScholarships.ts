@@ -1,6 +1,6 @@
 import { useState, useCallback } from 'react';
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
-import { Scholarship, DashboardStats, UserProfile } from '@/types/scholarship';
+import { Scholarship, DashboardStats, MatchedScholarshipsPage, UserProfile } from '@/types/scholarship';
 import { apiService } from '@/services/api';
 import { useAuth } from '@/contexts/AuthContext';
 import { useToast } from '@/hooks/use-toast';
@@ -14,7 +14,25 @@ export const useScholarships = () => {
   const [discoveryStatus, setDiscoveryStatus] = useState<'idle' | 'processing' | 'completed'>('idle');
   const [discoveryProgress, setDiscoveryProgress] = useState(0);
 
-  // 1. Main Query: Fetch Matched Scholarships
+  // Append the remaining match pages to the cached first page as they arrive
+  const streamRemainingPages = useCallback(async (uid: string, cursor: string) => {
+    let next: string | null | undefined = cursor;
+    while (next) {
+      const page = await apiService.getMatchedScholarships(uid, next);
+      queryClient.setQueryData(['scholarships', uid], (old: MatchedScholarshipsPage | undefined) => {
+        if (!old) return old;
+        const seen = new Set(old.scholarships.map(s => s.id));
+        return {
+          ...old,
+          scholarships: [...old.scholarships, ...page.scholarships.filter(s => !seen.has(s.id))],
+          next_cursor: page.next_cursor,
+        };
+      });
+      next = page.next_cursor;
+    }
+  }, [queryClient]);
+
+  // 1. Main Query: Fetch Matched Scholarships (first page renders, later pages stream in)
   const {
     data: matchedData,
     isLoading: loading,
@@ -22,8 +40,14 @@ export const useScholarships = () => {
   } = useQuery({
     queryKey: ['scholarships', user?.uid],
     queryFn: async () => {
-      if (!user?.uid) return { scholarships: [], total_value: 0, last_updated: '' };
-      return apiService.getMatchedScholarships(user.uid);
+      if (!user?.uid) return { scholarships: [], total_value: 0, last_updated: '', total_count: 0 };
+      const firstPage = await apiService.getMatchedScholarships(user.uid);
+      if (firstPage.next_cursor) {
+        streamRemainingPages(user.uid, firstPage.next_cursor).catch(error =>
+          console.error('Failed to load remaining matches:', error)
+        );
+      }
+      return firstPage;
     },
     enabled: !!user?.uid,
     staleTime: 5 * 60 * 1000, // 5 minutes
@@ -1,5 +1,5 @@
 // API Service Layer for ScholarStream Backend Integration
-import { Scholarship, DiscoveryJobResponse, UserProfile } from '@/types/scholarship';
+import { Scholarship, DiscoveryJobResponse, MatchedScholarshipsPage, UserProfile } from '@/types/scholarship';
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'https://scholarstream-backend-opdnpd6bsq-uc.a.run.app';
 
@@ -50,9 +50,11 @@ class ApiService {
     return this.fetchWithAuth(`/api/scholarships/discover/${jobId}`);
   }
 
-  // Get all matched scholarships for a user
-  async getMatchedScholarships(userId: string): Promise<{ scholarships: Scholarship[]; total_value: number; last_updated: string }> {
-    return this.fetchWithAuth(`/api/scholarships/matched?user_id=${userId}`);
+  // Get one page of matched scholarships for a user (follow next_cursor for the rest)
+  async getMatchedScholarships(userId: string, cursor?: string | null, limit = 50): Promise<MatchedScholarshipsPage> {
+    const params = new URLSearchParams({ user_id: userId, limit: String(limit) });
+    if (cursor) params.set('cursor', cursor);
+    return this.fetchWithAuth(`/api/scholarships/matched?${params}`);
   }
 
   // Get single scholarship details
@@ -65,6 +65,14 @@ export interface DiscoveryJobResponse {
   total_found?: number;
 }
 
+export interface MatchedScholarshipsPage {
+  scholarships: Scholarship[];
+  total_value: number;
+  last_updated: string;
+  total_count: number;
+  next_cursor?: string | null;
+}
+
 export interface UserProfile {
   name: string;
   academic_status: string;